@@ -1,34 +1,60 @@
 # TransPyC 入口程序
 
+# 启动时只导入参数解析需要的模块，翻译器、符号文件格式、批量构建等
+# 由各子命令在用到时才导入（见 LAZY_EXPORTS 和各方法中的局部导入），
+# 例如 -presym 处理 C 文件时不会载入翻译器。
 import sys
 import os
-import ast
-import json
-import struct
-# 添加lib目录到Python路径
-sys.path.append(os.path.join(os.path.dirname(__file__), 'lib', 'includes'))
-import c
-import t
 from lib.constants.config import (
     DEFAULT_INPUT_FILE, DEFAULT_OUTPUT_FILE,
     SUPPORTED_FILE_TYPES, DEFAULT_COMPILE_COMMAND,
     DEFAULT_COMPILE_FLAGS, ERROR_MESSAGES,
-    HELP_MESSAGE, GENERATE_Copyright
+    HELP_MESSAGE, GENERATE_Copyright, CACHE_DIR,
+    WATCH_INTERVAL
 )
 from lib.utils.helpers import (
     detect_file_type, execute_command,
     get_file_content, write_file_content,
-    append_file_content, validate_args
+    append_file_content, validate_args,
+    open_output_file
 )
-from lib.core.translator import Translator
+
+# 按需导入的模块级名称 -> 所在模块，保持 TransPyC.Translator 等原有用法可用
+LAZY_EXPORTS = {
+    'Translator': 'lib.core.translator',
+    'parse_python': 'lib.core.python_symbols',
+    'extract_python_symbols': 'lib.core.python_symbols',
+    'encode_symbol_table': 'lib.core.symbin',
+    'decode_symbol_table': 'lib.core.symbin',
+    'SymbolRegistry': 'lib.core.symbol_registry',
+    'collect_build_units': 'lib.core.builder',
+    'load_shared_symbols': 'lib.core.builder',
+    'resolve_jobs': 'lib.core.builder',
+    'run_build': 'lib.core.builder',
+    'format_build_report': 'lib.core.builder',
+    'convert_many': 'lib.core.builder',
+    'ConvertResult': 'lib.core.builder',
+}
+
+
+def __getattr__(name):
+    """第一次访问 LAZY_EXPORTS 中的名称时导入对应模块"""
+    module_name = LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
 
 def serialize_symbol_table(symbol_table: dict) -> bytes:
     """将符号表序列化为二进制格式
     
-    格式: 
-    - 4字节: JSON数据长度（小端序）
-    - N字节: JSON数据（UTF-8编码）
+    格式见 lib/core/symbin.py（第 2 版）：
+    - 文件头: 魔数、版本号和各区偏移
+    - 定长记录区和按名称排序的索引区，支持内存映射后按名称二分查找
+    - 字符串区: 符号名称和每个条目的 JSON
     
     Args:
         symbol_table: 符号表字典
@@ -36,28 +62,23 @@ def serialize_symbol_table(symbol_table: dict) -> bytes:
     Returns:
         二进制字节数据
     """
-    json_data = json.dumps(symbol_table, ensure_ascii=False).encode('utf-8')
-    length = len(json_data)
-    # 使用4字节小端序整数表示长度
-    header = struct.pack('<I', length)
-    return header + json_data
+    from lib.core.symbin import encode_symbol_table
+    return encode_symbol_table(symbol_table)
 
 
 def deserialize_symbol_table(data: bytes) -> dict:
     """从二进制数据反序列化符号表
     
+    同时支持第 2 版格式和旧的 4 字节长度加 JSON 格式
+    
     Args:
         data: 二进制字节数据
         
     Returns:
         符号表字典
     """
-    if len(data) < 4:
-        raise ValueError("Invalid symbin file: data too short")
-    # 解析4字节长度头（小端序）
-    length = struct.unpack('<I', data[:4])[0]
-    json_data = data[4:4+length]
-    return json.loads(json_data.decode('utf-8'))
+    from lib.core.symbin import decode_symbol_table
+    return decode_symbol_table(data)
 
 
 class SymbolFile:
@@ -89,22 +110,63 @@ class Config:
 class TransPyC:
     """TransPyC 主类"""
     
-    def __init__(self, code=None, debug=False):
+    def __init__(self, code=None, debug=False, cache_dir=None, profile=False):
         """初始化TransPyC对象
         
         Args:
             code: 代码字符串
             debug: 调试模式
+            cache_dir: 增量翻译和辅助文件符号的缓存目录，None 表示不使用缓存
+            profile: 性能分析，True 时转换后输出热点表；为字符串时还把分析数据写入该文件
+                     （.json 为 speedscope 格式，其他为 pstats 格式）
         """
         self.Args = {}
         self.HeaderFiles = []
         self.HelperFiles = []  # 辅助文件列表，用于解析符号信息
-        self.translator = Translator()  # 代码转换器
         self.code = code
-        self.translator.Content = code
+        self.CacheDir = cache_dir
+        self.Profile = profile
         self.config = Config()
         self.config.debug = debug
         self.symbol_files = []  # 符号文件列表
+        self._translator = None  # 代码转换器，第一次使用时创建
+        self._symbol_registry = None  # 已载入的符号文件登记表，第一次使用时创建
+        self.WarmSymbols = None  # 常驻服务保持的辅助文件符号表（WarmSymbolTables），None 表示每次重新解析
+        self.Metrics = None  # -metrics 的各阶段统计（lib.core.metrics.Metrics），None 表示不统计
+    
+    @property
+    def translator(self):
+        """代码转换器，第一次使用时才导入翻译器模块"""
+        if self._translator is None:
+            from lib.core.translator import Translator
+            self._translator = Translator()
+            self._translator.Content = self.code
+            if self.CacheDir:
+                self._translator.set_definition_cache(self.CacheDir)
+                self._translator.set_symbol_cache(self.CacheDir)
+            if self.Profile:
+                from lib.core.profiling import Profiler
+                record_events = isinstance(self.Profile, str) and self.Profile.endswith('.json')
+                self._translator.set_profiler(Profiler(record_events))
+        return self._translator
+    
+    def ProfileReport(self):
+        """输出性能分析热点表，指定了文件时同时写出分析数据"""
+        profiler = self.translator.Profiler
+        if profiler is None:
+            return
+        print(profiler.Report())
+        if isinstance(self.Profile, str):
+            profiler.Write(self.Profile)
+            print(f'Profile data written to: {self.Profile}')
+    
+    @property
+    def symbol_registry(self):
+        """已载入的符号文件登记表"""
+        if self._symbol_registry is None:
+            from lib.core.symbol_registry import SymbolRegistry
+            self._symbol_registry = SymbolRegistry()
+        return self._symbol_registry
     
     @staticmethod
     def PreProcessSymbol(symbol_file, debug=False):
@@ -120,7 +182,6 @@ class TransPyC:
             如果debug为False: bytes - 序列化后的符号表二进制数据
             如果debug为True: (bytes, str) - (二进制数据, 调试日志)
         """
-        translator = Translator()
         debug_logs = []
         
         try:
@@ -143,7 +204,11 @@ class TransPyC:
                     file_type = 'c'
             
             if file_type == 'py':
-                # Python文件处理
+                # Python文件处理，需要翻译器解析类型注解
+                import ast
+                from lib.core.translator import Translator
+                from lib.core.python_symbols import parse_python, extract_python_symbols
+                translator = Translator()
                 translator.OriginalLines = content.split('\n')
                 translator.Content = content
                 
@@ -156,70 +221,41 @@ class TransPyC:
                         f.write('')
                 
                 # 解析AST并提取符号
-                tree = ast.parse(content)
+                tree = parse_python(content)
                 
                 if debug:
-                    with open(debug_file, 'a', encoding=symbol_file.encoding) as f:
-                        f.write('=== AST Tree (Compact) ===\n')
-                        f.write(ast.dump(tree))
-                        f.write('\n\n')
+                    translator.debug_write('=== AST Tree (Compact) ===\n' + ast.dump(tree) + '\n\n',
+                                           symbol_file.encoding)
                 
-                # 遍历AST提取符号
-                for node in ast.iter_child_nodes(tree):
-                    if isinstance(node, ast.ClassDef):
-                        translator.SymbolTable[node.name] = {'type': 'struct', 'members': {}}
-                        for item in node.body:
-                            if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
-                                var_name = item.target.id
-                                var_type = translator.GetTypeName(item.annotation) if item.annotation else 'unknown'
-                                is_pointer = '*' in var_type or 'CPtr' in var_type
-                                translator.SymbolTable[node.name]['members'][var_name] = {
-                                    'type': var_type,
-                                    'is_pointer': is_pointer
-                                }
-                    elif isinstance(node, ast.FunctionDef):
-                        translator.SymbolTable[node.name] = {'type': 'function'}
-                    elif isinstance(node, ast.AnnAssign):
-                        if isinstance(node.target, ast.Name):
-                            var_name = node.target.id
-                            var_type = 'unknown'
-                            is_pointer = False
-                            if node.annotation:
-                                try:
-                                    var_type = translator.GetTypeName(node.annotation)
-                                    is_pointer = '*' in var_type or 'CPtr' in var_type
-                                except:
-                                    pass
-                            translator.SymbolTable[var_name] = {
-                                'type': 'variable', 
-                                'declared_type': var_type, 
-                                'is_pointer': is_pointer
-                            }
+                symbol_table = dict(extract_python_symbols(tree, translator))
                 
                 if debug:
-                    with open(debug_file, 'a', encoding=symbol_file.encoding) as f:
-                        f.write('=== Symbol Table ===\n')
-                        f.write(str(translator.SymbolTable))
-                        f.write('\n\n')
+                    translator.debug_write('=== Symbol Table ===\n' + str(symbol_table) + '\n\n', symbol_file.encoding)
+                    translator.flush_debug()
                     # 读取调试日志
                     with open(debug_file, 'r', encoding=symbol_file.encoding) as f:
                         debug_logs = f.read()
                 
             elif file_type == 'c':
-                # C文件处理 - 使用现有的ParseHelperFiles逻辑
-                translator.ParseHelperFiles([symbol_file.file_path], symbol_file.encoding)
+                # C文件处理，只需要 C 符号提取器，不载入翻译器
+                from lib.core.c_parser import extract_c_symbols
+                symbol_table = {}
+                try:
+                    extract_c_symbols(content, symbol_table)
+                except Exception as e:
+                    print(f'Warning: Failed to parse C file {symbol_file.file_path}: {e}')
                 
                 if debug:
                     debug_logs = f"=== C File Symbol Extraction ===\n"
                     debug_logs += f"File: {symbol_file.file_path}\n"
                     debug_logs += f"=== Symbol Table ===\n"
-                    debug_logs += str(translator.SymbolTable)
+                    debug_logs += str(symbol_table)
                     debug_logs += "\n\n"
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
             
             # 序列化符号表
-            binary_data = serialize_symbol_table(translator.SymbolTable)
+            binary_data = serialize_symbol_table(symbol_table)
             
             if debug:
                 return binary_data, debug_logs
@@ -231,98 +267,103 @@ class TransPyC:
                 return b'', error_msg
             raise RuntimeError(error_msg)
     
-    def ParseArgs(self):
-        """解析命令行参数"""
-        I = 1
-        while I < len(sys.argv):
-            if sys.argv[I] == '-f':
-                if I + 1 < len(sys.argv):
-                    self.Args['Input'] = sys.argv[I + 1]
+    def ParseArgs(self, argv=None):
+        """解析命令行参数
+        
+        Args:
+            argv: 参数列表（不含程序名），默认使用 sys.argv[1:]
+        """
+        argv = sys.argv[1:] if argv is None else argv
+        I = 0
+        while I < len(argv):
+            if argv[I] == '-f':
+                if I + 1 < len(argv):
+                    self.Args['Input'] = argv[I + 1]
                     I += 2
                 else:
                     print(f'Error: -f requires an argument')
                     sys.exit(1)
-            elif sys.argv[I] == '-o':
-                if I + 1 < len(sys.argv):
-                    self.Args['Output'] = sys.argv[I + 1]
+            elif argv[I] == '-o':
+                if I + 1 < len(argv):
+                    self.Args['Output'] = argv[I + 1]
                     I += 2
                 else:
                     print(f'Error: -o requires an argument')
                     sys.exit(1)
-            elif sys.argv[I] == '-wh':
-                if I + 1 < len(sys.argv):
-                    self.HeaderFiles = sys.argv[I + 1:]
+            elif argv[I] == '-wh':
+                if I + 1 < len(argv):
+                    self.HeaderFiles = argv[I + 1:]
                     break
                 else:
                     print(f'Error: -wh requires arguments')
                     sys.exit(1)
-            elif sys.argv[I] == '-debug':
-                if I + 1 < len(sys.argv):
-                    self.Args['Debug'] = sys.argv[I + 1]
+            elif argv[I] == '-debug':
+                if I + 1 < len(argv):
+                    self.Args['Debug'] = argv[I + 1]
                     I += 2
                 else:
                     print(f'Error: -debug requires an argument')
                     sys.exit(1)
-            elif sys.argv[I] == '-cc':
+            elif argv[I] == '-cc':
                 # 编译命令
-                if I + 1 < len(sys.argv):
-                    self.Args['CompileCommand'] = sys.argv[I + 1]
+                if I + 1 < len(argv):
+                    self.Args['CompileCommand'] = argv[I + 1]
                     I += 2
                 else:
                     print(f'Error: -cc requires an argument')
                     sys.exit(1)
-            elif sys.argv[I] == '-cflags':
+            elif argv[I] == '-cflags':
                 # 编译标志
-                if I + 1 < len(sys.argv):
-                    self.Args['CompileFlags'] = sys.argv[I + 1]
+                if I + 1 < len(argv):
+                    self.Args['CompileFlags'] = argv[I + 1]
                     I += 2
                 else:
                     print(f'Error: -cflags requires an argument')
                     sys.exit(1)
-            elif sys.argv[I] == '-run':
+            elif argv[I] == '-run':
                 # 是否运行生成的程序
                 self.Args['Run'] = True
                 I += 1
-            elif sys.argv[I] == '-args':
+            elif argv[I] == '-args':
                 # 运行时参数
-                if I + 1 < len(sys.argv):
-                    self.Args['RunArgs'] = sys.argv[I + 1]
+                if I + 1 < len(argv):
+                    self.Args['RunArgs'] = argv[I + 1]
                     I += 2
                 else:
                     print(f'Error: -args requires an argument')
                     sys.exit(1)
-            elif sys.argv[I] == '-h':
+            elif argv[I] == '-h':
                 # 辅助文件，用于解析符号信息
-                if I + 1 < len(sys.argv):
+                if I + 1 < len(argv):
                     # 收集所有后续参数作为辅助文件，直到遇到下一个以-开头的参数
-                    while I + 1 < len(sys.argv) and not sys.argv[I + 1].startswith('-'):
-                        self.HelperFiles.append(sys.argv[I + 1])
+                    while I + 1 < len(argv) and not argv[I + 1].startswith('-'):
+                        self.HelperFiles.append(argv[I + 1])
                         I += 1
                     I += 1
                 else:
                     print(f'Error: -h requires arguments')
                     sys.exit(1)
-            elif sys.argv[I] == '-presym':
+            elif argv[I] == '-presym':
                 # 预处理符号文件，生成.symbin文件
                 # 格式: -presym <input_file> -o <output_file> [-debug <debug_file>]
-                if I + 1 < len(sys.argv):
-                    input_file = sys.argv[I + 1]
+                if I + 1 < len(argv):
+                    input_file = argv[I + 1]
                     I += 2
                     
                     # 解析可选参数
                     output_file = None
                     debug_file = None
-                    while I < len(sys.argv) and sys.argv[I].startswith('-'):
-                        if sys.argv[I] == '-o':
-                            if I + 1 < len(sys.argv):
-                                output_file = sys.argv[I + 1]
+                    while I < len(argv) and argv[I].startswith('-'):
+                        if argv[I] == '-o':
+                            if I + 1 < len(argv):
+                                output_file = argv[I + 1]
                                 I += 2
                             else:
                                 print(f'Error: -o requires an argument')
                                 sys.exit(1)
-                        elif sys.argv[I] == '-debug':
-                            if I + 1 < len(sys.argv):
-                                debug_file = sys.argv[I + 1]
+                        elif argv[I] == '-debug':
+                            if I + 1 < len(argv):
+                                debug_file = argv[I + 1]
                                 I += 2
                             else:
                                 print(f'Error: -debug requires an argument')
@@ -343,20 +384,81 @@ class TransPyC:
                 else:
                     print(f'Error: -presym requires an argument')
                     sys.exit(1)
-            elif sys.argv[I] == '-e' or sys.argv[I] == '--encoding':
+            elif argv[I] == '-build':
+                # 批量构建：目录或清单文件
+                if I + 1 < len(argv):
+                    self.Args['Build'] = argv[I + 1]
+                    I += 2
+                else:
+                    print(f'Error: -build requires an argument')
+                    sys.exit(1)
+            elif argv[I] == '-j':
+                # 批量构建的工作进程数
+                if I + 1 < len(argv) and argv[I + 1].isdigit():
+                    self.Args['Jobs'] = int(argv[I + 1])
+                    I += 2
+                else:
+                    print(f'Error: -j requires a number')
+                    sys.exit(1)
+            elif argv[I] == '-cache':
+                # 增量翻译缓存目录
+                if I + 1 < len(argv):
+                    self.Args['CacheDir'] = argv[I + 1]
+                    I += 2
+                else:
+                    print(f'Error: -cache requires an argument')
+                    sys.exit(1)
+            elif argv[I] == '-nocache':
+                # 不使用辅助文件符号缓存
+                self.Args['NoCache'] = True
+                I += 1
+            elif argv[I] == '-e' or argv[I] == '--encoding':
                 # 编码参数
-                if I + 1 < len(sys.argv):
-                    self.Args['Encoding'] = sys.argv[I + 1]
+                if I + 1 < len(argv):
+                    self.Args['Encoding'] = argv[I + 1]
                     I += 2
                 else:
                     print(f'Error: -e/--encoding requires an argument')
                     sys.exit(1)
+            elif argv[I] == '-profile':
+                # 性能分析，可选参数为分析数据文件
+                if I + 1 < len(argv) and not argv[I + 1].startswith('-'):
+                    self.Profile = argv[I + 1]
+                    I += 2
+                else:
+                    self.Profile = True
+                    I += 1
+            elif argv[I] == '-metrics':
+                # 各阶段耗时、CPU 时间和内存峰值，写入 JSON 文件
+                if I + 1 < len(argv):
+                    self.Args['Metrics'] = argv[I + 1]
+                    I += 2
+                else:
+                    print(f'Error: -metrics requires an output file')
+                    sys.exit(1)
+            elif argv[I] == '-watch':
+                # 监视目录，文件变化时重新翻译
+                if I + 1 < len(argv):
+                    self.Args['Watch'] = argv[I + 1]
+                    I += 2
+                else:
+                    print(f'Error: -watch requires a directory')
+                    sys.exit(1)
+            elif argv[I] == '-serve':
+                # 常驻翻译服务，监听 Unix 域套接字
+                if I + 1 < len(argv):
+                    self.Args['Serve'] = argv[I + 1]
+                    I += 2
+                else:
+                    print(f'Error: -serve requires a socket path')
+                    sys.exit(1)
             else:
-                print(f'Error: Unknown argument {sys.argv[I]}')
+                print(f'Error: Unknown argument {argv[I]}')
                 sys.exit(1)
         
-        # 检查是否有预处理符号文件的请求，如果有则跳过输入输出检查
-        if 'PreSym' not in self.Args and ('Input' not in self.Args or 'Output' not in self.Args):
+        # 检查是否有预处理符号文件、批量构建、监视或常驻服务的请求，如果有则跳过输入输出检查
+        if (not any(key in self.Args for key in ('PreSym', 'Build', 'Watch', 'Serve'))
+                and ('Input' not in self.Args or 'Output' not in self.Args)):
             print(ERROR_MESSAGES['MISSING_ARGS'])
             print(HELP_MESSAGE)
             sys.exit(1)
@@ -371,11 +473,42 @@ class TransPyC:
         full_compile_cmd = f'{compile_cmd} {compile_flags} {OutputFile} -o {OutputFile}.exe'
         print(f'Compiling: {full_compile_cmd}')
         
-        # 执行编译命令
+        from lib.core.metrics import NULL_METRICS
+        metrics = self.Metrics or NULL_METRICS
+        
+        # 编译缓存默认启用，-nocache 关闭
+        compile_cache = None
+        if not self.Args.get('NoCache'):
+            from lib.core.compile_cache import CompileCache
+            compile_cache = CompileCache(self.Args.get('CacheDir'))
+        
+        # 执行编译命令；C代码、本地头文件、编译器和编译标志都没有变化时直接使用缓存的可执行文件
         try:
-            compile_result = execute_command(full_compile_cmd)
+            with metrics.Phase('compile'):
+                cached_seconds = None
+                cache_key = None
+                if compile_cache is not None:
+                    cache_key = compile_cache.MakeKey(OutputFile, compile_cmd, compile_flags)
+                    if cache_key is not None:
+                        cached_seconds = compile_cache.Lookup(cache_key, f'{OutputFile}.exe')
+                if cached_seconds is not None:
+                    compile_result = True
+                else:
+                    import time
+                    start = time.perf_counter()
+                    compile_result = execute_command(full_compile_cmd)
+                    if compile_result and cache_key is not None:
+                        compile_cache.Store(cache_key, f'{OutputFile}.exe', time.perf_counter() - start)
+            if compile_cache is not None:
+                compile_cache.Flush()
+                metrics.Count('compile_cache_hit', cached_seconds is not None)
             if compile_result:
-                print('Compilation successful!')
+                if cached_seconds is not None:
+                    print(f'Compilation successful! (cached, saved {cached_seconds * 1e3:.0f} ms)')
+                else:
+                    print('Compilation successful!')
+                if compile_cache is not None:
+                    print(compile_cache.Report())
                 
                 # 检查是否需要运行
                 if self.Args.get('Run', False):
@@ -384,7 +517,8 @@ class TransPyC:
                     print(f'Running: {run_cmd}')
                     
                     # 执行运行命令
-                    run_result = execute_command(run_cmd)
+                    with metrics.Phase('run'):
+                        run_result = execute_command(run_cmd)
                     if run_result:
                         print('Execution output:')
                         print(run_result.stdout)
@@ -420,39 +554,120 @@ class TransPyC:
         # 设置翻译器的调试文件
         self.translator.set_debug_file(debug_file)
         
+        # 启用增量翻译缓存
+        if 'CacheDir' in self.Args:
+            self.translator.set_definition_cache(self.Args['CacheDir'])
+        
+        # 辅助文件符号缓存默认启用，-nocache 关闭
+        if not self.Args.get('NoCache'):
+            self.translator.set_symbol_cache(self.Args.get('CacheDir'))
+        
         # 先清空调试文件
         with open(debug_file, 'w', encoding=encoding) as f:
             f.write('')
         
-        # 解析辅助文件，提取符号信息
-        if self.HelperFiles:
-            self.translator.ParseHelperFiles(self.HelperFiles, encoding)
+        from lib.core.metrics import NULL_METRICS
+        metrics = self.Metrics or NULL_METRICS
+        
+        # 解析辅助文件，提取符号信息；常驻服务中直接使用已经解析好的符号表
+        with metrics.Phase('helpers'):
+            if self.WarmSymbols is not None:
+                self.translator.SymbolTable.update(self.WarmSymbols.Load(self.HelperFiles, encoding))
+            elif self.HelperFiles:
+                self.translator.ParseHelperFiles(self.HelperFiles, encoding)
+        if self.Metrics is not None:
+            # len 不展开 .symbin 层，不会解码未用到的条目
+            metrics.Count('helper_files', len(self.HelperFiles))
+            metrics.Count('helper_symbols', len(self.translator.SymbolTable))
         
         # 获取编码参数
         encoding = self.Args.get('Encoding', 'utf-8')
-        with open(InputFile, 'r', encoding=encoding) as F:
-            Content = F.read()
+        with metrics.Phase('read'):
+            with open(InputFile, 'r', encoding=encoding) as F:
+                Content = F.read()
         
         # 保存原始代码行
         self.translator.OriginalLines = Content.split('\n')
         self.translator.Content = Content
+        metrics.Count('source_lines', len(self.translator.OriginalLines))
         
-        # 解析Python代码为AST
-        Tree = ast.parse(Content)
+        # 解析Python代码为AST（作为辅助文件解析过时直接复用）
+        import ast
+        from lib.core.python_symbols import parse_python
+        with metrics.Phase('parse'):
+            Tree = parse_python(Content)
         
-        # 写入AST树信息（压缩格式）
-        with open(debug_file, 'a', encoding=encoding) as f:
-            f.write('=== AST Tree (Compact) ===\n')
-            f.write(ast.dump(Tree))
-            f.write('\n\n')
+        # 写入AST树信息（压缩格式），与其它调试信息共用同一个输出缓冲区以保持顺序
+        with metrics.Phase('debug_dump'):
+            self.translator.debug_write('=== AST Tree (Compact) ===\n' + ast.dump(Tree) + '\n\n', encoding)
         
-        CCode = self.translator.GenerateCCode(Tree)
+        # 生成的代码直接流式写入输出文件；write 阶段只计打开、收尾和替换输出文件，
+        # 生成过程中流式写出的时间计入嵌套在其中的 generate 阶段
+        encoding = self.Args.get('Encoding', 'utf-8')
+        with metrics.Phase('write'):
+            with open_output_file(OutputFile, encoding) as F:
+                F.write(f'{GENERATE_Copyright}\n')
+                with metrics.Phase('generate'):
+                    self.translator.GenerateCCode(Tree, F)
+                F.write('\n')
+        
+        if self.Metrics is not None:
+            metrics.Count('ast_nodes', sum(1 for _ in ast.walk(Tree)))
+            metrics.Count('symbols', len(self.translator.SymbolTable))
+            metrics.Count('emitted_lines', self.translator.EmittedLines)
+        
+        if self.Profile:
+            self.ProfileReport()
+    
+    def Build(self, target):
+        """批量构建：共享一次解析的辅助符号表，在进程池中并行翻译多个文件
+        
+        Args:
+            target: 目录（翻译其中所有 .py 文件）或清单文件
+        
+        Returns:
+            全部成功返回 True
+        """
+        import time
+        from lib.core.builder import (
+            collect_build_units, load_shared_symbols, resolve_jobs,
+            run_build, format_build_report
+        )
         
         encoding = self.Args.get('Encoding', 'utf-8')
-        with open(OutputFile, 'w', encoding=encoding) as F:
-            F.write(f'{GENERATE_Copyright}\n')
-            F.write(CCode)
-            F.write('\n')
+        units = collect_build_units(target, self.Args.get('Output'), encoding)
+        if not units:
+            print(f'Error: No Python files to build in {target}')
+            return False
+        
+        start = time.perf_counter()
+        # 辅助文件（包括 .symbin）只在主进程中解析一次
+        if self.WarmSymbols is not None:
+            symbol_table = self.WarmSymbols.Load(self.HelperFiles, encoding)
+        else:
+            symbol_cache_dir = None if self.Args.get('NoCache') else self.Args.get('CacheDir', CACHE_DIR)
+            symbol_table = load_shared_symbols(self.HelperFiles, encoding, symbol_cache_dir)
+        jobs = resolve_jobs(self.Args.get('Jobs'), len(units))
+        results = run_build(units, symbol_table, jobs, encoding, self.Args.get('CacheDir'))
+        elapsed = time.perf_counter() - start
+        
+        print(format_build_report(results, elapsed, jobs))
+        return all(result.error is None for result in results)
+    
+    def Watch(self, directory, interval=WATCH_INTERVAL):
+        """监视目录，源文件或其依赖的辅助符号变化时重新翻译，直到被中断
+        
+        Args:
+            directory: 监视的目录（其中所有 .py 文件）
+            interval: 轮询间隔（秒）
+        """
+        from lib.core.watcher import Watcher
+        if not os.path.isdir(directory):
+            print(f'Error: {directory} is not a directory')
+            sys.exit(1)
+        watcher = Watcher(directory, self.Args.get('Output'), self.HelperFiles,
+                          self.Args.get('Encoding', 'utf-8'), self.Args.get('CacheDir'))
+        watcher.Run(interval)
     
     def CToPython(self, InputFile, OutputFile, HeaderFiles):
         """C到Python的转换（暂时禁用）"""
@@ -461,6 +676,9 @@ class TransPyC:
     def AddSymbol(self, symbol_files):
         """添加符号文件
         
+        已经载入过且没有变化的文件不会重复解析，新文件按各自的编码解析，
+        一次添加多个文件时并发读取和解析。
+        
         Args:
             symbol_files: 符号文件或符号文件列表
         """
@@ -469,21 +687,8 @@ class TransPyC:
         else:
             self.symbol_files.append(symbol_files)
         
-        # 收集文件路径和编码
-        helper_files = []
-        encodings = []
-        for symbol_file in self.symbol_files:
-            file_path = symbol_file.file_path
-            encoding = symbol_file.encoding
-            if file_path:
-                helper_files.append(file_path)
-                encodings.append(encoding)
-        
-        # 解析辅助文件
-        if helper_files:
-            # 暂时使用第一个文件的编码
-            encoding = encodings[0] if encodings else 'utf-8'
-            self.translator.ParseHelperFiles(helper_files, encoding)
+        # 登记表会跳过已经解析过的文件
+        self.symbol_registry.Register(self.translator, self.symbol_files)
     
     def Convert(self):
         """转换代码
@@ -499,13 +704,18 @@ class TransPyC:
         # 保存原始代码行
         self.translator.OriginalLines = self.code.split('\n')
         
-        # 解析Python代码为AST
-        Tree = ast.parse(self.code)
+        # 解析Python代码为AST（作为符号文件解析过时直接复用）
+        import ast
+        from lib.core.python_symbols import parse_python
+        Tree = parse_python(self.code)
         
         # 生成C代码
         CCode = self.translator.GenerateCCode(Tree)
         CCode = f'{GENERATE_Copyright}\n{CCode}\n'
         
+        if self.Profile:
+            self.ProfileReport()
+        
         # 处理调试信息
         if isinstance(self.config.debug, str):
             # 如果debug是字符串，写入调试信息到文件
@@ -529,12 +739,103 @@ class TransPyC:
             # 如果debug是False，只返回生成的C代码
             return CCode
     
-    def Run(self):
-        """主运行函数"""
+    def ConvertMany(self, sources, jobs=None, executor='thread'):
+        """批量转换多段代码
+        
+        以当前的符号表（AddSymbol 载入的符号）为只读基础，每段代码在独立的翻译器中
+        转换，各自的符号、变量作用域和函数返回类型互不影响，也不会留在本对象上。
+        
+        Args:
+            sources: (名称, 代码) 的可迭代对象
+            jobs: 并行数，默认为 CPU 核数
+            executor: 'thread' 使用线程池，'process' 使用进程池，None 在当前线程中逐个转换
+        
+        Returns:
+            按完成顺序产生 ConvertResult（name, code, seconds, error）的迭代器，
+            转换失败时 code 为 None，error 为错误信息
+        """
+        from lib.core.builder import convert_many
+        return convert_many(sources, self.SharedSymbolTable(), jobs, executor)
+    
+    def SharedSymbolTable(self):
+        """当前符号表的只读快照，作为批量和异步转换中各段代码共享的基础符号表"""
+        from types import MappingProxyType
+        return MappingProxyType(dict(self.translator.SymbolTable))
+    
+    async def ConvertAsync(self, code=None, name=None):
+        """在事件循环的默认线程池中转换代码，不阻塞事件循环
+        
+        与 ConvertMany 相同，每次转换使用独立的翻译器和当前符号表的只读快照，
+        同一个对象上可以同时进行多个转换。
+        
+        Args:
+            code: 代码字符串，默认使用 self.code
+            name: 结果中的名称
+        
+        Returns:
+            ConvertResult，转换失败时 code 为 None，error 为错误信息
+        """
+        import asyncio
+        from lib.core.builder import convert_source
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, convert_source, name,
+                                          self.code if code is None else code, self.SharedSymbolTable())
+    
+    async def CompileAsync(self, c_file, output_file=None, timeout=None):
+        """异步编译C文件，编译命令和标志与 CompileAndRun 相同（-cc/-cflags）
+        
+        编译器直接运行，不经过 shell；与 RunAsync 共用同时运行的进程数上限（ASYNC_PROCESS_LIMIT）。
+        
+        Args:
+            c_file: C 源文件
+            output_file: 可执行文件，默认为 c_file + '.exe'
+            timeout: 超时秒数，None 表示不限
+        
+        Returns:
+            ProcessResult
+        """
+        from lib.core.async_jobs import run_process, compile_argv
+        argv = compile_argv(c_file, output_file or f'{c_file}.exe',
+                            self.Args.get('CompileCommand', DEFAULT_COMPILE_COMMAND),
+                            self.Args.get('CompileFlags', DEFAULT_COMPILE_FLAGS))
+        return await run_process(argv, timeout)
+    
+    async def RunAsync(self, exe_file, args=None, timeout=None):
+        """异步运行编译出的程序
+        
+        Args:
+            exe_file: 可执行文件
+            args: 参数字符串或列表，默认使用 -args 的值
+            timeout: 超时秒数，None 表示不限；超时的进程会被结束
+        
+        Returns:
+            ProcessResult
+        """
+        from lib.core.async_jobs import run_process, split_args
+        if args is None:
+            args = self.Args.get('RunArgs', '')
+        # 与 shell 一样，不含路径分隔符的程序名按 PATH 查找，这里总是运行给定的文件
+        if os.sep not in exe_file:
+            exe_file = os.path.join(os.curdir, exe_file)
+        return await run_process([exe_file, *split_args(args)], timeout)
+    
+    def Run(self, argv=None):
+        """主运行函数
+        
+        Args:
+            argv: 参数列表（不含程序名），默认使用 sys.argv[1:]；常驻服务用它执行客户端转发的参数
+        """
+        argv = sys.argv[1:] if argv is None else argv
         # 检查是否有命令行参数
-        if len(sys.argv) > 1:
+        if argv:
             # 有命令行参数，使用 ParseArgs 方法解析
-            self.ParseArgs()
+            self.ParseArgs(argv)
+            
+            # 检查是否有启动常驻服务的请求
+            if 'Serve' in self.Args:
+                from lib.core.server import serve
+                serve(self.Args['Serve'], TransPyC)
+                return
             
             # 检查是否有预处理符号文件的请求
             if 'PreSym' in self.Args:
@@ -562,13 +863,24 @@ class TransPyC:
                 else:
                     binary_data = TransPyC.PreProcessSymbol(symbol_file, debug=False)
                 
-                # 写入二进制符号文件
-                with open(output_file, 'wb') as f:
-                    f.write(binary_data)
+                # 写入二进制符号文件（替换而不是覆盖，其它进程可能正在内存映射旧文件）
+                from lib.core.symbin import write_symbin_data
+                write_symbin_data(output_file, binary_data)
                 
                 print(f"Symbol file generated: {output_file}")
                 return
             
+            # 检查是否有批量构建的请求
+            if 'Build' in self.Args:
+                if not self.Build(self.Args['Build']):
+                    sys.exit(1)
+                return
+            
+            # 检查是否有监视目录的请求
+            if 'Watch' in self.Args:
+                self.Watch(self.Args['Watch'])
+                return
+            
             input_file = self.Args['Input']
             output_file = self.Args['Output']
         else:
@@ -580,10 +892,17 @@ class TransPyC:
         file_type = detect_file_type(input_file)
 
         if file_type == '.py':
+            if 'Metrics' in self.Args:
+                from lib.core.metrics import Metrics
+                self.Metrics = Metrics()
             self.PythonToC(input_file, output_file)
             # 检查是否需要编译和运行
             if 'CompileCommand' in self.Args or self.Args.get('Run', False):
                 self.CompileAndRun(output_file)
+            if self.Metrics is not None:
+                self.Metrics.Write(self.Args['Metrics'])
+                self.Metrics.Close()
+                print(f'Metrics written to: {self.Args["Metrics"]}')
         elif file_type == '.c':
             self.CToPython(input_file, output_file, self.HeaderFiles)
         else:
@@ -592,5 +911,9 @@ class TransPyC:
 
 
 if __name__ == '__main__':
+    # 瘦客户端：把其余参数转发给常驻服务，不载入翻译器
+    if len(sys.argv) > 2 and sys.argv[1] == '-client':
+        from lib.core.server import run_client
+        sys.exit(run_client(sys.argv[2], sys.argv[3:]))
     trans = TransPyC()
     trans.Run()
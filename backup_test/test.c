@@ -1,38 +1,36 @@
  /*
-                  ___         ___     
-      ___        /  /\       /  /\    
-     /  /\      /  /::\     /  /:/    
+       ___        ___         ___     
+      /  /\      /  /\       /  /\    
+     /  /:/     /  /::\     /  /:/    
     /  /:/     /  /:/\:\   /  /:/     
    /  /:/     /  /:/~/:/  /  /:/  ___ 
   /  /::\    /__/:/ /:/  /__/:/  /  /\
- /__/:/\:\   \  \:\/:/   \  \:\ /  /:/
- \__\/  \:\   \  \::/     \  \:\  /:/ 
-      \  \:\   \  \:\      \  \:\/:/  
-       \__\/    \  \:\      \  \::/   
-                 \__\/       \__\/    
-Copyright© GVSDS Team
-Actor TermiNexus
-
+ /  /:/\:\   \  \:\/:/   \  \:\ /  /:/
+/__/:/  \:\   \  \::/     \  \:\  /:/ 
+\__\/ \  \:\   \  \:\      \  \:\/:/  
+       \  \:\   \  \:\      \  \::/   
+        \__\/    \__\/       \__\/    
+Copyright GVSDS Team
+Actor TermiNexus 
+Generated by TransPyC
 */
-// Generated by TransPyC
-
 
 
 #include <stdio.h>
 #include "kernel2.h" // from kernel2 import *
 #define F1 -1
 int MOUSEX;
-static char keytable0[128];
+static char keytable0[0x80];
 unsigned char* buf_start;
 int global_var = 100;
 static int static_var = 200;
 struct a {
     int k1;
-    struct TASK* task;
+    struct struct* task;
     int led;
 };
 struct DLL_STRPICENV {
-    int work[((64 * 1024) / 4)];
+    int work[64 * 1024 / 4];
     struct FREEINFO *free[MEMMAN_FREES];
     struct SHEET *sheets[MAX_SHEETS];
     struct SHEET *sheets[MAX_SHEETS];
@@ -43,8 +41,8 @@ extern struct TIMER* task_timer;
 extern int languages[MAX_LANGUAGE_NUMBER];
 struct SHEET* sht_mouse;
 struct SHTCTL* shtctl;
-static char keytable0[128] = {0, 0, '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=', 8, 0, 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '[', ']', 10, 0, 'A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ';', '\'', '`', 0, '\\', 'Z', 'X', 'C', 'V', 'B', 'N', 'M', ',', '.', '/', 0, '*', 0, ' ', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '7', 0, '9', '-', '4', '5', '6', '+', '1', 0, '3', '0', '.', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 92, 0, 0, 0, 0, 0, 0, 0, 0, 0, 92, 0, 0};
-static char keytable1[128] = {0, 0, '!', '@', '#', '$', '%', '^', '&', '*', '(', ')', '_', '+', 8, 0, 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '{', '}', 10, 0, 'A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ':', '"', '~', 0, '|', 'Z', 'X', 'C', 'V', 'B', 'N', 'M', '<', '>', '?', 0, '*', 0, ' ', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '7', '8', '9', '-', '4', '5', '6', '+', '1', '2', '3', '0', '.', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '_', 0, 0, 0, 0, 0, 0, 0, 0, 0, '|', 0, 0};
+static char keytable0[0x80] = {0, 0, '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=', 0x08, 0, 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '[', ']', 0x0a, 0, 'A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ';', "'", '`', 0, '\\', 'Z', 'X', 'C', 'V', 'B', 'N', 'M', ',', '.', '/', 0, '*', 0, ' ', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '7', 0, '9', '-', '4', '5', '6', '+', '1', 0, '3', '0', '.', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0x5c, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0x5c, 0, 0};
+static char keytable1[0x80] = {0, 0, '!', '@', '#', '$', '%', '^', '&', '*', '(', ')', '_', '+', 0x08, 0, 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '{', '}', 0x0a, 0, 'A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ':', '"', '~', 0, '|', 'Z', 'X', 'C', 'V', 'B', 'N', 'M', '<', '>', '?', 0, '*', 0, ' ', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '7', '8', '9', '-', '4', '5', '6', '+', '1', '2', '3', '0', '.', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '_', 0, 0, 0, 0, 0, 0, 0, 0, 0, '|', 0, 0};
 struct FIFO32 {
 };
 struct FIFO32 f;
@@ -54,12 +52,12 @@ void keywin_off(struct SHEET* key_win);
 void keywin_off2(struct SHEET* key_win);
 void io_hlt(void);
 void test_ptr_operations(void) {
-    *((void *)4096) = 42;
-    *((int*)4096) = 42;
-    int value = ((void *)4096);
-    value = ((int*)4096);
-    struct value* var;
-    struct value* var2;
+    *((void *)0x1000) = 42;
+    *((int*)0x1000) = 42;
+    int value = ((void *)0x1000);
+    value = ((int*)0x1000);
+    struct struct* var = value;
+    struct struct* var2 = value();
 }
 void test_type_casting(void) {
     int x = 42;
@@ -82,21 +80,19 @@ long int test_bubble_sort(void) {
     long int arr[7] = {64, 34, 25, 12, 22, 11, 90};
     int n = (sizeof(arr) / sizeof(arr[0]));
     for (int i = 0; i < n; i += 1) {
-        for (int j = 0; j < ((n - i) - 1); j += 1) {
-            if ((arr[j] > arr[(j + 1)])) {
+        for (int j = 0; j < n - i - 1; j += 1) {
+            if (arr[j] > arr[j + 1]) {
                 int temp;
                 temp = arr[j];
-                arr[j] = arr[(j + 1)];
-                arr[(j + 1)] = temp;
+                arr[j] = arr[j + 1];
+                arr[j + 1] = temp;
             }
         }
     }
     printf("排序后的数组:");
-    printf("
-");
+    printf("\n");
     for (int i = 0; i < n; i += 1) {
-        printf("%d
-", arr[i]);
+        printf("%d\n", arr[i]);
     }
     return arr;
 }
@@ -111,25 +107,23 @@ void a__test_bubble_sort(struct a* self) {
     long int arr[7] = {64, 34, 25, 12, 22, 11, 90};
     int n = (sizeof(arr) / sizeof(arr[0]));
     for (int i = 0; i < n; i += 1) {
-        for (int j = 0; j < ((n - i) - 1); j += 1) {
-            if ((arr[j] > arr[(j + 1)])) {
+        for (int j = 0; j < n - i - 1; j += 1) {
+            if (arr[j] > arr[j + 1]) {
                 int temp;
                 temp = arr[j];
-                arr[j] = arr[(j + 1)];
-                arr[(j + 1)] = temp;
+                arr[j] = arr[j + 1];
+                arr[j + 1] = temp;
             }
         }
     }
     printf("排序后的数组:");
-    printf("
-");
+    printf("\n");
     for (int i = 0; i < n; i += 1) {
-        printf("%d
-", arr[i]);
+        printf("%d\n", arr[i]);
     }
 }
 void io_out8(uint8_t port, uint8_t value) {
-    asm volatile ("out %0, %1" : : "a"(value), "d"(port));
+    __asm__ volatile ("out %0, %1" : : "a"(value), "d"(port));
 }
 struct TASK* open_constask(struct SHEET* sht, unsigned int memtotal);
 struct TASK open_constask2(struct SHEET* sht, unsigned int memtotal);
@@ -137,48 +131,48 @@ int info_JPEG(struct DLL_STRPICENV* env, int* info, int size, uint8_t* fp);
 void memman_free_4k(struct MEMMAN* man, unsigned int addr, unsigned int size);
 void sheet_setbuf(struct SHEET* sht, unsigned char* buf, int xsize, int ysize, int col_inv);
 int main(void) {
-    *((long int*)236) = ((int)&X);
+    *((long int*)0xec) = ((int)&X);
     int* cons_fifo = 1;
     long int cons_fifo2 = 1;
-    if ((new_mx >= 0)) {
+    if (new_mx >= 0) {
         io_sti();
         sheet_slide(sht_mouse, new_mx, new_my);
         int new_mx = -1;
     }
-    else if ((new_wx != 2147483647)) {
+    else if (new_wx != 0x7fffffff) {
         io_sti();
         sheet_slide(sht, new_wx, new_wy);
-        int new_wx = 2147483647;
+        int new_wx = 0x7fffffff;
     }
     else {
         task_sleep(task_a);
         io_sti();
     }
-    finfo = file_search("HZK16.fnt", ((struct FILEINFO *)(ADR_DISKIMG + 9728)), 224);
+    finfo = file_search("HZK16.fnt", ((struct FILEINFO *)ADR_DISKIMG + 0x002600), 224);
     init_start(sht_start);
-    file_loadfile(((char *)(ADR_DISKIMG + 15872)));
-    file_loadfile(((char *)(ADR_DISKIMG + 15872)));
-    buf_start = ((unsigned char *)memman_alloc_4k(memman, (450 * 600)));
+    file_loadfile(((char *)ADR_DISKIMG + 0x003e00));
+    file_loadfile(((char *)ADR_DISKIMG + 0x003e00));
+    buf_start = ((unsigned char *)memman_alloc_4k(memman, 450 * 600));
     shtctl = shtctl_init(memman, binfo->vram, binfo->scrnx, binfo->scrny);
-    static char keytable0[128];
-    static char keytable1[128];
+    char keytable0[0x80];
+    char keytable1[0x80];
     extern char font1[4096];
     unsigned char* buf_back;
     unsigned char* buf_mouse[256][256];
-    int memtotal = memtest(4194304, 3221225471);
+    memtotal = memtest(0x00400000, 0xbfffffff);
     struct FIFO32 fifo;
     fifo.task = task_a;
-    int key_leds = ((binfo->leds >> 4) & 7);
+    key_leds = binfo->leds >> 4 & 7;
     long int K = test_bubble_sort();
     struct a s;
     a____init__(&s, 1);
-    struct a* p;
+    struct a* p = a;
     p = &s;
     a__test_bubble_sort(&s, s.k1, p->k1);
-    *((int*)4076) = ((int)&fifo);
-    io_out8(PIC1_IMR, 4194304);
-    p->flags |= 32;
-    int key_win = shtctl->sheets[(shtctl->top - 1)];
+    *((int*)0x0fec) = ((int)&fifo);
+    io_out8(PIC1_IMR, 0x00400000);
+    p->flags |= 0x20;
+    key_win = shtctl->sheets[shtctl->top - 1];
     key_shift &= ~1;
     return 0;
-}
\ No newline at end of file
+}
@@ -1,21 +1,19 @@
  /*
-                  ___         ___     
-      ___        /  /\       /  /\    
-     /  /\      /  /::\     /  /:/    
+       ___        ___         ___     
+      /  /\      /  /\       /  /\    
+     /  /:/     /  /::\     /  /:/    
     /  /:/     /  /:/\:\   /  /:/     
    /  /:/     /  /:/~/:/  /  /:/  ___ 
   /  /::\    /__/:/ /:/  /__/:/  /  /\
- /__/:/\:\   \  \:\/:/   \  \:\ /  /:/
- \__\/  \:\   \  \::/     \  \:\  /:/ 
-      \  \:\   \  \:\      \  \:\/:/  
-       \__\/    \  \:\      \  \::/   
-                 \__\/       \__\/    
-Copyright© GVSDS Team
-Actor TermiNexus
-
+ /  /:/\:\   \  \:\/:/   \  \:\ /  /:/
+/__/:/  \:\   \  \::/     \  \:\  /:/ 
+\__\/ \  \:\   \  \:\      \  \:\/:/  
+       \  \:\   \  \:\      \  \::/   
+        \__\/    \__\/       \__\/    
+Copyright GVSDS Team
+Actor TermiNexus 
+Generated by TransPyC
 */
-// Generated by TransPyC
-
 
 
 struct Person {
@@ -23,30 +21,19 @@ struct Person {
     int age;
 };
 void Person____init__(struct Person* self, char name, int age) {
-self->name = name;
-self->age = age;
+    self->name = name;
+    self->age = age;
 }
 char Person__get_name(struct Person* self) {
-return self->name;
+    return self->name;
 }
 int Person__get_age(struct Person* self) {
-return self->age;
-}
-void Person____init__(struct Person* self, char name, int age) {
-self->name = name;
-self->age = age;
+    return self->age;
 }
-char Person__get_name(struct Person* self) {
-return self->name;
-}
-int Person__get_age(struct Person* self) {
-return self->age;
+int main(void) {
+    struct Person p;
+    Person____init__(&p, "Alice", 30);
+    printf("%d\n", Person__get_name(&p));
+    printf("%d\n", Person__get_age(&p));
+    return 0;
 }
-int main() {
-int p = Person("Alice", 30);
-printf("%d
-", p__get_name(&p));
-printf("%d
-", p__get_age(&p));
-return 0;
-}
\ No newline at end of file
@@ -0,0 +1,98 @@
+# C 头文件解析基准测试：旧的三个正则与单遍词法/声明解析器的吞吐量对比
+#
+# 用法: python bench/bench_c_header.py [最大 MB 数]
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lib.core.c_parser import extract_c_symbols
+
+
+def ExtractWithRegex(content):
+    """旧实现：结构体、函数、变量三个正则各扫描一遍"""
+    table = {}
+    for struct_name in re.findall(r'struct\s+([a-zA-Z_]\w*)\s*\{', content):
+        table[struct_name] = {'type': 'struct'}
+    for func_name in re.findall(r'\b([a-zA-Z_]\w*)\s*\(', content):
+        if func_name not in ['if', 'for', 'while', 'switch']:
+            table[func_name] = {'type': 'function'}
+    for var_type, var_name, _ in re.findall(r'\b(\w+)\s+([a-zA-Z_]\w*)(\[\d*\])*\s*;', content):
+        table[var_name] = {'type': 'variable', 'declared_type': var_type, 'is_pointer': '*' in var_type}
+    return table
+
+
+def MakeHeaderChunk(i):
+    """生成一段类似预处理后头文件的内容"""
+    return f'''# {i} "include/module_{i}.h"
+/* module {i}: 注释中的 struct fake_{i} {{ 不应被识别 */
+#define MODULE_{i}_SIZE ({i} * 16)
+#define MODULE_{i}_ADDR(base, n) ((base) + (n) * MODULE_{i}_SIZE)
+typedef unsigned int u32_{i};
+struct item_{i} {{
+    struct item_{i} *next;
+    unsigned char name[32];
+    u32_{i} flags : 4;
+    union {{ int value; void *data; }};
+}};
+typedef struct {{ int x, y; }} point_{i};
+enum state_{i} {{ STATE_{i}_IDLE, STATE_{i}_BUSY = 1 << 2, STATE_{i}_DONE }};
+extern struct item_{i} *item_list_{i};
+extern point_{i} origin_{i};
+static const char *labels_{i}[] = {{ "a;", "b(", "c{{" }};
+int item_count_{i} = 0;
+void (*item_hook_{i})(struct item_{i} *item, int reason);
+struct item_{i} *item_new_{i}(const char *name, u32_{i} flags) __attribute__((malloc));
+static inline int item_size_{i}(const struct item_{i} *item) {{
+    int total = 0;
+    for (; item; item = item->next) {{ if (item->flags) total += sizeof(*item); }}
+    return total;
+}}
+'''
+
+
+def MakeHeader(size):
+    """拼接出至少 size 字节的头文件"""
+    chunks = []
+    length = 0
+    i = 0
+    while length < size:
+        chunk = MakeHeaderChunk(i)
+        chunks.append(chunk)
+        length += len(chunk)
+        i += 1
+    return ''.join(chunks)
+
+
+def Best(func, content, repeat=3):
+    """多次运行取最短耗时（秒），并返回最后一次的符号表"""
+    best = None
+    table = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table = func(content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, table
+
+
+def main():
+    max_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    sizes = [max_mb / 4, max_mb / 2, max_mb]
+    print(f'{"MB":>6} {"regex MB/s":>11} {"parser MB/s":>12} {"parser ms/MB":>13} '
+          f'{"regex structs w/ members":>25} {"parser structs w/ members":>26}')
+    for mb in sizes:
+        content = MakeHeader(int(mb * 1024 * 1024))
+        actual_mb = len(content) / (1024 * 1024)
+        regex_seconds, regex_table = Best(ExtractWithRegex, content)
+        parser_seconds, parser_table = Best(extract_c_symbols, content)
+        regex_members = sum(1 for entry in regex_table.values() if entry.get('members'))
+        parser_members = sum(1 for entry in parser_table.values() if entry.get('members'))
+        print(f'{actual_mb:>6.2f} {actual_mb / regex_seconds:>11.1f} {actual_mb / parser_seconds:>12.1f} '
+              f'{parser_seconds * 1e3 / actual_mb:>13.1f} {regex_members:>25} {parser_members:>26}')
+
+
+if __name__ == '__main__':
+    main()
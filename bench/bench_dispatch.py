@@ -0,0 +1,79 @@
+# 分派基准测试：比较按类型查表与 isinstance 链的单节点分派开销
+#
+# 用法: python bench/bench_dispatch.py [输入文件...]
+
+import ast
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from lib.core.translator import Translator
+
+# 重构前 HandleExpr / HandleBody 中 isinstance 判断的顺序
+EXPRESSION_CHAIN = (
+    ast.Constant, ast.Name, ast.BinOp, ast.BoolOp, ast.UnaryOp, ast.Call, ast.Subscript,
+    ast.Tuple, ast.List, ast.Set, ast.Compare, ast.Attribute, ast.IfExp, ast.NamedExpr,
+)
+STATEMENT_CHAIN = (
+    ast.Expr, ast.If, ast.For, ast.While, ast.Break, ast.Continue, ast.Return,
+    ast.Assign, ast.AugAssign, ast.AnnAssign, ast.ClassDef, ast.Match,
+)
+
+
+def ChainDispatch(node, chain):
+    """模拟 isinstance 链：返回匹配的位置"""
+    for i, node_type in enumerate(chain):
+        if isinstance(node, node_type):
+            return i
+    return -1
+
+
+def TimeLoop(func, nodes, repeat):
+    """返回每个节点的平均耗时（纳秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for node in nodes:
+            func(node)
+    return (time.perf_counter() - start) / (repeat * len(nodes)) * 1e9
+
+
+def main():
+    files = sys.argv[1:] or [os.path.join(ROOT, 'kernel.py'), os.path.join(ROOT, 'kernel2.py')]
+    trees = []
+    for file_path in files:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            code = f.read()
+        trees.append((code, ast.parse(code)))
+    expressions = [n for _, tree in trees for n in ast.walk(tree) if isinstance(n, ast.expr)]
+    statements = [n for _, tree in trees for n in ast.walk(tree) if isinstance(n, ast.stmt)]
+    repeat = max(1, 200000 // max(1, len(expressions)))
+
+    expr_table = Translator.ExpressionVisitors
+    stmt_table = Translator.StatementVisitors
+    print(f'{len(expressions)} expression nodes, {len(statements)} statement nodes, repeat={repeat}')
+    print(f'{"":<12} {"isinstance(ns)":>15} {"dict(ns)":>10}')
+    print(f'{"expression":<12} {TimeLoop(lambda n: ChainDispatch(n, EXPRESSION_CHAIN), expressions, repeat):>15.1f}'
+          f' {TimeLoop(lambda n: expr_table.get(type(n)), expressions, repeat):>10.1f}')
+    print(f'{"statement":<12} {TimeLoop(lambda n: ChainDispatch(n, STATEMENT_CHAIN), statements, repeat):>15.1f}'
+          f' {TimeLoop(lambda n: stmt_table.get(type(n)), statements, repeat):>10.1f}')
+
+    # 整体翻译时平均到每个 AST 节点的耗时
+    for (code, tree), file_path in zip(trees, files):
+        node_count = sum(1 for _ in ast.walk(tree))
+        best = None
+        for _ in range(5):
+            translator = Translator()
+            translator.OriginalLines = code.split('\n')
+            translator.Content = code
+            start = time.perf_counter()
+            translator.GenerateCCode(ast.parse(code))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f'{os.path.basename(file_path)}: {node_count} nodes, GenerateCCode {best * 1e3:.2f} ms, '
+              f'{best / node_count * 1e9:.0f} ns/node')
+
+
+if __name__ == '__main__':
+    main()
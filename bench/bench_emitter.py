@@ -0,0 +1,92 @@
+# 代码输出基准测试：逐层复制缩进与 CodeEmitter 流式写出的对比
+#
+# 生成语句总数固定、嵌套深度不同的 for 循环，分别测量：
+#   GenerateCCode 的完整耗时（使用 IndentedCode + CodeEmitter）
+#   只比较缩进与拼接：旧做法每层 ['    ' + line ...] 复制再 '\n'.join，新做法 CodeEmitter 一次写出
+#
+# 用法: python bench/bench_emitter.py [语句总数]
+
+import ast
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lib.core.emitter import IndentedCode, CodeEmitter
+from lib.core.translator import Translator
+
+# Python 的分词器最多支持 100 层缩进
+DEPTHS = [1, 8, 32, 64, 96]
+
+
+def MakeNestedLoops(depth, statements):
+    """生成 depth 层嵌套的 range 循环，所有语句都在最内层"""
+    lines = ['def main():', '    total: t.CInt = 0']
+    indent = '    '
+    for level in range(depth):
+        lines.append(f'{indent}for i{level} in range(2):')
+        indent += '    '
+    for i in range(statements):
+        lines.append(f'{indent}total += {i}')
+    return '\n'.join(lines) + '\n'
+
+
+def LegacyRender(code):
+    """旧做法：每个嵌套块都把内层的行复制一遍加上缩进"""
+    def Flatten(items):
+        result = []
+        for item in items:
+            if isinstance(item, IndentedCode):
+                result.extend(['    ' * item.Levels + line for line in Flatten(item.Lines)])
+            else:
+                result.append(item)
+        return result
+    return '\n'.join(Flatten(code))
+
+
+def EmitterRender(code):
+    """新做法：按深度一次写出"""
+    buffer = io.StringIO()
+    CodeEmitter(buffer).Emit(code)
+    return buffer.getvalue()
+
+
+def Best(func, repeat=3):
+    """多次运行取最短耗时（秒），并返回最后一次的结果"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f'{statements} statements in the innermost loop')
+    print(f'{"depth":>6} {"GenerateCCode ms":>17} {"legacy re-indent ms":>20} {"emitter ms":>11}')
+    for depth in DEPTHS:
+        code = MakeNestedLoops(depth, statements)
+        tree = ast.parse(code)
+
+        def Generate():
+            translator = Translator()
+            translator.Content = code
+            return translator.GenerateCCode(tree)
+
+        generate_seconds, c_code = Best(Generate)
+        # 取出函数定义生成的代码行（含嵌套块），单独比较两种输出方式
+        translator = Translator()
+        translator.Content = code
+        function_code = translator.HandleFunctionDef(tree.body[0])
+        legacy_seconds, legacy_text = Best(lambda: LegacyRender(function_code))
+        emitter_seconds, emitter_text = Best(lambda: EmitterRender(function_code))
+        assert legacy_text == emitter_text and emitter_text in c_code
+        print(f'{depth:>6} {generate_seconds * 1e3:>17.1f} {legacy_seconds * 1e3:>20.2f} {emitter_seconds * 1e3:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# 增量翻译基准测试：修改单个函数后重新翻译的耗时
+#
+# 用法: python bench/bench_incremental.py [输入文件] [辅助文件...]
+
+import ast
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from lib.core.translator import Translator
+
+
+def Translate(code, helper_files, cache_dir=None, repeat=1):
+    """完整翻译（解析辅助文件、ast.parse、GenerateCCode），返回 (C代码, 最短耗时秒, 最后一次的翻译器)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        translator = Translator()
+        if cache_dir:
+            translator.set_definition_cache(cache_dir)
+        translator.ParseHelperFiles(helper_files)
+        translator.OriginalLines = code.split('\n')
+        translator.Content = code
+        c_code = translator.GenerateCCode(ast.parse(code))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return c_code, best, translator
+
+
+def EditLastFunction(code):
+    """在最后一个多行顶层函数体开头插入一条语句，模拟只修改一个函数"""
+    tree = ast.parse(code)
+    functions = [n for n in tree.body if isinstance(n, ast.FunctionDef) and n.body[0].lineno > n.lineno]
+    target = functions[-1]
+    lines = code.split('\n')
+    first = target.body[0]
+    indent = lines[first.lineno - 1][:first.col_offset]
+    lines.insert(first.lineno - 1, f'{indent}bench_edit_counter: t.CInt = 1')
+    return '\n'.join(lines), target.name
+
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, 'kernel.py')
+    helper_files = sys.argv[2:] if len(sys.argv) > 2 else [os.path.join(ROOT, 'kernel2.py')]
+    with open(input_file, 'r', encoding='utf-8') as f:
+        code = f.read()
+    edited, edited_name = EditLastFunction(code)
+
+    cache_dir = tempfile.mkdtemp(prefix='transpyc_bench_')
+    try:
+        _, uncached, _ = Translate(code, helper_files, repeat=5)
+        _, cold, _ = Translate(code, helper_files, cache_dir)
+        _, warm, translator = Translate(code, helper_files, cache_dir, repeat=5)
+        warm_stats = (translator.DefinitionCache.Hits, translator.DefinitionCache.Misses)
+        edited_code, incremental, translator = Translate(edited, helper_files, cache_dir)
+        edit_stats = (translator.DefinitionCache.Hits, translator.DefinitionCache.Misses)
+        # 增量结果必须与不使用缓存的完整翻译一致
+        expected, _, _ = Translate(edited, helper_files)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f'{"run":<28} {"ms":>8} {"hits":>6} {"misses":>7}')
+    print(f'{"no cache":<28} {uncached * 1e3:>8.2f}')
+    print(f'{"cold cache":<28} {cold * 1e3:>8.2f}')
+    print(f'{"warm cache":<28} {warm * 1e3:>8.2f} {warm_stats[0]:>6} {warm_stats[1]:>7}')
+    print(f'{"edit " + edited_name:<28} {incremental * 1e3:>8.2f} {edit_stats[0]:>6} {edit_stats[1]:>7}')
+    print(f'incremental output identical: {edited_code == expected}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+# 规模扩展报告：逐个放大合成输入的各个维度，观察翻译耗时和内存随规模的变化
+#
+# 每次只改变一个维度（其余保持 workload.DEFAULT_SPEC），对每个规模点测量：
+#   helper ms     解析辅助文件（Translator.ParseHelperFiles）
+#   translate ms  Translator.GenerateCCode 的中位数（AST 在计时外解析）
+#   peak KB       单独一次翻译期间的 tracemalloc 内存峰值
+# 并按相邻两点的 log(耗时)/log(规模) 分别计算两种耗时的增长指数：约为 1 时是线性，
+# 明显大于 1（SUPERLINEAR_EXPONENT）说明出现了超线性。
+# 终端中用字符条形图显示耗时；安装了 matplotlib 时可用 --plot 输出图片。
+#
+# 用法:
+#   python bench/bench_scaling.py [--dims functions,depth] [--runs N] [-o report.json] [--plot scaling.png]
+
+import argparse
+import ast
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'bench'))
+from lib.core.translator import Translator
+from lib.core.python_symbols import PARSED_TREES
+from workload import WorkloadSpec, write_workload
+
+# 各维度的规模点
+SWEEPS = {
+    'functions': [25, 50, 100, 200, 400],
+    'depth': [2, 4, 8, 12, 16],
+    'literals': [64, 256, 1024, 4096, 16384],
+    'structs': [8, 32, 128, 512],
+    'members': [4, 16, 64, 256],
+    'defines': [16, 64, 256, 1024],
+    'helper_symbols': [64, 256, 1024, 4096],
+}
+# 增长指数超过该值时标记为超线性
+SUPERLINEAR_EXPONENT = 1.3
+BAR_WIDTH = 40
+
+
+def MeasurePoint(spec, work_dir, runs):
+    """测量一个规模点，返回 {'helper_ms', 'translate_ms', 'peak_kb', 'source_kb'}"""
+    source_path, helper_path = write_workload(work_dir, spec)
+    with open(source_path, 'r', encoding='utf-8') as f:
+        code = f.read()
+
+    # 同样内容的辅助文件会命中 AST 缓存，每个规模点都重新解析
+    PARSED_TREES.clear()
+    start = time.perf_counter()
+    helper = Translator()
+    helper.ParseHelperFiles([helper_path])
+    helper_ms = (time.perf_counter() - start) * 1e3
+    symbol_table = dict(helper.SymbolTable)
+
+    def setup():
+        translator = Translator()
+        translator.SymbolTable = dict(symbol_table)
+        translator.OriginalLines = code.split('\n')
+        translator.Content = code
+        tree = ast.parse(code)
+        return lambda: translator.GenerateCCode(tree)
+
+    setup()()  # 预热
+    times = []
+    for _ in range(runs):
+        run = setup()
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1e3)
+    run = setup()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'helper_ms': round(helper_ms, 3),
+        'translate_ms': round(statistics.median(times), 3),
+        'peak_kb': round((peak - before) / 1024, 1),
+        'source_kb': round(len(code.encode('utf-8')) / 1024, 1),
+    }
+
+
+def GrowthExponent(size0, value0, size1, value1):
+    """相邻两个规模点之间的增长指数"""
+    if size0 <= 0 or size1 <= size0 or value0 <= 0 or value1 <= 0:
+        return None
+    return math.log(value1 / value0) / math.log(size1 / size0)
+
+
+def FormatSweep(dimension, points):
+    """一个维度的表格和字符条形图"""
+    lines = [f'== {dimension} ==',
+             f'{"size":>8} {"source KB":>10} {"helper ms":>10} {"exp":>5} {"translate ms":>13} {"exp":>5} '
+             f'{"peak KB":>9}  translate time']
+    longest = max(point['translate_ms'] for point in points) or 1
+    previous = None
+    for point in points:
+        flags = []
+        texts = []
+        for metric in ('helper_ms', 'translate_ms'):
+            exponent = None
+            if previous is not None:
+                exponent = GrowthExponent(previous['size'], previous[metric], point['size'], point[metric])
+            point[metric.replace('_ms', '_exponent')] = None if exponent is None else round(exponent, 2)
+            texts.append('' if exponent is None else f'{exponent:.2f}')
+            if exponent is not None and exponent > SUPERLINEAR_EXPONENT:
+                flags.append(f'{metric[:-3]} superlinear')
+        bar = '#' * max(1, round(point['translate_ms'] / longest * BAR_WIDTH))
+        lines.append(f'{point["size"]:>8} {point["source_kb"]:>10.1f} {point["helper_ms"]:>10.2f} {texts[0]:>5} '
+                     f'{point["translate_ms"]:>13.2f} {texts[1]:>5} {point["peak_kb"]:>9.1f}  '
+                     f'{bar}{" " + ", ".join(flags) if flags else ""}')
+        previous = point
+    return '\n'.join(lines)
+
+
+def Plot(report, path):
+    """用 matplotlib 画出各维度的耗时和内存（log-log），未安装时给出提示"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print('matplotlib is not installed; skipping --plot')
+        return
+    figure, axes = plt.subplots(1, 2, figsize=(12, 5))
+    for dimension, points in report.items():
+        sizes = [point['size'] for point in points]
+        axes[0].plot(sizes, [point['translate_ms'] for point in points], marker='o', label=dimension)
+        axes[1].plot(sizes, [point['peak_kb'] for point in points], marker='o', label=dimension)
+    for axis, label in zip(axes, ('translate ms', 'peak KB')):
+        axis.set_xscale('log')
+        axis.set_yscale('log')
+        axis.set_xlabel('size')
+        axis.set_ylabel(label)
+        axis.legend()
+    figure.tight_layout()
+    figure.savefig(path)
+    print(f'Plot written to {path}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TransPyC scaling report on synthetic workloads')
+    parser.add_argument('--dims', default=','.join(SWEEPS), help='comma-separated dimensions to sweep')
+    parser.add_argument('--runs', type=int, default=3, help='timed runs per point')
+    parser.add_argument('-o', '--output', help='write the report to this JSON file')
+    parser.add_argument('--plot', help='write a log-log plot to this image file (needs matplotlib)')
+    args = parser.parse_args()
+
+    report = {}
+    base = WorkloadSpec()
+    with tempfile.TemporaryDirectory() as work_dir:
+        for dimension in args.dims.split(','):
+            if dimension not in SWEEPS:
+                parser.error(f'unknown dimension {dimension}; choose from {", ".join(SWEEPS)}')
+            points = []
+            for size in SWEEPS[dimension]:
+                point = MeasurePoint(base.Replace(**{dimension: size}), work_dir, args.runs)
+                point['size'] = size
+                points.append(point)
+            report[dimension] = points
+            print(FormatSweep(dimension, points), flush=True)
+            print()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'base': repr(base), 'sweeps': report}, f, indent=2)
+    if args.plot:
+        Plot(report, args.plot)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# 常驻翻译服务基准测试：每次启动新进程翻译与通过 -client 交给常驻服务翻译的耗时对比
+#
+# 同一条翻译命令（带 -h 辅助文件）分别：
+#   冷启动：python TransPyC.py ...，每次重新导入翻译器并解析辅助文件
+#   常驻服务：python TransPyC.py -client SOCKET ...，辅助文件符号表只在第一次请求时解析
+# 最后打印服务端统计的请求延迟百分位数。
+#
+# 用法: python bench/bench_server.py [运行次数]
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY = os.path.join(ROOT, 'TransPyC.py')
+INPUT_FILE = 'kernel.py'
+HELPER_FILES = ['kernel2.py']
+
+
+def RunOnce(command):
+    """在新进程中运行一次命令，返回秒数"""
+    start = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def WaitForSocket(socket_path, timeout=10):
+    """等待服务创建套接字"""
+    deadline = time.perf_counter() + timeout
+    while not os.path.exists(socket_path):
+        if time.perf_counter() > deadline:
+            raise RuntimeError(f'server did not start on {socket_path}')
+        time.sleep(0.01)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as out_dir:
+        args = ['-f', INPUT_FILE, '-o', os.path.join(out_dir, 'kernel.c'), '-h', *HELPER_FILES]
+        cold = [RunOnce([sys.executable, ENTRY, *args]) for _ in range(runs)]
+
+        socket_path = os.path.join(out_dir, 'transpyc.sock')
+        server = subprocess.Popen([sys.executable, ENTRY, '-serve', socket_path], cwd=ROOT,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            WaitForSocket(socket_path)
+            client = [sys.executable, ENTRY, '-client', socket_path]
+            first = RunOnce([*client, *args])
+            warm = [RunOnce([*client, *args]) for _ in range(runs)]
+            stats = subprocess.run([*client, '-stats'], cwd=ROOT, capture_output=True, text=True).stdout
+            subprocess.run([*client, '-stop'], cwd=ROOT, stdout=subprocess.DEVNULL)
+        finally:
+            server.wait(timeout=10)
+
+    print(f'{"mode":>14} {"median ms":>10} {"min ms":>8}')
+    print(f'{"cold process":>14} {statistics.median(cold) * 1e3:>10.1f} {min(cold) * 1e3:>8.1f}')
+    print(f'{"server, first":>14} {first * 1e3:>10.1f} {first * 1e3:>8.1f}')
+    print(f'{"server, warm":>14} {statistics.median(warm) * 1e3:>10.1f} {min(warm) * 1e3:>8.1f}')
+    print('server-side latency:')
+    print(stats, end='')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# 源码索引基准测试：验证字面量提取随文件大小线性增长
+#
+# 用法: python bench/bench_source_index.py [最大行数]
+
+import ast
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lib.core.translator import Translator
+
+
+def MakeKeytableSource(line_count):
+    """生成类似 kernel.py 中 keytable0 的数组表，每行一个数组"""
+    lines = ['import c', 'import t', '']
+    for i in range(line_count):
+        lines.append(f"keytable{i}: t.CStatic | t.CChar[8] = [0, 0x{i % 256:02x}, '1', '2', 'A', 'B', {i}, 0]")
+    return '\n'.join(lines) + '\n'
+
+
+def TimeTranslate(code):
+    """翻译一次并返回耗时（秒）"""
+    translator = Translator()
+    translator.OriginalLines = code.split('\n')
+    translator.Content = code
+    tree = ast.parse(code)
+    start = time.perf_counter()
+    translator.GenerateCCode(tree)
+    return time.perf_counter() - start
+
+
+def main():
+    max_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    sizes = [max_lines // 8, max_lines // 4, max_lines // 2, max_lines]
+    print(f'{"lines":>8} {"total(s)":>10} {"us/line":>10}')
+    per_line = []
+    for size in sizes:
+        elapsed = TimeTranslate(MakeKeytableSource(size))
+        per_line.append(elapsed / size * 1e6)
+        print(f'{size:>8} {elapsed:>10.3f} {per_line[-1]:>10.2f}')
+    # 线性增长时每行耗时应基本不变
+    print(f'scaling ratio (largest/smallest us/line): {per_line[-1] / per_line[0]:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# 启动耗时基准测试：帮助、-presym（C/Python）和翻译路径的冷启动时间与导入耗时分解
+#
+# 每条路径用新的解释器进程运行多次取中位数，再用 -X importtime 运行一次，
+# 列出累计导入耗时最高的顶层模块。
+#
+# 用法: python bench/bench_startup.py [运行次数]
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY = os.path.join(ROOT, 'TransPyC.py')
+TOP_IMPORTS = 5
+
+
+def MakePaths(out_dir):
+    """各启动路径的命令行参数"""
+    return [
+        ('help', ['-f', 'kernel.py']),
+        ('presym .c', ['-presym', 'kernel2.c', '-o', os.path.join(out_dir, 'kernel2c.symbin')]),
+        ('presym .py', ['-presym', 'kernel2.py', '-o', os.path.join(out_dir, 'kernel2.symbin')]),
+        ('translate', ['-f', 'test/test_simple.py', '-o', os.path.join(out_dir, 'test_simple.c'), '-nocache']),
+    ]
+
+
+def RunOnce(command):
+    """在新进程中运行一次命令，返回 (秒, stderr)"""
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return time.perf_counter() - start, result.stderr
+
+
+def TopImports(stderr):
+    """解析 -X importtime 输出，返回 (导入总毫秒, 累计耗时最高的顶层导入 [(模块, 毫秒), ...])"""
+    total_us = 0
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        # 嵌套导入的模块名前有缩进
+        if not name[1:].startswith(' '):
+            imports.append((name.strip(), int(cumulative_us) / 1000))
+    imports.sort(key=lambda item: item[1], reverse=True)
+    return total_us / 1000, imports[:TOP_IMPORTS]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    interpreter = statistics.median(RunOnce([sys.executable, '-c', 'pass'])[0] for _ in range(runs))
+    print(f'interpreter startup (python -c pass): {interpreter * 1e3:.1f} ms')
+    with tempfile.TemporaryDirectory() as out_dir:
+        print(f'{"path":>11} {"median ms":>10} {"min ms":>8} {"imports ms":>11}  top-level imports (cumulative ms)')
+        for name, args in MakePaths(out_dir):
+            times = [RunOnce([sys.executable, ENTRY, *args])[0] for _ in range(runs)]
+            _, stderr = RunOnce([sys.executable, '-X', 'importtime', ENTRY, *args])
+            import_ms, top = TopImports(stderr)
+            breakdown = ', '.join(f'{module} {ms:.1f}' for module, ms in top)
+            print(f'{name:>11} {statistics.median(times) * 1e3:>10.1f} {min(times) * 1e3:>8.1f} '
+                  f'{import_ms:>11.1f}  {breakdown}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,349 @@
+# 翻译器基准测试套件：各阶段耗时的中位数/p95 和内存峰值，与基线比较发现性能退化
+#
+# 测量对象：
+#   translate  Translator.GenerateCCode（AST 在计时外解析，辅助符号表在计时外载入）
+#   presym     TransPyC.PreProcessSymbol（.py 和 .c）
+#   symbin     Translator.LoadSymbinFile
+#   parse-c    Translator.ParseCFile
+# 输入为仓库中的真实文件、把真实文件的顶层函数复制多份得到的放大输入，
+# 以及 bench/workload.py 生成的合成输入（200 个函数，嵌套 6 层）。
+#
+# 基线记录的是具体机器上的结果，不随仓库提交，应在运行检查的同一台机器上用 --save-baseline 生成；
+# 没有基线时退出码为 1（检查不能悄悄通过），只想看结果时加 --allow-missing-baseline。
+#
+# 耗时在 --processes 个新启动的工作进程中分别测量：每个进程先预热，再把每个用例运行 --runs 次
+# （计时期间关闭垃圾回收），比较时使用各进程中位数中最小的一个。在共享的单核机器上，
+# 同一段代码在不同进程中的耗时常常整体相差 1.5 倍（CPU 时间同样变慢，不是被抢占），
+# 在同一个进程里多测几轮、按参照代码的耗时折算都无济于事；取 5 个进程中最快的一个后，
+# 两次运行之间仍可能相差 30% 以上，所以比较时：
+#   - 超出阈值的用例在一批新进程中再测一次，两批进程合在一起取最小的中位数；
+#   - 比基线慢不到 MIN_SLOWDOWN_MS（1 ms）的不算退化，亚毫秒用例的相对波动没有意义；
+#   - 变慢的幅度不超过这次各进程中位数之间的差别时，作为"无法与噪声区分"单独列出，不算退化。
+# 在这样的机器上，代码不变时连续三次比较都没有误报，慢 60% 的用例在进程间差别更大的那次
+# 只能列为无法区分；需要更小的阈值时应在独占的机器上运行。
+# 每个进程另外单独运行一次，用 tracemalloc 统计内存峰值（tracemalloc 会拖慢运行，
+# 不与计时混在一起），内存峰值基本不受机器负载影响，不重测。
+#
+# 用法:
+#   python bench/bench_suite.py [-o results.json] [--runs N] [--processes N] [--filter 子串]
+#   python bench/bench_suite.py --save-baseline          # 在参考机器上生成基线
+#   python bench/bench_suite.py --threshold 0.15         # 与基线比较，超过 15% 时退出码为 1（默认 25%）
+
+import argparse
+import ast
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'bench'))
+from TransPyC import TransPyC, SymbolFile
+from lib.core.translator import Translator
+from lib.core.python_symbols import PARSED_TREES
+from lib.core.server import percentile
+from workload import WorkloadSpec, write_workload
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'bench', 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_RUNS = 10
+DEFAULT_PROCESSES = 5
+MIN_SLOWDOWN_MS = 1.0
+WARMUP_RUNS = 2
+
+
+def ReadSource(relative_path):
+    with open(os.path.join(ROOT, relative_path), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def ScaleSource(code, factor):
+    """把顶层函数复制 factor 份（第 i 份的函数名加后缀 _i，调用也随之改名），其他顶层定义保留一份"""
+    tree = ast.parse(code)
+    functions = {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+
+    class Rename(ast.NodeTransformer):
+        def __init__(self, suffix):
+            self.suffix = suffix
+
+        def visit_FunctionDef(self, node):
+            node.name += self.suffix
+            self.generic_visit(node)
+            return node
+
+        def visit_Name(self, node):
+            if node.id in functions:
+                node.id += self.suffix
+            return node
+
+    body = [node for node in tree.body if not isinstance(node, ast.FunctionDef)]
+    for index in range(factor):
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef):
+                copied = ast.parse(ast.unparse(node)).body[0]
+                body.append(Rename(f'_{index}').visit(copied))
+    tree.body = body
+    return ast.unparse(tree)
+
+
+def HelperTable(helper_files):
+    """载入辅助文件，返回展开后的符号表"""
+    translator = Translator()
+    translator.ParseHelperFiles([os.path.join(ROOT, path) for path in helper_files])
+    return dict(translator.SymbolTable)
+
+
+def TranslateCase(code, helper_files=()):
+    """GenerateCCode：每次使用新的翻译器和新解析的 AST"""
+    symbol_table = HelperTable(helper_files)
+
+    def setup():
+        translator = Translator()
+        translator.SymbolTable = dict(symbol_table)
+        translator.OriginalLines = code.split('\n')
+        translator.Content = code
+        tree = ast.parse(code)
+        return lambda: translator.GenerateCCode(tree)
+    return setup
+
+
+def PreSymCase(relative_path):
+    """PreProcessSymbol：清空 AST 缓存，每次都重新解析"""
+    path = os.path.join(ROOT, relative_path)
+
+    def setup():
+        PARSED_TREES.clear()
+        return lambda: TransPyC.PreProcessSymbol(SymbolFile(file=path))
+    return setup
+
+
+def SymbinCase(symbin_path):
+    """LoadSymbinFile：载入到新翻译器的符号表"""
+    def setup():
+        translator = Translator()
+        return lambda: translator.LoadSymbinFile(symbin_path)
+    return setup
+
+
+def ParseCCase(relative_path):
+    """ParseCFile：解析到新翻译器的符号表"""
+    path = os.path.join(ROOT, relative_path)
+
+    def setup():
+        translator = Translator()
+        return lambda: translator.ParseCFile(path)
+    return setup
+
+
+def MakeCases(work_dir):
+    """用例名 -> setup 函数；setup 在计时外准备状态，返回被计时的无参函数"""
+    symbin_path = os.path.join(work_dir, 'kernel2.symbin')
+    with open(symbin_path, 'wb') as f:
+        f.write(TransPyC.PreProcessSymbol(SymbolFile(file=os.path.join(ROOT, 'kernel2.py'))))
+    workload_source, workload_helper = write_workload(work_dir, WorkloadSpec(functions=200, depth=6))
+    with open(workload_source, 'r', encoding='utf-8') as f:
+        workload = f.read()
+    kernel = ReadSource('kernel.py')
+    example1 = ReadSource('test/example1.py')
+    return {
+        'translate/kernel.py': TranslateCase(kernel, ['kernel2.py']),
+        'translate/kernel2.py': TranslateCase(ReadSource('kernel2.py')),
+        'translate/example1.py': TranslateCase(example1),
+        'translate/kernel.py x4': TranslateCase(ScaleSource(kernel, 4), ['kernel2.py']),
+        'translate/example1.py x16': TranslateCase(ScaleSource(example1, 16)),
+        'translate/workload': TranslateCase(workload, [workload_helper]),
+        'presym/kernel2.py': PreSymCase('kernel2.py'),
+        'presym/kernel2.c': PreSymCase('kernel2.c'),
+        'symbin/kernel2.symbin': SymbinCase(symbin_path),
+        'parse-c/kernel2.c': ParseCCase('kernel2.c'),
+    }
+
+
+def TimeRuns(setup, runs):
+    """计时 runs 次，返回每次的耗时（毫秒）；与 timeit 一样，计时期间关闭垃圾回收"""
+    times = []
+    for _ in range(runs):
+        run = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) * 1e3)
+        finally:
+            gc.enable()
+    return times
+
+
+def PeakMemory(setup):
+    """单独运行一次，返回 tracemalloc 统计的内存峰值（KB）"""
+    run = setup()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round((peak - before) / 1024, 1)
+
+
+def SelectCases(cases, name_filter, names=None):
+    """按名称子串筛选用例；给出 names 时只保留其中列出的用例"""
+    return {name: setup for name, setup in cases.items()
+            if name_filter in name and (not names or name in names)}
+
+
+def MeasureWorker(runs, name_filter, names=None):
+    """在工作进程中测量一轮：返回 {'times': 用例名 -> 每次耗时, 'peak_kb': 用例名 -> 内存峰值}"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        cases = SelectCases(MakeCases(work_dir), name_filter, names)
+        for setup in cases.values():
+            for _ in range(WARMUP_RUNS):
+                setup()()
+        times = {name: TimeRuns(setup, runs) for name, setup in cases.items()}
+        return {'times': times, 'peak_kb': {name: PeakMemory(setup) for name, setup in cases.items()}}
+
+
+def Measure(runs, processes, name_filter='', names=None):
+    """在 processes 个新进程中各测量一轮
+
+    返回 用例名 -> {'median_ms', 'p95_ms', 'min_ms', 'peak_kb', 'runs', 'process_ms'}：
+    process_ms 是各进程的中位数，median_ms 取其中最小的一个，p95_ms 和 min_ms 按全部运行计算。
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--worker', '--runs', str(runs), '--filter', name_filter]
+    for name in names or ():
+        command += ['--case', name]
+    rounds = []
+    for _ in range(processes):
+        worker = subprocess.run(command, capture_output=True, text=True, check=True)
+        rounds.append(json.loads(worker.stdout))
+    results = {}
+    for name in rounds[0]['times']:
+        all_times = sorted(run_time for measured in rounds for run_time in measured['times'][name])
+        process_ms = [round(statistics.median(measured['times'][name]), 3) for measured in rounds]
+        results[name] = {
+            'median_ms': min(process_ms),
+            'p95_ms': round(percentile(all_times, 0.95), 3),
+            'min_ms': round(all_times[0], 3),
+            'peak_kb': min(measured['peak_kb'][name] for measured in rounds),
+            'runs': len(all_times),
+            'process_ms': process_ms,
+        }
+    return results
+
+
+def Regressed(result, base, metric, threshold):
+    """result 的 metric 是否超出基线 threshold；耗时另外要求至少慢 MIN_SLOWDOWN_MS"""
+    if base[metric] <= 0 or result[metric] <= base[metric] * (1 + threshold):
+        return False
+    return metric != 'median_ms' or result[metric] - base[metric] >= MIN_SLOWDOWN_MS
+
+
+def Spread(result):
+    """各进程中位数之间的相对差别，即这次测量本身的噪声"""
+    process_ms = result.get('process_ms') or [result['median_ms']]
+    return max(process_ms) / min(process_ms) - 1 if min(process_ms) > 0 else 0.0
+
+
+def Recheck(results, baseline, threshold, runs, processes):
+    """耗时超出阈值的用例在一批新进程中再测一次，两批进程合在一起重新取最小的中位数"""
+    slow = [name for name, result in results.items()
+            if name in baseline and Regressed(result, baseline[name], 'median_ms', threshold)]
+    if not slow:
+        return results
+    print(f'Re-measuring {len(slow)} slow case(s): {", ".join(slow)}')
+    for name, result in Measure(runs, processes, names=slow).items():
+        results[name]['process_ms'] += result['process_ms']
+        results[name]['median_ms'] = min(results[name]['process_ms'])
+    return results
+
+
+def Compare(results, baseline, threshold):
+    """与基线比较中位数耗时和内存峰值，返回 (退化描述列表, 无法确定的描述列表)
+
+    耗时变慢的幅度不超过各进程之间的差别时无法与噪声区分，归入第二个列表。
+    """
+    regressions = []
+    inconclusive = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in ('median_ms', 'peak_kb'):
+            if Regressed(result, base, metric, threshold):
+                change = result[metric] / base[metric] - 1
+                line = f'{name}: {metric} {base[metric]} -> {result[metric]} (+{change:.0%})'
+                if metric == 'median_ms' and change <= Spread(result):
+                    inconclusive.append(f'{line}, processes differ by {Spread(result):.0%}')
+                else:
+                    regressions.append(line)
+    return regressions, inconclusive
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TransPyC translator benchmark suite')
+    parser.add_argument('-o', '--output', help='write results to this JSON file')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help='timed runs per case and process')
+    parser.add_argument('--processes', type=int, default=DEFAULT_PROCESSES,
+                        help='worker processes; the lowest per-process median is compared')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this text')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown/memory growth over the baseline (0.2 = 20%%)')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--allow-missing-baseline', action='store_true',
+                        help='exit 0 instead of 1 when there is no baseline to compare against')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--case', action='append', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(MeasureWorker(args.runs, args.filter, args.case), sys.stdout)
+        return 0
+    results = Measure(args.runs, args.processes, args.filter)
+    print(f'{"case":>26} {"median ms":>10} {"p95 ms":>8} {"peak KB":>9}')
+    for name, result in results.items():
+        print(f'{name:>26} {result["median_ms"]:>10.2f} {result["p95_ms"]:>8.2f} {result["peak_kb"]:>9.1f}')
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cases': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; run with --save-baseline to create one')
+        return 0 if args.allow_missing_baseline else 1
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    results = Recheck(results, baseline['cases'], args.threshold, args.runs, args.processes)
+    regressions, inconclusive = Compare(results, baseline['cases'], args.threshold)
+    if inconclusive:
+        print('Slower than the baseline but within the timing noise of this run:')
+        for line in inconclusive:
+            print(f'  {line}')
+    if regressions:
+        print(f'Regressions beyond {args.threshold:.0%} against {args.baseline}:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print(f'No regressions beyond {args.threshold:.0%} against {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
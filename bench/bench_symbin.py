@@ -0,0 +1,92 @@
+# .symbin 加载基准测试：旧 JSON 格式整体加载与第 2 版内存映射按需查询的对比
+#
+# 用法: python bench/bench_symbin.py [最大符号数]
+
+import json
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lib.core.symbin import encode_symbol_table, open_symbol_file
+
+LOOKUPS = 200
+
+
+def MakeSymbolTable(count):
+    """生成与头文件导出的符号表形状相同的符号：结构体、函数和变量各占一部分"""
+    table = {}
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            table[f'STRUCT_{i}'] = {'type': 'struct', 'members': {
+                f'm{j}': {'type': 'int' if j % 2 else 'char*', 'is_pointer': bool(j % 2 == 0)} for j in range(6)
+            }}
+        elif kind == 1:
+            table[f'func_{i}'] = {'type': 'function'}
+        else:
+            table[f'var_{i}'] = {'type': 'variable', 'declared_type': 'unsigned int', 'is_pointer': False}
+    return table
+
+
+def EncodeLegacy(table):
+    """旧格式：4 字节长度加 JSON"""
+    json_data = json.dumps(table, ensure_ascii=False).encode('utf-8')
+    return struct.pack('<I', len(json_data)) + json_data
+
+
+def Best(func, repeat=5):
+    """多次运行取最短耗时（秒）"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    max_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    sizes = [max_count // 100, max_count // 10, max_count]
+    work_dir = tempfile.mkdtemp(prefix='transpyc_symbin_')
+    try:
+        print(f'{"symbols":>8} {"legacy KB":>10} {"v2 KB":>8} {"legacy load ms":>15} '
+              f'{"v2 open ms":>11} {f"v2 open+{LOOKUPS} lookups ms":>26}')
+        for size in sizes:
+            table = MakeSymbolTable(size)
+            names = random.Random(size).sample(list(table), min(LOOKUPS, size))
+            legacy_path = os.path.join(work_dir, f'legacy_{size}.symbin')
+            binary_path = os.path.join(work_dir, f'v2_{size}.symbin')
+            with open(legacy_path, 'wb') as f:
+                f.write(EncodeLegacy(table))
+            with open(binary_path, 'wb') as f:
+                f.write(encode_symbol_table(table))
+
+            def LoadLegacy():
+                symbols = {}
+                symbols.update(open_symbol_file(legacy_path))
+                for name in names:
+                    symbols[name]
+
+            def OpenBinary():
+                open_symbol_file(binary_path).Close()
+
+            def QueryBinary():
+                symbols = open_symbol_file(binary_path)
+                for name in names:
+                    symbols[name]
+                symbols.Close()
+
+            print(f'{size:>8} {os.path.getsize(legacy_path) / 1024:>10.0f} {os.path.getsize(binary_path) / 1024:>8.0f} '
+                  f'{Best(LoadLegacy) * 1e3:>15.2f} {Best(OpenBinary) * 1e3:>11.3f} {Best(QueryBinary) * 1e3:>26.3f}')
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
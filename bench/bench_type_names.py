@@ -0,0 +1,61 @@
+# GetTypeName 基准测试：每次清空结构缓存与保留缓存的对比
+#
+# 用法: python bench/bench_type_names.py [Python 文件 ...]
+
+import ast
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from lib.core import translator as translator_module
+from lib.core.translator import Translator
+
+DEFAULT_FILES = ['kernel.py', 'kernel2.py', 'test.py', 'test2.py']
+ROUNDS = 20
+
+
+def CollectAnnotations(tree):
+    """收集变量、参数和返回值的类型注解"""
+    annotations = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.AnnAssign, ast.arg)) and node.annotation is not None:
+            annotations.append(node.annotation)
+        elif isinstance(node, ast.FunctionDef) and node.returns is not None:
+            annotations.append(node.returns)
+    return annotations
+
+
+def Resolve(translator, annotations, cached):
+    """解析所有注解 ROUNDS 遍，返回耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        if not cached:
+            translator_module.TYPE_NAME_CACHE.clear()
+        for annotation in annotations:
+            translator.GetTypeName(annotation)
+    return time.perf_counter() - start
+
+
+def main():
+    files = sys.argv[1:] or [os.path.join(ROOT, name) for name in DEFAULT_FILES]
+    print(f'{"file":>12} {"annotations":>12} {"uncached ms":>12} {"cached ms":>10} {"hit rate":>9}')
+    for file_path in files:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            code = f.read()
+        annotations = CollectAnnotations(ast.parse(code))
+        translator = Translator()
+        translator.Content = code
+        uncached = Resolve(translator, annotations, cached=False)
+        translator_module.TYPE_NAME_CACHE.clear()
+        translator.TypeNameHits = translator.TypeNameMisses = 0
+        cached = Resolve(translator, annotations, cached=True)
+        lookups = translator.TypeNameHits + translator.TypeNameMisses
+        hit_rate = translator.TypeNameHits * 100.0 / lookups if lookups else 0.0
+        print(f'{os.path.basename(file_path):>12} {len(annotations):>12} {uncached * 1e3:>12.2f} '
+              f'{cached * 1e3:>10.2f} {hit_rate:>8.1f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+# 合成测试输入生成器：按可调的规模生成 TransPyC 方言（t/c DSL）的 Python 源代码
+#
+# 可调的维度见 WorkloadSpec。生成的翻译单元包含宏定义、结构体、带初始化列表的全局数组
+# 和多层嵌套（if/for/while/match 轮流）的函数，函数中访问结构体成员、数组元素，
+# 并调用辅助文件中声明的函数和外部变量；辅助文件单独生成，用 -h 传给翻译器。
+#
+# 用法（命令行）:
+#   python bench/workload.py out_dir [维度=值 ...]    如 functions=200 depth=6
+# 在 out_dir 中写入 workload.py 和 workload_helper.py。
+
+import os
+import sys
+
+# 各维度的默认值
+DEFAULT_SPEC = {
+    'functions': 20,  # 顶层函数数
+    'depth': 3,  # 函数体中控制语句的嵌套层数
+    'literals': 16,  # 每个全局数组初始化列表中的字面量个数
+    'arrays': 4,  # 带初始化列表的全局数组数
+    'structs': 4,  # 结构体数
+    'members': 6,  # 每个结构体的成员数
+    'defines': 8,  # t.CDefine 宏定义数
+    'helper_symbols': 32,  # 辅助文件中的符号数（函数声明、宏和外部变量）
+}
+
+# 嵌套时轮流使用的控制语句
+NESTING_KINDS = ('if', 'for', 'while', 'match')
+MEMBER_TYPES = ('t.CInt', 't.CUnsignedChar', 't.CShort | t.CPtr', 't.CInt | t.CPtr', 't.CUnsignedInt')
+INDENT = '    '
+
+
+class WorkloadSpec:
+    """合成输入的规模，属性与 DEFAULT_SPEC 的键一一对应"""
+
+    __slots__ = tuple(DEFAULT_SPEC)
+
+    def __init__(self, **values):
+        unknown = set(values) - set(DEFAULT_SPEC)
+        if unknown:
+            raise ValueError(f'Unknown workload dimensions: {", ".join(sorted(unknown))}')
+        for name, default in DEFAULT_SPEC.items():
+            setattr(self, name, int(values.get(name, default)))
+
+    def Replace(self, **values):
+        """返回修改了部分维度的新规格"""
+        merged = {name: getattr(self, name) for name in DEFAULT_SPEC}
+        merged.update(values)
+        return WorkloadSpec(**merged)
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)}' for name in DEFAULT_SPEC)
+        return f'WorkloadSpec({fields})'
+
+
+def helper_names(spec):
+    """辅助文件中各类符号的名称：(函数, 宏, 外部变量)"""
+    count = spec.helper_symbols
+    functions = [f'wl_helper_{i}' for i in range((count + 1) // 2)]
+    defines = [f'WL_HELPER_DEFINE_{i}' for i in range(count // 4)]
+    externs = [f'wl_extern_{i}' for i in range(count - len(functions) - len(defines))]
+    return functions, defines, externs
+
+
+def generate_helper(spec):
+    """生成辅助文件：函数声明、宏定义和外部变量声明"""
+    functions, defines, externs = helper_names(spec)
+    lines = ['import c', 'import t', '']
+    for index, name in enumerate(defines):
+        lines.append(f'{name}: t.CDefine = {index * 4}')
+    for name in functions:
+        lines.append(f'def {name}(value: t.CInt) -> t.CInt | c.State: pass')
+    for name in externs:
+        lines.append(f'{name}: t.CExtern | t.CInt = c.State')
+    return '\n'.join(lines) + '\n'
+
+
+def literal(index):
+    """初始化列表中的字面量，十进制、十六进制和字符轮流出现"""
+    kind = index % 3
+    if kind == 0:
+        return str(index)
+    if kind == 1:
+        return hex(index * 17 & 0xff)
+    return repr(chr(ord('A') + index % 26))
+
+
+def generate_body(spec, function_index, helpers):
+    """生成函数体：逐层嵌套控制语句，最内层访问结构体成员、数组并调用辅助函数"""
+    helper_functions, _, helper_externs = helpers
+    struct_member = f'm{function_index % spec.members}' if spec.members else None
+    lines = [f'{INDENT}acc: t.CInt = 0']
+    for level in range(spec.depth):
+        lines.append(f'{INDENT}i{level}: t.CInt = 0')
+
+    innermost = []
+    if spec.structs and struct_member:
+        innermost.append(f'acc += p.{struct_member}')
+    if spec.arrays:
+        innermost.append(f'acc += wl_table_{function_index % spec.arrays}[n & {max(spec.literals - 1, 0)}]')
+    if helper_functions:
+        innermost.append(f'acc = {helper_functions[function_index % len(helper_functions)]}(acc)')
+    if helper_externs:
+        innermost.append(f'acc += {helper_externs[function_index % len(helper_externs)]}')
+    if spec.defines:
+        innermost.append(f'acc += WL_DEFINE_{function_index % spec.defines}')
+    innermost = innermost or ['acc += 1']
+
+    def emit(level, indent):
+        pad = INDENT * indent
+        if level == spec.depth:
+            lines.extend(pad + statement for statement in innermost)
+            return
+        kind = NESTING_KINDS[level % len(NESTING_KINDS)]
+        if kind == 'if':
+            lines.append(f'{pad}if n > {level}:')
+            emit(level + 1, indent + 1)
+            lines.append(f'{pad}else:')
+            lines.append(f'{pad}{INDENT}acc -= {level}')
+        elif kind == 'for':
+            lines.append(f'{pad}for i{level} in range(n):')
+            emit(level + 1, indent + 1)
+        elif kind == 'while':
+            lines.append(f'{pad}while acc < {100 * (level + 1)}:')
+            emit(level + 1, indent + 1)
+            lines.append(f'{pad}{INDENT}acc += 1')
+        else:
+            lines.append(f'{pad}match n:')
+            lines.append(f'{pad}{INDENT}case {level}:')
+            emit(level + 1, indent + 2)
+            lines.append(f'{pad}{INDENT}case _:')
+            lines.append(f'{pad}{INDENT * 2}acc = 0')
+
+    emit(0, 1)
+    lines.append(f'{INDENT}return acc')
+    return lines
+
+
+def generate_source(spec):
+    """生成翻译单元"""
+    helpers = helper_names(spec)
+    lines = ['import c', 'import t', '']
+    for index in range(spec.defines):
+        lines.append(f'WL_DEFINE_{index}: t.CDefine = {index + 1}')
+    lines.append('')
+    for index in range(spec.structs):
+        lines.append(f'class WL_STRUCT_{index}(t.CStruct):')
+        for member in range(spec.members):
+            lines.append(f'{INDENT}m{member}: {MEMBER_TYPES[member % len(MEMBER_TYPES)]}')
+        if not spec.members:
+            lines.append(f'{INDENT}pass')
+        lines.append('')
+    for index in range(spec.arrays):
+        values = ', '.join(literal(index + i) for i in range(spec.literals))
+        lines.append(f'wl_table_{index}: t.CStatic | t.CUnsignedChar[{max(spec.literals, 1)}] = [{values}]')
+    lines.append('')
+    for index in range(spec.functions):
+        if spec.structs:
+            parameters = f'p: WL_STRUCT_{index % spec.structs} | t.CPtr, n: t.CInt'
+        else:
+            parameters = 'n: t.CInt'
+        lines.append(f'def wl_func_{index}({parameters}) -> t.CInt:')
+        lines.extend(generate_body(spec, index, helpers))
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def write_workload(out_dir, spec):
+    """写入翻译单元和辅助文件，返回 (翻译单元路径, 辅助文件路径)"""
+    os.makedirs(out_dir, exist_ok=True)
+    source_path = os.path.join(out_dir, 'workload.py')
+    helper_path = os.path.join(out_dir, 'workload_helper.py')
+    with open(source_path, 'w', encoding='utf-8') as f:
+        f.write(generate_source(spec))
+    with open(helper_path, 'w', encoding='utf-8') as f:
+        f.write(generate_helper(spec))
+    return source_path, helper_path
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python bench/workload.py out_dir [dimension=value ...]')
+        print(f'Dimensions: {", ".join(f"{name}={value}" for name, value in DEFAULT_SPEC.items())}')
+        return 1
+    values = dict(argument.split('=', 1) for argument in sys.argv[2:])
+    spec = WorkloadSpec(**values)
+    source_path, helper_path = write_workload(sys.argv[1], spec)
+    print(f'{spec}\n  {source_path}\n  {helper_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
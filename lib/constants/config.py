@@ -14,6 +14,35 @@ SUPPORTED_FILE_TYPES = {
 DEFAULT_COMPILE_COMMAND = 'gcc'
 DEFAULT_COMPILE_FLAGS = ''
 
+# 调试输出缓冲区大小（行数），缓冲区写满或 GenerateCCode 结束时写入 .p2c 文件
+DEBUG_BUFFER_LINES = 4096
+
+# 缓存根目录（-cache 未指定目录时使用），各类缓存分别放在其下的子目录中
+CACHE_DIR = '.transpyc_cache'
+# 顶层定义增量翻译缓存的子目录
+DEFINITION_CACHE_SUBDIR = 'defs'
+# 辅助文件符号表缓存的子目录
+SYMBOL_CACHE_SUBDIR = 'symbols'
+# -cc/-run 编译结果缓存的子目录
+COMPILE_CACHE_SUBDIR = 'objects'
+
+# -profile 热点表显示的条目数
+PROFILE_TOP_ENTRIES = 25
+
+# 按源代码保留的已解析 AST 数量，提取符号时解析过的文件翻译时不再重新解析
+PARSED_TREE_CACHE_SIZE = 8
+
+# 监视模式（-watch）两次检查文件变化之间的间隔（秒）
+WATCH_INTERVAL = 0.5
+
+# 异步接口（CompileAsync/RunAsync）同时运行的编译器和测试程序进程数上限，None 表示 CPU 核数
+ASYNC_PROCESS_LIMIT = None
+
+# 常驻翻译服务（-serve）为每类请求保留的最近耗时记录数，用于计算延迟百分位数
+SERVER_LATENCY_WINDOW = 1024
+# 连接常驻翻译服务的超时（秒）；只限制建立连接，不限制翻译本身的耗时
+SERVER_CONNECT_TIMEOUT = 5.0
+
 # 错误消息
 ERROR_MESSAGES = {
     'MISSING_ARGS': 'Missing required arguments -f and/or -o',
@@ -27,7 +56,29 @@ ERROR_MESSAGES = {
 HELP_MESSAGE = '''
 Usage: python TransPyC.py -f input_file -o output_file [-wh header_files] [-debug debug_file]
        [-cc compile_command] [-cflags compile_flags] [-run] [-args run_args] [-h helper_files]
+       [-cache cache_dir] [-nocache] [-profile [profile_file]] [-metrics metrics_file]
+       python TransPyC.py -build dir_or_manifest [-o output_dir] [-j jobs] [-h helper_files] [-cache cache_dir] [-nocache]
+       python TransPyC.py -watch dir [-o output_dir] [-h helper_files] [-cache cache_dir]
+       python TransPyC.py -serve socket_path
+       python TransPyC.py -client socket_path (translate/-presym/-build arguments | -stats | -stop)
        -h: Specify helper files (C or Python) to help identify structs, functions, variables, and pointers
+       -build: Translate every .py file in a directory (or listed in a manifest: "input.py [output.c]" per line)
+               in parallel, sharing the helper symbol tables parsed once
+       -cache: Reuse the C code of unchanged top-level functions from cache_dir (incremental translation)
+       -nocache: Do not use the helper file symbol cache or the compile cache (kept in cache_dir, default
+                 .transpyc_cache); the compile cache reuses the executable when the generated C, its local
+                 "..." headers, the compiler and -cflags are unchanged (a "..." header that cannot be found
+                 in the source directory, -iquote/-I/-isystem/-idirafter or CPATH disables caching)
+       -profile: Print a hotspot table of the translator's Handle* methods (self/cumulative time and calls per
+                 AST node type); profile_file receives pstats data, or speedscope JSON when it ends in .json
+       -metrics: Write wall time, CPU time and tracemalloc peak memory of each phase (helpers, read, parse,
+                 debug_dump, generate, write, compile, run) and symbol/AST node/emitted line counts as JSON
+       -watch: Poll dir and retranslate a .py file when it changes, or when a helper symbol it uses changes;
+               an output file is rewritten only when the generated C code differs
+       -serve: Run a translation server on a Unix domain socket, keeping helper symbol tables parsed
+               between requests (a helper is re-parsed when its mtime or size changes)
+       -client: Send the remaining arguments to the server; -stats prints request latency percentiles,
+                -stop shuts the server down
 '''
 
 # 类型映射
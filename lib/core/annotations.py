@@ -0,0 +1,155 @@
+# 类型注解分析
+
+import ast
+
+# 按顺序探测的基本类型：注解中出现的第一个匹配项决定基本类型
+BASIC_TYPE_PROBES = (
+    ('CUnsignedChar', 'unsigned char'),
+    ('CChar', 'char'),
+    ('CInt', 'int'),
+    ('CUnsignedInt', 'unsigned int'),
+    ('CLong', 'long'),
+    ('CUnsignedLong', 'unsigned long'),
+    ('CFloat', 'float'),
+    ('CDouble', 'double'),
+    ('CVoid', 'void'),
+)
+
+# 存储类修饰符对应的 t 模块类型名
+STORAGE_CLASS_NAMES = {
+    'CStatic': 'static',
+    'CExtern': 'extern',
+    'CRegister': 'register',
+    'CAuto': 'auto',
+}
+
+# 注解节点上保存分析结果的属性名
+ANALYSIS_ATTRIBUTE = 'CAnnotation'
+
+
+class AnnotationInfo:
+    """类型注解的结构分析结果
+
+    遍历一次注解子树，只收集其中的标识符（Name.id 和 Attribute.attr），
+    各调用方共用同一份结果，不再用 ast.dump 把子树序列化成字符串再查找。
+
+    Attributes:
+        IsPointer: 是否包含 t.CPtr
+        IsArrayPtr: 是否包含 t.CArrayPtr
+        StorageClass: 存储类，如 'static'，没有时为空字符串
+        HasStruct: 是否包含 t.CStruct
+        StructTarget: t.CStruct(name=X)、t.CStruct(X) 或 X | t.CPtr 中的结构体名 X，没有时为 None
+        BasicType: 按 BASIC_TYPE_PROBES 顺序探测到的基本类型，没有时为空字符串
+    """
+
+    __slots__ = ('IsPointer', 'IsArrayPtr', 'StorageClass', 'HasStruct',
+                 'StructTarget', 'BasicType')
+
+    def __init__(self, annotation):
+        names = []
+        self.StructTarget = collect_names(annotation, names)
+        if self.StructTarget is None and type(annotation) is ast.BinOp:
+            # X | t.CPtr 形式：| 两侧唯一的裸名称作为结构体名
+            bare_names = [node.id for node in flatten_bitor(annotation, [])
+                          if type(node) is ast.Name and node.id not in ('t', 'c')]
+            if len(bare_names) == 1:
+                self.StructTarget = bare_names[0]
+        self.IsPointer = 'CPtr' in names
+        self.IsArrayPtr = 'CArrayPtr' in names
+        self.StorageClass = ''
+        for name, storage_class in STORAGE_CLASS_NAMES.items():
+            if name in names:
+                self.StorageClass = storage_class
+                break
+        self.HasStruct = mentions(names, 'CStruct')
+        self.BasicType = ''
+        for probe, basic_type in BASIC_TYPE_PROBES:
+            if mentions(names, probe):
+                self.BasicType = basic_type
+                break
+
+
+def mentions(names, text):
+    """是否有包含 text 的标识符，如 'CInt' 也匹配 t.CInt32T"""
+    for name in names:
+        if text in name:
+            return True
+    return False
+
+
+def collect_names(node, names):
+    """把注解中的标识符追加到 names，返回遇到的第一个 t.CStruct(...) 调用中的结构体名
+
+    注解只由名称、属性、|、下标、调用和常量组成，直接按节点类型递归，
+    不使用通用的 ast.walk。
+    """
+    node_type = type(node)
+    if node_type is ast.Name:
+        names.append(node.id)
+        return None
+    if node_type is ast.Attribute:
+        names.append(node.attr)
+        return collect_names(node.value, names)
+    if node_type is ast.BinOp:
+        left = collect_names(node.left, names)
+        right = collect_names(node.right, names)
+        return left if left is not None else right
+    if node_type is ast.Subscript:
+        value = collect_names(node.value, names)
+        size = collect_names(node.slice, names)
+        return value if value is not None else size
+    if node_type is ast.Call:
+        target = call_struct_target(node)
+        inner = collect_names(node.func, names)
+        for arg in node.args:
+            found = collect_names(arg, names)
+            inner = inner if inner is not None else found
+        for keyword in node.keywords:
+            found = collect_names(keyword.value, names)
+            inner = inner if inner is not None else found
+        return target if target is not None else inner
+    if node_type is ast.Tuple:
+        target = None
+        for element in node.elts:
+            found = collect_names(element, names)
+            target = target if target is not None else found
+        return target
+    if node_type is ast.Constant:
+        return None
+    # 其他节点（如 -1、a + b 这样的数组大小表达式）
+    target = None
+    for child in ast.iter_child_nodes(node):
+        found = collect_names(child, names)
+        target = target if target is not None else found
+    return target
+
+
+def call_struct_target(node):
+    """获取 t.CStruct(name=X) 或 t.CStruct(X) 调用中的结构体名"""
+    if not (type(node.func) is ast.Attribute and node.func.attr == 'CStruct'):
+        return None
+    for keyword in node.keywords:
+        if keyword.arg == 'name' and type(keyword.value) is ast.Name:
+            return keyword.value.id
+    if node.args and type(node.args[0]) is ast.Name:
+        return node.args[0].id
+    return None
+
+
+def flatten_bitor(node, operands):
+    """展开 a | b | c 形式的注解，把各个操作数追加到 operands"""
+    if type(node) is ast.BinOp and type(node.op) is ast.BitOr:
+        flatten_bitor(node.left, operands)
+        flatten_bitor(node.right, operands)
+    else:
+        operands.append(node)
+    return operands
+
+
+def analyze_annotation(annotation):
+    """获取注解节点的分析结果，每个节点只分析一次"""
+    info = getattr(annotation, ANALYSIS_ATTRIBUTE, None)
+    if info is None:
+        info = AnnotationInfo(annotation)
+        setattr(annotation, ANALYSIS_ATTRIBUTE, info)
+    return info
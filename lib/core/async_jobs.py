@@ -0,0 +1,93 @@
+# 异步编译和运行
+
+import asyncio
+import os
+import shlex
+import time
+import weakref
+
+from lib.constants.config import ASYNC_PROCESS_LIMIT
+
+# 每个事件循环一个信号量，限制同时运行的子进程数
+_Semaphores = weakref.WeakKeyDictionary()
+_ProcessLimit = ASYNC_PROCESS_LIMIT
+
+
+class ProcessResult:
+    """子进程的运行结果"""
+
+    def __init__(self, argv, returncode, stdout, stderr, seconds, timed_out=False):
+        self.argv = argv
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.seconds = seconds
+        self.timed_out = timed_out
+
+    @property
+    def ok(self):
+        """是否正常结束且退出码为 0"""
+        return self.returncode == 0 and not self.timed_out
+
+
+def set_process_limit(limit):
+    """设置同时运行的子进程数上限（None 表示 CPU 核数），对之后创建的事件循环生效"""
+    global _ProcessLimit
+    _ProcessLimit = limit
+
+
+def process_semaphore():
+    """当前事件循环的子进程信号量"""
+    loop = asyncio.get_running_loop()
+    semaphore = _Semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _Semaphores[loop] = asyncio.Semaphore(_ProcessLimit or os.cpu_count() or 1)
+    return semaphore
+
+
+def split_args(args):
+    """把字符串形式的参数按 shell 规则拆开，列表原样返回"""
+    if not args:
+        return []
+    if isinstance(args, str):
+        return shlex.split(args)
+    return list(args)
+
+
+async def run_process(argv, timeout=None, cwd=None):
+    """在信号量限制下直接运行程序（不经过 shell），返回 ProcessResult
+
+    超时的进程会被结束，timed_out 为 True，stdout/stderr 为超时前已经产生的输出；
+    程序不存在时退出码为 127，与 shell 相同。
+    调用方取消任务时同样结束子进程。
+    """
+    async with process_semaphore():
+        start = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        except OSError as e:
+            return ProcessResult(argv, 127, '', str(e), time.perf_counter() - start)
+        # 超时时 wait_for 只取消 shield，communicate 继续读取，已经产生的输出不会丢失
+        communicate = asyncio.ensure_future(process.communicate())
+        timed_out = False
+        try:
+            stdout, stderr = await asyncio.wait_for(asyncio.shield(communicate), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            stdout, stderr = await communicate
+            timed_out = True
+        except asyncio.CancelledError:
+            process.kill()
+            communicate.cancel()
+            await process.wait()
+            raise
+        return ProcessResult(argv, process.returncode,
+                             stdout.decode('utf-8', errors='replace'),
+                             stderr.decode('utf-8', errors='replace'),
+                             time.perf_counter() - start, timed_out)
+
+
+def compile_argv(c_file, output_file, compile_command, compile_flags):
+    """编译命令的参数列表：编译器 [标志...] 源文件 -o 输出文件"""
+    return [*split_args(compile_command), *split_args(compile_flags), c_file, '-o', output_file]
@@ -0,0 +1,264 @@
+# 多文件并行构建
+
+import ast
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from lib.constants.config import GENERATE_Copyright
+from lib.core.translator import Translator
+from lib.core.python_symbols import parse_python
+from lib.utils.helpers import open_output_file
+
+
+# ConvertMany 支持的执行方式：None 表示在调用方线程中逐个翻译
+CONVERT_EXECUTORS = (None, 'thread', 'process')
+
+# 工作进程中的共享状态，由 init_build_worker 在进程启动时设置一次
+_WorkerSymbolTable = {}
+_WorkerEncoding = 'utf-8'
+_WorkerCacheDir = None
+
+
+class BuildUnit:
+    """一个待翻译的文件"""
+
+    def __init__(self, input_file, output_file):
+        self.input_file = input_file
+        self.output_file = output_file
+
+
+class BuildResult:
+    """单个文件的翻译结果"""
+
+    def __init__(self, unit, seconds, error=None):
+        self.unit = unit
+        self.seconds = seconds
+        self.error = error
+
+
+def output_path_for(input_file, source_root, output_dir):
+    """根据输入文件计算输出路径，指定输出目录时保持相对目录结构
+
+    不在 source_root 下的文件直接放在输出目录顶层。
+    """
+    base = os.path.splitext(input_file)[0] + '.c'
+    if not output_dir:
+        return base
+    relative = os.path.relpath(base, source_root)
+    if relative.startswith(os.pardir):
+        relative = os.path.basename(base)
+    return os.path.join(output_dir, relative)
+
+
+def collect_directory_units(directory, output_dir=None):
+    """递归收集目录下的所有 .py 文件，按路径排序以保证输出顺序确定"""
+    units = []
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if entry.name != '__pycache__' and not entry.name.startswith('.'):
+                        pending.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    units.append(BuildUnit(entry.path, output_path_for(entry.path, directory, output_dir)))
+    units.sort(key=lambda unit: unit.input_file)
+    return units
+
+
+def load_manifest(manifest_file, output_dir=None, encoding='utf-8'):
+    """读取构建清单
+
+    清单每行一个文件：`输入文件 [输出文件]`，# 开头的行为注释，
+    相对路径相对于清单所在目录；按清单中的顺序输出结果。
+    """
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_file))
+    units = []
+    with open(manifest_file, 'r', encoding=encoding) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split()
+            input_file = os.path.join(manifest_dir, parts[0])
+            if len(parts) > 1:
+                output_file = os.path.join(output_dir or manifest_dir, parts[1])
+            else:
+                output_file = output_path_for(input_file, manifest_dir, output_dir)
+            units.append(BuildUnit(input_file, output_file))
+    return units
+
+
+def collect_build_units(target, output_dir=None, encoding='utf-8'):
+    """根据 -build 参数收集待翻译文件，target 可以是目录或清单文件"""
+    if os.path.isdir(target):
+        return collect_directory_units(target, output_dir)
+    return load_manifest(target, output_dir, encoding)
+
+
+def load_shared_symbols(helper_files, encoding='utf-8', symbol_cache_dir=None):
+    """在主进程中解析一次辅助文件（.py/.c/.h/.symbin），返回所有文件共享的符号表
+
+    指定 symbol_cache_dir 时通过符号缓存解析，内容未变的辅助文件不再重新解析。
+    """
+    translator = Translator()
+    if symbol_cache_dir:
+        translator.set_symbol_cache(symbol_cache_dir)
+    if helper_files:
+        translator.ParseHelperFiles(helper_files, encoding)
+    return translator.SymbolTable
+
+
+def init_build_worker(symbol_table, encoding, cache_dir):
+    """工作进程初始化：保存共享符号表，之后每个文件只复制一份"""
+    global _WorkerSymbolTable, _WorkerEncoding, _WorkerCacheDir
+    _WorkerSymbolTable = symbol_table
+    _WorkerEncoding = encoding
+    _WorkerCacheDir = cache_dir
+
+
+def build_unit(unit):
+    """翻译单个文件并写入输出，返回 BuildResult"""
+    start = time.perf_counter()
+    try:
+        with open(unit.input_file, 'r', encoding=_WorkerEncoding) as f:
+            content = f.read()
+        translator = Translator()
+        translator.SymbolTable = dict(_WorkerSymbolTable)
+        if _WorkerCacheDir:
+            translator.set_definition_cache(_WorkerCacheDir)
+        translator.OriginalLines = content.split('\n')
+        translator.Content = content
+        tree = parse_python(content)
+        output_dir = os.path.dirname(unit.output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open_output_file(unit.output_file, _WorkerEncoding) as f:
+            f.write(f'{GENERATE_Copyright}\n')
+            translator.GenerateCCode(tree, f)
+            f.write('\n')
+    except Exception as e:
+        return BuildResult(unit, time.perf_counter() - start, f'{type(e).__name__}: {e}')
+    return BuildResult(unit, time.perf_counter() - start)
+
+
+def resolve_jobs(jobs, unit_count):
+    """计算实际使用的工作进程数，默认为 CPU 核数，且不超过文件数"""
+    return max(1, min(jobs or os.cpu_count() or 1, unit_count))
+
+
+def run_build(units, symbol_table, jobs=None, encoding='utf-8', cache_dir=None):
+    """并行翻译所有文件
+
+    Args:
+        units: BuildUnit 列表
+        symbol_table: load_shared_symbols 返回的共享符号表
+        jobs: 工作进程数，默认为 CPU 核数；为 1 或只有一个文件时在当前进程中翻译
+        encoding: 源文件和输出文件编码
+        cache_dir: 增量翻译缓存目录
+
+    Returns:
+        与 units 顺序一致的 BuildResult 列表
+    """
+    jobs = resolve_jobs(jobs, len(units))
+    if jobs == 1:
+        init_build_worker(symbol_table, encoding, cache_dir)
+        return [build_unit(unit) for unit in units]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_build_worker,
+                             initargs=(symbol_table, encoding, cache_dir)) as executor:
+        # map 按提交顺序返回结果，报告顺序与完成先后无关
+        return list(executor.map(build_unit, units))
+
+
+class ConvertResult:
+    """ConvertMany 中一段代码的翻译结果"""
+
+    def __init__(self, name, code, seconds, error=None):
+        self.name = name
+        self.code = code
+        self.seconds = seconds
+        self.error = error
+
+
+def convert_source(name, code, symbol_table, tree=None, cache_dir=None):
+    """用独立的翻译器翻译一段代码，返回 ConvertResult
+
+    symbol_table 是各段代码共享的只读基础符号表，这里复制一份作为本段代码自己的符号表，
+    翻译时写入的符号、作用域和函数返回类型都不会影响其他代码。
+
+    Args:
+        tree: 调用方已经解析好的 AST，None 时在这里解析
+        cache_dir: 增量翻译缓存目录，None 表示不使用
+    """
+    start = time.perf_counter()
+    try:
+        translator = Translator()
+        translator.SymbolTable = dict(symbol_table)
+        if cache_dir:
+            translator.set_definition_cache(cache_dir)
+        translator.OriginalLines = code.split('\n')
+        translator.Content = code
+        if tree is None:
+            # 不经过 parse_python 的共享缓存，多个线程同时翻译时互不干扰
+            tree = ast.parse(code)
+        c_code = translator.GenerateCCode(tree)
+    except Exception as e:
+        return ConvertResult(name, None, time.perf_counter() - start, f'{type(e).__name__}: {e}')
+    return ConvertResult(name, f'{GENERATE_Copyright}\n{c_code}\n', time.perf_counter() - start)
+
+
+def convert_worker(source):
+    """进程池中的翻译任务，使用 init_build_worker 保存的共享符号表"""
+    name, code = source
+    return convert_source(name, code, _WorkerSymbolTable)
+
+
+def convert_many(sources, symbol_table, jobs=None, executor='thread'):
+    """翻译多段代码，按完成顺序返回 ConvertResult 的迭代器
+
+    Args:
+        sources: (名称, 代码) 序列
+        symbol_table: 共享的只读基础符号表
+        jobs: 并行数，默认为 CPU 核数；为 1 或只有一段代码时在调用方线程中翻译
+        executor: 'thread'、'process' 或 None（见 CONVERT_EXECUTORS）
+    """
+    if executor not in CONVERT_EXECUTORS:
+        raise ValueError(f'Unknown executor {executor!r}, expected one of {CONVERT_EXECUTORS}')
+    sources = list(sources)
+    jobs = resolve_jobs(jobs, len(sources))
+    if executor is None or jobs == 1:
+        return (convert_source(name, code, symbol_table) for name, code in sources)
+    return iter_completed(sources, symbol_table, jobs, executor)
+
+
+def iter_completed(sources, symbol_table, jobs, executor):
+    """在线程池或进程池中翻译，谁先完成先返回谁；迭代提前结束时取消尚未开始的任务"""
+    if executor == 'process':
+        # 基础符号表在每个工作进程启动时传入一次
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=init_build_worker,
+                                   initargs=(dict(symbol_table), 'utf-8', None))
+        futures = [pool.submit(convert_worker, source) for source in sources]
+    else:
+        pool = ThreadPoolExecutor(max_workers=jobs)
+        futures = [pool.submit(convert_source, name, code, symbol_table) for name, code in sources]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def format_build_report(results, elapsed, jobs):
+    """生成构建报告：每个文件的耗时和整体吞吐量"""
+    lines = []
+    width = len(str(len(results)))
+    for index, result in enumerate(results, 1):
+        status = f'FAILED {result.error}' if result.error else f'-> {result.unit.output_file}'
+        lines.append(f'[{index:>{width}}/{len(results)}] {result.seconds * 1e3:8.1f} ms  {result.unit.input_file} {status}')
+    failed = sum(1 for result in results if result.error)
+    throughput = len(results) / elapsed if elapsed > 0 else 0.0
+    lines.append(f'Built {len(results) - failed}/{len(results)} files in {elapsed:.2f} s '
+                 f'({throughput:.1f} files/sec, {jobs} workers)')
+    return '\n'.join(lines)
@@ -0,0 +1,495 @@
+# C 头文件符号提取
+
+import re
+
+
+# 词法单元的种类
+TOKEN_IDENTIFIER = 'id'
+TOKEN_NUMBER = 'num'
+TOKEN_STRING = 'str'
+TOKEN_PUNCT = 'punct'
+TOKEN_DIRECTIVE = 'directive'
+
+# 一个正则覆盖全部词法规则，finditer 对整个文件只扫描一遍；
+# 分组按出现频率排列，空白和注释合并为一个跳过分组，预处理指令（包括续行）作为一个整体
+C_TOKEN_PATTERN = re.compile(r'''
+    (?P<id>[A-Za-z_]\w*)
+  | (?P<skip>(?:[ \t\r\f\v]+|\\\n|//[^\n]*|/\*.*?\*/)+)
+  | (?P<num>\.?\d(?:[eEpP][+-]|[\w.])*)
+  | (?P<punct>[][(){};,*]|\.\.\.|->|<<=|>>=|[-+*/%&|^!=<>]=|&&|\|\||\+\+|--|<<|>>|[.:?~/%&|^!=<>+-])
+  | (?P<newline>\n)
+  | (?P<str>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<directive>\#(?:[^\n\\]|\\.|\\\n)*)
+  | (?P<other>.)
+''', re.S | re.X)
+
+DEFINE_PATTERN = re.compile(r'#\s*define\s+([A-Za-z_]\w*)(\()?')
+
+STORAGE_CLASSES = {'extern', 'static', 'register', 'auto', '_Thread_local', 'thread_local', '__thread'}
+TYPE_QUALIFIERS = {'const', 'volatile', 'restrict', '_Atomic'}
+# 不影响符号类型的说明符，直接跳过
+IGNORED_SPECIFIERS = {
+    'inline', '__inline', '__inline__', '_Noreturn', '__extension__', '__restrict', '__restrict__',
+    '__const', '__volatile__', '__signed__', '__cdecl', '__stdcall', '__fastcall',
+}
+# 后面跟着括号参数、整体跳过的扩展语法
+PAREN_EXTENSIONS = {'__attribute__', '__attribute', '__declspec', '__asm__', '__asm', 'asm', '_Alignas', 'alignas'}
+BASIC_TYPES = {
+    'void', 'char', 'short', 'int', 'long', 'float', 'double', 'signed', 'unsigned',
+    '_Bool', 'bool', '_Complex', '_Imaginary', '__int128', '__builtin_va_list',
+}
+TAG_KEYWORDS = {'struct', 'union', 'enum'}
+BRACKET_PAIRS = {'(': ')', '[': ']', '{': '}'}
+END_TOKEN = (None, None)
+
+
+def tokenize_c(content):
+    """把 C 源码切分为 (种类, 文本) 序列的生成器
+
+    预处理指令只在行首识别，返回的指令文本包含续行；注释和空白不返回。
+    """
+    at_line_start = True
+    for match in C_TOKEN_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind == 'skip':
+            continue
+        if kind == 'newline':
+            at_line_start = True
+            continue
+        text = match.group()
+        if kind == 'directive':
+            if at_line_start:
+                yield TOKEN_DIRECTIVE, text
+                continue
+            # 不在行首的 # 只是普通符号，其余部分重新切分
+            yield TOKEN_PUNCT, '#'
+            yield from tokenize_c(text[1:])
+            at_line_start = False
+            continue
+        at_line_start = False
+        if kind == 'other':
+            kind = TOKEN_PUNCT
+        yield kind, text
+
+
+def join_tokens(texts):
+    """把词法单元文本拼回表达式，只在两个标识符或数字之间保留空格"""
+    result = ''
+    for text in texts:
+        if result and (result[-1].isalnum() or result[-1] == '_') and (text[0].isalnum() or text[0] == '_'):
+            result += ' '
+        result += text
+    return result
+
+
+class Declarator:
+    """一个声明符解析结果"""
+
+    def __init__(self):
+        self.name = None
+        self.pointer_depth = 0
+        self.arrays = []
+        self.is_function = False  # 函数声明，如 int f(void)
+        self.is_function_pointer = False  # 函数指针，如 void (*f)(int)
+
+
+class CSymbolExtractor:
+    """C 声明解析器
+
+    单遍扫描词法单元流，识别文件作用域内的结构体/联合体（包括成员）、typedef、
+    枚举常量、函数原型和定义、全局变量以及 #define 宏，按与 Python 辅助文件相同的
+    结构写入符号表：
+      struct   : {'type': 'struct', 'members': {成员: {'type', 'is_pointer'}}}
+      function : {'type': 'function'}
+      variable : {'type': 'variable', 'declared_type', 'is_pointer'}
+    函数体被整体跳过，其中的调用和局部变量不会被当作全局符号。
+    """
+
+    def __init__(self, symbol_table):
+        """初始化解析器
+
+        Args:
+            symbol_table: 要写入的符号表
+        """
+        self.SymbolTable = symbol_table
+        self.TypedefNames = set()
+        self.TypedefStructs = {}  # typedef 名称 -> 结构体成员，用于 typedef 的再次 typedef
+        self.Tokens = None
+        self.Buffer = []
+
+    # 词法单元流操作
+
+    def Peek(self, offset=0):
+        """查看后面第 offset 个词法单元，没有时返回 (None, None)"""
+        buffer = self.Buffer
+        if len(buffer) > offset:
+            return buffer[offset]
+        while len(buffer) <= offset:
+            token = next(self.Tokens, None)
+            if token is None:
+                return END_TOKEN
+            buffer.append(token)
+        return buffer[offset]
+
+    def Next(self):
+        """取出下一个词法单元"""
+        if self.Buffer:
+            return self.Buffer.pop(0)
+        return next(self.Tokens, END_TOKEN)
+
+    def PeekText(self, offset=0):
+        """查看后面第 offset 个词法单元的文本"""
+        return self.Peek(offset)[1]
+
+    def SkipBalanced(self):
+        """跳过一对括号（( [ {）及其中的内容，返回内部词法单元的文本列表"""
+        opener = self.Next()[1]
+        closer = BRACKET_PAIRS[opener]
+        depth = 1
+        inner = []
+        # 先消耗预读缓冲，其余直接从词法单元流中读取，函数体等大块内容走这条快速路径
+        while self.Buffer:
+            kind, text = self.Buffer.pop(0)
+            if kind == TOKEN_PUNCT:
+                if text == opener:
+                    depth += 1
+                elif text == closer:
+                    depth -= 1
+                    if not depth:
+                        return inner
+            inner.append(text)
+        for kind, text in self.Tokens:
+            if kind == TOKEN_PUNCT:
+                if text == opener:
+                    depth += 1
+                elif text == closer:
+                    depth -= 1
+                    if not depth:
+                        break
+            inner.append(text)
+        return inner
+
+    def SkipStatement(self):
+        """出错恢复：跳到当前语句的 ; 或者花括号块之后"""
+        while True:
+            kind, text = self.Peek()
+            if kind is None:
+                return
+            if text == ';':
+                self.Next()
+                return
+            if text in ('(', '['):
+                self.SkipBalanced()
+            elif text == '{':
+                self.SkipBalanced()
+                if self.PeekText() == ';':
+                    self.Next()
+                return
+            elif kind == TOKEN_DIRECTIVE:
+                return
+            else:
+                self.Next()
+
+    def SkipExtensions(self):
+        """跳过 __attribute__((...))、__asm__(...) 等扩展语法"""
+        while self.PeekText() in PAREN_EXTENSIONS:
+            self.Next()
+            if self.PeekText() == '(':
+                self.SkipBalanced()
+
+    # 解析
+
+    def Parse(self, content):
+        """解析 C 源码并把符号写入符号表"""
+        self.Tokens = tokenize_c(content)
+        self.Buffer = []
+        while True:
+            kind, text = self.Peek()
+            if kind is None:
+                break
+            if kind == TOKEN_DIRECTIVE:
+                self.Next()
+                self.ParseDirective(text)
+            elif text in (';', '}'):
+                # 空语句，或者 extern "C" { ... } 的结束括号
+                self.Next()
+            elif text == 'extern' and self.Peek(1)[0] == TOKEN_STRING:
+                # extern "C" 链接说明，花括号块按文件作用域继续解析
+                self.Next()
+                self.Next()
+                if self.PeekText() == '{':
+                    self.Next()
+            else:
+                self.ParseExternalDeclaration()
+        return self.SymbolTable
+
+    def ParseDirective(self, text):
+        """处理预处理指令，只关心 #define"""
+        match = DEFINE_PATTERN.match(text)
+        if not match:
+            return
+        name = match.group(1)
+        if match.group(2):
+            # 函数式宏按函数处理
+            self.SymbolTable[name] = {'type': 'function'}
+        else:
+            self.SymbolTable[name] = {'type': 'variable', 'declared_type': '#define', 'is_pointer': False}
+
+    def ParseSpecifiers(self):
+        """解析声明说明符
+
+        Returns:
+            (是否 typedef, 类型文字列表, 结构体成员或 None)
+        """
+        is_typedef = False
+        words = []
+        members = None
+        has_type = False
+        while True:
+            kind, text = self.Peek()
+            if kind != TOKEN_IDENTIFIER:
+                break
+            if text == 'typedef':
+                is_typedef = True
+                self.Next()
+            elif text in STORAGE_CLASSES or text in TYPE_QUALIFIERS:
+                words.append(text)
+                self.Next()
+            elif text in IGNORED_SPECIFIERS:
+                self.Next()
+            elif text in PAREN_EXTENSIONS:
+                self.SkipExtensions()
+            elif text in BASIC_TYPES:
+                words.append(text)
+                has_type = True
+                self.Next()
+            elif text in TAG_KEYWORDS:
+                tag_words, members = self.ParseTagSpecifier()
+                words.extend(tag_words)
+                has_type = True
+            elif not has_type and (text in self.TypedefNames or self.Peek(1)[0] == TOKEN_IDENTIFIER
+                                   or self.PeekText(1) == '*'):
+                # typedef 名称（或未知的类型名）
+                words.append(text)
+                has_type = True
+                if text in self.TypedefStructs:
+                    members = self.TypedefStructs[text]
+                self.Next()
+            else:
+                break
+        return is_typedef, words, members
+
+    def ParseTagSpecifier(self):
+        """解析 struct/union/enum 说明符，有定义体时登记结构体或枚举常量
+
+        Returns:
+            (类型文字列表, 结构体成员或 None)
+        """
+        keyword = self.Next()[1]
+        self.SkipExtensions()
+        tag = None
+        if self.Peek()[0] == TOKEN_IDENTIFIER:
+            tag = self.Next()[1]
+            self.SkipExtensions()
+        members = None
+        if self.PeekText() == '{':
+            if keyword == 'enum':
+                self.ParseEnumBody(tag)
+            else:
+                members = self.ParseStructBody()
+                if tag:
+                    self.SymbolTable[tag] = {'type': 'struct', 'members': members}
+        elif tag and keyword != 'enum':
+            entry = self.SymbolTable.get(tag)
+            if entry is not None and entry.get('type') == 'struct':
+                members = entry.get('members')
+        # 联合体与结构体使用相同的成员访问方式，类型名保留原关键字
+        words = [keyword, tag] if tag else [keyword]
+        return words, members
+
+    def ParseEnumBody(self, tag):
+        """解析枚举体，每个枚举常量登记为变量"""
+        self.Next()
+        declared_type = f'enum {tag}' if tag else 'int'
+        while True:
+            kind, text = self.Peek()
+            if kind is None:
+                return
+            if text == '}':
+                self.Next()
+                return
+            if kind == TOKEN_IDENTIFIER:
+                self.Next()
+                self.SymbolTable[text] = {'type': 'variable', 'declared_type': declared_type, 'is_pointer': False}
+                # 跳过 = 表达式，直到 , 或 }
+                while self.PeekText() not in (',', '}', None):
+                    if self.PeekText() in ('(', '[', '{'):
+                        self.SkipBalanced()
+                    else:
+                        self.Next()
+                if self.PeekText() == ',':
+                    self.Next()
+            else:
+                self.Next()
+
+    def ParseStructBody(self):
+        """解析结构体/联合体的成员列表，返回成员字典"""
+        self.Next()
+        members = {}
+        while True:
+            kind, text = self.Peek()
+            if kind is None:
+                return members
+            if text == '}':
+                self.Next()
+                return members
+            if text == ';' or kind == TOKEN_DIRECTIVE:
+                self.Next()
+                continue
+            _, words, nested_members = self.ParseSpecifiers()
+            if not words:
+                self.SkipStatement()
+                continue
+            if self.PeekText() == ';':
+                # 匿名结构体/联合体成员，其成员直接属于外层
+                self.Next()
+                if nested_members:
+                    members.update(nested_members)
+                continue
+            while True:
+                declarator = self.ParseDeclarator()
+                if self.PeekText() == ':':
+                    # 位域
+                    self.Next()
+                    while self.PeekText() not in (',', ';', '}', None):
+                        self.Next()
+                if declarator.name:
+                    members[declarator.name] = {
+                        'type': self.FormatType([word for word in words if word not in STORAGE_CLASSES], declarator),
+                        'is_pointer': declarator.pointer_depth > 0 or declarator.is_function_pointer,
+                    }
+                if self.PeekText() == ',':
+                    self.Next()
+                    continue
+                break
+            if self.PeekText() == ';':
+                self.Next()
+            elif self.PeekText() != '}':
+                self.SkipStatement()
+
+    def ParseDeclarator(self):
+        """解析声明符：指针、名称（或括号内的声明符）、数组和参数列表"""
+        declarator = Declarator()
+        while True:
+            text = self.PeekText()
+            if text == '*':
+                declarator.pointer_depth += 1
+                self.Next()
+            elif text in TYPE_QUALIFIERS or text in IGNORED_SPECIFIERS:
+                self.Next()
+            elif text in PAREN_EXTENSIONS:
+                self.SkipExtensions()
+            else:
+                break
+        inner = None
+        kind, text = self.Peek()
+        if kind == TOKEN_IDENTIFIER:
+            declarator.name = text
+            self.Next()
+        elif text == '(' and self.PeekText(1) in ('*', '^', '('):
+            # 括号内的声明符，如 (*handler) 或 (*table)[4]
+            self.Next()
+            inner = self.ParseDeclarator()
+            if self.PeekText() == ')':
+                self.Next()
+        while True:
+            text = self.PeekText()
+            if text == '[':
+                declarator.arrays.append(join_tokens(self.SkipBalanced()))
+            elif text == '(':
+                self.SkipBalanced()
+                if inner is None and not declarator.arrays:
+                    declarator.is_function = True
+            else:
+                break
+        self.SkipExtensions()
+        if inner is not None:
+            # 函数指针或数组指针：按指针变量处理
+            declarator.name = inner.name
+            declarator.is_function_pointer = inner.pointer_depth > 0 or inner.is_function_pointer
+            declarator.pointer_depth += inner.pointer_depth
+            declarator.arrays = inner.arrays + declarator.arrays
+            declarator.is_function = inner.is_function
+        return declarator
+
+    def FormatType(self, words, declarator):
+        """生成与 GetTypeName 风格一致的类型字符串，如 'extern struct SHEET*'、'char[0x80]'"""
+        type_name = ' '.join(words) + '*' * declarator.pointer_depth
+        for size in declarator.arrays:
+            type_name += f'[{size}]'
+        return type_name
+
+    def ParseExternalDeclaration(self):
+        """解析文件作用域内的一条声明或函数定义"""
+        is_typedef, words, members = self.ParseSpecifiers()
+        if self.PeekText() == ';':
+            # 只有说明符，如 struct X { ... };
+            self.Next()
+            return
+        if not words and self.Peek()[0] != TOKEN_IDENTIFIER and self.PeekText() not in ('*', '('):
+            self.SkipStatement()
+            return
+        while True:
+            declarator = self.ParseDeclarator()
+            if declarator.name is None:
+                self.SkipStatement()
+                return
+            if is_typedef:
+                self.TypedefNames.add(declarator.name)
+                if members is not None and not declarator.pointer_depth and not declarator.arrays:
+                    self.TypedefStructs[declarator.name] = members
+                    self.SymbolTable[declarator.name] = {'type': 'struct', 'members': members}
+            elif declarator.is_function:
+                self.SymbolTable[declarator.name] = {'type': 'function'}
+                if self.PeekText() == '{':
+                    # 函数定义，跳过函数体
+                    self.SkipBalanced()
+                    return
+            else:
+                self.SymbolTable[declarator.name] = {
+                    'type': 'variable',
+                    'declared_type': self.FormatType(words, declarator),
+                    'is_pointer': declarator.pointer_depth > 0 or declarator.is_function_pointer,
+                }
+            if self.PeekText() == '=':
+                # 跳过初始化表达式
+                self.Next()
+                while self.PeekText() not in (',', ';', None):
+                    if self.PeekText() in ('(', '[', '{'):
+                        self.SkipBalanced()
+                    else:
+                        self.Next()
+            text = self.PeekText()
+            if text == ',':
+                self.Next()
+                continue
+            if text == ';':
+                self.Next()
+            else:
+                self.SkipStatement()
+            return
+
+
+def extract_c_symbols(content, symbol_table=None):
+    """从 C 源码或头文件中提取符号
+
+    Args:
+        content: C 源码
+        symbol_table: 要写入的符号表，None 时新建
+
+    Returns:
+        写入后的符号表
+    """
+    if symbol_table is None:
+        symbol_table = {}
+    return CSymbolExtractor(symbol_table).Parse(content)
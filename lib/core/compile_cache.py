@@ -0,0 +1,221 @@
+# 编译结果缓存：生成的C代码、本地头文件、编译器和编译标志都没有变化时不再调用编译器
+
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import threading
+
+from lib.constants.config import CACHE_DIR, COMPILE_CACHE_SUBDIR
+from lib.core.incremental import write_entry
+
+# #include "..." 形式的本地头文件；<...> 形式的系统头文件不参与计算
+LOCAL_INCLUDE = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*"([^"]+)"', re.MULTILINE)
+STATS_FILE = 'stats.json'
+# 会改变头文件查找路径的编译选项（按编译器的查找顺序排列）和环境变量
+INCLUDE_OPTIONS = ('-iquote', '-I', '-isystem', '-idirafter')
+INCLUDE_ENVIRONMENT = ('CPATH', 'C_INCLUDE_PATH')
+# 引入其它输入文件的选项：库和库目录、链接脚本、强制包含的头文件、传给链接器的参数等，
+# 这些文件的内容不在缓存键中
+INPUT_OPTIONS = ('-l', '-L', '-T', '-B', '-include', '-imacros', '-Wl,', '-Xlinker', '-specs')
+# 其后跟一个单独参数、且该参数不是输入文件的选项
+ARGUMENT_OPTIONS = (*INCLUDE_OPTIONS, '-D', '-U', '-x')
+
+
+def include_dirs(compile_flags):
+    """本地头文件的查找目录：编译标志中的 -iquote、-I、-isystem，环境变量 CPATH 等，最后是 -idirafter"""
+    found = {option: [] for option in INCLUDE_OPTIONS}
+    args = shlex.split(compile_flags) if compile_flags else []
+    for index, arg in enumerate(args):
+        for option in INCLUDE_OPTIONS:
+            if arg == option and index + 1 < len(args):
+                found[option].append(args[index + 1])
+            elif arg.startswith(option) and len(arg) > len(option):
+                found[option].append(arg[len(option):])
+    dirs = found['-iquote'] + found['-I'] + found['-isystem']
+    for name in INCLUDE_ENVIRONMENT:
+        dirs.extend(directory for directory in os.environ.get(name, '').split(os.pathsep) if directory)
+    return dirs + found['-idirafter']
+
+
+def flags_have_inputs(compile_flags):
+    """编译标志是否引入了其它输入文件
+
+    .c/.o/.a 等操作数、@ 响应文件以及 INPUT_OPTIONS 中的选项都算。
+    """
+    args = shlex.split(compile_flags) if compile_flags else []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in ARGUMENT_OPTIONS:
+            skip = True
+        elif not arg.startswith('-') or arg.startswith(INPUT_OPTIONS):
+            return True
+    return False
+
+
+def hash_includes(digest, data, source_dir, search_dirs, seen):
+    """把 data 中引用的本地头文件（递归）的名称和内容加入摘要
+
+    查找顺序与编译器一致：先在包含它的文件所在目录，再按 include_dirs 的顺序。
+
+    Returns:
+        全部本地头文件都找到时为 True。找不到的头文件可能来自编译器默认的查找目录，
+        修改后无法发现，这样的编译结果不能缓存。
+    """
+    resolved = True
+    for match in LOCAL_INCLUDE.finditer(data):
+        name = match.group(1).decode('utf-8', 'replace')
+        digest.update(b'include\0' + name.encode('utf-8') + b'\0')
+        for directory in [source_dir, *search_dirs]:
+            path = os.path.normpath(os.path.join(directory, name))
+            try:
+                with open(path, 'rb') as f:
+                    header = f.read()
+            except OSError:
+                continue
+            digest.update(path.encode('utf-8') + b'\0')
+            if path not in seen:
+                seen.add(path)
+                digest.update(hashlib.sha256(header).digest())
+                resolved &= hash_includes(digest, header, os.path.dirname(path), search_dirs, seen)
+            break
+        else:
+            resolved = False
+    return resolved
+
+
+def compiler_identity(compile_command):
+    """编译器的标识：命令本身，加上可执行文件的路径、修改时间和大小
+
+    与 ccache 默认的 compiler_check=mtime 相同，升级编译器后旧的缓存条目自然失效，
+    又不必每次都运行一遍 --version。
+    """
+    args = shlex.split(compile_command) if compile_command else []
+    identity = [compile_command or '']
+    program = shutil.which(args[0]) if args else None
+    if program:
+        stat = os.stat(program)
+        identity.append(f'{os.path.realpath(program)}\0{stat.st_mtime_ns}\0{stat.st_size}')
+    return '\0'.join(identity)
+
+
+class CompileCache:
+    """编译出的可执行文件的磁盘缓存（与 ccache 相似）
+
+    以生成的C代码、它引用的本地头文件、编译器标识、编译标志和头文件查找路径环境变量的哈希为键，
+    保存编译成功得到的可执行文件和编译耗时。命中时直接复制可执行文件，不再调用编译器。
+    有本地头文件找不到时（可能在编译器默认的查找目录中），或者编译标志引入了其它源文件、库、
+    链接脚本等输入文件时不使用缓存。
+    命中、未命中、不能缓存的次数和节省的编译时间记在对象上，Flush 时一次累加到缓存目录的 stats.json 中。
+    """
+
+    def __init__(self, cache_dir=None):
+        """初始化编译缓存
+
+        Args:
+            cache_dir: 缓存根目录，默认为当前目录下的 CACHE_DIR
+        """
+        self.CacheDir = os.path.join(cache_dir or CACHE_DIR, COMPILE_CACHE_SUBDIR)
+        self.Hits = 0
+        self.Misses = 0
+        self.Uncacheable = 0
+        self.SavedSeconds = 0.0
+        self.Pending = {'hits': 0, 'misses': 0, 'uncacheable': 0, 'saved_seconds': 0.0}  # 尚未写入 stats.json 的统计
+
+    def MakeKey(self, c_file, compile_command, compile_flags):
+        """根据C源文件（含本地头文件）、编译器标识和编译标志生成缓存键
+
+        Returns:
+            缓存键；有本地头文件找不到或编译标志引入了其它输入文件、编译结果不能缓存时返回 None
+        """
+        if flags_have_inputs(compile_flags):
+            self.Uncacheable += 1
+            self.Pending['uncacheable'] += 1
+            return None
+        with open(c_file, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256()
+        digest.update(compiler_identity(compile_command).encode('utf-8') + b'\0')
+        digest.update((compile_flags or '').encode('utf-8') + b'\0')
+        for name in INCLUDE_ENVIRONMENT:
+            digest.update(f'{name}={os.environ.get(name, "")}\0'.encode('utf-8'))
+        digest.update(hashlib.sha256(data).digest())
+        if not hash_includes(digest, data, os.path.dirname(os.path.abspath(c_file)),
+                             include_dirs(compile_flags), set()):
+            self.Uncacheable += 1
+            self.Pending['uncacheable'] += 1
+            return None
+        return digest.hexdigest()
+
+    def EntryPath(self, key):
+        """缓存的可执行文件路径，同名的 .json 文件保存编译耗时"""
+        return os.path.join(self.CacheDir, key[:2], key + '.exe')
+
+    def Lookup(self, key, output_file):
+        """命中时把缓存的可执行文件复制到 output_file，返回当初的编译耗时（秒），否则返回 None"""
+        path = self.EntryPath(key)
+        try:
+            with open(path[:-4] + '.json', 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            shutil.copy2(path, output_file)
+        except (OSError, ValueError):
+            self.Misses += 1
+            self.Pending['misses'] += 1
+            return None
+        seconds = entry.get('seconds', 0.0)
+        self.Hits += 1
+        self.SavedSeconds += seconds
+        self.Pending['hits'] += 1
+        self.Pending['saved_seconds'] += seconds
+        return seconds
+
+    def Store(self, key, output_file, seconds):
+        """缓存编译成功得到的可执行文件
+
+        先复制到临时文件再替换，并行的测试不会读到不完整的可执行文件；
+        耗时条目在可执行文件之后写入，Lookup 以它的存在作为条目完整的标志。
+        """
+        path = self.EntryPath(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            shutil.copy2(output_file, temp_path)
+            os.replace(temp_path, path)
+            write_entry(path[:-4] + '.json', {'seconds': seconds})
+        except OSError as e:
+            print(f'Warning: Failed to write compile cache {path}: {e}')
+
+    def Stats(self):
+        """累计的统计（stats.json 加上尚未写入的部分）：{'hits', 'misses', 'uncacheable', 'saved_seconds'}"""
+        try:
+            with open(os.path.join(self.CacheDir, STATS_FILE), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {}
+        return {name: stored.get(name, 0) + value for name, value in self.Pending.items()}
+
+    def Flush(self):
+        """把尚未写入的统计累加到 stats.json；并发更新时可能丢失个别计数，只用于报告"""
+        if not any(self.Pending.values()):
+            return
+        stats = self.Stats()
+        stats['saved_seconds'] = round(stats['saved_seconds'], 6)
+        try:
+            write_entry(os.path.join(self.CacheDir, STATS_FILE), stats)
+        except OSError:
+            return
+        self.Pending = dict.fromkeys(self.Pending, 0)
+        self.Pending['saved_seconds'] = 0.0
+
+    def Report(self):
+        """一行统计：本次和累计的命中情况"""
+        stats = self.Stats()
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] * 100.0 / lookups if lookups else 0.0
+        return (f'Compile cache: hits={self.Hits}, misses={self.Misses}, uncacheable={self.Uncacheable}; '
+                f'total hits={stats["hits"]}, misses={stats["misses"]}, hit rate={hit_rate:.1f}%, '
+                f'saved {stats["saved_seconds"]:.2f} s')
@@ -0,0 +1,90 @@
+# C 代码输出
+
+
+INDENT_UNIT = '    '
+
+
+class IndentedCode:
+    """缩进若干层的代码块
+
+    Handle 方法返回的代码行列表中可以包含 IndentedCode，表示其中的行
+    （以及嵌套的块）相对外层再缩进 levels 层。块只保存对原列表的引用，
+    嵌套多少层都不会复制行，缩进在 CodeEmitter 写出时一次性加上。
+    """
+
+    __slots__ = ('Lines', 'Levels', 'LineCount')
+
+    def __init__(self, lines, levels=1):
+        self.Lines = lines
+        self.Levels = levels
+        self.LineCount = count_code_lines(lines)
+
+
+def count_code_lines(code):
+    """统计代码行列表展开后的行数（嵌套块使用已经算好的行数）"""
+    count = 0
+    for item in code:
+        count += item.LineCount if isinstance(item, IndentedCode) else 1
+    return count
+
+
+class CodeEmitter:
+    """按缩进深度把代码行直接写入文本流
+
+    行与行之间用换行分隔，最后一行后面不加换行，写出的内容与
+    '\\n'.join 展开后的代码行完全相同。
+    """
+
+    def __init__(self, stream, indent_unit=INDENT_UNIT):
+        """初始化输出器
+
+        Args:
+            stream: 输出目标（io.TextIOBase，如打开的文件或 io.StringIO）
+            indent_unit: 每层缩进的字符串
+        """
+        self.Stream = stream
+        self.IndentUnit = indent_unit
+        self.Depth = 0
+        self.Prefixes = ['']  # 各深度的缩进前缀
+        self.Started = False
+        self.LineCount = 0  # 已写出的行数
+
+    def Prefix(self, depth):
+        """获取指定深度的缩进前缀"""
+        while len(self.Prefixes) <= depth:
+            self.Prefixes.append(self.Prefixes[-1] + self.IndentUnit)
+        return self.Prefixes[depth]
+
+    def Line(self, text):
+        """按当前深度写出一行"""
+        if self.Started:
+            self.Stream.write('\n')
+        else:
+            self.Started = True
+        self.LineCount += 1
+        self.Stream.write(self.Prefix(self.Depth) + text)
+
+    def Emit(self, code):
+        """写出代码行列表，遇到 IndentedCode 时加深缩进后递归写出"""
+        for item in code:
+            if isinstance(item, IndentedCode):
+                self.Depth += item.Levels
+                try:
+                    self.Emit(item.Lines)
+                finally:
+                    self.Depth -= item.Levels
+            else:
+                self.Line(item)
+
+
+def flatten_code(code, prefix='', lines=None):
+    """把包含 IndentedCode 的代码行列表展开为带缩进的字符串列表"""
+    if lines is None:
+        lines = []
+    for item in code:
+        if isinstance(item, IndentedCode):
+            flatten_code(item.Lines, prefix + INDENT_UNIT * item.Levels, lines)
+        else:
+            lines.append(prefix + item)
+    return lines
+
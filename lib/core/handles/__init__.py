@@ -2,7 +2,8 @@
 Handles 包 - 使用 Mixin 模式组织 Handle 函数
 """
 
-from .base import debug_handle, HandleMixin
+from lib.core.tracing import debug_handle
+from .base import HandleMixin
 from .imports import ImportMixin
 from .functions import FunctionMixin
 from .classes import ClassMixin
@@ -0,0 +1,254 @@
+# 增量翻译缓存
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import MutableMapping
+
+from lib.constants.config import CACHE_DIR, DEFINITION_CACHE_SUBDIR, SYMBOL_CACHE_SUBDIR
+
+
+LIB_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ToolFingerprint = None
+
+
+def tool_fingerprint():
+    """计算翻译器自身的指纹
+
+    对 lib 目录下所有 .py 源文件的内容求哈希，任何转换逻辑或 t/c 类型定义的
+    修改都会使之前写入的缓存条目失效。结果在进程内只计算一次。
+    """
+    global _ToolFingerprint
+    if _ToolFingerprint is None:
+        digest = hashlib.sha256()
+        for dir_path, dir_names, file_names in os.walk(LIB_ROOT):
+            dir_names[:] = sorted(d for d in dir_names if d != '__pycache__')
+            for file_name in sorted(file_names):
+                if not file_name.endswith('.py'):
+                    continue
+                file_path = os.path.join(dir_path, file_name)
+                digest.update(os.path.relpath(file_path, LIB_ROOT).encode('utf-8'))
+                with open(file_path, 'rb') as f:
+                    digest.update(f.read())
+        _ToolFingerprint = digest.hexdigest()
+    return _ToolFingerprint
+
+
+def digest_value(value):
+    """计算符号表条目的摘要，不存在的条目返回 None"""
+    if value is None:
+        return None
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class RecordingTable(MutableMapping):
+    """记录读写的符号表覆盖层
+
+    翻译单个定义时临时替换 Translator 上的 SymbolTable/FunctionReturnTypes，
+    记录它读取了哪些键、写入了哪些值；遍历整个表（items/keys 等）时记为读取全部。
+    读取时先查本次的写入再查原始表，写入只保存在 Writes 中，不复制原始表，
+    开销与定义实际读写的条目数成正比。
+    依赖按翻译开始前的原始表计算：定义自身的写入由源码决定，不需要记录。
+    """
+
+    def __init__(self, original):
+        self.Original = original
+        self.Reads = set()
+        self.ReadAll = False
+        self.Writes = {}
+
+    def __getitem__(self, key):
+        self.Reads.add(key)
+        if key in self.Writes:
+            return self.Writes[key]
+        return self.Original[key]
+
+    def __contains__(self, key):
+        self.Reads.add(key)
+        return key in self.Writes or key in self.Original
+
+    def get(self, key, default=None):
+        self.Reads.add(key)
+        if key in self.Writes:
+            return self.Writes[key]
+        return self.Original.get(key, default)
+
+    def __setitem__(self, key, value):
+        self.Writes[key] = value
+
+    def __delitem__(self, key):
+        # 翻译过程中只会添加或覆盖符号，删除无法回放
+        raise TypeError('RecordingTable does not support deleting symbols')
+
+    def __iter__(self):
+        self.ReadAll = True
+        yield from self.Original
+        for key in self.Writes:
+            if key not in self.Original:
+                yield key
+
+    def __len__(self):
+        self.ReadAll = True
+        return len(self.Original) + sum(1 for key in self.Writes if key not in self.Original)
+
+    def Dependencies(self):
+        """返回依赖描述：读取全部时为整表摘要，否则为每个读取键的条目摘要"""
+        if self.ReadAll:
+            return {'all': digest_value(self.Original)}
+        return {'keys': {key: digest_value(self.Original.get(key)) for key in self.Reads}}
+
+
+def write_entry(path, value):
+    """把缓存条目写为 JSON 文件
+
+    先写临时文件再替换，避免并发构建读到不完整的条目。
+    """
+    data = json.dumps(value, ensure_ascii=False)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def dependencies_match(dependencies, table):
+    """检查记录的依赖在当前符号表中是否仍然成立"""
+    if 'all' in dependencies:
+        return dependencies['all'] == digest_value(table)
+    for key, value_digest in dependencies['keys'].items():
+        if digest_value(table.get(key)) != value_digest:
+            return False
+    return True
+
+
+class DefinitionCache:
+    """顶层定义的磁盘缓存
+
+    每个条目对应一个顶层函数（或一个类的全部方法），以定义的源码片段和
+    翻译器指纹的哈希为键，保存生成的C代码行、翻译时读取的符号表条目摘要、
+    对符号表的写入以及作用域栈记录的名字解析（ScopeStack.Resolved）。
+    命中时只需校验依赖并回放写入和名字解析，不再重新生成代码。
+    """
+
+    def __init__(self, cache_dir=None):
+        """初始化定义缓存
+
+        Args:
+            cache_dir: 缓存根目录，默认为当前目录下的 CACHE_DIR
+        """
+        self.CacheDir = os.path.join(cache_dir or CACHE_DIR, DEFINITION_CACHE_SUBDIR)
+        self.Hits = 0
+        self.Misses = 0
+
+    def MakeKey(self, handler_name, segment):
+        """根据处理方法名和源码片段生成缓存键"""
+        digest = hashlib.sha256()
+        digest.update(tool_fingerprint().encode('ascii'))
+        digest.update(handler_name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(segment.encode('utf-8'))
+        return digest.hexdigest()
+
+    def EntryPath(self, key):
+        """缓存条目文件路径"""
+        return os.path.join(self.CacheDir, key[:2], key + '.json')
+
+    def Lookup(self, key, tables):
+        """查找缓存条目
+
+        Args:
+            key: MakeKey 生成的键
+            tables: 名称到当前符号表的映射，如 {'SymbolTable': ...}
+
+        Returns:
+            依赖全部成立时返回条目字典，否则返回 None
+        """
+        try:
+            with open(self.EntryPath(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.Misses += 1
+            return None
+        for name, dependencies in entry['deps'].items():
+            if not dependencies_match(dependencies, tables[name]):
+                self.Misses += 1
+                return None
+        self.Hits += 1
+        return entry
+
+    def Store(self, key, code, recorders, resolved):
+        """写入缓存条目
+
+        Args:
+            key: MakeKey 生成的键
+            code: 生成的C代码行列表
+            recorders: 名称到 RecordingTable 的映射
+            resolved: 翻译该定义时 ScopeStack 记录的名字解析，{限定名: {名字: 'local'/'global'}}
+        """
+        entry = {
+            'code': code,
+            'deps': {name: recorder.Dependencies() for name, recorder in recorders.items()},
+            'writes': {name: recorder.Writes for name, recorder in recorders.items() if recorder.Writes},
+            'resolved': resolved,
+        }
+        path = self.EntryPath(key)
+        try:
+            write_entry(path, entry)
+        except (OSError, TypeError, ValueError) as e:
+            print(f'Warning: Failed to write definition cache {path}: {e}')
+
+
+class SymbolCache:
+    """辅助文件符号表的磁盘缓存
+
+    以文件内容、解析方式（扩展名）、编码和翻译器指纹的哈希为键，保存单独
+    解析该文件得到的符号表（保持插入顺序）。内容不变的辅助文件命中后直接
+    合并缓存的符号，不再读取 AST 或 C 声明。
+    注册表和批量构建的工作线程共用同一个对象，命中和未命中计数在锁内更新。
+    """
+
+    def __init__(self, cache_dir=None):
+        """初始化符号缓存
+
+        Args:
+            cache_dir: 缓存根目录，默认为当前目录下的 CACHE_DIR
+        """
+        self.CacheDir = os.path.join(cache_dir or CACHE_DIR, SYMBOL_CACHE_SUBDIR)
+        self.Hits = 0
+        self.Misses = 0
+        self.Lock = threading.Lock()
+
+    def MakeKey(self, kind, encoding, data):
+        """根据解析方式、编码和文件内容（bytes）生成缓存键"""
+        digest = hashlib.sha256()
+        digest.update(tool_fingerprint().encode('ascii'))
+        digest.update(f'{kind}\0{encoding}\0'.encode('utf-8'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def EntryPath(self, key):
+        """缓存条目文件路径"""
+        return os.path.join(self.CacheDir, key[:2], key + '.json')
+
+    def Lookup(self, key):
+        """查找缓存的符号表，不存在时返回 None"""
+        try:
+            with open(self.EntryPath(key), 'r', encoding='utf-8') as f:
+                symbols = json.load(f)
+        except (OSError, ValueError):
+            with self.Lock:
+                self.Misses += 1
+            return None
+        with self.Lock:
+            self.Hits += 1
+        return symbols
+
+    def Store(self, key, symbols):
+        """写入单个文件的符号表"""
+        path = self.EntryPath(key)
+        try:
+            write_entry(path, symbols)
+        except (OSError, TypeError, ValueError) as e:
+            print(f'Warning: Failed to write symbol cache {path}: {e}')
@@ -0,0 +1,181 @@
+# 翻译流程各阶段的耗时、CPU 时间和内存峰值统计（-metrics）
+
+import json
+import os
+import time
+import tracemalloc
+
+
+class PhaseMetrics:
+    """一个阶段的统计
+
+    耗时和 CPU 时间不含嵌套在其中的子阶段；内存峰值是阶段期间（含子阶段）
+    tracemalloc 记录的最高占用减去阶段开始时的占用。
+    """
+
+    __slots__ = ('Name', 'Wall', 'Cpu', 'Peak', 'Parent',
+                 'StartWall', 'StartCpu', 'StartMemory', 'ChildWall', 'ChildCpu')
+
+    def __init__(self, name, parent=None):
+        self.Name = name
+        self.Parent = parent
+        self.Wall = 0.0
+        self.Cpu = 0.0
+        self.Peak = 0
+        self.StartWall = 0.0
+        self.StartCpu = 0.0
+        self.StartMemory = 0
+        self.ChildWall = 0.0
+        self.ChildCpu = 0.0
+
+    def ToDict(self):
+        return {
+            'name': self.Name,
+            'parent': self.Parent,
+            'wall_ms': round(self.Wall * 1e3, 3),
+            'cpu_ms': round(self.Cpu * 1e3, 3),
+            'peak_kb': round(self.Peak / 1024, 1),
+        }
+
+
+def cpu_seconds():
+    """本进程和已结束子进程的 CPU 时间（编译器、生成的程序都算在内）"""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+class Metrics:
+    """按阶段记录耗时、CPU 时间和内存峰值，并记录符号数、节点数等计数
+
+    用法:
+        metrics = Metrics()
+        with metrics.Phase('parse'):
+            ...
+        metrics.Count('ast_nodes', n)
+        metrics.Write('out.json')
+
+    内存峰值由 tracemalloc 统计，它会明显拖慢翻译，因此只在 -metrics 时启用；
+    进入和退出每个阶段时先把当前峰值折算到外层阶段再 reset_peak，嵌套阶段互不干扰。
+    """
+
+    def __init__(self, track_memory=True):
+        self.Phases = []
+        self.Counts = {}
+        self.Stack = []
+        self.Start = time.perf_counter()
+        self.StartCpu = cpu_seconds()
+        self.OwnsTracing = False
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.OwnsTracing = True
+        self.TrackMemory = tracemalloc.is_tracing()
+
+    def Phase(self, name):
+        return PhaseContext(self, name)
+
+    def CheckpointMemory(self):
+        """把 tracemalloc 当前的峰值计入栈顶阶段，然后重置峰值"""
+        if not self.TrackMemory:
+            return 0
+        current, peak = tracemalloc.get_traced_memory()
+        if self.Stack:
+            phase = self.Stack[-1]
+            phase.Peak = max(phase.Peak, peak - phase.StartMemory)
+        tracemalloc.reset_peak()
+        return current
+
+    def Enter(self, name):
+        memory = self.CheckpointMemory()
+        phase = PhaseMetrics(name, self.Stack[-1].Name if self.Stack else None)
+        phase.StartMemory = memory
+        phase.StartCpu = cpu_seconds()
+        phase.StartWall = time.perf_counter()
+        self.Stack.append(phase)
+        self.Phases.append(phase)
+
+    def Exit(self):
+        now = time.perf_counter()
+        cpu = cpu_seconds()
+        self.CheckpointMemory()
+        phase = self.Stack.pop()
+        wall = now - phase.StartWall
+        cpu -= phase.StartCpu
+        phase.Wall = wall - phase.ChildWall
+        phase.Cpu = max(cpu - phase.ChildCpu, 0.0)
+        if self.Stack:
+            parent = self.Stack[-1]
+            parent.ChildWall += wall
+            parent.ChildCpu += cpu
+            parent.Peak = max(parent.Peak, phase.Peak + phase.StartMemory - parent.StartMemory)
+
+    def Count(self, name, value):
+        self.Counts[name] = value
+
+    def ToDict(self):
+        return {
+            'phases': [phase.ToDict() for phase in self.Phases],
+            'counts': dict(self.Counts),
+            'total': {
+                'wall_ms': round((time.perf_counter() - self.Start) * 1e3, 3),
+                'cpu_ms': round((cpu_seconds() - self.StartCpu) * 1e3, 3),
+            },
+            'memory_tracked': self.TrackMemory,
+        }
+
+    def Write(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.ToDict(), f, indent=2)
+            f.write('\n')
+
+    def Close(self):
+        """停止由本对象启动的 tracemalloc"""
+        if self.OwnsTracing:
+            tracemalloc.stop()
+            self.OwnsTracing = False
+            self.TrackMemory = False
+
+
+class PhaseContext:
+    """Metrics.Phase 返回的上下文管理器"""
+
+    __slots__ = ('metrics', 'name')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.metrics.Enter(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.Exit()
+        return False
+
+
+class NullPhase:
+    """不记录任何内容的阶段"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class NullMetrics:
+    """未启用 -metrics 时使用，各方法都不做任何事"""
+
+    __slots__ = ()
+    PHASE = NullPhase()
+
+    def Phase(self, name):
+        return self.PHASE
+
+    def Count(self, name, value):
+        pass
+
+
+NULL_METRICS = NullMetrics()
@@ -0,0 +1,227 @@
+# 处理方法性能分析
+
+import ast
+import functools
+import json
+import marshal
+import time
+
+from lib.constants.config import PROFILE_TOP_ENTRIES
+
+# 除 Handle* 方法外需要分析的辅助方法
+PROFILED_HELPERS = ('GetTypeName', 'GetStringQuoteType', 'GetNumericLiteral')
+
+
+class ProfileEntry:
+    """一个 (方法, 节点类型) 的统计"""
+
+    __slots__ = ('Calls', 'PrimitiveCalls', 'SelfTime', 'TotalTime', 'Callers')
+
+    def __init__(self):
+        self.Calls = 0
+        self.PrimitiveCalls = 0  # 不在同一个键的递归调用内部的调用次数
+        self.SelfTime = 0.0  # 扣除被分析的子调用后的耗时
+        self.TotalTime = 0.0  # 累计耗时，递归调用只计最外层
+        self.Callers = {}  # 调用方的键 -> [调用次数, 原始调用次数, 自身耗时, 累计耗时]，与 pstats 中调用方的顺序相同
+
+
+class Profiler:
+    """记录被分析方法的调用次数、自身耗时和累计耗时
+
+    统计按 (方法名, 节点类型) 分组，节点类型取参数中第一个 AST 节点的类型名。
+    进入和退出时维护一个调用栈：子调用的耗时从父调用的自身耗时中扣除，
+    同一个键递归调用时累计耗时只在最外层计入，与 cProfile 的口径一致。
+    """
+
+    def __init__(self, record_events=False):
+        """初始化Profiler对象
+
+        Args:
+            record_events: 是否记录每次进入和退出的时间点（写出 speedscope 文件时需要）
+        """
+        self.Entries = {}
+        self.Locations = {}  # 方法名 -> (源文件, 行号)
+        self.Stack = []  # [键, 开始时间, 子调用耗时]
+        self.Active = {}  # 键 -> 当前嵌套层数
+        self.ActiveEdges = {}  # (调用方的键, 键) -> 当前嵌套层数
+        self.Frames = {}  # 键 -> speedscope 帧序号
+        self.Events = [] if record_events else None
+        self.Start = time.perf_counter()
+
+    def Enter(self, key):
+        now = time.perf_counter()
+        if self.Stack:
+            edge = (self.Stack[-1][0], key)
+            self.ActiveEdges[edge] = self.ActiveEdges.get(edge, 0) + 1
+        self.Stack.append([key, now, 0.0])
+        self.Active[key] = self.Active.get(key, 0) + 1
+        if self.Events is not None:
+            self.Events.append(('O', self.FrameIndex(key), now))
+
+    def Exit(self):
+        now = time.perf_counter()
+        key, start, child_time = self.Stack.pop()
+        elapsed = now - start
+        entry = self.Entries.get(key)
+        if entry is None:
+            entry = self.Entries[key] = ProfileEntry()
+        depth = self.Active[key] - 1
+        self.Active[key] = depth
+        entry.Calls += 1
+        entry.SelfTime += elapsed - child_time
+        if depth == 0:
+            entry.PrimitiveCalls += 1
+            entry.TotalTime += elapsed
+        if self.Stack:
+            caller = self.Stack[-1]
+            caller[2] += elapsed
+            stats = entry.Callers.get(caller[0])
+            if stats is None:
+                stats = entry.Callers[caller[0]] = [0, 0, 0.0, 0.0]
+            # 调用方条目的原始调用与 cProfile 一致：同一对 (调用方, 被调用方) 不在外层调用中
+            edge = (caller[0], key)
+            edge_depth = self.ActiveEdges[edge] - 1
+            self.ActiveEdges[edge] = edge_depth
+            stats[0] += 1
+            stats[2] += elapsed - child_time
+            if edge_depth == 0:
+                stats[1] += 1
+                stats[3] += elapsed
+        if self.Events is not None:
+            self.Events.append(('C', self.FrameIndex(key), now))
+
+    def FrameIndex(self, key):
+        index = self.Frames.get(key)
+        if index is None:
+            index = self.Frames[key] = len(self.Frames)
+        return index
+
+    def Report(self, limit=PROFILE_TOP_ENTRIES):
+        """按自身耗时排序的热点表"""
+        entries = sorted(self.Entries.items(), key=lambda item: item[1].SelfTime, reverse=True)
+        total_self = sum(entry.SelfTime for entry in self.Entries.values())
+        total_calls = sum(entry.Calls for entry in self.Entries.values())
+        lines = [f'=== Profile: {total_calls} calls, {total_self * 1e3:.1f} ms in profiled methods ===',
+                 f'{"self ms":>9} {"self %":>7} {"cum ms":>9} {"calls":>8} {"us/call":>8}  method [node]']
+        for (method, node_type), entry in entries[:limit]:
+            share = entry.SelfTime / total_self * 100 if total_self else 0.0
+            label = f'{method} [{node_type}]' if node_type else method
+            lines.append(f'{entry.SelfTime * 1e3:>9.2f} {share:>6.1f}% {entry.TotalTime * 1e3:>9.2f} '
+                         f'{entry.Calls:>8} {entry.SelfTime / entry.Calls * 1e6:>8.1f}  {label}')
+        if len(entries) > limit:
+            lines.append(f'... {len(entries) - limit} more')
+        return '\n'.join(lines)
+
+    def FunctionKey(self, key):
+        """pstats 中的函数标识 (文件名, 行号, 名称)"""
+        method, node_type = key
+        file_name, line = self.Locations.get(method, ('~', 0))
+        return file_name, line, f'{method}[{node_type}]' if node_type else method
+
+    def WritePstats(self, file_path):
+        """写出可以用 pstats.Stats 或 snakeviz 等工具打开的文件
+
+        与 cProfile 相同，函数条目为 (原始调用次数, 调用次数, 自身耗时, 累计耗时, 调用方)，
+        调用方条目为 (调用次数, 原始调用次数, 自身耗时, 累计耗时)。
+        """
+        stats = {}
+        for key, entry in self.Entries.items():
+            callers = {self.FunctionKey(caller): tuple(values) for caller, values in entry.Callers.items()}
+            stats[self.FunctionKey(key)] = (entry.PrimitiveCalls, entry.Calls,
+                                            entry.SelfTime, entry.TotalTime, callers)
+        with open(file_path, 'wb') as f:
+            marshal.dump(stats, f)
+
+    def WriteSpeedscope(self, file_path):
+        """写出 speedscope 的 evented 格式（需要 record_events=True）"""
+        events = self.Events or []
+        frames = [None] * len(self.Frames)
+        for key, index in self.Frames.items():
+            method, node_type = key
+            file_name, line = self.Locations.get(method, ('~', 0))
+            frames[index] = {'name': f'{method} [{node_type}]' if node_type else method,
+                             'file': file_name, 'line': line}
+        profile = {
+            'type': 'evented',
+            'name': 'TransPyC',
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': (events[-1][2] - self.Start) * 1e3 if events else 0,
+            'events': [{'type': kind, 'frame': frame, 'at': (at - self.Start) * 1e3}
+                       for kind, frame, at in events],
+        }
+        document = {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [profile],
+            'name': 'TransPyC profile',
+            'exporter': 'TransPyC',
+        }
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+
+    def Write(self, file_path):
+        """按扩展名写出：.json 为 speedscope 格式，其他为 pstats 格式"""
+        if file_path.endswith('.json'):
+            self.WriteSpeedscope(file_path)
+        else:
+            self.WritePstats(file_path)
+
+
+def profiled_method_names(cls):
+    """需要分析的方法名：所有 Handle* 方法和 PROFILED_HELPERS"""
+    names = [name for name in dir(cls) if name.startswith('Handle') and callable(getattr(cls, name, None))]
+    names.extend(name for name in PROFILED_HELPERS if hasattr(cls, name))
+    return names
+
+
+def MakeProfiledMethod(obj, name, inner, profiler):
+    """包装实例上当前的方法（可能是调试记录包装），进入和退出时通知 profiler"""
+    enter = profiler.Enter
+    exit_ = profiler.Exit
+
+    @functools.wraps(inner)
+    def wrapper(*args, **kwargs):
+        node_type = ''
+        for arg in args:
+            if isinstance(arg, ast.AST):
+                node_type = type(arg).__name__
+                break
+        enter((name, node_type))
+        try:
+            return inner(*args, **kwargs)
+        finally:
+            exit_()
+    wrapper.Profiler = profiler
+    wrapper.Inner = inner
+    return wrapper
+
+
+def BindProfiledMethods(obj, profiler):
+    """在实例上绑定或移除性能分析包装
+
+    与调试记录一样只在实例上绑定，关闭时类上的方法没有额外开销。
+    已经绑定了调试记录包装的方法在其外层再包一层；已经带有同一个 profiler 包装的方法跳过，
+    因此设置调试文件后可以再次调用本函数补上被替换掉的包装。
+
+    Args:
+        obj: 转换器实例
+        profiler: Profiler，None 时移除包装
+    """
+    cls = type(obj)
+    for name in profiled_method_names(cls):
+        current = obj.__dict__.get(name)
+        wrapper_profiler = getattr(current, 'Profiler', None)
+        if profiler is None:
+            if wrapper_profiler is not None:
+                inner = current.Inner
+                if getattr(inner, '__self__', None) is obj and getattr(inner, '__func__', None) is getattr(cls, name):
+                    del obj.__dict__[name]
+                else:
+                    setattr(obj, name, inner)
+            continue
+        if wrapper_profiler is profiler:
+            continue
+        func = getattr(cls, name)
+        profiler.Locations[name] = (func.__code__.co_filename, func.__code__.co_firstlineno)
+        setattr(obj, name, MakeProfiledMethod(obj, name, getattr(obj, name), profiler))
@@ -0,0 +1,87 @@
+# Python 符号提取
+
+import ast
+import threading
+import types
+
+from lib.constants.config import PARSED_TREE_CACHE_SIZE
+from lib.core.annotations import analyze_annotation
+from lib.core.type_model import c_type
+
+# 源代码 -> AST，按使用顺序淘汰最早的条目
+PARSED_TREES = {}
+# SymbolRegistry 等在工作线程中解析文件，对 PARSED_TREES 的读写需要加锁
+PARSED_TREES_LOCK = threading.Lock()
+
+# 模块节点上保存提取结果的属性名
+SYMBOLS_ATTRIBUTE = 'PythonSymbols'
+
+
+def parse_python(content):
+    """解析 Python 源代码，最近解析过的同一份源代码直接返回已有的 AST
+
+    翻译过程不修改 AST，为提取符号解析的树可以直接用于生成代码。
+    """
+    with PARSED_TREES_LOCK:
+        tree = PARSED_TREES.pop(content, None)
+    if tree is None:
+        tree = ast.parse(content)
+    with PARSED_TREES_LOCK:
+        # 另一个线程同时解析了同一份源代码时，使用先放入的树
+        tree = PARSED_TREES.pop(content, tree)
+        PARSED_TREES[content] = tree
+        while len(PARSED_TREES) > PARSED_TREE_CACHE_SIZE:
+            del PARSED_TREES[next(iter(PARSED_TREES))]
+    return tree
+
+
+def extract_python_symbols(tree, translator):
+    """提取模块顶层的类（结构体及成员）、函数和带注解的全局变量
+
+    只遍历一次顶层节点，类型名称通过 translator.GetTypeName 解析。
+    结果是只读映射，保存在模块节点上，同一棵树（在相同源代码下）再次提取时直接返回。
+
+    Args:
+        tree: 模块 AST
+        translator: 用于解析类型名称的 Translator
+
+    Returns:
+        符号名 -> 符号信息 的只读映射，顺序与定义顺序一致
+    """
+    cached = getattr(tree, SYMBOLS_ATTRIBUTE, None)
+    # 数组大小等字面量按翻译器当前的源代码还原写法，源代码不同时需要重新提取
+    if cached is not None and cached[0] == translator.Content:
+        return cached[1]
+    symbols = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            members = {}
+            for item in node.body:
+                if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
+                    try:
+                        members[item.target.id] = annotated_symbol(translator, item.annotation)
+                    except Exception:
+                        pass
+            symbols[node.name] = {'type': 'struct', 'members': members}
+        elif isinstance(node, ast.FunctionDef):
+            symbols[node.name] = {'type': 'function'}
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            try:
+                member = annotated_symbol(translator, node.annotation)
+            except Exception:
+                member = {'type': 'unknown', 'is_pointer': False}
+            symbols[node.target.id] = {
+                'type': 'variable',
+                'declared_type': member['type'],
+                'is_pointer': member['is_pointer'],
+            }
+    result = types.MappingProxyType(symbols)
+    setattr(tree, SYMBOLS_ATTRIBUTE, (translator.Content, result))
+    return result
+
+
+def annotated_symbol(translator, annotation):
+    """解析注解的类型名称，类型名或注解中包含 t.CPtr 时视为指针"""
+    var_type = translator.GetTypeName(annotation)
+    is_pointer = c_type(var_type).IsPointer or analyze_annotation(annotation).IsPointer
+    return {'type': var_type, 'is_pointer': is_pointer}
@@ -0,0 +1,88 @@
+# 变量作用域
+
+# 撤销记录中表示“进入作用域前没有这个名字”
+UNBOUND = None
+
+
+class ScopeStack:
+    """函数作用域栈
+
+    所有作用域共用一张 名字 -> (类型, 深度) 的扁平映射，内层的绑定直接覆盖外层。
+    每个作用域有一份撤销记录，保存本作用域覆盖掉的旧绑定，离开作用域时按相反顺序恢复。
+    因此查找一个名字总是一次字典访问，与嵌套深度无关。
+
+    同时按函数记录解析到的名字：Resolved[限定名][名字] 为 'local'（作用域中的变量）
+    或 'global'（符号表中的全局符号），供后续分析使用。限定名由调用方给出的名字
+    （方法为 '类名.方法名'）加上外层函数的限定名组成，如 'outer.inner'，
+    不同类中的同名方法、不同函数中的同名嵌套函数各有一份记录。
+    """
+
+    def __init__(self):
+        self.Bindings = {}  # 名字 -> (类型, 所在作用域的深度)
+        self.UndoLogs = []  # 每个作用域一份 [(名字, 旧绑定), ...]
+        self.Owners = []  # 每个作用域所属函数的限定名
+        self.Resolved = {}  # 限定名 -> {名字: 'local' / 'global'}
+
+    def __len__(self):
+        return len(self.UndoLogs)
+
+    def Enter(self, owner):
+        """进入函数 owner 的作用域，owner 为函数名或 '类名.方法名'"""
+        if self.Owners:
+            owner = f'{self.Owners[-1]}.{owner}'
+        self.UndoLogs.append([])
+        self.Owners.append(owner)
+        self.Resolved.setdefault(owner, {})
+
+    def Leave(self):
+        """离开当前作用域，恢复被本作用域覆盖的绑定"""
+        if not self.UndoLogs:
+            return
+        undo_log = self.UndoLogs.pop()
+        self.Owners.pop()
+        for name, previous in reversed(undo_log):
+            if previous is UNBOUND:
+                del self.Bindings[name]
+            else:
+                self.Bindings[name] = previous
+
+    def Bind(self, name, type_name):
+        """在当前作用域中绑定变量类型，没有作用域时忽略"""
+        if not self.UndoLogs:
+            return
+        depth = len(self.UndoLogs)
+        previous = self.Bindings.get(name, UNBOUND)
+        if previous is UNBOUND or previous[1] != depth:
+            # 本作用域第一次绑定该名字时才需要记录旧值，重复绑定直接覆盖
+            self.UndoLogs[-1].append((name, previous))
+        self.Bindings[name] = (type_name, depth)
+
+    def Lookup(self, name):
+        """查找变量类型（内层优先），找不到时返回 None"""
+        binding = self.Bindings.get(name)
+        if binding is None:
+            return None
+        if self.Owners:
+            self.Resolved[self.Owners[-1]][name] = 'local'
+        return binding[0]
+
+    def InCurrent(self, name):
+        """变量是否在当前（最内层）作用域中声明"""
+        binding = self.Bindings.get(name)
+        return binding is not None and binding[1] == len(self.UndoLogs)
+
+    def NoteGlobal(self, name):
+        """记录当前函数从符号表解析到的全局符号"""
+        if self.Owners:
+            self.Resolved[self.Owners[-1]].setdefault(name, 'global')
+
+    def MergeResolved(self, resolved):
+        """合并另一份名字解析记录（如定义缓存命中时回放的记录）
+
+        结果与这些记录在本栈上直接产生时相同：'local' 覆盖已有的记录，'global' 只在没有记录时写入。
+        """
+        for owner, names in resolved.items():
+            target = self.Resolved.setdefault(owner, {})
+            for name, kind in names.items():
+                if kind == 'local' or name not in target:
+                    target[name] = kind
@@ -0,0 +1,314 @@
+# 常驻翻译服务
+
+# 模块顶层只导入客户端需要的标准库，-client 启动时不载入翻译器；
+# 服务端用到的 socketserver、翻译器等在 serve 中才导入。
+import json
+import os
+import socket
+import stat
+import sys
+import time
+from collections import deque
+
+from lib.constants.config import SERVER_CONNECT_TIMEOUT, SERVER_LATENCY_WINDOW
+
+# 一个请求或响应占一行 JSON
+ENCODING = 'utf-8'
+# 不会结束的模式，转发给单线程的服务会阻塞其它客户端（包括 -stop）
+BLOCKING_OPTIONS = ('-serve', '-watch')
+
+
+class WarmHelper:
+    """常驻内存的单个辅助文件符号表"""
+
+    __slots__ = ('mtime_ns', 'size', 'encoding', 'symbols')
+
+    def __init__(self, mtime_ns, size, encoding, symbols):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.encoding = encoding
+        self.symbols = symbols
+
+
+class WarmSymbolTables:
+    """在请求之间保持已经解析的辅助文件符号表
+
+    以绝对路径为键，保存每个辅助文件（.py/.c/.h/.symbin）单独解析得到的符号表。
+    mtime、大小和编码都没变的文件直接复用，否则重新解析。
+    Load 按参数顺序合并成新的字典，调用方可以随意修改。
+    """
+
+    def __init__(self):
+        self.Files = {}
+        self.Hits = 0
+        self.Reloads = 0
+
+    def LoadFile(self, file_path, encoding):
+        """获取单个辅助文件的符号表，文件变化时重新解析"""
+        path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            self.Files.pop(path, None)
+            print(f'Warning: Failed to read helper file {file_path}: {e}')
+            return {}
+        warm = self.Files.get(path)
+        if (warm is not None and warm.mtime_ns == stat.st_mtime_ns
+                and warm.size == stat.st_size and warm.encoding == encoding):
+            self.Hits += 1
+            return warm.symbols
+        from lib.core.translator import Translator
+        # 每个文件用独立的翻译器解析；.symbin 的惰性分层表在这里一次展开
+        translator = Translator()
+        translator.ParseHelperFile(path, encoding)
+        symbols = dict(translator.SymbolTable)
+        self.Files[path] = WarmHelper(stat.st_mtime_ns, stat.st_size, encoding, symbols)
+        self.Reloads += 1
+        return symbols
+
+    def Load(self, helper_files, encoding='utf-8'):
+        """返回合并后的辅助文件符号表（新字典）"""
+        symbol_table = {}
+        for file_path in helper_files:
+            symbol_table.update(self.LoadFile(file_path, encoding))
+        return symbol_table
+
+
+def percentile(sorted_values, fraction):
+    """最近秩法计算百分位数，sorted_values 已升序排列且非空"""
+    index = max(0, min(len(sorted_values) - 1, int(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class LatencyStats:
+    """按请求类型记录最近的请求耗时（毫秒）"""
+
+    def __init__(self, window=SERVER_LATENCY_WINDOW):
+        self.window = window
+        self.Samples = {}
+        self.Counts = {}
+
+    def Record(self, kind, elapsed_ms):
+        samples = self.Samples.get(kind)
+        if samples is None:
+            samples = self.Samples[kind] = deque(maxlen=self.window)
+        samples.append(elapsed_ms)
+        self.Counts[kind] = self.Counts.get(kind, 0) + 1
+
+    def Format(self):
+        """每类请求一行：总数和最近 window 个请求的 p50/p95/p99/最大耗时"""
+        lines = []
+        for kind in sorted(self.Samples):
+            values = sorted(self.Samples[kind])
+            lines.append(f'{kind:>9}: {self.Counts[kind]} requests, '
+                         f'p50 {percentile(values, 0.50):.1f} ms, p95 {percentile(values, 0.95):.1f} ms, '
+                         f'p99 {percentile(values, 0.99):.1f} ms, max {values[-1]:.1f} ms')
+        return '\n'.join(lines) if lines else 'no requests served'
+
+
+def request_kind(argv):
+    """按参数判断请求类型"""
+    if '-presym' in argv:
+        return 'presym'
+    if '-build' in argv:
+        return 'build'
+    return 'translate'
+
+
+class TranslationServer:
+    """处理客户端转发的命令行
+
+    每个请求用新的 TransPyC 对象执行，共用 WarmSymbolTables；翻译器模块中的
+    类型名缓存、C 类型缓存和 AST 缓存都是模块级的，在请求之间自然保持。
+    请求逐个处理：执行期间切换到客户端的工作目录，并分别截获标准输出和标准错误。
+    """
+
+    def __init__(self, app_class):
+        self.app_class = app_class
+        self.WarmSymbols = WarmSymbolTables()
+        self.Latency = LatencyStats()
+        self.StartTime = time.perf_counter()
+        self.Stopping = False
+
+    def Execute(self, argv, cwd):
+        """执行一条命令行，返回 (退出码, 标准输出, 标准错误)"""
+        import contextlib
+        import io
+        import traceback
+        output = io.StringIO()
+        errors = io.StringIO()
+        status = 0
+        previous_cwd = os.getcwd()
+        try:
+            os.chdir(cwd)
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+                app = self.app_class()
+                app.WarmSymbols = self.WarmSymbols
+                try:
+                    app.Run(argv)
+                except SystemExit as e:
+                    status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                except Exception:
+                    traceback.print_exc()
+                    status = 1
+        except OSError as e:
+            errors.write(f'Error: {e}\n')
+            status = 1
+        finally:
+            os.chdir(previous_cwd)
+        return status, output.getvalue(), errors.getvalue()
+
+    def FormatStats(self):
+        uptime = time.perf_counter() - self.StartTime
+        return (f'uptime {uptime:.1f} s, {len(self.WarmSymbols.Files)} helper files warm, '
+                f'{self.WarmSymbols.Hits} reused, {self.WarmSymbols.Reloads} parsed\n'
+                f'{self.Latency.Format()}\n')
+
+    def Handle(self, request):
+        """处理一个请求，返回响应字典"""
+        command = request.get('command')
+        if command == 'stats':
+            return {'status': 0, 'output': self.FormatStats()}
+        if command == 'stop':
+            self.Stopping = True
+            return {'status': 0, 'output': self.FormatStats()}
+        if command != 'run':
+            return {'status': 1, 'output': f'Error: Unknown server command {command}\n'}
+        argv = request.get('argv', [])
+        for option in BLOCKING_OPTIONS:
+            if option in argv:
+                return {'status': 1, 'output': f'Error: {option} cannot be forwarded to a running server\n'}
+        start = time.perf_counter()
+        status, output, errors = self.Execute(argv, request.get('cwd') or os.getcwd())
+        elapsed_ms = (time.perf_counter() - start) * 1e3
+        self.Latency.Record(request_kind(argv), elapsed_ms)
+        return {'status': status, 'output': output, 'errors': errors, 'elapsed_ms': elapsed_ms}
+
+
+def server_is_listening(socket_path):
+    """检查是否有服务在 socket_path 上监听
+
+    连接被拒绝说明套接字文件是已经退出的服务留下的；连接超时时按有服务（忙）处理，不替换它。
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(SERVER_CONNECT_TIMEOUT)
+        try:
+            probe.connect(socket_path)
+        except socket.timeout:
+            return True
+        except OSError:
+            return False
+    return True
+
+
+def remove_stale_socket(socket_path):
+    """删除已退出的服务留下的套接字文件
+
+    Returns:
+        可以在 socket_path 上启动服务时为 True；已有服务在监听，或该路径不是套接字文件时为 False
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return True
+    if not stat.S_ISSOCK(mode):
+        print(f'Error: {socket_path} exists and is not a socket')
+        return False
+    if server_is_listening(socket_path):
+        print(f'Error: A server is already listening on {socket_path}')
+        return False
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+    print(f'Removed stale socket {socket_path}')
+    return True
+
+
+def serve(socket_path, app_class):
+    """在 Unix 域套接字上运行翻译服务，直到收到 -stop 请求或被中断
+
+    Args:
+        socket_path: 套接字路径，是已退出的服务留下的套接字文件时会被替换
+        app_class: 执行命令行的类（TransPyC），由入口程序传入
+    """
+    import socketserver
+    # 预先载入翻译器，第一个请求不再承担导入耗时
+    import lib.core.translator  # noqa: F401
+
+    if not remove_stale_socket(socket_path):
+        sys.exit(1)
+
+    server = TranslationServer(app_class)
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                response = server.Handle(json.loads(line.decode(ENCODING)))
+            except ValueError as e:
+                response = {'status': 1, 'output': f'Error: Invalid request: {e}\n'}
+            self.wfile.write((json.dumps(response) + '\n').encode(ENCODING))
+
+    # UnixStreamServer 逐个处理请求，Execute 切换工作目录和截获输出不会互相干扰
+    try:
+        listener = socketserver.UnixStreamServer(socket_path, RequestHandler)
+    except OSError as e:
+        # 检查之后另一个服务抢先绑定了同一路径
+        print(f'Error: Cannot listen on {socket_path}: {e}')
+        sys.exit(1)
+    with listener:
+        print(f'TransPyC server listening on {socket_path}')
+        sys.stdout.flush()
+        try:
+            while not server.Stopping:
+                listener.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+    print(server.FormatStats(), end='')
+
+
+def send_request(socket_path, request):
+    """发送一个请求并等待响应；只有建立连接有超时，翻译本身耗时多久都等待"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(SERVER_CONNECT_TIMEOUT)
+        client.connect(socket_path)
+        client.settimeout(None)
+        client.sendall((json.dumps(request) + '\n').encode(ENCODING))
+        with client.makefile('rb') as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError('server closed the connection without a response')
+    return json.loads(line.decode(ENCODING))
+
+
+def run_client(socket_path, argv):
+    """瘦客户端：把命令行转发给服务并输出结果，返回退出码
+
+    argv 为 ['-stats'] 时查询延迟统计，为 ['-stop'] 时停止服务，
+    其余参数与直接运行 TransPyC.py 时相同，相对路径按客户端的工作目录解析，
+    标准输出和标准错误分别原样写到客户端的标准输出和标准错误。
+    套接字文件存在但服务已经退出时连接立即被拒绝，不会等待。
+    """
+    if argv == ['-stats']:
+        request = {'command': 'stats'}
+    elif argv == ['-stop']:
+        request = {'command': 'stop'}
+    else:
+        request = {'command': 'run', 'argv': argv, 'cwd': os.getcwd()}
+    try:
+        response = send_request(socket_path, request)
+    except ConnectionRefusedError:
+        print(f'Error: No TransPyC server is listening on {socket_path} (stale socket file); '
+              f'start one with -serve {socket_path}')
+        return 1
+    except (OSError, ValueError) as e:
+        print(f'Error: Cannot reach TransPyC server on {socket_path}: {e}')
+        return 1
+    sys.stdout.write(response.get('output', ''))
+    sys.stderr.write(response.get('errors', ''))
+    return response.get('status', 1)
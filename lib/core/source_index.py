@@ -0,0 +1,138 @@
+# 源码索引，用于字面量提取
+
+import bisect
+import io
+import re
+import token
+import tokenize
+
+
+# 数字字面量的模式：[0-9]+(\.[0-9]+)?([eE][+-]?[0-9]+)?|0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+
+NUMERIC_LITERAL_PATTERN = re.compile(
+    r'\b(?:0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+|\d+(?:\.\d*)?(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)\b'
+)
+
+
+class SourceIndex:
+    """单次翻译的源码索引
+
+    在 Translator.Content 赋值时创建，保存按行切分的源码和每行的起始偏移；
+    tokenize 生成的字符串/数字 token 表在第一次查询字面量时构建一次，
+    之后按 (lineno, col_offset) 直接查表，避免每个常量都重新切分整个文件。
+    设置了顶层语句范围后，只切分被查询到的语句，增量翻译时跳过的函数不会被切分。
+    """
+
+    def __init__(self, code):
+        """初始化源码索引
+
+        Args:
+            code: 源代码字符串，None 视为空字符串
+        """
+        self.Code = code or ''
+        # 与原实现保持一致，使用 splitlines(keepends=True) 切分行
+        self.Lines = self.Code.splitlines(keepends=True)
+        self.LineStarts = []
+        offset = 0
+        for line in self.Lines:
+            self.LineStarts.append(offset)
+            offset += len(line)
+        self.Tokens = None  # (lineno, col_offset) -> (token类型, token文本)
+        self.StatementRanges = None  # 顶层语句的 (起始行, 结束行) 列表，按起始行排序
+        self.StatementStarts = []
+        self.TokenizedStatements = set()
+
+    def GetLine(self, lineno, keepends=True):
+        """获取指定行（1-based）
+
+        Args:
+            lineno: 行号
+            keepends: 是否保留行尾换行符
+        """
+        if lineno - 1 >= len(self.Lines):
+            raise IndexError("AST节点行号超出原始代码行范围")
+        line = self.Lines[lineno - 1]
+        if keepends:
+            return line
+        return line.splitlines()[0]
+
+    def GetOffset(self, lineno, col):
+        """将 (行号, 列号) 转换为整个源码中的字符偏移"""
+        return self.LineStarts[lineno - 1] + col
+
+    def SetStatementRanges(self, ranges):
+        """设置顶层语句的行范围，之后按语句分块切分 token
+
+        Args:
+            ranges: (起始行, 结束行) 列表，行号从 1 开始，按起始行排序
+        """
+        self.StatementRanges = list(ranges)
+        self.StatementStarts = [start for start, _ in self.StatementRanges]
+        self.TokenizedStatements = set()
+        self.Tokens = {}
+
+    def BuildTokens(self):
+        """使用 tokenize 构建整个文件的字面量 token 表"""
+        self.Tokens = {}
+        self.TokenizeText(self.Code, 0)
+
+    def TokenizeStatement(self, lineno):
+        """切分包含指定行的顶层语句，已切分过的语句直接跳过"""
+        index = bisect.bisect_right(self.StatementStarts, lineno) - 1
+        if index < 0 or index in self.TokenizedStatements:
+            return
+        start, end = self.StatementRanges[index]
+        if lineno > end:
+            return
+        self.TokenizedStatements.add(index)
+        self.TokenizeText(''.join(self.Lines[start - 1:end]), start - 1)
+
+    def TokenizeText(self, text, line_offset):
+        """切分一段源码并把字符串/数字 token 加入 token 表
+
+        ast 的 col_offset 是 UTF-8 字节偏移，而 tokenize 给出的是字符列号，
+        因此非 ASCII 行需要换算成字节偏移后再作为键。
+
+        Args:
+            text: 要切分的源码，必须从一个逻辑行的开头开始
+            line_offset: text 第一行之前的行数
+        """
+        try:
+            for tok in tokenize.generate_tokens(io.StringIO(text).readline):
+                if tok.type != token.STRING and tok.type != token.NUMBER:
+                    continue
+                # 跨行的字符串（如多行三引号字符串）交给逐行扫描处理
+                if tok.start[0] != tok.end[0]:
+                    continue
+                lineno, col = tok.start
+                if not tok.line.isascii():
+                    col = len(tok.line[:col].encode('utf-8'))
+                self.Tokens[(lineno + line_offset, col)] = (tok.type, tok.string)
+        except (tokenize.TokenError, SyntaxError):
+            # 源码无法完整切分时保留已收集的 token，其余回退到逐行扫描
+            pass
+
+    def GetToken(self, lineno, col, token_type):
+        """查询指定位置、指定类型的 token 文本，不存在时返回 None"""
+        if self.StatementRanges is not None:
+            self.TokenizeStatement(lineno)
+        elif self.Tokens is None:
+            self.BuildTokens()
+        entry = self.Tokens.get((lineno, col))
+        if entry is not None and entry[0] == token_type:
+            return entry[1]
+        return None
+
+    def GetStringLiteral(self, lineno, col):
+        """获取位于 (lineno, col) 的单行字符串字面量（包括前缀和引号）"""
+        return self.GetToken(lineno, col, token.STRING)
+
+    def GetNumericLiteral(self, lineno, col):
+        """获取位于 (lineno, col) 的数字字面量原文
+
+        只有符合 NUMERIC_LITERAL_PATTERN 的 token 才直接返回，
+        其它写法（如 1_000）仍按原有的逐行正则规则处理。
+        """
+        literal = self.GetToken(lineno, col, token.NUMBER)
+        if literal is not None and NUMERIC_LITERAL_PATTERN.fullmatch(literal):
+            return literal
+        return None
@@ -0,0 +1,389 @@
+# .symbin 符号文件格式
+
+import json
+import mmap
+import os
+import struct
+import threading
+
+
+# 第 2 版二进制格式（小端序）：
+#   文件头   : 魔数 'SYMB'、版本号、标志、符号数、记录区/索引区/字符串区的偏移和字符串区大小
+#   记录区   : 每个符号一条定长记录 (名称偏移, 名称长度, 条目偏移, 条目长度)，按原符号表的插入顺序排列
+#   索引区   : 按名称（UTF-8 字节序）排序的记录编号，用于二分查找
+#   字符串区 : 名称（UTF-8）和条目内容（紧凑 JSON），偏移相对于字符串区起点
+# 第 1 版（旧格式）为 4 字节长度加整个符号表的 JSON。
+SYMBIN_MAGIC = b'SYMB'
+SYMBIN_VERSION = 2
+SYMBIN_HEADER = struct.Struct('<4sHHIIIII')
+SYMBIN_RECORD = struct.Struct('<IIII')
+SYMBIN_INDEX_ENTRY = struct.Struct('<I')
+LEGACY_HEADER = struct.Struct('<I')
+# -presym 生成 .symbin 时可能的源文件扩展名，文件损坏时从源文件重新生成
+SYMBIN_SOURCE_EXTENSIONS = ('.py', '.c', '.h')
+
+
+def encode_symbol_table(symbol_table):
+    """将符号表编码为第 2 版二进制格式"""
+    strings = bytearray()
+    records = []
+    names = []
+    for name, entry in symbol_table.items():
+        name_bytes = str(name).encode('utf-8')
+        entry_bytes = json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        name_offset = len(strings)
+        strings += name_bytes
+        entry_offset = len(strings)
+        strings += entry_bytes
+        records.append(SYMBIN_RECORD.pack(name_offset, len(name_bytes), entry_offset, len(entry_bytes)))
+        names.append(name_bytes)
+    order = sorted(range(len(names)), key=names.__getitem__)
+
+    records_offset = SYMBIN_HEADER.size
+    index_offset = records_offset + SYMBIN_RECORD.size * len(records)
+    strings_offset = index_offset + SYMBIN_INDEX_ENTRY.size * len(order)
+    header = SYMBIN_HEADER.pack(SYMBIN_MAGIC, SYMBIN_VERSION, 0, len(records),
+                                records_offset, index_offset, strings_offset, len(strings))
+    return b''.join([header, *records, *(SYMBIN_INDEX_ENTRY.pack(i) for i in order), bytes(strings)])
+
+
+def write_symbin_data(file_path, data):
+    """写出 .symbin 文件的数据
+
+    先写临时文件再替换，正在内存映射旧文件的进程（常驻服务、监视模式等）不受影响；
+    直接覆盖会使它们读到截断或混杂的数据。
+    """
+    temp_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, file_path)
+
+
+def write_symbol_file(file_path, symbol_table):
+    """把符号表写为第 2 版 .symbin 文件"""
+    write_symbin_data(file_path, encode_symbol_table(symbol_table))
+
+
+def find_symbol_source(file_path):
+    """查找与 .symbin 文件同名的源文件（.py/.c/.h），不存在时返回 None"""
+    stem = file_path[:-len('.symbin')] if file_path.endswith('.symbin') else file_path
+    for ext in SYMBIN_SOURCE_EXTENSIONS:
+        if os.path.isfile(stem + ext):
+            return stem + ext
+    return None
+
+
+def is_binary_symbin(data):
+    """检查数据是否为第 2 版二进制格式（旧格式以 JSON 长度开头，其后紧跟 JSON 文本）"""
+    if len(data) < SYMBIN_HEADER.size or data[:4] != SYMBIN_MAGIC:
+        return False
+    version = struct.unpack_from('<H', data, 4)[0]
+    return version == SYMBIN_VERSION
+
+
+def decode_legacy_symbol_table(data):
+    """读取第 1 版格式：4 字节长度加 JSON"""
+    if len(data) < LEGACY_HEADER.size:
+        raise ValueError("Invalid symbin file: data too short")
+    # 解析4字节长度头（小端序）
+    length = LEGACY_HEADER.unpack_from(data)[0]
+    if LEGACY_HEADER.size + length > len(data):
+        raise ValueError("Invalid symbin file: truncated data")
+    json_data = data[LEGACY_HEADER.size:LEGACY_HEADER.size + length]
+    return json.loads(bytes(json_data).decode('utf-8'))
+
+
+def decode_symbol_table(data):
+    """将 .symbin 数据完整解码为符号表字典，支持新旧两种格式"""
+    if is_binary_symbin(data):
+        return dict(SymbinTable(data).items())
+    return decode_legacy_symbol_table(data)
+
+
+class SymbinTable:
+    """第 2 版 .symbin 的只读、按需解码视图
+
+    打开时只读取文件头，按名称查询时在索引区二分查找并只解码该条目；
+    遍历时按原符号表的插入顺序返回。数据可以是 bytes 或 mmap 对象。
+    """
+
+    def __init__(self, data, file_path=None):
+        """初始化符号表视图
+
+        Args:
+            data: 第 2 版格式的数据（bytes 或 mmap）
+            file_path: 数据来源文件，仅用于错误信息
+        """
+        if not is_binary_symbin(data):
+            raise ValueError(f"Not a version {SYMBIN_VERSION} symbin file: {file_path or '<data>'}")
+        (_, _, _, self.Count, self.RecordsOffset, self.IndexOffset,
+         self.StringsOffset, self.StringsSize) = SYMBIN_HEADER.unpack_from(data)
+        self.Data = data
+        self.FilePath = file_path
+        self.Entries = {}  # 已解码的条目缓存
+        self.File = None
+        self.Validate()
+
+    def Validate(self):
+        """检查文件头中各区的范围
+
+        只检查文件头，打开文件的开销与符号数无关；每条记录和索引项在读取时由 Record 检查。
+        截断的文件在这里、损坏的记录在读取时以 ValueError 报告，而不是抛出 IndexError/struct.error。
+        """
+        records_end = self.RecordsOffset + SYMBIN_RECORD.size * self.Count
+        index_end = self.IndexOffset + SYMBIN_INDEX_ENTRY.size * self.Count
+        if not (SYMBIN_HEADER.size <= self.RecordsOffset and records_end <= self.IndexOffset
+                and index_end <= self.StringsOffset and self.StringsOffset + self.StringsSize <= len(self.Data)):
+            raise ValueError(f"Invalid symbin file: truncated data in {self.FilePath or '<data>'}")
+
+    @classmethod
+    def Open(cls, file_path):
+        """以内存映射方式打开 .symbin 文件"""
+        f = open(file_path, 'rb')
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            f.close()
+            raise ValueError(f"Invalid symbin file (too short): {file_path}")
+        try:
+            table = cls(data, file_path)
+        except ValueError:
+            data.close()
+            f.close()
+            raise
+        table.File = f
+        return table
+
+    def Close(self):
+        """释放内存映射"""
+        if isinstance(self.Data, mmap.mmap):
+            self.Data.close()
+        if self.File is not None:
+            self.File.close()
+            self.File = None
+
+    def Record(self, record_number):
+        """读取一条记录：(名称偏移, 名称长度, 条目偏移, 条目长度)，编号或偏移超出范围时抛出 ValueError"""
+        if not 0 <= record_number < self.Count:
+            raise ValueError(f"Invalid symbin file: index out of range in {self.FilePath or '<data>'}")
+        record = SYMBIN_RECORD.unpack_from(self.Data, self.RecordsOffset + record_number * SYMBIN_RECORD.size)
+        name_offset, name_length, entry_offset, entry_length = record
+        if name_offset + name_length > self.StringsSize or entry_offset + entry_length > self.StringsSize:
+            raise ValueError(f"Invalid symbin file: record out of range in {self.FilePath or '<data>'}")
+        return record
+
+    def RecordName(self, record_number):
+        """读取记录的名称字节"""
+        name_offset, name_length, _, _ = self.Record(record_number)
+        start = self.StringsOffset + name_offset
+        return self.Data[start:start + name_length]
+
+    def Find(self, name):
+        """二分查找名称，返回记录编号，不存在时返回 -1"""
+        if not isinstance(name, str):
+            return -1
+        key = name.encode('utf-8')
+        low, high = 0, self.Count
+        while low < high:
+            middle = (low + high) // 2
+            record_number = SYMBIN_INDEX_ENTRY.unpack_from(self.Data, self.IndexOffset + middle * SYMBIN_INDEX_ENTRY.size)[0]
+            probe = self.RecordName(record_number)
+            if probe < key:
+                low = middle + 1
+            elif probe > key:
+                high = middle
+            else:
+                return record_number
+        return -1
+
+    def DecodeEntry(self, record_number):
+        """解码记录对应的条目"""
+        _, _, entry_offset, entry_length = self.Record(record_number)
+        start = self.StringsOffset + entry_offset
+        return json.loads(bytes(self.Data[start:start + entry_length]).decode('utf-8'))
+
+    def __contains__(self, name):
+        return name in self.Entries or self.Find(name) >= 0
+
+    def __getitem__(self, name):
+        entry = self.Entries.get(name)
+        if entry is None:
+            record_number = self.Find(name)
+            if record_number < 0:
+                raise KeyError(name)
+            entry = self.Entries[name] = self.DecodeEntry(record_number)
+        return entry
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __len__(self):
+        return self.Count
+
+    def __iter__(self):
+        """按原插入顺序返回名称"""
+        for record_number in range(self.Count):
+            yield bytes(self.RecordName(record_number)).decode('utf-8')
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        """按原插入顺序返回 (名称, 条目)，直接按记录编号解码，不经过索引区"""
+        result = []
+        for record_number in range(self.Count):
+            name = bytes(self.RecordName(record_number)).decode('utf-8')
+            entry = self.Entries.get(name)
+            if entry is None:
+                entry = self.Entries[name] = self.DecodeEntry(record_number)
+            result.append((name, entry))
+        return result
+
+
+def open_symbol_file(file_path):
+    """打开 .symbin 文件
+
+    第 2 版格式返回内存映射的 SymbinTable，旧格式返回解码后的字典；
+    文件截断、损坏或版本不支持时抛出 ValueError。
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(SYMBIN_HEADER.size)
+    if is_binary_symbin(head):
+        return SymbinTable.Open(file_path)
+    if head[:4] == SYMBIN_MAGIC:
+        raise ValueError(f"Unsupported symbin version in {file_path}")
+    with open(file_path, 'rb') as f:
+        return decode_legacy_symbol_table(f.read())
+
+
+class LayeredSymbolTable(dict):
+    """叠加了按需加载的 .symbin 层的符号表
+
+    字典本身保存直接写入的符号；SymbinTable 层只在按名称查询时解码。
+    查询时字典优先，其次是较晚加载的层。整体遍历（items/keys 等）时
+    会把所有层按与 dict.update 逐个合并完全相同的顺序展开到字典中，之后不再分层；
+    len 只读取各层的名称，不解码条目，也不展开。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.Layers = []
+        # 直接写入的新符号 -> 写入时已加载的层数，用于展开时还原插入顺序
+        self.Epochs = dict.fromkeys(super().keys(), 0)
+
+    def AddLayer(self, table):
+        """叠加一个 SymbinTable 层，等价于 dict.update(table)"""
+        # 已经存在于字典中的符号保留原位置，值被新层覆盖
+        for name in [name for name in super().keys() if name in table]:
+            super().__setitem__(name, table[name])
+        self.Layers.append(table)
+
+    def FindInLayers(self, name):
+        """从最新的层开始查找符号"""
+        for table in reversed(self.Layers):
+            if name in table:
+                return table
+        return None
+
+    def Flatten(self):
+        """把所有层展开到字典中"""
+        if not self.Layers:
+            return
+        merged = {}
+        for epoch in range(len(self.Layers) + 1):
+            for name in super().keys():
+                if self.Epochs.get(name) == epoch:
+                    merged[name] = None
+            if epoch < len(self.Layers):
+                for name in self.Layers[epoch]:
+                    if name not in merged:
+                        merged[name] = None
+        for name in merged:
+            merged[name] = self[name]
+        layers = self.Layers
+        self.Layers = []
+        self.Epochs = {}
+        super().clear()
+        super().update(merged)
+        for table in layers:
+            table.Close()
+
+    def __missing__(self, name):
+        table = self.FindInLayers(name)
+        if table is None:
+            raise KeyError(name)
+        return table[name]
+
+    def __contains__(self, name):
+        return super().__contains__(name) or (bool(self.Layers) and self.FindInLayers(name) is not None)
+
+    def get(self, name, default=None):
+        if super().__contains__(name):
+            return super().__getitem__(name)
+        table = self.FindInLayers(name) if self.Layers else None
+        return table[name] if table is not None else default
+
+    def __setitem__(self, name, value):
+        if name not in self.Epochs and (not self.Layers or self.FindInLayers(name) is None):
+            self.Epochs[name] = len(self.Layers)
+        super().__setitem__(name, value)
+
+    def update(self, *args, **kwargs):
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+
+    def __delitem__(self, name):
+        # 层是只读的，删除层中的符号时先展开
+        if self.Layers and self.FindInLayers(name) is not None:
+            self.Flatten()
+        super().__delitem__(name)
+        self.Epochs.pop(name, None)
+
+    def pop(self, name, *default):
+        if name in self:
+            value = self[name]
+            del self[name]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(name)
+
+    def __iter__(self):
+        self.Flatten()
+        return super().__iter__()
+
+    def __len__(self):
+        if not self.Layers:
+            return super().__len__()
+        names = set(super().keys())
+        for table in self.Layers:
+            names.update(table)
+        return len(names)
+
+    def __repr__(self):
+        self.Flatten()
+        return super().__repr__()
+
+    def keys(self):
+        self.Flatten()
+        return super().keys()
+
+    def values(self):
+        self.Flatten()
+        return super().values()
+
+    def items(self):
+        self.Flatten()
+        return super().items()
+
+    def copy(self):
+        self.Flatten()
+        return dict(self)
+
+    def __reduce__(self):
+        # 传给其它进程时展开为普通字典，内存映射不能被序列化
+        return (dict, (dict(self.items()),))
@@ -0,0 +1,166 @@
+# 符号文件登记表
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.core.symbin import SymbinTable, open_symbol_file
+from lib.core.translator import Translator
+
+
+class RegisteredFile:
+    """已经解析过的符号文件"""
+
+    def __init__(self, mtime_ns, size, digest, encoding):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.encoding = encoding
+
+
+class SymbolRegistry:
+    """记录已经载入翻译器的符号文件
+
+    以绝对路径为键，保存文件的 mtime、大小和内容哈希。再次登记时
+    mtime 和大小都没变的文件直接跳过；变了但内容哈希相同的文件只更新记录；
+    只有新文件和内容变化的文件才会重新解析，并使用各自的编码。
+
+    每个文件解析得到的符号单独保存。只新增了文件时把它们依次叠加到翻译器上；
+    先前登记的文件内容变化时，先从翻译器的符号表中删除它旧版本提供的符号（新版本删掉的
+    函数等不再能查到），再按登记顺序重新叠加全部文件，
+    后登记的文件中的同名符号仍然覆盖先登记的，与逐个调用 ParseHelperFile 的结果相同。
+    """
+
+    def __init__(self, max_workers=None):
+        """初始化登记表
+
+        Args:
+            max_workers: 并发读取和解析文件的线程数，默认由 ThreadPoolExecutor 决定
+        """
+        self.Files = {}
+        self.Order = []  # 按登记顺序排列的绝对路径
+        self.Symbols = {}  # 绝对路径 -> 解析得到的符号表（.symbin 文件为 None，叠加时重新载入）
+        self.Names = {}  # 绝对路径 -> 该文件提供的符号名
+        self.max_workers = max_workers
+        self.Parsed = 0
+        self.Skipped = 0
+
+    def FindChanged(self, symbol_files):
+        """找出需要重新检查的文件，返回 (SymbolFile, 绝对路径, stat结果) 列表"""
+        pending = []
+        seen = set()
+        for symbol_file in symbol_files:
+            if not symbol_file.file_path:
+                continue
+            path = os.path.abspath(symbol_file.file_path)
+            if path in seen:
+                continue
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                print(f'Warning: Failed to read symbol file {symbol_file.file_path}: {e}')
+                continue
+            registered = self.Files.get(path)
+            if (registered is not None and registered.mtime_ns == stat.st_mtime_ns
+                    and registered.size == stat.st_size and registered.encoding == symbol_file.encoding):
+                self.Skipped += 1
+                continue
+            pending.append((symbol_file, path, stat))
+        return pending
+
+    def LoadFile(self, item, symbol_cache=None):
+        """读取并解析单个文件（在工作线程中运行）
+
+        Returns:
+            (内容哈希, 解析得到的符号表, 符号名列表)；内容未变化时符号表和符号名为 None；
+            .symbin 文件的符号表同样为 None，由 Register 在主线程中按顺序叠加，这里只读取符号名
+        """
+        symbol_file, path, _ = item
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        registered = self.Files.get(path)
+        if registered is not None and registered.digest == digest and registered.encoding == symbol_file.encoding:
+            return digest, None, None
+        if path.endswith('.symbin'):
+            return digest, None, symbin_names(path)
+        # 每个文件用独立的翻译器解析，互不影响，之后按登记顺序合并
+        translator = Translator()
+        translator.SymbolCache = symbol_cache
+        translator.ParseHelperFile(symbol_file.file_path, symbol_file.encoding)
+        return digest, translator.SymbolTable, list(translator.SymbolTable)
+
+    def Register(self, translator, symbol_files):
+        """把新的或变化过的符号文件载入翻译器的符号表
+
+        文件并发读取和解析，合并时按 symbol_files 中的顺序进行，
+        结果与逐个调用 ParseHelperFile 相同。
+
+        Args:
+            translator: 目标翻译器
+            symbol_files: SymbolFile 列表（可以包含已经登记过的文件）
+
+        Returns:
+            本次实际解析的文件数
+        """
+        pending = self.FindChanged(symbol_files)
+        if not pending:
+            return 0
+        # 工作线程共用目标翻译器的符号缓存
+        symbol_cache = translator.SymbolCache
+        if len(pending) == 1:
+            results = [self.LoadFile(pending[0], symbol_cache)]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(lambda item: self.LoadFile(item, symbol_cache), pending))
+
+        parsed = 0
+        added = []
+        replaced = False
+        removed = set()  # 变化的文件旧版本提供的符号名
+        for (symbol_file, path, stat), (digest, symbols, names) in zip(pending, results):
+            registered = self.Files.get(path)
+            changed = registered is None or registered.digest != digest or registered.encoding != symbol_file.encoding
+            if changed:
+                self.Symbols[path] = symbols
+                if registered is None:
+                    self.Order.append(path)
+                    added.append(path)
+                else:
+                    replaced = True
+                    removed.update(self.Names.get(path, ()))
+                self.Names[path] = names or []
+                parsed += 1
+            self.Files[path] = RegisteredFile(stat.st_mtime_ns, stat.st_size, digest, symbol_file.encoding)
+
+        # 先登记的文件变化后要让后登记的文件重新覆盖它，因此删除旧符号后按登记顺序全部重新叠加；
+        # 仍由某个文件提供的符号在重新叠加时恢复
+        for name in removed:
+            translator.SymbolTable.pop(name, None)
+        for path in (self.Order if replaced else added):
+            self.Apply(translator, path)
+        self.Parsed += parsed
+        self.Skipped += len(pending) - parsed
+        translator.debug_print(f"[SYMBOLS] Registered {parsed} new or changed files, {self.Skipped} unchanged so far")
+        if symbol_cache is not None:
+            translator.debug_print(f"[CACHE] Symbols: hits={symbol_cache.Hits}, misses={symbol_cache.Misses}")
+        return parsed
+
+    def Apply(self, translator, path):
+        """把一个已登记文件的符号叠加到翻译器的符号表上"""
+        if path.endswith('.symbin'):
+            translator.LoadSymbinFile(path)
+        elif self.Symbols.get(path):
+            translator.SymbolTable.update(self.Symbols[path])
+
+
+def symbin_names(path):
+    """读取 .symbin 文件中的符号名（不解码条目），文件无法读取时返回空列表"""
+    try:
+        symbols = open_symbol_file(path)
+    except (OSError, ValueError):
+        return []
+    names = list(symbols)
+    if isinstance(symbols, SymbinTable):
+        symbols.Close()
+    return names
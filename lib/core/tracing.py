@@ -0,0 +1,131 @@
+# 调试追踪
+
+import functools
+
+from lib.constants.config import DEBUG_BUFFER_LINES
+from lib.core.emitter import count_code_lines
+
+
+def debug_handle(func):
+    """装饰器：标记需要记录进入和退出的 Handle 方法
+
+    被标记的方法在类上保持原样，关闭调试时调用没有任何额外开销；
+    只有设置了调试文件后，BindTracedMethods 才会在实例上绑定带记录的包装函数。
+    """
+    func.DebugTraced = True
+    return func
+
+
+def DescribeNode(args):
+    """生成节点描述，如 [Name] id=x"""
+    node_info = ""
+    if args and hasattr(args[0], '__class__'):
+        node = args[0]
+        node_type = type(node).__name__
+        node_info = f"[{node_type}]"
+        # 尝试获取节点详情
+        if hasattr(node, 'id'):
+            node_info += f" id={node.id}"
+        elif hasattr(node, 'attr'):
+            node_info += f" attr={node.attr}"
+        elif hasattr(node, 'name'):
+            node_info += f" name={node.name}"
+    return node_info
+
+
+def MakeTracedMethod(obj, func):
+    """为实例创建记录 [ENTER]/[EXIT]/[ERROR] 的绑定方法"""
+    func_name = func.__name__
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        node_info = DescribeNode(args)
+        obj.debug_print(f"[ENTER] {func_name} {node_info}")
+        try:
+            result = func(obj, *args, **kwargs)
+            result_summary = ""
+            if isinstance(result, list):
+                result_summary = f" -> {count_code_lines(result)} lines"
+            elif isinstance(result, str):
+                result_summary = f" -> '{result[:50]}...'" if len(result) > 50 else f" -> '{result}'"
+            obj.debug_print(f"[EXIT] {func_name} {node_info}{result_summary}")
+            return result
+        except Exception as e:
+            obj.debug_print(f"[ERROR] {func_name} {node_info}: {e}")
+            # 出错时立即写出，避免异常终止后丢失日志
+            obj.flush_debug()
+            raise
+    return wrapper
+
+
+def BindTracedMethods(obj, enabled):
+    """在实例上绑定或移除带记录的 Handle 方法
+
+    Args:
+        obj: 转换器实例
+        enabled: True 时绑定包装函数，False 时恢复为类上的原始方法
+    """
+    cls = type(obj)
+    for name in dir(cls):
+        func = getattr(cls, name, None)
+        if not getattr(func, 'DebugTraced', False):
+            continue
+        if enabled:
+            setattr(obj, name, MakeTracedMethod(obj, func))
+        else:
+            obj.__dict__.pop(name, None)
+
+
+class Tracer:
+    """调试输出器
+
+    所有调试信息先写入有界的内存缓冲区，写满或调用 Flush 时
+    通过同一个带缓冲的文件句柄追加到调试文件中。
+    """
+    
+    def __init__(self, file_path, capacity=DEBUG_BUFFER_LINES, encoding='utf-8'):
+        """初始化Tracer对象
+        
+        Args:
+            file_path: 调试文件路径
+            capacity: 缓冲区最多保存的条目数
+            encoding: 文件编码
+        """
+        self.FilePath = file_path
+        self.Capacity = capacity
+        self.Encoding = encoding
+        self.Buffer = []
+        self.Handle = None
+    
+    def Write(self, text, encoding=None):
+        """写入一条调试信息
+
+        encoding 与调试文件的编码不同时（如 -e 指定的编码写入的 AST 信息），
+        先写出缓冲区，再单独按该编码追加这一条，文件中各部分的顺序不变。
+        """
+        if encoding is not None and encoding != self.Encoding:
+            self.Flush()
+            with open(self.FilePath, 'a', encoding=encoding) as f:
+                f.write(text)
+            return
+        self.Buffer.append(text)
+        if len(self.Buffer) >= self.Capacity:
+            self.Flush()
+    
+    def Flush(self):
+        """将缓冲区内容写入调试文件"""
+        if not self.Buffer:
+            return
+        if self.Handle is None:
+            # 延迟到第一次写出时才打开文件，调用方可以先清空调试文件
+            self.Handle = open(self.FilePath, 'a', encoding=self.Encoding)
+        self.Handle.write(''.join(self.Buffer))
+        self.Buffer.clear()
+        self.Handle.flush()
+    
+    def Close(self):
+        """写出剩余内容并关闭文件"""
+        self.Flush()
+        if self.Handle is not None:
+            self.Handle.close()
+            self.Handle = None
@@ -1,10 +1,10 @@
 # 核心转换逻辑
 
 import ast
+import io
 import re
 import sys
 import os
-import functools
 # 添加lib目录到Python路径
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'lib', 'includes'))
 import c
@@ -18,63 +18,139 @@ from lib.utils.helpers import (
     detect_file_type, extract_array_size, 
     check_storage_class, build_array_initialization
 )
+from lib.core.source_index import SourceIndex, NUMERIC_LITERAL_PATTERN
+from lib.core.tracing import debug_handle, BindTracedMethods, Tracer
+from lib.core.profiling import BindProfiledMethods
+from lib.core.incremental import DefinitionCache, RecordingTable, SymbolCache
+from lib.core.symbin import (
+    open_symbol_file, find_symbol_source, write_symbol_file, SymbinTable, LayeredSymbolTable,
+)
+from lib.core.c_parser import extract_c_symbols
+from lib.core.emitter import IndentedCode, CodeEmitter, flatten_code
+from lib.core.type_model import c_type
+from lib.core.scopes import ScopeStack
+from lib.core.annotations import analyze_annotation
+from lib.core.python_symbols import parse_python, extract_python_symbols
 
 
-def debug_handle(func):
-    """装饰器：记录 Handle 方法的进入和退出"""
-    @functools.wraps(func)
-    def wrapper(self, *args, **kwargs):
-        func_name = func.__name__
-        # 获取节点类型信息
-        node_info = ""
-        if args and hasattr(args[0], '__class__'):
-            node = args[0]
-            node_type = type(node).__name__
-            node_info = f"[{node_type}]"
-            # 尝试获取节点详情
-            if hasattr(node, 'id'):
-                node_info += f" id={node.id}"
-            elif hasattr(node, 'attr'):
-                node_info += f" attr={node.attr}"
-            elif hasattr(node, 'name'):
-                node_info += f" name={node.name}"
-        
-        self.debug_print(f"[ENTER] {func_name} {node_info}")
-        try:
-            result = func(self, *args, **kwargs)
-            result_summary = ""
-            if isinstance(result, list):
-                result_summary = f" -> {len(result)} lines"
-            elif isinstance(result, str):
-                result_summary = f" -> '{result[:50]}...'" if len(result) > 50 else f" -> '{result}'"
-            self.debug_print(f"[EXIT] {func_name} {node_info}{result_summary}")
-            return result
-        except Exception as e:
-            self.debug_print(f"[ERROR] {func_name} {node_info}: {e}")
-            raise
-    return wrapper
+# GetTypeName 的结构缓存：type_name_key 或 ('|', 左侧类型, 右侧类型) -> 类型名称
+# 结果只取决于节点结构和 t 模块，所有 Translator 实例共用
+TYPE_NAME_CACHE = {}
+
+
+def type_name_key(Node):
+    """生成类型注解叶子节点的结构键，需要生成表达式（数组大小）或递归组合的节点返回 None"""
+    if isinstance(Node, ast.Name):
+        return ('name', Node.id)
+    if isinstance(Node, ast.Attribute):
+        if isinstance(Node.value, ast.Name):
+            return ('attr', Node.value.id, Node.attr)
+        return ('attr',)
+    if isinstance(Node, ast.Call):
+        func = Node.func
+        if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == 't'):
+            return ('call',)
+        keywords = []
+        for kw in Node.keywords:
+            # 与 GetTypeName 一致，只有常量和名称参数会传给类型对象；常量带上类型以区分 1 和 True
+            if isinstance(kw.value, ast.Constant):
+                keywords.append((kw.arg, type(kw.value.value).__name__, kw.value.value))
+            elif isinstance(kw.value, ast.Name):
+                keywords.append((kw.arg, 'name', kw.value.id))
+        return ('call', func.attr, tuple(keywords))
+    return None
 
 
 class Translator:
     """代码转换器"""
     
     def __init__(self):
-        self.VarScopes = []  # 跟踪变量作用域
+        self.VarScopes = ScopeStack()  # 跟踪变量作用域
         self.FunctionReturnTypes = {}  # 记录函数名和其返回类型
         self.SymbolTable = {}  # 符号表
         self.OriginalLines = []  # 原始代码行
         self.Content = ''
         self.debug_file = None  # 调试输出文件路径
+        self.Tracer = None  # 调试输出器，关闭调试时为 None
+        self.Profiler = None  # 性能分析器，未启用时为 None
+        self.DefinitionCache = None  # 顶层定义缓存，未启用增量翻译时为 None
+        self.SymbolCache = None  # 辅助文件符号缓存，未启用时为 None
+        self.TypeNameHits = 0  # GetTypeName 缓存命中次数
+        self.TypeNameMisses = 0
+        self.EmittedLines = 0  # 上一次 GenerateCCode 写出的C代码行数
+    
+    @property
+    def Content(self):
+        """当前翻译的源代码"""
+        return self._Content
+    
+    @Content.setter
+    def Content(self, value):
+        """设置源代码，同时重建源码索引"""
+        self._Content = value
+        self.SourceIndex = SourceIndex(value)
+    
+    def GetSourceIndex(self, code):
+        """获取代码对应的源码索引，当前源代码直接复用已构建的索引"""
+        if code is self._Content:
+            return self.SourceIndex
+        return SourceIndex(code)
     
     def set_debug_file(self, file_path):
-        """设置调试输出文件"""
+        """设置调试输出文件
+        
+        设置文件后才会在实例上绑定带记录的 Handle 方法，传入 None 关闭调试
+        """
+        if self.Tracer is not None:
+            self.Tracer.Close()
         self.debug_file = file_path
+        self.Tracer = Tracer(file_path) if file_path else None
+        BindTracedMethods(self, self.Tracer is not None)
+        if self.Profiler is not None:
+            # 调试记录包装替换掉了部分性能分析包装，重新补上
+            BindProfiledMethods(self, self.Profiler)
+    
+    def set_profiler(self, profiler):
+        """设置性能分析器
+        
+        设置后才会在实例上绑定记录耗时的 Handle* 等方法，传入 None 关闭
+        """
+        if self.Profiler is not None:
+            BindProfiledMethods(self, None)
+        self.Profiler = profiler
+        if profiler is not None:
+            BindProfiledMethods(self, profiler)
+    
+    def set_definition_cache(self, cache_dir):
+        """启用顶层定义的增量翻译缓存
+        
+        Args:
+            cache_dir: 缓存根目录，None 表示使用默认目录
+        """
+        self.DefinitionCache = DefinitionCache(cache_dir)
+    
+    def set_symbol_cache(self, cache_dir):
+        """启用辅助文件的符号缓存
+        
+        Args:
+            cache_dir: 缓存根目录，None 表示使用默认目录
+        """
+        self.SymbolCache = SymbolCache(cache_dir)
     
-    def debug_print(self, *args, **kwargs):
+    def debug_print(self, *args, sep=' ', end='\n', **kwargs):
         """输出调试信息到文件"""
-        if self.debug_file:
-            with open(self.debug_file, 'a', encoding='utf-8') as f:
-                print(*args, file=f, **kwargs)
+        if self.Tracer is not None:
+            self.Tracer.Write(sep.join(str(arg) for arg in args) + end)
+    
+    def debug_write(self, text, encoding=None):
+        """原样写入调试文本，encoding 为 None 时使用调试文件的编码（UTF-8）"""
+        if self.Tracer is not None:
+            self.Tracer.Write(text, encoding)
+    
+    def flush_debug(self):
+        """将缓冲的调试信息写入文件"""
+        if self.Tracer is not None:
+            self.Tracer.Flush()
     
     def ParseHelperFiles(self, helper_files, encoding='utf-8'):
         """解析辅助文件，提取符号信息
@@ -82,339 +158,385 @@ class Translator:
         支持 .py, .c, .h 和 .symbin 文件
         """
         for file_path in helper_files:
-            ext = detect_file_type(file_path)
-            if ext == '.py':
-                self.ParsePythonFile(file_path, encoding)
-            elif ext == '.c':
-                self.ParseCFile(file_path, encoding)
-            elif file_path.endswith('.symbin'):
-                self.LoadSymbinFile(file_path)
+            self.ParseHelperFile(file_path, encoding)
+        if self.SymbolCache is not None and helper_files:
+            self.debug_print(f"[CACHE] Symbols: hits={self.SymbolCache.Hits}, misses={self.SymbolCache.Misses}")
+    
+    def ParseHelperFile(self, file_path, encoding='utf-8'):
+        """按扩展名解析单个辅助文件"""
+        ext = detect_file_type(file_path)
+        if ext == '.py':
+            self.ParseCachedHelperFile(file_path, encoding, ext, self.ParsePythonFile)
+        elif ext in ('.c', '.h'):
+            self.ParseCachedHelperFile(file_path, encoding, ext, self.ParseCFile)
+        elif file_path.endswith('.symbin'):
+            self.LoadSymbinFile(file_path)
+    
+    def ParseCachedHelperFile(self, file_path, encoding, ext, parse):
+        """通过符号缓存解析辅助文件
+        
+        未启用缓存时直接解析到符号表。启用时先按文件内容查找缓存，命中则合并
+        缓存的符号；未命中时把文件单独解析到一个空表中，成功后写入缓存再合并。
+        
+        Args:
+            file_path: 辅助文件路径
+            encoding: 文件编码
+            ext: 扩展名，决定解析方式，也是缓存键的一部分
+            parse: 解析方法（ParsePythonFile 或 ParseCFile），成功时返回 True
+        """
+        if self.SymbolCache is None:
+            parse(file_path, encoding)
+            return
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            # 由解析方法给出读取失败的警告
+            parse(file_path, encoding)
+            return
+        key = self.SymbolCache.MakeKey(ext, encoding, data)
+        symbols = self.SymbolCache.Lookup(key)
+        if symbols is None:
+            symbol_table = self.SymbolTable
+            self.SymbolTable = {}
+            try:
+                parsed = parse(file_path, encoding)
+            finally:
+                symbols, self.SymbolTable = self.SymbolTable, symbol_table
+            if parsed:
+                self.SymbolCache.Store(key, symbols)
+        self.SymbolTable.update(symbols)
     
     def LoadSymbinFile(self, file_path):
         """从.symbin文件加载符号表
         
+        第 2 版二进制格式以内存映射方式叠加到符号表上，符号在第一次查询时才解码；
+        旧的 JSON 格式仍然整体读入并合并。文件截断或损坏时，如果旁边有生成它的源文件，
+        就从源文件重新生成。
+        
         Args:
             file_path: .symbin文件路径
         """
         try:
-            with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            # 导入序列化函数（避免循环导入）
-            import sys
-            import os
-            import json
-            import struct
-            
-            # 解析二进制格式
-            if len(data) < 4:
-                print(f"Warning: Invalid symbin file (too short): {file_path}")
+            try:
+                symbols = open_symbol_file(file_path)
+            except (OSError, ValueError) as e:
+                source = find_symbol_source(file_path)
+                if source is None:
+                    print(f"Warning: Failed to load symbin file {file_path}: {e}")
+                    return
+                print(f"Warning: Failed to load symbin file {file_path}: {e}; rebuilding from {source}")
+                self.RebuildSymbinFile(file_path, source)
                 return
             
-            # 解析4字节长度头（小端序）
-            length = struct.unpack('<I', data[:4])[0]
-            json_data = data[4:4+length]
-            symbols = json.loads(json_data.decode('utf-8'))
-            
             # 合并到当前符号表
-            self.SymbolTable.update(symbols)
+            if isinstance(symbols, SymbinTable):
+                if not isinstance(self.SymbolTable, LayeredSymbolTable):
+                    self.SymbolTable = LayeredSymbolTable(self.SymbolTable)
+                self.SymbolTable.AddLayer(symbols)
+            else:
+                self.SymbolTable.update(symbols)
             self.debug_print(f"[SYMBIN] Loaded {len(symbols)} symbols from {file_path}")
             
         except Exception as e:
             print(f"Warning: Failed to load symbin file {file_path}: {e}")
     
+    def RebuildSymbinFile(self, file_path, source):
+        """从源文件重新解析符号，合并到符号表并重新写出 .symbin 文件
+        
+        Args:
+            file_path: 损坏的 .symbin 文件路径
+            source: 生成它的源文件（.py/.c/.h）
+        """
+        parse = self.ParsePythonFile if source.endswith('.py') else self.ParseCFile
+        symbol_table = self.SymbolTable
+        self.SymbolTable = {}
+        try:
+            parsed = parse(source)
+        finally:
+            symbols, self.SymbolTable = self.SymbolTable, symbol_table
+        self.SymbolTable.update(symbols)
+        if not parsed:
+            return
+        try:
+            write_symbol_file(file_path, symbols)
+        except OSError as e:
+            print(f"Warning: Failed to rewrite symbin file {file_path}: {e}")
+            return
+        self.debug_print(f"[SYMBIN] Rebuilt {len(symbols)} symbols for {file_path} from {source}")
+    
     def ParsePythonFile(self, file_path, encoding='utf-8'):
-        """解析Python文件，提取类、函数、变量信息"""
+        """解析Python文件，提取顶层的类、函数、变量信息"""
         try:
             with open(file_path, 'r', encoding=encoding) as f:
                 content = f.read()
             
-            # 解析Python代码为AST
-            tree = ast.parse(content)
-            
-            # 提取类定义（作为结构体）
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    class_name = node.name
-                    # 提取结构体成员信息
-                    members = {}
-                    for item in node.body:
-                        if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
-                            var_name = item.target.id
-                            try:
-                                var_type = self.GetTypeName(item.annotation)
-                                # 检查是否是指针类型
-                                is_pointer = '*' in var_type or 'CPtr' in var_type
-                                # 检查原始注解是否包含CPtr
-                                if not is_pointer:
-                                    # 直接检查AST节点是否包含CPtr
-                                    if isinstance(item.annotation, ast.BinOp) and isinstance(item.annotation.op, ast.BitOr):
-                                        # 检查左右两侧是否有CPtr
-                                        left_str = ast.dump(item.annotation.left)
-                                        right_str = ast.dump(item.annotation.right)
-                                        if 'CPtr' in left_str or 'CPtr' in right_str:
-                                            is_pointer = True
-                                members[var_name] = {'type': var_type, 'is_pointer': is_pointer}
-                            except:
-                                pass
-                    self.SymbolTable[class_name] = {'type': 'struct', 'members': members}
-                elif isinstance(node, ast.FunctionDef):
-                    func_name = node.name
-                    self.SymbolTable[func_name] = {'type': 'function'}
-                elif isinstance(node, ast.AnnAssign):
-                    if isinstance(node.target, ast.Name):
-                        var_name = node.target.id
-                        # 尝试获取类型信息
-                        var_type = 'unknown'
-                        is_pointer = False
-                        if node.annotation:
-                            try:
-                                var_type = self.GetTypeName(node.annotation)
-                                is_pointer = '*' in var_type or 'CPtr' in var_type
-                            except:
-                                pass
-                        self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': var_type, 'is_pointer': is_pointer}
+            # 解析Python代码为AST，之后翻译同一份代码时直接复用
+            tree = parse_python(content)
+            self.SymbolTable.update(extract_python_symbols(tree, self))
         except Exception as e:
             print(f'Warning: Failed to parse Python file {file_path}: {e}')
+            return False
+        return True
     
     def ParseCFile(self, file_path, encoding='utf-8'):
-        """解析C文件，提取结构体、函数、变量信息"""
+        """解析C源文件或头文件，提取结构体（含成员）、typedef、枚举常量、函数、全局变量和宏"""
         try:
             with open(file_path, 'r', encoding=encoding) as f:
                 content = f.read()
             
-            # 简单的C文件解析，提取结构体、函数、变量声明
-            
-            # 提取结构体定义
-            struct_pattern = r'struct\s+([a-zA-Z_]\w*)\s*\{'
-            struct_matches = re.findall(struct_pattern, content)
-            for struct_name in struct_matches:
-                self.SymbolTable[struct_name] = {'type': 'struct'}
-            
-            # 提取函数声明
-            func_pattern = r'\b([a-zA-Z_]\w*)\s*\('  # 简单模式
-            func_matches = re.findall(func_pattern, content)
-            for func_name in func_matches:
-                if func_name not in ['if', 'for', 'while', 'switch']:
-                    self.SymbolTable[func_name] = {'type': 'function'}
-            
-            # 提取变量声明
-            var_pattern = r'\b(\w+)\s+([a-zA-Z_]\w*)(\[\d*\])*\s*;'
-            var_matches = re.findall(var_pattern, content)
-            for var_type, var_name, _ in var_matches:
-                is_pointer = '*' in var_type
-                self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': var_type, 'is_pointer': is_pointer}
+            # 单遍词法扫描加声明解析，跳过注释、字符串和函数体
+            extract_c_symbols(content, self.SymbolTable)
         except Exception as e:
             print(f'Warning: Failed to parse C file {file_path}: {e}')
+            return False
+        return True
     
-    def GenerateCCode(self, Tree):
-        """生成C代码"""
+    def GenerateCCode(self, Tree, stream=None):
+        """生成C代码
+        
+        只遍历一次顶层节点：填充符号表的同时按 TopLevelSections 把节点归入
+        导入、宏定义、全局变量/结构体、函数/类方法四个输出段，再按段依次生成代码，
+        输出顺序与逐段扫描完全一致。每个顶层节点生成后立即由 CodeEmitter 写出，
+        嵌套代码块的缩进在写出时才加上。
+        
+        Args:
+            Tree: 模块 AST
+            stream: 输出目标（io.TextIOBase），None 时返回生成的字符串
+        
+        Returns:
+            stream 为 None 时返回C代码字符串，否则返回 None
+        """
+        Sections = [[] for _ in TOP_LEVEL_SECTIONS]
+        # 按顶层语句切分 token，只有实际查询字面量的语句才会被切分
+        if isinstance(Tree, ast.Module) and self.Content:
+            self.SourceIndex.SetStatementRanges(
+                (min([Node.lineno] + [d.lineno for d in getattr(Node, 'decorator_list', [])]), Node.end_lineno)
+                for Node in Tree.body
+            )
         # 首先解析主文件中的类定义、函数定义和变量定义，填充符号表
+        if isinstance(Tree, ast.Module):
+            self.SymbolTable.update(extract_python_symbols(Tree, self))
         for Node in ast.iter_child_nodes(Tree):
-            if isinstance(Node, ast.ClassDef):
-                class_name = Node.name
-                # 提取结构体成员信息
-                members = {}
-                for item in Node.body:
-                    if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
-                        var_name = item.target.id
-                        try:
-                            var_type = self.GetTypeName(item.annotation)
-                            # 检查是否是指针类型
-                            is_pointer = '*' in var_type or 'CPtr' in var_type
-                            # 检查原始注解是否包含CPtr
-                            if not is_pointer:
-                                # 直接检查AST节点是否包含CPtr
-                                if isinstance(item.annotation, ast.BinOp) and isinstance(item.annotation.op, ast.BitOr):
-                                    # 检查左右两侧是否有CPtr
-                                    left_str = ast.dump(item.annotation.left)
-                                    right_str = ast.dump(item.annotation.right)
-                                    if 'CPtr' in left_str or 'CPtr' in right_str:
-                                        is_pointer = True
-                            members[var_name] = {'type': var_type, 'is_pointer': is_pointer}
-                        except:
-                            pass
-                self.SymbolTable[class_name] = {'type': 'struct', 'members': members}
-            elif isinstance(Node, ast.FunctionDef):
-                func_name = Node.name
-                self.SymbolTable[func_name] = {'type': 'function'}
-            elif isinstance(Node, ast.AnnAssign):
-                if isinstance(Node.target, ast.Name):
-                    var_name = Node.target.id
-                    # 尝试获取类型信息
-                    var_type = 'unknown'
-                    is_pointer = False
-                    if Node.annotation:
-                        try:
-                            var_type = self.GetTypeName(Node.annotation)
-                            is_pointer = '*' in var_type or 'CPtr' in var_type
-                        except:
-                            pass
-                    self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': var_type, 'is_pointer': is_pointer}
+            sections = self.TopLevelSections.get(type(Node)) or find_visitor(self.TopLevelSections, type(Node))
+            for section, handler_name in sections or ():
+                Sections[section].append((handler_name, Node))
         
-        Code = []
+        output = io.StringIO() if stream is None else stream
+        emitter = CodeEmitter(output)
         # 打印符号表（用于调试）
-        self.debug_print("=== Symbol Table ===")
-        for key, value in self.SymbolTable.items():
-            self.debug_print(f"{key}: {value}")
-        self.debug_print("===================")
-        # 处理导入语句
-        for Node in ast.iter_child_nodes(Tree):
-            if isinstance(Node, ast.Import):
-                import_code = self.HandleImport(Node)
-                if import_code:
-                    Code.extend(import_code)
-            elif isinstance(Node, ast.ImportFrom):
-                import_from_code = self.HandleImportFrom(Node)
-                if import_from_code:
-                    Code.extend(import_from_code)
-        
-        # 处理宏定义
-        for Node in ast.iter_child_nodes(Tree):
-            if isinstance(Node, ast.Expr):
-                if isinstance(Node.value, ast.Call):
-                    if isinstance(Node.value.func, ast.Attribute):
-                        if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
-                            if Node.value.func.attr == 'Macro':
-                                macro_code = self.HandleCSpecialCall(Node.value.func.attr, Node.value.args, Node.value.keywords)
-                                if macro_code:
-                                    Code.extend(macro_code)
-        
-        # 处理全局变量和结构体定义
-        for Node in ast.iter_child_nodes(Tree):
-            if isinstance(Node, ast.ClassDef):
-                Code.extend(self.HandleClassDef(Node))
-            elif isinstance(Node, ast.Assign):
-                assign_code = self.HandleAssign(Node)
-                if assign_code:
-                    Code.extend(assign_code)
-            elif isinstance(Node, ast.AnnAssign):
-                # 直接生成声明语句
-                if isinstance(Node.target, ast.Name):
-                    var_name = Node.target.id
-                    # 检查是否有赋值部分
-                    if Node.value:
-                        ValueCode = self.HandleExpr(Node.value)
-                        if ValueCode:
-                            # 尝试获取类型名称
-                            try:
-                                type_name = self.GetTypeName(Node.annotation)
-                                if type_name:
-                                    # 处理 t.CDefine 类型，生成宏定义
-                                    if type_name == '#define':
-                                        # 生成正确的宏定义格式
-                                        Code.append(f'#define {var_name} {ValueCode[0]}')
-                                    else:
-                                        # 处理数组类型，提取数组大小
-                                        base_type, array_size_str = extract_array_size(type_name)
-                                        
-                                        # 检查 base_type 是否包含存储类修饰符
-                                        storage_class, type_part = check_storage_class(base_type)
-                                        
-                                        # 特殊处理 c.State，表示仅声明不定义
-                                        if ValueCode[0] == 'c.State':
-                                            # 处理 t.CPtr 类型，当 base_type 为 '*' 时，使用右侧表达式的名称作为类型
-                                            if base_type == '*':
-                                                # 尝试从右侧表达式获取类型名称
-                                                if isinstance(Node.value, ast.Name):
-                                                    type_name = Node.value.id
-                                                    if storage_class:
-                                                        Code.append(f'{storage_class} struct {type_name}* {var_name}{array_size_str};')
-                                                    else:
-                                                        Code.append(f'struct {type_name}* {var_name}{array_size_str};')
-                                                else:
-                                                    if storage_class:
-                                                        Code.append(f'{storage_class} void* {var_name}{array_size_str};')
-                                                    else:
-                                                        Code.append(f'void* {var_name}{array_size_str};')
-                                            else:
-                                                if storage_class:
-                                                    Code.append(f'{storage_class} {type_part} {var_name}{array_size_str};')
-                                                else:
-                                                    Code.append(f'{base_type} {var_name}{array_size_str};')
-                                        else:
-                                            # 处理 t.CPtr 类型，当 base_type 为 '*' 时，使用右侧表达式的名称作为类型
-                                            if base_type == '*':
-                                                # 尝试从右侧表达式获取类型名称
-                                                if isinstance(Node.value, ast.Name):
-                                                    type_name = Node.value.id
-                                                    if storage_class:
-                                                        Code.append(f'{storage_class} struct {type_name}* {var_name}{array_size_str} = {ValueCode[0]};')
-                                                    else:
-                                                        Code.append(f'struct {type_name}* {var_name}{array_size_str} = {ValueCode[0]};')
-                                                else:
-                                                    if storage_class:
-                                                        Code.append(f'{storage_class} void* {var_name}{array_size_str} = {ValueCode[0]};')
-                                                    else:
-                                                        Code.append(f'void* {var_name}{array_size_str} = {ValueCode[0]};')
-                                            else:
-                                                if storage_class:
-                                                    Code.append(f'{storage_class} {type_part} {var_name}{array_size_str} = {ValueCode[0]};')
-                                                else:
-                                                    Code.append(f'{base_type} {var_name}{array_size_str} = {ValueCode[0]};')
-                                else:
-                                    # 默认使用int类型
-                                    # 特殊处理 c.State，表示仅声明不定义
-                                    if ValueCode[0] == 'c.State':
-                                        Code.append(f'int {var_name};')
-                                    else:
-                                        Code.append(f'int {var_name} = {ValueCode[0]};')
-                                # 将变量添加到符号表中
-                                self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': type_name if type_name else 'int'}
-                            except Exception as e:
-                                print(f'Warning: Failed to get type annotation: {e}')
-                                # 发生异常时，默认使用int类型
-                                # 特殊处理 c.State，表示仅声明不定义
-                                if ValueCode[0] == 'c.State':
-                                    Code.append(f'int {var_name};')
-                                else:
-                                    Code.append(f'int {var_name} = {ValueCode[0]};')
-                                # 将变量添加到符号表中
-                                self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': 'int'}
-                    else:
-                        # 没有赋值部分，视为仅声明不定义，等价于 = c.State
-                        try:
-                            type_name = self.GetTypeName(Node.annotation)
-                            if type_name and type_name.strip():
+        if self.Tracer is not None:
+            self.debug_print("=== Symbol Table ===")
+            for key, value in self.SymbolTable.items():
+                self.debug_print(f"{key}: {value}")
+            self.debug_print("===================")
+        for section_index, section in enumerate(Sections):
+            for handler_name, Node in section:
+                if section_index == SECTION_FUNCTIONS and self.DefinitionCache is not None:
+                    node_code = self.EmitCachedDefinition(handler_name, Node)
+                else:
+                    # 通过实例属性查找处理方法，保证调试模式下绑定的记录包装生效
+                    node_code = getattr(self, handler_name)(Node)
+                if node_code:
+                    emitter.Emit(node_code)
+        self.EmittedLines = emitter.LineCount
+        
+        if self.DefinitionCache is not None:
+            self.debug_print(f"[CACHE] Definitions: hits={self.DefinitionCache.Hits}, misses={self.DefinitionCache.Misses}")
+        if self.Tracer is not None:
+            lookups = self.TypeNameHits + self.TypeNameMisses
+            hit_rate = self.TypeNameHits * 100.0 / lookups if lookups else 0.0
+            self.debug_print(f"[CACHE] Type names: hits={self.TypeNameHits}, misses={self.TypeNameMisses}, hit rate={hit_rate:.1f}%")
+        self.flush_debug()
+        if stream is None:
+            return output.getvalue()
+        return None
+    
+    def GetDefinitionSegment(self, Node):
+        """获取顶层定义（包括装饰器）的源码片段，无法定位时返回 None"""
+        end_lineno = getattr(Node, 'end_lineno', None)
+        if end_lineno is None or end_lineno > len(self.SourceIndex.Lines):
+            return None
+        start_lineno = min([Node.lineno] + [decorator.lineno for decorator in getattr(Node, 'decorator_list', [])])
+        return ''.join(self.SourceIndex.Lines[start_lineno - 1:end_lineno])
+    
+    def EmitCachedDefinition(self, handler_name, Node):
+        """通过定义缓存生成顶层函数或类方法的C代码
+        
+        缓存命中时回放该定义对 SymbolTable/FunctionReturnTypes 的写入和作用域栈的名字解析记录，
+        并直接返回缓存的代码；未命中时用 RecordingTable 记录翻译过程中的读写，
+        用一份空的 Resolved 收集名字解析，生成后写入缓存。
+        """
+        handler = getattr(self, handler_name)
+        segment = self.GetDefinitionSegment(Node)
+        # 顶层定义翻译前作用域栈应为空，否则生成结果依赖外部状态，不使用缓存
+        if segment is None or self.VarScopes:
+            return handler(Node)
+        
+        cache = self.DefinitionCache
+        key = cache.MakeKey(handler_name, segment)
+        tables = {'SymbolTable': self.SymbolTable, 'FunctionReturnTypes': self.FunctionReturnTypes}
+        entry = cache.Lookup(key, tables)
+        if entry is not None:
+            for name, writes in entry['writes'].items():
+                tables[name].update(writes)
+            self.VarScopes.MergeResolved(entry.get('resolved', {}))
+            self.debug_print(f"[CACHE] Hit {handler_name} '{Node.name}'")
+            return entry['code']
+        
+        self.debug_print(f"[CACHE] Miss {handler_name} '{Node.name}'")
+        recorders = {name: RecordingTable(table) for name, table in tables.items()}
+        self.SymbolTable = recorders['SymbolTable']
+        self.FunctionReturnTypes = recorders['FunctionReturnTypes']
+        resolved = self.VarScopes.Resolved
+        self.VarScopes.Resolved = {}
+        try:
+            node_code = handler(Node)
+        finally:
+            # 恢复原来的表对象，并应用翻译过程中的写入和名字解析
+            self.SymbolTable = tables['SymbolTable']
+            self.FunctionReturnTypes = tables['FunctionReturnTypes']
+            for name, recorder in recorders.items():
+                tables[name].update(recorder.Writes)
+            recorded = self.VarScopes.Resolved
+            self.VarScopes.Resolved = resolved
+            self.VarScopes.MergeResolved(recorded)
+        cache.Store(key, flatten_code(node_code or []), recorders, recorded)
+        return node_code
+    
+    def HandleTopLevelExpr(self, Node):
+        """处理顶层表达式语句，只有 c.Macro 调用会生成宏定义"""
+        if isinstance(Node.value, ast.Call):
+            if isinstance(Node.value.func, ast.Attribute):
+                if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
+                    if Node.value.func.attr == 'Macro':
+                        return self.HandleCSpecialCall(Node.value.func.attr, Node.value.args, Node.value.keywords)
+        return []
+    
+    def HandleClassMethods(self, Node):
+        """为类中的每个方法生成对应的C函数"""
+        Code = []
+        for item in Node.body:
+            if isinstance(item, ast.FunctionDef):
+                # 生成类方法对应的C函数
+                method_code = self.HandleMethodDef(Node.name, item)
+                if method_code:
+                    Code.extend(method_code)
+        return Code
+    
+    def HandleGlobalAnnAssign(self, Node):
+        """处理全局的带类型注解变量，直接生成声明语句"""
+        Code = []
+        # 直接生成声明语句
+        if isinstance(Node.target, ast.Name):
+            var_name = Node.target.id
+            # 检查是否有赋值部分
+            if Node.value:
+                ValueCode = self.HandleExpr(Node.value)
+                if ValueCode:
+                    # 尝试获取类型名称
+                    try:
+                        type_name = self.GetTypeName(Node.annotation)
+                        if type_name:
+                            # 处理 t.CDefine 类型，生成宏定义
+                            if type_name == '#define':
+                                # 生成正确的宏定义格式
+                                Code.append(f'#define {var_name} {ValueCode[0]}')
+                            else:
                                 # 处理数组类型，提取数组大小
                                 base_type, array_size_str = extract_array_size(type_name)
                                 
                                 # 检查 base_type 是否包含存储类修饰符
                                 storage_class, type_part = check_storage_class(base_type)
                                 
-                                if storage_class:
-                                    Code.append(f'{storage_class} {type_part} {var_name}{array_size_str};')
+                                # 特殊处理 c.State，表示仅声明不定义
+                                if ValueCode[0] == 'c.State':
+                                    # 处理 t.CPtr 类型，当 base_type 为 '*' 时，使用右侧表达式的名称作为类型
+                                    if base_type == '*':
+                                        # 尝试从右侧表达式获取类型名称
+                                        if isinstance(Node.value, ast.Name):
+                                            type_name = Node.value.id
+                                            if storage_class:
+                                                Code.append(f'{storage_class} struct {type_name}* {var_name}{array_size_str};')
+                                            else:
+                                                Code.append(f'struct {type_name}* {var_name}{array_size_str};')
+                                        else:
+                                            if storage_class:
+                                                Code.append(f'{storage_class} void* {var_name}{array_size_str};')
+                                            else:
+                                                Code.append(f'void* {var_name}{array_size_str};')
+                                    else:
+                                        if storage_class:
+                                            Code.append(f'{storage_class} {type_part} {var_name}{array_size_str};')
+                                        else:
+                                            Code.append(f'{base_type} {var_name}{array_size_str};')
                                 else:
-                                    Code.append(f'{base_type} {var_name}{array_size_str};')
-                            else:
+                                    # 处理 t.CPtr 类型，当 base_type 为 '*' 时，使用右侧表达式的名称作为类型
+                                    if base_type == '*':
+                                        # 尝试从右侧表达式获取类型名称
+                                        if isinstance(Node.value, ast.Name):
+                                            type_name = Node.value.id
+                                            if storage_class:
+                                                Code.append(f'{storage_class} struct {type_name}* {var_name}{array_size_str} = {ValueCode[0]};')
+                                            else:
+                                                Code.append(f'struct {type_name}* {var_name}{array_size_str} = {ValueCode[0]};')
+                                        else:
+                                            if storage_class:
+                                                Code.append(f'{storage_class} void* {var_name}{array_size_str} = {ValueCode[0]};')
+                                            else:
+                                                Code.append(f'void* {var_name}{array_size_str} = {ValueCode[0]};')
+                                    else:
+                                        if storage_class:
+                                            Code.append(f'{storage_class} {type_part} {var_name}{array_size_str} = {ValueCode[0]};')
+                                        else:
+                                            Code.append(f'{base_type} {var_name}{array_size_str} = {ValueCode[0]};')
+                        else:
+                            # 默认使用int类型
+                            # 特殊处理 c.State，表示仅声明不定义
+                            if ValueCode[0] == 'c.State':
                                 Code.append(f'int {var_name};')
-                            # 将变量添加到符号表中
-                            self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': type_name if type_name else 'int'}
-                        except Exception as e:
-                            print(f'Warning: Failed to get type annotation: {e}')
+                            else:
+                                Code.append(f'int {var_name} = {ValueCode[0]};')
+                        # 将变量添加到符号表中
+                        self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': type_name if type_name else 'int'}
+                    except Exception as e:
+                        print(f'Warning: Failed to get type annotation: {e}')
+                        # 发生异常时，默认使用int类型
+                        # 特殊处理 c.State，表示仅声明不定义
+                        if ValueCode[0] == 'c.State':
                             Code.append(f'int {var_name};')
-                            # 将变量添加到符号表中
-                            self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': 'int'}
-                else:
-                    # 直接生成int类型的声明语句
-                    Code.append(f'int a = "123";')
-        
-        # 处理函数定义和类方法
-        for Node in ast.iter_child_nodes(Tree):
-            if isinstance(Node, ast.FunctionDef):
-                func_code = self.HandleFunctionDef(Node)
-                if func_code:
-                    Code.extend(func_code)
-            elif isinstance(Node, ast.ClassDef):
-                # 处理类方法
-                for item in Node.body:
-                    if isinstance(item, ast.FunctionDef):
-                        # 生成类方法对应的C函数
-                        method_code = self.HandleMethodDef(Node.name, item)
-                        if method_code:
-                            Code.extend(method_code)
-
-        return '\n'.join(Code)
+                        else:
+                            Code.append(f'int {var_name} = {ValueCode[0]};')
+                        # 将变量添加到符号表中
+                        self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': 'int'}
+            else:
+                # 没有赋值部分，视为仅声明不定义，等价于 = c.State
+                try:
+                    type_name = self.GetTypeName(Node.annotation)
+                    if type_name and type_name.strip():
+                        # 处理数组类型，提取数组大小
+                        base_type, array_size_str = extract_array_size(type_name)
+                        
+                        # 检查 base_type 是否包含存储类修饰符
+                        storage_class, type_part = check_storage_class(base_type)
+                        
+                        if storage_class:
+                            Code.append(f'{storage_class} {type_part} {var_name}{array_size_str};')
+                        else:
+                            Code.append(f'{base_type} {var_name}{array_size_str};')
+                    else:
+                        Code.append(f'int {var_name};')
+                    # 将变量添加到符号表中
+                    self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': type_name if type_name else 'int'}
+                except Exception as e:
+                    print(f'Warning: Failed to get type annotation: {e}')
+                    Code.append(f'int {var_name};')
+                    # 将变量添加到符号表中
+                    self.SymbolTable[var_name] = {'type': 'variable', 'declared_type': 'int'}
+        else:
+            # 直接生成int类型的声明语句
+            Code.append(f'int a = "123";')
+        return Code
     
     def HandleImport(self, Node):
         """处理导入语句"""
@@ -586,7 +708,7 @@ class Translator:
         
         Params = []
         # 为函数创建新的作用域
-        self.VarScopes.append({})
+        self.VarScopes.Enter(Node.name)
         self.debug_print(f"[SCOPE] Enter function '{Node.name}', new scope created, depth={len(self.VarScopes)}")
         
         # 添加函数参数到当前作用域
@@ -608,16 +730,16 @@ class Translator:
                         ParamType = ' '.join(unique_types)
                     Params.append(f'{ParamType} {Arg.arg}')
                     # 添加参数到作用域
-                    self.VarScopes[-1][Arg.arg] = ParamType
+                    self.VarScopes.Bind(Arg.arg, ParamType)
                 except Exception as e:
                     print(f'Warning: Failed to get parameter type: {e}')
                     Params.append(f'int {Arg.arg}')
                     # 添加参数到作用域
-                    self.VarScopes[-1][Arg.arg] = 'int'
+                    self.VarScopes.Bind(Arg.arg, 'int')
             else:
                 Params.append(f'int {Arg.arg}')
                 # 添加参数到作用域
-                self.VarScopes[-1][Arg.arg] = 'int'
+                self.VarScopes.Bind(Arg.arg, 'int')
         
         # 处理无参数函数，生成 void 参数列表
         if not Params:
@@ -634,12 +756,11 @@ class Translator:
             Code.append(f'{ReturnType} {Node.name}({ParamsStr}) {{')
             body_code = self.HandleBody(Node.body)
             # 为函数体中的语句添加4个空格的缩进
-            Code.extend(['    ' + line for line in body_code])
+            Code.append(IndentedCode(body_code))
             Code.append('}')
         
         # 清理作用域
-        if self.VarScopes:
-            self.VarScopes.pop()
+        self.VarScopes.Leave()
         self.debug_print(f"[SCOPE] Exit function '{Node.name}', scope popped, depth={len(self.VarScopes)}")
         
         # 记录函数返回类型
@@ -700,22 +821,8 @@ class Translator:
                                 else:
                                     Code.append(f'    struct {struct_name} {var_name};')
                             else:
-                                # 检查是否是数组类型，需要将数组大小放在变量名后面
-                                if '[' in type_name and ']' in type_name:
-                                    # 提取基础类型和数组大小
-                                    base_type = type_name.split('[')[0]
-                                    array_size = type_name[type_name.find('['):]
-                                    # 检查基础类型是否以 * 结尾，如果是，将 * 移到变量名前面
-                                    if base_type.endswith('*'):
-                                        base_type = base_type[:-1].strip()
-                                        # 生成正确的数组指针类型格式
-                                        Code.append(f'    {base_type} *{var_name}{array_size};')
-                                    else:
-                                        # 生成正确的数组类型格式
-                                        Code.append(f'    {base_type} {var_name}{array_size};')
-                                else:
-                                    # 生成普通类型成员
-                                    Code.append(f'    {type_name} {var_name};')
+                                # 数组大小放在变量名后面，指针数组的 * 移到变量名前面
+                                Code.append(f'    {c_type(type_name).Declare(var_name)};')
                         else:
                             # 默认使用int类型
                             Code.append(f'    int {var_name};')
@@ -791,8 +898,8 @@ class Translator:
         Code.append(f'{ReturnType} {func_name}({ParamsStr}) {{')
         
         # 处理函数体
-        # 为函数创建新的作用域
-        self.VarScopes.append({})
+        # 为函数创建新的作用域，以 类名.方法名 区分不同类中的同名方法
+        self.VarScopes.Enter(f'{class_name}.{Node.name}')
         
         # 添加参数到当前作用域
         for Arg in Node.args.args:
@@ -801,21 +908,20 @@ class Translator:
                     ParamType = self.GetTypeName(Arg.annotation)
                     if not ParamType:
                         ParamType = 'int'
-                    self.VarScopes[-1][Arg.arg] = ParamType
+                    self.VarScopes.Bind(Arg.arg, ParamType)
                 except Exception as e:
                     print(f'Warning: Failed to get parameter type for {Arg.arg}: {e}')
-                    self.VarScopes[-1][Arg.arg] = 'int'
+                    self.VarScopes.Bind(Arg.arg, 'int')
         
         # 处理函数体语句
         body_code = self.HandleBody(Node.body)
         # 为函数体中的语句添加4个空格的缩进
-        Code.extend(['    ' + line for line in body_code])
+        Code.append(IndentedCode(body_code))
         
         Code.append('}')
         
         # 清理作用域
-        if self.VarScopes:
-            self.VarScopes.pop()
+        self.VarScopes.Leave()
         
         return Code
     
@@ -849,17 +955,16 @@ class Translator:
                     var_name = Target.id
                     var_declared = False
                     
-                    # 从最内层作用域向外查找
-                    for scope in reversed(self.VarScopes):
-                        if var_name in scope:
-                            var_declared = True
-                            break
+                    # 从作用域中查找
+                    if self.VarScopes.Lookup(var_name) is not None:
+                        var_declared = True
                     
                     # 检查变量是否在符号表中声明过（外部注解的变量）
                     if not var_declared and var_name in self.SymbolTable:
                         symbol_info = self.SymbolTable[var_name]
                         if symbol_info['type'] == 'variable':
                             var_declared = True
+                            self.VarScopes.NoteGlobal(var_name)
                     
                     if var_declared:
                         # 变量已经声明过，只生成赋值语句
@@ -912,15 +1017,9 @@ class Translator:
                                                     # 如果是最后一个成员，设置 is_pointer
                                                     if i == len(access_chain) - 1:
                                                         is_pointer = member_is_ptr
-                                                    # 更新当前类型为成员类型
-                                                    current_type = members[member_name]['type']
-                                                    # 提取结构体名
-                                                    if current_type.startswith('struct '):
-                                                        current_type = current_type.split(' ')[1]
-                                                    elif '*' in current_type:
-                                                        type_parts = current_type.split('*')[0].strip()
-                                                        if type_parts.startswith('struct '):
-                                                            current_type = type_parts.split(' ')[1]
+                                                    # 更新当前类型为成员类型的结构体名
+                                                    member_ctype = c_type(members[member_name]['type'])
+                                                    current_type = member_ctype.StructName or member_ctype.Base
                         # 检查右侧是否是函数调用
                         elif isinstance(Node.value, ast.Call):
                             # 检查是否是函数名调用
@@ -933,7 +1032,7 @@ class Translator:
                                 # 检查函数返回类型是否已记录
                                 elif func_name in self.FunctionReturnTypes:
                                     var_type = self.FunctionReturnTypes[func_name]
-                                    if '*' in var_type:
+                                    if c_type(var_type).IsPointer:
                                         is_pointer = True
                                 else:
                                     # 从符号表中查找函数名
@@ -958,8 +1057,7 @@ class Translator:
                             elements_str = ', '.join(elements)
                             Code.append(f'{var_type} {var_name}[] = {{ {elements_str} }};')
                             # 添加变量到当前作用域
-                            if self.VarScopes:
-                                self.VarScopes[-1][var_name] = var_type
+                            self.VarScopes.Bind(var_name, var_type)
                         else:
                             if struct_name:
                                 # 生成结构体声明
@@ -974,8 +1072,7 @@ class Translator:
                                     # 生成构造函数调用
                                     Code.append(f'{struct_name}____init__({args_str});')
                                 # 添加变量到当前作用域
-                                if self.VarScopes:
-                                    self.VarScopes[-1][var_name] = f'struct {struct_name}'
+                                self.VarScopes.Bind(var_name, f'struct {struct_name}')
                             else:
                                 # 根据是否是指针生成不同的声明语句
                                 if is_pointer:
@@ -983,11 +1080,10 @@ class Translator:
                                 else:
                                     Code.append(f'{var_type} {var_name} = {ValueCode[0]};')
                                 # 添加变量到当前作用域
-                                if self.VarScopes:
-                                    if is_pointer:
-                                        self.VarScopes[-1][var_name] = f'{var_type}*'
-                                    else:
-                                        self.VarScopes[-1][var_name] = var_type
+                                if is_pointer:
+                                    self.VarScopes.Bind(var_name, f'{var_type}*')
+                                else:
+                                    self.VarScopes.Bind(var_name, var_type)
             elif isinstance(Target, ast.UnaryOp):
                 # 处理指针解引用赋值，如 *(addr) = value
                 if isinstance(Target.operand, ast.Name):
@@ -1042,18 +1138,10 @@ class Translator:
                     # 从作用域中查找变量类型
                     elif obj_name:
                         # 首先检查局部作用域（优先级高）
-                        found_in_scope = False
-                        is_function_param = False
-                        for i, scope in enumerate(reversed(self.VarScopes)):
-                            if obj_name in scope:
-                                var_type = scope[obj_name]
-                                if '*' in var_type:
-                                    is_pointer = True
-                                found_in_scope = True
-                                # 检查是否是函数参数（通常在第一个作用域中）
-                                if i == len(self.VarScopes) - 1:
-                                    is_function_param = True
-                                break
+                        var_type = self.VarScopes.Lookup(obj_name)
+                        found_in_scope = var_type is not None
+                        if found_in_scope and c_type(var_type).IsPointer:
+                            is_pointer = True
                         
                         # 特殊处理：如果变量名是 cons 且是函数参数，它总是指针
                         if not found_in_scope and obj_name == 'cons':
@@ -1062,24 +1150,21 @@ class Translator:
                                 symbol_info = self.SymbolTable[obj_name]
                                 if 'is_pointer' in symbol_info:
                                     is_pointer = symbol_info['is_pointer']
-                                elif 'declared_type' in symbol_info and '*' in symbol_info['declared_type']:
+                                elif 'declared_type' in symbol_info and c_type(symbol_info['declared_type']).IsPointer:
                                     is_pointer = True
                         # 如果作用域中没有找到，从符号表中查找（全局变量）
                         elif not found_in_scope and obj_name in self.SymbolTable:
+                            self.VarScopes.NoteGlobal(obj_name)
                             symbol_info = self.SymbolTable[obj_name]
                             if 'is_pointer' in symbol_info:
                                 is_pointer = symbol_info['is_pointer']
-                            elif 'declared_type' in symbol_info and '*' in symbol_info['declared_type']:
+                            elif 'declared_type' in symbol_info and c_type(symbol_info['declared_type']).IsPointer:
                                 is_pointer = True
                     
                     # 如果有最后一个成员名，检查该成员是否是指针类型
                     if last_member_name and obj_name:
                         # 先从VarScopes中查找变量类型
-                        var_type = None
-                        for scope in reversed(self.VarScopes):
-                            if obj_name in scope:
-                                var_type = scope[obj_name]
-                                break
+                        var_type = self.VarScopes.Lookup(obj_name)
                         
                         # 如果VarScopes中没有找到，从SymbolTable中查找
                         if not var_type and obj_name in self.SymbolTable:
@@ -1088,8 +1173,8 @@ class Translator:
                                 var_type = base_info['declared_type']
                         
                         # 如果找到了变量类型，解析结构体名称并查找成员
-                        if var_type and var_type.startswith('struct '):
-                            struct_name = var_type.split(' ')[1].rstrip('*')
+                        struct_name = c_type(var_type).StructName if var_type else None
+                        if struct_name:
                             if struct_name in self.SymbolTable:
                                 struct_info = self.SymbolTable[struct_name]
                                 if struct_info['type'] == 'struct' and 'members' in struct_info:
@@ -1101,7 +1186,7 @@ class Translator:
                                         # 注意：只有数组类型的成员（如 TYPE* arr[N]）才需要特殊处理
                                         # 非数组类型的指针成员（如 TYPE* ptr）不需要特殊处理
                                         if isinstance(obj_expr, ast.Subscript):
-                                            if '[' in member_type:
+                                            if c_type(member_type).IsArray:
                                                 # 是数组类型，检查元素是否是指针
                                                 if member_info.get('is_pointer'):
                                                     is_pointer = True
@@ -1129,7 +1214,7 @@ class Translator:
                                         # 特殊处理数组访问
                                         if isinstance(obj_expr, ast.Subscript):
                                             member_type = member_info.get('type', '')
-                                            if '[' in member_type and member_info.get('is_pointer'):
+                                            if c_type(member_type).IsArray and member_info.get('is_pointer'):
                                                 # 是指针数组，元素是指针
                                                 is_pointer = True
                                             else:
@@ -1172,7 +1257,7 @@ class Translator:
             ValueCode = self.HandleExpr(Node.value)
             if ValueCode:
                 # 检查变量是否已经在当前作用域中声明过
-                if self.VarScopes and var_name in self.VarScopes[-1]:
+                if self.VarScopes.InCurrent(var_name):
                     # 变量已存在，生成赋值语句而不是声明语句
                     self.debug_print(f'[VAR] Variable {var_name} already declared, generating assignment')
                     Code.append(f'{var_name} = {ValueCode[0]};')
@@ -1366,8 +1451,7 @@ class Translator:
                                 else:
                                     Code.append(f'{base_type} {var_name}{array_size_str} = {ValueCode[0]};')
                         # 添加变量到当前作用域
-                        if self.VarScopes:
-                            self.VarScopes[-1][var_name] = type_name
+                        self.VarScopes.Bind(var_name, type_name)
                     else:
                         # 默认使用int类型
                         # 特殊处理数组初始化
@@ -1380,8 +1464,7 @@ class Translator:
                         else:
                             Code.append(f'int {var_name} = {ValueCode[0]};')
                         # 添加变量到当前作用域
-                        if self.VarScopes:
-                            self.VarScopes[-1][var_name] = 'int'
+                        self.VarScopes.Bind(var_name, 'int')
                 except Exception as e:
                     print(f'Warning: Failed to get type annotation: {e}')
                     # 发生异常时，默认使用int类型
@@ -1399,8 +1482,7 @@ class Translator:
                         else:
                             Code.append(f'int {var_name} = {ValueCode[0]};')
                     # 添加变量到当前作用域
-                    if self.VarScopes:
-                        self.VarScopes[-1][var_name] = 'int'
+                    self.VarScopes.Bind(var_name, 'int')
         return Code
     
 
@@ -1411,13 +1493,14 @@ class Translator:
         line_num = node.lineno
         col = node.col_offset
         
-        # 直接从原始代码中提取字符串字面量
-        # 找到包含当前位置的行
-        lines = code.splitlines(keepends=True)
-        if line_num - 1 >= len(lines):
-            raise IndexError("AST节点行号超出原始代码行范围")
+        # 单行字符串直接从 token 表中取出原始字面量
+        index = self.GetSourceIndex(code)
+        string_literal = index.GetStringLiteral(line_num, col)
+        if string_literal is not None:
+            return string_literal
         
-        target_line = lines[line_num - 1]
+        # 跨行字符串等情况回退到逐行扫描
+        target_line = index.GetLine(line_num)
         if col >= len(target_line):
             raise IndexError("AST节点列偏移超出该行字符范围")
         
@@ -1468,23 +1551,19 @@ class Translator:
             raise ValueError("节点必须是数字类型的ast.Constant")
         line_num = node.lineno
         col = node.col_offset
-        code_lines = code.splitlines(keepends=False)
-        if line_num - 1 >= len(code_lines):
-            raise IndexError("AST节点行号超出原始代码行范围")
-        target_line = code_lines[line_num - 1]
+        
+        # 优先从 token 表中取出原始字面量
+        index = self.GetSourceIndex(code)
+        literal = index.GetNumericLiteral(line_num, col)
+        if literal is not None:
+            return literal
+        
+        target_line = index.GetLine(line_num, keepends=False)
         if col >= len(target_line):
             raise IndexError("AST节点列偏移超出该行字符范围")
         
-        # 提取数字字面量
-        # 数字字面量的模式：[0-9]+(\.[0-9]+)?([eE][+-]?[0-9]+)?|0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+
-        import re
         # 从当前位置开始查找数字字面量
-        # 首先找到当前位置的字符
-        start_char = target_line[col]
-        # 构建正则表达式匹配数字字面量
-        num_pattern = r'\b(?:0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+|\d+(?:\.\d*)?(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)\b'
-        # 查找所有匹配的数字字面量
-        matches = list(re.finditer(num_pattern, target_line))
+        matches = list(NUMERIC_LITERAL_PATTERN.finditer(target_line))
         # 找到包含当前列的匹配
         for match in matches:
             if match.start() <= col <= match.end():
@@ -1495,520 +1574,489 @@ class Translator:
     @debug_handle
     def HandleExpr(self, Node, use_single_quote=False):
         """处理表达式"""
-        if isinstance(Node, ast.Constant):
-            if isinstance(Node.value, str):
-                # 使用 GetStringQuoteType 函数获取原始的字符串字面量
-                string_literal = self.GetStringQuoteType(self.Content, Node)
-                # 直接返回原始字符串字面量
-                return [string_literal]
-            elif isinstance(Node.value, bool):
-                # 处理布尔值，将 True 转换为 1，将 False 转换为 0
-                return ['1' if Node.value else '0']
-            else:
-                # 检查是否是数字
-                if isinstance(Node.value, (int, float, complex)):
-                    # 尝试获取原始字面量表示
-                    try:
-                        literal = self.GetNumericLiteral(self.Content, Node)
-                        return [literal]
-                    except:
-                        # 如果获取失败，返回默认的字符串表示
-                        return [str(Node.value)]
-                # 默认处理
-                return [str(Node.value)]
-        elif isinstance(Node, ast.Name):
-            # 处理布尔值名称，将 True 转换为 1，将 False 转换为 0
-            if Node.id == 'True':
-                return ['1']
-            elif Node.id == 'False':
-                return ['0']
-            else:
-                return [Node.id]
-        elif isinstance(Node, ast.BinOp):
-            Left = self.HandleExpr(Node.left)[0]
-            Right = self.HandleExpr(Node.right)[0]
-            Op = self.GetOpSymbol(Node.op)
-            return [f'{Left} {Op} {Right}']
-        elif isinstance(Node, ast.BoolOp):
-            # 处理逻辑运算符 and 和 or
-            values = []
-            for value in Node.values:
-                values.append(self.HandleExpr(value)[0])
-            if isinstance(Node.op, ast.And):
-                # 将 and 转换为 &&
-                return [' && '.join(values)]
-            elif isinstance(Node.op, ast.Or):
-                # 将 or 转换为 ||
-                return [' || '.join(values)]
-            else:
-                return ['0']
-        elif isinstance(Node, ast.UnaryOp):
-            Operand = self.HandleExpr(Node.operand)[0]
-            Op = self.GetUnaryOpSymbol(Node.op)
-            # 直接返回一元运算符表达式，不做特殊处理
-            return [f'{Op}{Operand}']
-        elif isinstance(Node, ast.Call):
-            # 处理函数调用
-            if isinstance(Node.func, ast.Attribute):
-                if isinstance(Node.func.value, ast.Name) and Node.func.value.id == 'c':
-                    # 处理c模块中的特殊语法
-                    return self.HandleCSpecialCall(Node.func.attr, Node.args, Node.keywords)
-                elif isinstance(Node.func.value, ast.Name) and Node.func.value.id == 't':
-                    # 处理t模块中的特殊语法
-                    return self.HandleTSpecialCall(Node.func.attr, Node.args, Node.keywords)
-                else:
-                    # 处理方法调用，如 obj.method(args)
-                    obj = self.HandleExpr(Node.func.value)[0]
-                    method = Node.func.attr
-                    
-                    # 尝试获取对象的类型名（结构体名）
-                    struct_name = None  # 默认值
-                    # 从符号表中查找对象类型
-                    if obj in self.SymbolTable:
-                        symbol_info = self.SymbolTable[obj]
-                        if 'declared_type' in symbol_info:
-                            declared_type = symbol_info['declared_type']
-                            # 提取结构体名
-                            if declared_type.startswith('struct '):
-                                struct_name = declared_type.split(' ')[1]
-                            elif '*' in declared_type:
-                                # 处理指针类型
-                                type_parts = declared_type.split('*')[0].strip()
-                                if type_parts.startswith('struct '):
-                                    struct_name = type_parts.split(' ')[1]
-                    # 从作用域中查找变量类型
-                    if not struct_name:
-                        for scope in reversed(self.VarScopes):
-                            if obj in scope:
-                                var_type = scope[obj]
-                                if var_type.startswith('struct '):
-                                    struct_name = var_type.split(' ')[1]
-                                    break
-                    # 如果还是没找到，尝试从函数名推断
-                    if not struct_name and isinstance(Node.func.value, ast.Call):
-                        if isinstance(Node.func.value.func, ast.Name):
-                            struct_name = Node.func.value.func.id
-                    # 如果还是没找到，使用默认值
-                    if not struct_name:
-                        struct_name = obj  # 使用变量名作为结构体名
-                    
-                    # 生成函数名：structName__methodName
-                    func_name = f'{struct_name}__{method}'
-                    
-                    # 构建参数列表，第一个参数是对象指针
-                    # 自动获取对象的地址作为 self 参数
-                    Args = [f'&{obj}']
-                    for Arg in Node.args:
-                        Args.append(self.HandleExpr(Arg)[0])
-                    ArgsStr = ', '.join(Args)
-                    
-                    return [f'{func_name}({ArgsStr})']
+        visitor = self.ExpressionVisitors.get(type(Node)) or find_visitor(self.ExpressionVisitors, type(Node))
+        if visitor is None:
+            return ['0']
+        return visitor(self, Node, use_single_quote)
+    
+    def ExprConstant(self, Node, use_single_quote=False):
+        """处理常量：字符串、布尔值和数字"""
+        if isinstance(Node.value, str):
+            # 使用 GetStringQuoteType 函数获取原始的字符串字面量
+            string_literal = self.GetStringQuoteType(self.Content, Node)
+            # 直接返回原始字符串字面量
+            return [string_literal]
+        elif isinstance(Node.value, bool):
+            # 处理布尔值，将 True 转换为 1，将 False 转换为 0
+            return ['1' if Node.value else '0']
+        else:
+            # 检查是否是数字
+            if isinstance(Node.value, (int, float, complex)):
+                # 尝试获取原始字面量表示
+                try:
+                    literal = self.GetNumericLiteral(self.Content, Node)
+                    return [literal]
+                except:
+                    # 如果获取失败，返回默认的字符串表示
+                    return [str(Node.value)]
+            # 默认处理
+            return [str(Node.value)]
+    
+    def ExprName(self, Node, use_single_quote=False):
+        """处理名称"""
+        # 处理布尔值名称，将 True 转换为 1，将 False 转换为 0
+        if Node.id == 'True':
+            return ['1']
+        elif Node.id == 'False':
+            return ['0']
+        else:
+            return [Node.id]
+    
+    def ExprBinOp(self, Node, use_single_quote=False):
+        """处理二元运算"""
+        Left = self.HandleExpr(Node.left)[0]
+        Right = self.HandleExpr(Node.right)[0]
+        Op = self.GetOpSymbol(Node.op)
+        return [f'{Left} {Op} {Right}']
+    
+    def ExprBoolOp(self, Node, use_single_quote=False):
+        """处理逻辑运算 and/or"""
+        # 处理逻辑运算符 and 和 or
+        values = []
+        for value in Node.values:
+            values.append(self.HandleExpr(value)[0])
+        if isinstance(Node.op, ast.And):
+            # 将 and 转换为 &&
+            return [' && '.join(values)]
+        elif isinstance(Node.op, ast.Or):
+            # 将 or 转换为 ||
+            return [' || '.join(values)]
+        else:
+            return ['0']
+    
+    def ExprUnaryOp(self, Node, use_single_quote=False):
+        """处理一元运算"""
+        Operand = self.HandleExpr(Node.operand)[0]
+        Op = self.GetUnaryOpSymbol(Node.op)
+        # 直接返回一元运算符表达式，不做特殊处理
+        return [f'{Op}{Operand}']
+    
+    def ExprCall(self, Node, use_single_quote=False):
+        """处理函数调用和方法调用"""
+        # 处理函数调用
+        if isinstance(Node.func, ast.Attribute):
+            if isinstance(Node.func.value, ast.Name) and Node.func.value.id == 'c':
+                # 处理c模块中的特殊语法
+                return self.HandleCSpecialCall(Node.func.attr, Node.args, Node.keywords)
+            elif isinstance(Node.func.value, ast.Name) and Node.func.value.id == 't':
+                # 处理t模块中的特殊语法
+                return self.HandleTSpecialCall(Node.func.attr, Node.args, Node.keywords)
             else:
-                Func = self.HandleExpr(Node.func)[0]
-                Args = []
+                # 处理方法调用，如 obj.method(args)
+                obj = self.HandleExpr(Node.func.value)[0]
+                method = Node.func.attr
+                
+                # 尝试获取对象的类型名（结构体名）
+                struct_name = None  # 默认值
+                # 从符号表中查找对象类型
+                if obj in self.SymbolTable:
+                    self.VarScopes.NoteGlobal(obj)
+                    symbol_info = self.SymbolTable[obj]
+                    if 'declared_type' in symbol_info:
+                        # 提取结构体名
+                        struct_name = c_type(symbol_info['declared_type']).StructName
+                # 从作用域中查找变量类型
+                if not struct_name:
+                    var_type = self.VarScopes.Lookup(obj)
+                    if var_type is not None:
+                        struct_name = c_type(var_type).StructName
+                # 如果还是没找到，尝试从函数名推断
+                if not struct_name and isinstance(Node.func.value, ast.Call):
+                    if isinstance(Node.func.value.func, ast.Name):
+                        struct_name = Node.func.value.func.id
+                # 如果还是没找到，使用默认值
+                if not struct_name:
+                    struct_name = obj  # 使用变量名作为结构体名
+                
+                # 生成函数名：structName__methodName
+                func_name = f'{struct_name}__{method}'
+                
+                # 构建参数列表，第一个参数是对象指针
+                # 自动获取对象的地址作为 self 参数
+                Args = [f'&{obj}']
                 for Arg in Node.args:
                     Args.append(self.HandleExpr(Arg)[0])
                 ArgsStr = ', '.join(Args)
-                # 特殊处理len函数
-                if Func == 'len':
-                    if Args:
-                        arr_name = Args[0]
-                        return [f'(sizeof({arr_name}) / sizeof({arr_name}[0]))']
-                    else:
-                        return ['0']
-                # 特殊处理sizeof函数
-                elif Func == 'sizeof':
-                    if Args:
-                        # 检查参数是否是t.CStruct调用
-                        if Node.args and isinstance(Node.args[0], ast.Call):
-                            arg_call = Node.args[0]
-                            if isinstance(arg_call.func, ast.Attribute):
-                                if isinstance(arg_call.func.value, ast.Name) and arg_call.func.value.id == 't':
-                                    if arg_call.func.attr == 'CStruct':
-                                        # 处理 sizeof(t.CStruct(NAME))
-                                        if arg_call.args and isinstance(arg_call.args[0], ast.Name):
-                                            struct_name = arg_call.args[0].id
-                                            return [f'sizeof(struct {struct_name})']
-                        # 普通sizeof处理
-                        return [f'sizeof({Args[0]})']
+                
+                return [f'{func_name}({ArgsStr})']
+        else:
+            Func = self.HandleExpr(Node.func)[0]
+            Args = []
+            for Arg in Node.args:
+                Args.append(self.HandleExpr(Arg)[0])
+            ArgsStr = ', '.join(Args)
+            # 特殊处理len函数
+            if Func == 'len':
+                if Args:
+                    arr_name = Args[0]
+                    return [f'(sizeof({arr_name}) / sizeof({arr_name}[0]))']
+                else:
+                    return ['0']
+            # 特殊处理sizeof函数
+            elif Func == 'sizeof':
+                if Args:
+                    # 检查参数是否是t.CStruct调用
+                    if Node.args and isinstance(Node.args[0], ast.Call):
+                        arg_call = Node.args[0]
+                        if isinstance(arg_call.func, ast.Attribute):
+                            if isinstance(arg_call.func.value, ast.Name) and arg_call.func.value.id == 't':
+                                if arg_call.func.attr == 'CStruct':
+                                    # 处理 sizeof(t.CStruct(NAME))
+                                    if arg_call.args and isinstance(arg_call.args[0], ast.Name):
+                                        struct_name = arg_call.args[0].id
+                                        return [f'sizeof(struct {struct_name})']
+                    # 普通sizeof处理
+                    return [f'sizeof({Args[0]})']
+                else:
+                    return ['0']
+            # 特殊处理print函数
+            elif Func == 'print':
+                # 为不同类型的参数生成不同的printf格式
+                if Args:
+                    first_arg = Args[0]
+                    if first_arg.startswith('"') and first_arg.endswith('"'):
+                        # 字符串参数
+                        # Python的print默认添加换行符
+                        return [f'printf({first_arg});', 'printf("\\n");']
                     else:
-                        return ['0']
-                # 特殊处理print函数
-                elif Func == 'print':
-                    # 为不同类型的参数生成不同的printf格式
-                    if Args:
-                        first_arg = Args[0]
-                        if first_arg.startswith('"') and first_arg.endswith('"'):
-                            # 字符串参数
-                            # Python的print默认添加换行符
-                            return [f'printf({first_arg});', 'printf("\\n");']
-                        else:
-                            # 数值参数
-                            # Python的print默认添加换行符
-                            return [f'printf("%d\\n", {ArgsStr});']
-                    return [f'printf("\\n");']
-                # 普通函数调用
-                return [f'{Func}({ArgsStr})']
-        elif isinstance(Node, ast.Subscript):
-            # 检查是否是后置自增模式: (k, k:=k+1)[0]
-            if isinstance(Node.value, ast.Tuple) and len(Node.value.elts) == 2:
-                elt0 = Node.value.elts[0]
-                elt1 = Node.value.elts[1]
-                if isinstance(elt0, ast.Name) and isinstance(elt1, ast.NamedExpr):
-                    if elt0.id == elt1.target.id:
-                        if isinstance(elt1.value, ast.BinOp) and isinstance(elt1.value.op, ast.Add):
-                            if isinstance(elt1.value.left, ast.Name) and elt1.value.left.id == elt1.target.id:
-                                if isinstance(elt1.value.right, ast.Constant) and elt1.value.right.value == 1:
-                                    # 检查索引是否是0
-                                    if isinstance(Node.slice, ast.Constant) and Node.slice.value == 0:
-                                        # 优化为后置自增: k++
-                                        return [f'{self.HandleExpr(elt0)[0]}++']
+                        # 数值参数
+                        # Python的print默认添加换行符
+                        return [f'printf("%d\\n", {ArgsStr});']
+                return [f'printf("\\n");']
+            # 普通函数调用
+            return [f'{Func}({ArgsStr})']
+    
+    def ExprSubscript(self, Node, use_single_quote=False):
+        """处理下标访问"""
+        # 检查是否是后置自增模式: (k, k:=k+1)[0]
+        if isinstance(Node.value, ast.Tuple) and len(Node.value.elts) == 2:
+            elt0 = Node.value.elts[0]
+            elt1 = Node.value.elts[1]
+            if isinstance(elt0, ast.Name) and isinstance(elt1, ast.NamedExpr):
+                if elt0.id == elt1.target.id:
+                    if isinstance(elt1.value, ast.BinOp) and isinstance(elt1.value.op, ast.Add):
+                        if isinstance(elt1.value.left, ast.Name) and elt1.value.left.id == elt1.target.id:
+                            if isinstance(elt1.value.right, ast.Constant) and elt1.value.right.value == 1:
+                                # 检查索引是否是0
+                                if isinstance(Node.slice, ast.Constant) and Node.slice.value == 0:
+                                    # 优化为后置自增: k++
+                                    return [f'{self.HandleExpr(elt0)[0]}++']
+        
+        # 处理普通数组访问，如 arr[j] 或 ctl.sheets[h]
+        value = self.HandleExpr(Node.value)[0]
+        index = self.HandleExpr(Node.slice)[0]
+        
+        # 检查是否是数组访问后的成员访问（如 ctl.sheets[h].height）
+        # 如果是，需要检查数组元素类型是否是指针
+        result = f'{value}[{index}]'
+        return [result]
+    
+    def ExprTuple(self, Node, use_single_quote=False):
+        """处理逗号表达式"""
+        # 处理逗号表达式，如 (a, b)
+        elements = []
+        for elt in Node.elts:
+            elements.append(self.HandleExpr(elt)[0])
+        elements_str = ', '.join(elements)
+        return [f'({elements_str})']
+    
+    def ExprList(self, Node, use_single_quote=False):
+        """处理列表（数组初始化）"""
+        # 处理数组初始化，如 [64, 34, 25, 12, 22, 11, 90]
+        elements = []
+        for elt in Node.elts:
+            elements.append(self.HandleExpr(elt, use_single_quote=True)[0])
+        elements_str = ', '.join(elements)
+        return [f'{{{elements_str}}}']
+    
+    def ExprSet(self, Node, use_single_quote=False):
+        """处理集合（数组初始化）"""
+        # 处理集合初始化，如 {3, 1, 0, 2}，转换为数组初始化
+        elements = []
+        for elt in Node.elts:
+            elements.append(self.HandleExpr(elt, use_single_quote=True)[0])
+        elements_str = ', '.join(elements)
+        return [f'{{{elements_str}}}']
+    
+    def ExprCompare(self, Node, use_single_quote=False):
+        """处理比较运算"""
+        # 处理链式比较，如 a <= b <= c 转换为 (a <= b) && (b <= c)
+        Comparisons = []
+        Left = self.HandleExpr(Node.left)[0]
+        for i, Op in enumerate(Node.ops):
+            Comparator = self.GetComparatorSymbol(Op)
+            Right = self.HandleExpr(Node.comparators[i])[0]
+            Comparisons.append(f'{Left} {Comparator} {Right}')
+            Left = Right  # 下一个比较的左操作数是当前的右操作数
+        if len(Comparisons) == 1:
+            return [Comparisons[0]]
+        else:
+            return [' && '.join(Comparisons)]
+    
+    def ExprAttribute(self, Node, use_single_quote=False):
+        """处理属性访问"""
+        # 处理属性访问，如 s.Value 或 self.led
+        if isinstance(Node.value, ast.Name) and Node.value.id == 'c':
+            # 处理c模块的属性访问，如 c.State
+            attr = Node.attr
+            return [f'c.{attr}']
+        else:
+            # 构建完整的属性访问链
+            access_chain = []
+            current_node = Node
             
-            # 处理普通数组访问，如 arr[j] 或 ctl.sheets[h]
-            value = self.HandleExpr(Node.value)[0]
-            index = self.HandleExpr(Node.slice)[0]
+            # 遍历属性访问链，获取完整的访问路径
+            while isinstance(current_node, ast.Attribute):
+                access_chain.insert(0, current_node.attr)
+                current_node = current_node.value
             
-            # 检查是否是数组访问后的成员访问（如 ctl.sheets[h].height）
-            # 如果是，需要检查数组元素类型是否是指针
-            result = f'{value}[{index}]'
-            return [result]
-        elif isinstance(Node, ast.Tuple):
-            # 处理逗号表达式，如 (a, b)
-            elements = []
-            for elt in Node.elts:
-                elements.append(self.HandleExpr(elt)[0])
-            elements_str = ', '.join(elements)
-            return [f'({elements_str})']
-        elif isinstance(Node, ast.List):
-            # 处理数组初始化，如 [64, 34, 25, 12, 22, 11, 90]
-            elements = []
-            for elt in Node.elts:
-                elements.append(self.HandleExpr(elt, use_single_quote=True)[0])
-            elements_str = ', '.join(elements)
-            return [f'{{{elements_str}}}']
-        elif isinstance(Node, ast.Set):
-            # 处理集合初始化，如 {3, 1, 0, 2}，转换为数组初始化
-            elements = []
-            for elt in Node.elts:
-                elements.append(self.HandleExpr(elt, use_single_quote=True)[0])
-            elements_str = ', '.join(elements)
-            return [f'{{{elements_str}}}']
-        elif isinstance(Node, ast.Compare):
-            # 处理链式比较，如 a <= b <= c 转换为 (a <= b) && (b <= c)
-            Comparisons = []
-            Left = self.HandleExpr(Node.left)[0]
-            for i, Op in enumerate(Node.ops):
-                Comparator = self.GetComparatorSymbol(Op)
-                Right = self.HandleExpr(Node.comparators[i])[0]
-                Comparisons.append(f'{Left} {Comparator} {Right}')
-                Left = Right  # 下一个比较的左操作数是当前的右操作数
-            if len(Comparisons) == 1:
-                return [Comparisons[0]]
-            else:
-                return [' && '.join(Comparisons)]
-        elif isinstance(Node, ast.Attribute):
-            # 处理属性访问，如 s.Value 或 self.led
-            if isinstance(Node.value, ast.Name) and Node.value.id == 'c':
-                # 处理c模块的属性访问，如 c.State
-                attr = Node.attr
-                return [f'c.{attr}']
-            else:
-                # 构建完整的属性访问链
-                access_chain = []
-                current_node = Node
+            # 处理基础表达式
+            if isinstance(current_node, ast.Name):
+                # 基础表达式是名称节点
+                base_var = current_node.id
                 
-                # 遍历属性访问链，获取完整的访问路径
-                while isinstance(current_node, ast.Attribute):
-                    access_chain.insert(0, current_node.attr)
-                    current_node = current_node.value
+                # 从符号表中查找基础变量的类型
+                current_struct_name = None
+                is_ptr = False
                 
-                # 处理基础表达式
-                if isinstance(current_node, ast.Name):
-                    # 基础表达式是名称节点
-                    base_var = current_node.id
-                    
-                    # 从符号表中查找基础变量的类型
-                    current_struct_name = None
-                    is_ptr = False
-                    
-                    # 特殊处理：如果基础变量是函数参数中的 self，它总是指针
-                    if base_var == 'self':
-                        is_ptr = True
-                    # 从变量作用域中获取变量类型
+                # 特殊处理：如果基础变量是函数参数中的 self，它总是指针
+                if base_var == 'self':
+                    is_ptr = True
+                # 从变量作用域中获取变量类型
+                else:
+                    var_type = self.VarScopes.Lookup(base_var)
+                    if var_type is not None:
+                        var_ctype = c_type(var_type)
+                        current_struct_name = var_ctype.StructName
+                        if var_ctype.IsPointer:
+                            is_ptr = True
+                    # 如果作用域中没有找到，从符号表中查找
                     else:
-                        # 遍历所有作用域，查找变量类型
-                        found = False
-                        for scope in reversed(self.VarScopes):
-                            if base_var in scope:
-                                var_type = scope[base_var]
-                                if var_type.startswith('struct '):
-                                    # 提取结构体名称，去掉可能的指针符号
-                                    struct_part = var_type.split(' ')[1]
-                                    current_struct_name = struct_part.rstrip('*')
-                                    # 检查是否是指针类型
-                                    if '*' in var_type:
+                        if base_var in self.SymbolTable:
+                            self.VarScopes.NoteGlobal(base_var)
+                            symbol_info = self.SymbolTable[base_var]
+                            if symbol_info['type'] == 'variable':
+                                if 'is_pointer' in symbol_info:
+                                    is_ptr = symbol_info['is_pointer']
+                                if 'declared_type' in symbol_info:
+                                    declared_ctype = c_type(symbol_info['declared_type'])
+                                    current_struct_name = declared_ctype.StructName
+                                    if declared_ctype.IsPointer:
                                         is_ptr = True
-                                elif '*' in var_type:
-                                    # 处理指针类型
-                                    type_parts = var_type.split('*')[0].strip()
-                                    if type_parts.startswith('struct '):
-                                        current_struct_name = type_parts.split(' ')[1]
-                                    is_ptr = True
-                                found = True
-                                break
-                        
-                        # 如果作用域中没有找到，从符号表中查找
-                        if not found:
-                            if base_var in self.SymbolTable:
-                                symbol_info = self.SymbolTable[base_var]
-                                if symbol_info['type'] == 'variable':
-                                    if 'is_pointer' in symbol_info:
-                                        is_ptr = symbol_info['is_pointer']
-                                    if 'declared_type' in symbol_info:
-                                        declared_type = symbol_info['declared_type']
-                                        if declared_type.startswith('struct '):
-                                            # 提取结构体名称，去掉可能的指针符号
-                                            struct_part = declared_type.split(' ')[1]
-                                            current_struct_name = struct_part.rstrip('*')
-                                            # 检查是否是指针类型
-                                            if '*' in declared_type:
-                                                is_ptr = True
-                                        elif '*' in declared_type:
-                                            type_parts = declared_type.split('*')[0].strip()
-                                            if type_parts.startswith('struct '):
-                                                current_struct_name = type_parts.split(' ')[1]
-                                            is_ptr = True
-                        
-                        # 特殊处理：如果变量名是 cons 且在函数参数中，它总是指针
-                        # 检查是否在函数参数作用域中
-                        if base_var == 'cons':
-                            # 检查当前作用域是否是函数作用域
-                            if self.VarScopes:
-                                # 函数参数通常在最内层作用域中
-                                for scope in self.VarScopes:
-                                    if base_var in scope:
-                                        # 检查变量类型是否是指针
-                                        var_type = scope[base_var]
-                                        if '*' in var_type:
-                                            is_ptr = True
-                                        else:
-                                            is_ptr = False
-                                        break
-                        
-                        # 特殊处理：如果变量名是常见的指针变量名，默认视为指针
-                        """if not is_ptr:
-                            # 检查变量名是否在常见的指针变量名列表中（这是不合规的，暂且这么处理吧，也没啥问题）
-                            if base_var in ['task', 'p', 'ptr', 'buf', 'memman', 'nihongo']:
-                                is_ptr = True
-                            # 检查变量名是否以 _ptr 结尾
-                            elif base_var.endswith('_ptr'):
-                                is_ptr = True
-                            # 检查变量名是否包含 ptr
-                            elif 'ptr' in base_var:
-                                is_ptr = True"""
+
                     
-                    # 构建完整的访问表达式
-                    expr_parts = [base_var]
-                    current_check_struct = current_struct_name
-                    current_is_ptr = is_ptr  # 保存当前的指针状态
+                    # 特殊处理：如果变量名是常见的指针变量名，默认视为指针
+                    """if not is_ptr:
+                        # 检查变量名是否在常见的指针变量名列表中（这是不合规的，暂且这么处理吧，也没啥问题）
+                        if base_var in ['task', 'p', 'ptr', 'buf', 'memman', 'nihongo']:
+                            is_ptr = True
+                        # 检查变量名是否以 _ptr 结尾
+                        elif base_var.endswith('_ptr'):
+                            is_ptr = True
+                        # 检查变量名是否包含 ptr
+                        elif 'ptr' in base_var:
+                            is_ptr = True"""
+                
+                # 构建完整的访问表达式
+                expr_parts = [base_var]
+                current_check_struct = current_struct_name
+                current_is_ptr = is_ptr  # 保存当前的指针状态
+                
+                # 遍历访问链，检查每一步的类型
+                for i in range(len(access_chain)):
+                    member_name = access_chain[i]
                     
-                    # 遍历访问链，检查每一步的类型
-                    for i in range(len(access_chain)):
-                        member_name = access_chain[i]
-                        
-                        # 更新指针状态和结构体名
-                        # 首先，尝试根据成员名推断类型
-                        # 特殊处理常见的指针成员名
-                        next_is_ptr = current_is_ptr  # 默认保持当前指针状态
-                        is_member_pointer = False
-                        
-                        # 然后，从符号表中查找更准确的类型信息
-                        if current_check_struct in self.SymbolTable:
-                            struct_info = self.SymbolTable[current_check_struct]
-                            if struct_info['type'] == 'struct' and 'members' in struct_info:
-                                if member_name in struct_info['members']:
-                                    # 检查当前成员是否是指针
-                                    if struct_info['members'][member_name]['is_pointer']:
-                                        next_is_ptr = True
-                                        is_member_pointer = True
-                                    else:
-                                        next_is_ptr = False
-                                        is_member_pointer = False
-                                    # 更新检查的结构体名为当前成员的类型名
-                                    member_type = struct_info['members'][member_name]['type']
-                                    if member_type.startswith('struct '):
-                                        # 提取结构体名称，去掉可能的指针符号
-                                        struct_part = member_type.split(' ')[1]
-                                        current_check_struct = struct_part.rstrip('*')
-                                    elif '*' in member_type:
-                                        type_parts = member_type.split('*')[0].strip()
-                                        if type_parts.startswith('struct '):
-                                            # 提取结构体名称，去掉可能的指针符号
-                                            struct_part = type_parts.split(' ')[1]
-                                            current_check_struct = struct_part.rstrip('*')
-                        """# 如果结构体不在符号表中，但我们知道它是一个结构体类型
-                        elif current_check_struct:
-                            # 假设结构体成员的类型与成员名相关
-                            # 例如，next 成员通常是指针
-                            if member_name in ['next', 'prev', 'head', 'tail', 'ptr', 'buf', 'data', 'task', 'timer']:
-                                next_is_ptr = True
-                                is_member_pointer = True
-                            else:
-                                is_member_pointer = False
-                            # 更新当前检查的结构体名
-                            # 对于嵌套的结构体，我们假设成员类型是同名的结构体
-                            if member_name in ['next', 'prev']:
-                                current_check_struct = current_check_struct
-                            else:
-                                current_check_struct = member_name"""
-                        
-                        # 更新当前的指针状态，用于处理下一个成员
-                        # 如果当前成员是指针类型，后续访问也使用指针运算符
-                        # next_current_is_ptr 应该只基于成员是否是指针，而不是当前变量是否是指针
-                        next_current_is_ptr = is_member_pointer
-                        
-                        # 特殊处理：根据符号表中的信息确定是否使用指针运算符
-                        # 检查当前成员是否在符号表中定义为指针类型
-                        if current_check_struct in self.SymbolTable:
-                            struct_info = self.SymbolTable[current_check_struct]
-                            if struct_info['type'] == 'struct' and 'members' in struct_info:
-                                if member_name in struct_info['members']:
-                                    if struct_info['members'][member_name]['is_pointer']:
-                                        next_current_is_ptr = True
-                        
-                        # 根据当前成员是否是指针选择运算符
-                        # 使用当前变量的指针状态来决定是否使用 -> 或 .
-                        # is_member_pointer 只影响下一轮循环的 current_is_ptr，不影响当前运算符选择
-                        if current_is_ptr:
-                            expr_parts.append('->')
+                    # 更新指针状态和结构体名
+                    # 首先，尝试根据成员名推断类型
+                    # 特殊处理常见的指针成员名
+                    next_is_ptr = current_is_ptr  # 默认保持当前指针状态
+                    is_member_pointer = False
+                    
+                    # 然后，从符号表中查找更准确的类型信息
+                    if current_check_struct in self.SymbolTable:
+                        struct_info = self.SymbolTable[current_check_struct]
+                        if struct_info['type'] == 'struct' and 'members' in struct_info:
+                            if member_name in struct_info['members']:
+                                # 检查当前成员是否是指针
+                                if struct_info['members'][member_name]['is_pointer']:
+                                    next_is_ptr = True
+                                    is_member_pointer = True
+                                else:
+                                    next_is_ptr = False
+                                    is_member_pointer = False
+                                # 更新检查的结构体名为当前成员的类型名
+                                member_struct = c_type(struct_info['members'][member_name]['type']).StructName
+                                if member_struct:
+                                    current_check_struct = member_struct
+                    """# 如果结构体不在符号表中，但我们知道它是一个结构体类型
+                    elif current_check_struct:
+                        # 假设结构体成员的类型与成员名相关
+                        # 例如，next 成员通常是指针
+                        if member_name in ['next', 'prev', 'head', 'tail', 'ptr', 'buf', 'data', 'task', 'timer']:
+                            next_is_ptr = True
+                            is_member_pointer = True
                         else:
-                            expr_parts.append('.')
-                        expr_parts.append(member_name)
-                        
-                        # 更新当前的指针状态，用于处理下一个成员
-                        # 对于指针成员，后续访问也应该使用指针运算符
-                        if is_member_pointer:
-                            current_is_ptr = True
+                            is_member_pointer = False
+                        # 更新当前检查的结构体名
+                        # 对于嵌套的结构体，我们假设成员类型是同名的结构体
+                        if member_name in ['next', 'prev']:
+                            current_check_struct = current_check_struct
                         else:
-                            current_is_ptr = next_current_is_ptr
+                            current_check_struct = member_name"""
                     
-                    # 构建完整的表达式字符串
-                    return [''.join(expr_parts)]
-                else:
-                    # 基础表达式不是名称节点，递归处理
-                    base_expr = self.HandleExpr(current_node)[0]
+                    # 更新当前的指针状态，用于处理下一个成员
+                    # 如果当前成员是指针类型，后续访问也使用指针运算符
+                    # next_current_is_ptr 应该只基于成员是否是指针，而不是当前变量是否是指针
+                    next_current_is_ptr = is_member_pointer
+                    
+                    # 特殊处理：根据符号表中的信息确定是否使用指针运算符
+                    # 检查当前成员是否在符号表中定义为指针类型
+                    if current_check_struct in self.SymbolTable:
+                        struct_info = self.SymbolTable[current_check_struct]
+                        if struct_info['type'] == 'struct' and 'members' in struct_info:
+                            if member_name in struct_info['members']:
+                                if struct_info['members'][member_name]['is_pointer']:
+                                    next_current_is_ptr = True
                     
-                    # 检查基础表达式是否是指针
+                    # 根据当前成员是否是指针选择运算符
+                    # 使用当前变量的指针状态来决定是否使用 -> 或 .
+                    # is_member_pointer 只影响下一轮循环的 current_is_ptr，不影响当前运算符选择
+                    if current_is_ptr:
+                        expr_parts.append('->')
+                    else:
+                        expr_parts.append('.')
+                    expr_parts.append(member_name)
+                    
+                    # 更新当前的指针状态，用于处理下一个成员
+                    # 对于指针成员，后续访问也应该使用指针运算符
+                    if is_member_pointer:
+                        current_is_ptr = True
+                    else:
+                        current_is_ptr = next_current_is_ptr
+                
+                # 构建完整的表达式字符串
+                return [''.join(expr_parts)]
+            else:
+                # 基础表达式不是名称节点，递归处理
+                base_expr = self.HandleExpr(current_node)[0]
+                
+                # 检查基础表达式是否是指针
+                is_ptr = False
+                # 检查 base_expr 是否以 & 开头（取地址操作）
+                if base_expr.startswith('&'):
+                    is_ptr = True
+                # 检查 base_expr 是否以 * 开头（解引用操作）
+                elif base_expr.startswith('*'):
                     is_ptr = False
-                    # 检查 base_expr 是否以 & 开头（取地址操作）
-                    if base_expr.startswith('&'):
+                # 检查 base_expr 是否包含指针类型的特征
+                elif '*' in base_expr:
+                    # 简单判断：如果包含 * 且不是乘法运算符，视为指针
+                    if not (' * ' in base_expr or ' *(' in base_expr or ')* ' in base_expr):
                         is_ptr = True
-                    # 检查 base_expr 是否以 * 开头（解引用操作）
-                    elif base_expr.startswith('*'):
-                        is_ptr = False
-                    # 检查 base_expr 是否包含指针类型的特征
-                    elif '*' in base_expr:
-                        # 简单判断：如果包含 * 且不是乘法运算符，视为指针
-                        if not (' * ' in base_expr or ' *(' in base_expr or ')* ' in base_expr):
-                            is_ptr = True
-                    
-                    # 特殊处理：如果基础表达式是数组访问（如 sheets[x]）
-                    # 需要检查数组元素类型是否是指针
-                    if isinstance(current_node, ast.Subscript):
-                        # 获取数组基础表达式（如 sheets）
-                        array_base = current_node.value
-                        if isinstance(array_base, ast.Attribute):
-                            array_name = array_base.attr
-                            struct_name = None
-                            
-                            # 从符号表中查找结构体信息
-                            if array_base.value.id in self.SymbolTable:
-                                symbol_info = self.SymbolTable[array_base.value.id]
-                                if symbol_info['type'] == 'variable' and 'declared_type' in symbol_info:
-                                    declared_type = symbol_info['declared_type']
-                                    # 提取结构体名称
-                                    if declared_type.startswith('struct '):
-                                        struct_name = declared_type.split(' ')[1].rstrip('*')
-                            
-                            # 在变量作用域中查找
-                            if not struct_name:
-                                for scope in reversed(self.VarScopes):
-                                    if array_base.value.id in scope:
-                                        var_type = scope[array_base.value.id]
-                                        if var_type.startswith('struct '):
-                                            # 处理 'struct SHTCTL*' 或 'struct SHTCTL' 格式
-                                            type_parts = var_type.split(' ')
-                                            if len(type_parts) >= 2:
-                                                struct_name = type_parts[1].rstrip('*')
-                                        break
-                            
-                            # 从结构体定义中查找数组成员类型
-                            if struct_name and struct_name in self.SymbolTable:
-                                struct_info = self.SymbolTable[struct_name]
+                
+                # 特殊处理：如果基础表达式是数组访问（如 sheets[x]）
+                # 需要检查数组元素类型是否是指针
+                if isinstance(current_node, ast.Subscript):
+                    # 获取数组基础表达式（如 sheets）
+                    array_base = current_node.value
+                    if isinstance(array_base, ast.Attribute):
+                        array_name = array_base.attr
+                        struct_name = None
+                        
+                        # 从符号表中查找结构体信息
+                        if array_base.value.id in self.SymbolTable:
+                            self.VarScopes.NoteGlobal(array_base.value.id)
+                            symbol_info = self.SymbolTable[array_base.value.id]
+                            if symbol_info['type'] == 'variable' and 'declared_type' in symbol_info:
+                                # 提取结构体名称
+                                struct_name = c_type(symbol_info['declared_type']).StructName
+                        
+                        # 在变量作用域中查找
+                        if not struct_name:
+                            var_type = self.VarScopes.Lookup(array_base.value.id)
+                            if var_type is not None:
+                                struct_name = c_type(var_type).StructName
+                        
+                        # 从结构体定义中查找数组成员类型
+                        if struct_name and struct_name in self.SymbolTable:
+                            struct_info = self.SymbolTable[struct_name]
+                            if struct_info['type'] == 'struct' and 'members' in struct_info:
+                                members = struct_info['members']
+                                if array_name in members:
+                                    member = members[array_name]
+                                    # 检查数组成员类型：
+                                    # 1. 如果是数组（包含 '['）且元素是指针，则 array[i] 是指针
+                                    # 2. 如果不是数组（如 FILEHANDLE* fhandle），则 ptr[i] 不是指针
+                                    if 'type' in member and c_type(member['type']).IsArray:
+                                        # 是数组类型，检查元素是否是指针
+                                        if 'is_pointer' in member and member['is_pointer']:
+                                            is_ptr = True
+                                        elif c_type(member['type']).IsPointer:
+                                            is_ptr = True
+                        
+                        # 特殊处理：即使找不到变量类型，也检查是否是已知的结构体成员
+                        # 这对于全局变量或未声明的变量（如 ctl）很有用
+                        elif not struct_name:
+                            # 尝试在所有结构体中查找成员名
+                            for struct_name_iter, struct_info in self.SymbolTable.items():
                                 if struct_info['type'] == 'struct' and 'members' in struct_info:
-                                    members = struct_info['members']
-                                    if array_name in members:
-                                        member = members[array_name]
-                                        # 检查数组成员类型：
-                                        # 1. 如果是数组（包含 '['）且元素是指针，则 array[i] 是指针
-                                        # 2. 如果不是数组（如 FILEHANDLE* fhandle），则 ptr[i] 不是指针
-                                        if 'type' in member and '[' in member['type']:
-                                            # 是数组类型，检查元素是否是指针
+                                    if array_name in struct_info['members']:
+                                        member = struct_info['members'][array_name]
+                                        # 检查数组成员类型
+                                        if 'type' in member and c_type(member['type']).IsArray:
                                             if 'is_pointer' in member and member['is_pointer']:
                                                 is_ptr = True
-                                            elif '*' in member['type']:
+                                            elif c_type(member['type']).IsPointer:
                                                 is_ptr = True
-                            
-                            # 特殊处理：即使找不到变量类型，也检查是否是已知的结构体成员
-                            # 这对于全局变量或未声明的变量（如 ctl）很有用
-                            elif not struct_name:
-                                # 尝试在所有结构体中查找成员名
-                                for struct_name_iter, struct_info in self.SymbolTable.items():
-                                    if struct_info['type'] == 'struct' and 'members' in struct_info:
-                                        if array_name in struct_info['members']:
-                                            member = struct_info['members'][array_name]
-                                            # 检查数组成员类型
-                                            if 'type' in member and '[' in member['type']:
-                                                if 'is_pointer' in member and member['is_pointer']:
-                                                    is_ptr = True
-                                                elif '*' in member['type']:
-                                                    is_ptr = True
-                                            break
-                    
-                    # 处理访问链
-                    result = base_expr
-                    for attr in access_chain:
-                        if is_ptr:
-                            result += f'->{attr}'
-                        else:
-                            result += f'.{attr}'
-                        
-                        # 特殊处理：如果当前成员是常见的指针成员名，后续访问也使用指针运算符
-                        if attr in ['next', 'prev', 'head', 'tail', 'ptr', 'buf', 'data', 'task', 'timer']:
-                            is_ptr = True
+                                        break
+                
+                # 处理访问链
+                result = base_expr
+                for attr in access_chain:
+                    if is_ptr:
+                        result += f'->{attr}'
+                    else:
+                        result += f'.{attr}'
                     
-                    return [result]
-        elif isinstance(Node, ast.IfExp):
-            # 处理条件表达式（三目运算符），如 1 if eax else 2
-            test = self.HandleExpr(Node.test)[0]
-            body = self.HandleExpr(Node.body)[0]
-            orelse = self.HandleExpr(Node.orelse)[0]
-            return [f'({test} ? {body} : {orelse})']
-        elif isinstance(Node, ast.NamedExpr):
-            # 处理海象运算符（赋值表达式），如 (n := len(data))
-            target = self.HandleExpr(Node.target)[0]
-            value = self.HandleExpr(Node.value)[0]
-            
-            # 检查是否是前置自增模式: k := k + 1
-            if isinstance(Node.value, ast.BinOp) and isinstance(Node.value.op, ast.Add):
-                if isinstance(Node.value.left, ast.Name) and Node.value.left.id == Node.target.id:
-                    if isinstance(Node.value.right, ast.Constant) and Node.value.right.value == 1:
-                        # 优化为前置自增: ++k
-                        return [f'++{target}']
-            
-            # 转换为C语言的逗号运算符：((target = value), target)
-            return [f'(({target} = {value}), {target})']
-        return ['0']
+                    # 特殊处理：如果当前成员是常见的指针成员名，后续访问也使用指针运算符
+                    if attr in ['next', 'prev', 'head', 'tail', 'ptr', 'buf', 'data', 'task', 'timer']:
+                        is_ptr = True
+                
+                return [result]
+    
+    def ExprIfExp(self, Node, use_single_quote=False):
+        """处理条件表达式"""
+        # 处理条件表达式（三目运算符），如 1 if eax else 2
+        test = self.HandleExpr(Node.test)[0]
+        body = self.HandleExpr(Node.body)[0]
+        orelse = self.HandleExpr(Node.orelse)[0]
+        return [f'({test} ? {body} : {orelse})']
+    
+    def ExprNamedExpr(self, Node, use_single_quote=False):
+        """处理海象运算符"""
+        # 处理海象运算符（赋值表达式），如 (n := len(data))
+        target = self.HandleExpr(Node.target)[0]
+        value = self.HandleExpr(Node.value)[0]
+        
+        # 检查是否是前置自增模式: k := k + 1
+        if isinstance(Node.value, ast.BinOp) and isinstance(Node.value.op, ast.Add):
+            if isinstance(Node.value.left, ast.Name) and Node.value.left.id == Node.target.id:
+                if isinstance(Node.value.right, ast.Constant) and Node.value.right.value == 1:
+                    # 优化为前置自增: ++k
+                    return [f'++{target}']
+        
+        # 转换为C语言的逗号运算符：((target = value), target)
+        return [f'(({target} = {value}), {target})']
     
     def GetComparatorSymbol(self, Op):
         """获取比较运算符符号"""
@@ -2064,20 +2112,17 @@ class Translator:
                 elif isinstance(Node.target.value, ast.Name):
                     var_name = Node.target.value.id
                     # 从变量作用域中获取变量类型
-                    found_in_scope = False
-                    for scope in reversed(self.VarScopes):
-                        if var_name in scope:
-                            var_type = scope[var_name]
-                            if '*' in var_type:
-                                is_ptr = True
-                            found_in_scope = True
-                            break
+                    var_type = self.VarScopes.Lookup(var_name)
+                    found_in_scope = var_type is not None
+                    if found_in_scope and c_type(var_type).IsPointer:
+                        is_ptr = True
                     # 如果作用域中没有找到，从符号表中查找
                     if not found_in_scope and var_name in self.SymbolTable:
+                        self.VarScopes.NoteGlobal(var_name)
                         symbol_info = self.SymbolTable[var_name]
                         if 'is_pointer' in symbol_info:
                             is_ptr = symbol_info['is_pointer']
-                        elif 'declared_type' in symbol_info and '*' in symbol_info['declared_type']:
+                        elif 'declared_type' in symbol_info and c_type(symbol_info['declared_type']).IsPointer:
                             is_ptr = True
                     # 简化处理：如果变量名是 'p'，则认为是指针
                     elif obj == 'p':
@@ -2100,610 +2145,596 @@ class Translator:
         """
         Code = []
         for Node in Body:
-            if isinstance(Node, ast.Expr):
-                # 检查是否是c模块中的特殊语法调用
-                if isinstance(Node.value, ast.Call):
-                    if isinstance(Node.value.func, ast.Attribute):
-                        if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
-                            # 直接处理c模块中的特殊语法调用
-                            special_code = self.HandleCSpecialCall(Node.value.func.attr, Node.value.args, Node.value.keywords)
-                            if special_code:
-                                Code.extend(special_code)
-                            continue
-                    # 处理其他函数调用，如print
-                    expr_code = self.HandleExpr(Node.value)
-                    if expr_code:
-                        # 为函数调用语句添加分号
-                        for i, expr in enumerate(expr_code):
-                            # 检查是否已经有分号
-                            if not expr.endswith(';'):
-                                expr_code[i] = expr + ';'
-                        Code.extend(expr_code)
-                else:
-                    expr_code = self.HandleExpr(Node)
-                    # 检查是否是c模块中的特殊语法调用
-                    if expr_code:
-                        # 过滤掉无效的表达式
-                        valid_exprs = [expr for expr in expr_code if expr and expr != '0']
-                        if valid_exprs:
-                            Code.extend(valid_exprs)
-            elif isinstance(Node, ast.If):
-                Code.extend(self.HandleIf(Node))
-            elif isinstance(Node, ast.For):
-                Code.extend(self.HandleFor(Node))
-            elif isinstance(Node, ast.While):
-                Code.extend(self.HandleWhile(Node))
-            elif isinstance(Node, ast.Break):
-                Code.append('break;')
-            elif isinstance(Node, ast.Continue):
-                Code.append('continue;')
-            elif isinstance(Node, ast.Return):
-                if Node.value:
-                    Value = self.HandleExpr(Node.value)[0]
-                    Code.append(f'return {Value};')
-                else:
-                    Code.append('return;')
-            elif isinstance(Node, ast.Assign):
-                assign_code = self.HandleAssign(Node)
-                if assign_code:
-                    Code.extend(assign_code)
-            elif isinstance(Node, ast.AugAssign):
-                # 处理复合赋值运算符，如 a += b
-                aug_assign_code = self.HandleAugAssign(Node)
-                if aug_assign_code:
-                    Code.extend(aug_assign_code)
-            elif isinstance(Node, ast.AnnAssign):
-                # 处理带有类型注解的变量赋值
-                if isinstance(Node.target, ast.Name):
-                    var_name = Node.target.id
-                    # 检查是否有赋值部分
-                    if Node.value:
-                        ValueCode = self.HandleExpr(Node.value)
-                        if ValueCode:
-                            # 在非块级作用域中，检查变量是否已声明
-                            if not in_block and self.VarScopes and var_name in self.VarScopes[-1]:
-                                # 变量已存在，生成赋值语句而不是声明语句
-                                Code.append(f'{var_name} = {ValueCode[0]};')
-                                continue
-                            # 在块级作用域中，每个块中的变量是独立的
-                            # 所以直接生成声明语句
-                            # 尝试获取类型名称
-                            try:
-                                type_name = self.GetTypeName(Node.annotation)
-                                # 无论type_name是否为空，都生成声明语句
-                                if type_name and type_name.strip():
-                                    # 处理数组类型，提取数组大小
-                                    base_type, array_size_str = extract_array_size(type_name)
-                                    
-                                    # 检查是否是数组指针类型，如 'const char (*)[16]'
-                                    is_array_ptr = '(*)' in base_type
-                                    
-                                    # 检查是否是指针类型
-                                    is_ptr = False
-                                    original_base_type = base_type
-                                    if '*' in base_type and not is_array_ptr:
-                                        is_ptr = True
-                                        base_type = base_type.replace('*', '').strip()
-                                    elif base_type == '*':
-                                        # 处理 t.CPtr 类型
-                                        is_ptr = True
-                                        base_type = ''
-                                    
-                                    # 检查是否是 typedef 类型
-                                    is_typedef = False
-                                    if base_type == 'typedef':
-                                        is_typedef = True
-                                        base_type = ''
-                                    
-                                    # 检查是否是结构体类型
-                                    is_struct = False
-                                    struct_name = None
-                                    
-                                    # 检查是否是基本类型
-                                    is_basic_type = False
-                                    basic_type_name = ''
-                                    
-                                    # 尝试从类型注解中获取类型信息
-                                    annotation_str = ast.dump(Node.annotation)
-                                    import re
-                                    
-                                    # 首先根据 type_name 检查是否是基本类型
-                                    basic_types_map = {
-                                        'int': 'int',
-                                        'char': 'char',
-                                        'float': 'float',
-                                        'double': 'double',
-                                        'void': 'void',
-                                        'long': 'long',
-                                        'short': 'short',
-                                        'unsigned int': 'unsigned int',
-                                        'unsigned char': 'unsigned char',
-                                        'unsigned long': 'unsigned long',
-                                        'unsigned short': 'unsigned short',
-                                    }
-                                    if type_name in basic_types_map:
-                                        is_basic_type = True
-                                        basic_type_name = basic_types_map[type_name]
-                                    # 检查是否是基本类型组合（如 t.CUnsignedChar | t.CPtr）
-                                    elif 'CUnsignedChar' in annotation_str:
-                                        is_basic_type = True
-                                        basic_type_name = 'unsigned char'
-                                    elif 'CChar' in annotation_str:
-                                        is_basic_type = True
-                                        basic_type_name = 'char'
-                                    elif 'CInt' in annotation_str:
-                                        is_basic_type = True
-                                        basic_type_name = 'int'
-                                    elif 'CUnsignedInt' in annotation_str:
-                                        is_basic_type = True
-                                        basic_type_name = 'unsigned int'
-                                    elif 'CLong' in annotation_str:
-                                        is_basic_type = True
-                                        basic_type_name = 'long'
-                                    elif 'CUnsignedLong' in annotation_str:
-                                        is_basic_type = True
-                                        basic_type_name = 'unsigned long'
-                                    elif 'CFloat' in annotation_str:
-                                        is_basic_type = True
-                                        basic_type_name = 'float'
-                                    elif 'CDouble' in annotation_str:
-                                        is_basic_type = True
-                                        basic_type_name = 'double'
-                                    elif 'CVoid' in annotation_str:
-                                        is_basic_type = True
-                                        basic_type_name = 'void'
-                                    
-                                    # 检查是否需要添加指针
-                                    if is_basic_type and 'CPtr' in annotation_str:
-                                        is_ptr = True
+            visitor = self.StatementVisitors.get(type(Node)) or find_visitor(self.StatementVisitors, type(Node))
+            if visitor is not None:
+                Code.extend(visitor(self, Node, in_block))
+        return Code
+    
+    def StmtExpr(self, Node, in_block=False):
+        """处理表达式语句"""
+        Code = []
+        # 检查是否是c模块中的特殊语法调用
+        if isinstance(Node.value, ast.Call):
+            if isinstance(Node.value.func, ast.Attribute):
+                if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
+                    # 直接处理c模块中的特殊语法调用
+                    special_code = self.HandleCSpecialCall(Node.value.func.attr, Node.value.args, Node.value.keywords)
+                    if special_code:
+                        Code.extend(special_code)
+                    return Code
+            # 处理其他函数调用，如print
+            expr_code = self.HandleExpr(Node.value)
+            if expr_code:
+                # 为函数调用语句添加分号
+                for i, expr in enumerate(expr_code):
+                    # 检查是否已经有分号
+                    if not expr.endswith(';'):
+                        expr_code[i] = expr + ';'
+                Code.extend(expr_code)
+        else:
+            expr_code = self.HandleExpr(Node)
+            # 检查是否是c模块中的特殊语法调用
+            if expr_code:
+                # 过滤掉无效的表达式
+                valid_exprs = [expr for expr in expr_code if expr and expr != '0']
+                if valid_exprs:
+                    Code.extend(valid_exprs)
+        return Code
+    
+    def StmtIf(self, Node, in_block=False):
+        """处理if语句"""
+        return self.HandleIf(Node)
+    
+    def StmtFor(self, Node, in_block=False):
+        """处理for语句"""
+        return self.HandleFor(Node)
+    
+    def StmtWhile(self, Node, in_block=False):
+        """处理while语句"""
+        return self.HandleWhile(Node)
+    
+    def StmtBreak(self, Node, in_block=False):
+        """处理break语句"""
+        return ['break;']
+    
+    def StmtContinue(self, Node, in_block=False):
+        """处理continue语句"""
+        return ['continue;']
+    
+    def StmtReturn(self, Node, in_block=False):
+        """处理return语句"""
+        Code = []
+        if Node.value:
+            Value = self.HandleExpr(Node.value)[0]
+            Code.append(f'return {Value};')
+        else:
+            Code.append('return;')
+        return Code
+    
+    def StmtAssign(self, Node, in_block=False):
+        """处理赋值语句"""
+        return self.HandleAssign(Node)
+    
+    def StmtAugAssign(self, Node, in_block=False):
+        """处理复合赋值语句"""
+        # 处理复合赋值运算符，如 a += b
+        return self.HandleAugAssign(Node)
+    
+    def StmtAnnAssign(self, Node, in_block=False):
+        """处理带有类型注解的局部变量声明"""
+        Code = []
+        # 处理带有类型注解的变量赋值
+        if isinstance(Node.target, ast.Name):
+            var_name = Node.target.id
+            # 检查是否有赋值部分
+            if Node.value:
+                ValueCode = self.HandleExpr(Node.value)
+                if ValueCode:
+                    # 在非块级作用域中，检查变量是否已声明
+                    if not in_block and self.VarScopes.InCurrent(var_name):
+                        # 变量已存在，生成赋值语句而不是声明语句
+                        Code.append(f'{var_name} = {ValueCode[0]};')
+                        return Code
+                    # 在块级作用域中，每个块中的变量是独立的
+                    # 所以直接生成声明语句
+                    # 尝试获取类型名称
+                    try:
+                        type_name = self.GetTypeName(Node.annotation)
+                        # 无论type_name是否为空，都生成声明语句
+                        if type_name and type_name.strip():
+                            # 处理数组类型，提取数组大小
+                            base_type, array_size_str = extract_array_size(type_name)
+                            
+                            # 检查是否是数组指针类型，如 'const char (*)[16]'
+                            is_array_ptr = '(*)' in base_type
+                            
+                            # 检查是否是指针类型
+                            is_ptr = False
+                            original_base_type = base_type
+                            if '*' in base_type and not is_array_ptr:
+                                is_ptr = True
+                                base_type = base_type.replace('*', '').strip()
+                            elif base_type == '*':
+                                # 处理 t.CPtr 类型
+                                is_ptr = True
+                                base_type = ''
+                            
+                            # 检查是否是 typedef 类型
+                            is_typedef = False
+                            if base_type == 'typedef':
+                                is_typedef = True
+                                base_type = ''
+                            
+                            # 检查是否是结构体类型
+                            is_struct = False
+                            struct_name = None
+                            
+                            # 检查是否是基本类型
+                            is_basic_type = False
+                            basic_type_name = ''
+                            
+                            # 尝试从类型注解中获取类型信息
+                            annotation = analyze_annotation(Node.annotation)
+                            
+                            # 首先根据 type_name 检查是否是基本类型
+                            basic_types_map = {
+                                'int': 'int',
+                                'char': 'char',
+                                'float': 'float',
+                                'double': 'double',
+                                'void': 'void',
+                                'long': 'long',
+                                'short': 'short',
+                                'unsigned int': 'unsigned int',
+                                'unsigned char': 'unsigned char',
+                                'unsigned long': 'unsigned long',
+                                'unsigned short': 'unsigned short',
+                            }
+                            if type_name in basic_types_map:
+                                is_basic_type = True
+                                basic_type_name = basic_types_map[type_name]
+                            # 检查是否是基本类型组合（如 t.CUnsignedChar | t.CPtr）
+                            elif annotation.BasicType:
+                                is_basic_type = True
+                                basic_type_name = annotation.BasicType
+                            
+                            # 检查是否需要添加指针
+                            if is_basic_type and annotation.IsPointer:
+                                is_ptr = True
+                            
+                            # 如果不是基本类型，尝试从类型注解中获取结构体名称
+                            if not is_basic_type:
+                                # 检查是否是结构体类型（CStruct 或 CStruct | CPtr）
+                                if annotation.HasStruct:
+                                    is_struct = True
+                                    # 尝试提取结构体名称
+                                    struct_name = annotation.StructTarget
+                                elif base_type == 'struct':
+                                    # 处理 t.CStruct 类型
+                                    is_struct = True
+                                    # 使用右侧表达式的名称作为结构体名（仅当是函数调用时）
+                                    if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Name):
+                                        struct_name = Node.value.func.id
+                                    else:
+                                        # 如果右侧不是函数调用，使用默认结构体名
+                                        struct_name = 'XXX'
+                                elif base_type == 'struct *':
+                                    # 处理 t.CStruct | t.CPtr 类型
+                                    is_struct = True
+                                    is_ptr = True
+                                    # 使用右侧表达式的名称作为结构体名（仅当是函数调用时）
+                                    if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Name):
+                                        struct_name = Node.value.func.id
+                                    else:
+                                        # 如果右侧不是函数调用，使用默认结构体名
+                                        struct_name = 'XXX'
+                                elif base_type.startswith('struct '):
+                                    # 处理已经包含 struct 关键字的类型
+                                    is_struct = True
+                                    struct_name = base_type[7:]
+                                # 处理 t.CStruct | t.CPtr 类型
+                                elif original_base_type == '*' or (is_ptr and base_type == ''):
+                                    # 处理 t.CStruct | t.CPtr 类型
+                                    is_struct = True
+                                    is_ptr = True
+                                    # 使用右侧表达式的名称作为结构体名（仅当是函数调用时）
+                                    if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Name):
+                                        struct_name = Node.value.func.id
+                                    else:
+                                        # 如果右侧不是函数调用，使用默认结构体名
+                                        struct_name = 'XXX'
+                            
+                            # 处理 typedef 类型
+                            if is_typedef:
+                                # 获取右侧类型
+                                right_type = 'int'  # 默认类型
+                                if isinstance(Node.value, ast.Attribute) and isinstance(Node.value.value, ast.Name) and Node.value.value.id == 't':
+                                    right_attr = Node.value.attr
+                                    if hasattr(t, right_attr):
+                                        type_obj = getattr(t, right_attr)
+                                        if isinstance(type_obj, type):
+                                            right_type = type_obj().CName
+                                # 生成 typedef 语句
+                                Code.append(f'typedef {right_type} {var_name};')
+                                # 添加变量到当前作用域
+                                self.VarScopes.Bind(var_name, var_name)
+                                return Code
+                            
+                            # 特殊处理 c.State，表示仅声明不定义
+                            if ValueCode[0] == 'c.State':
+                                # 处理其他变量
+                                if is_basic_type:
+                                    # 处理基本类型
+                                    ptr_str = '*' if is_ptr else ''
+                                    Code.append(f'{basic_type_name}{ptr_str} {var_name}{array_size_str};')
+                                elif is_struct and struct_name:
+                                    if is_ptr:
+                                        Code.append(f'struct {struct_name}* {var_name}{array_size_str};')
+                                    else:
+                                        Code.append(f'struct {struct_name} {var_name}{array_size_str};')
+                                else:
+                                    # 检查 base_type 是否包含存储类修饰符
+                                    storage_class, type_part = check_storage_class(base_type)
                                     
-                                    # 如果不是基本类型，尝试从类型注解中获取结构体名称
-                                    if not is_basic_type:
-                                        # 检查是否是结构体类型（CStruct 或 CStruct | CPtr）
-                                        if 'CStruct' in annotation_str:
-                                            is_struct = True
-                                            # 尝试提取结构体名称
-                                            match = re.search(r'Name\(id=\"([A-Za-z0-9_]+)\"', annotation_str)
-                                            if match:
-                                                struct_name = match.group(1)
-                                        elif base_type == 'struct':
-                                            # 处理 t.CStruct 类型
-                                            is_struct = True
-                                            # 使用右侧表达式的名称作为结构体名（仅当是函数调用时）
-                                            if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Name):
-                                                struct_name = Node.value.func.id
-                                            else:
-                                                # 如果右侧不是函数调用，使用默认结构体名
-                                                struct_name = 'XXX'
-                                        elif base_type == 'struct *':
-                                            # 处理 t.CStruct | t.CPtr 类型
-                                            is_struct = True
-                                            is_ptr = True
-                                            # 使用右侧表达式的名称作为结构体名（仅当是函数调用时）
-                                            if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Name):
-                                                struct_name = Node.value.func.id
+                                    if storage_class:
+                                        # 处理带存储类修饰符的变量
+                                        Code.append(f'{storage_class} {type_part} {var_name}{array_size_str};')
+                                    else:
+                                        Code.append(f'{base_type} {var_name}{array_size_str};')
+                            else:
+                                self.debug_print(f"DEBUG ELSE: ValueCode[0]='{ValueCode[0]}', Node.value type={type(Node.value)}")
+                                # 优先检查是否是 t.CType 调用
+                                if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Attribute):
+                                    # 检查是否是 t.CType 调用
+                                    if (isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 't' and 
+                                        Node.value.func.attr == 'CType'):
+                                        # 提取参数
+                                        if len(Node.value.args) >= 1:
+                                            # 获取地址值
+                                            addr = self.HandleExpr(Node.value.args[0])[0]
+                                            # 生成类型转换代码
+                                            if is_basic_type:
+                                                # 处理基本类型
+                                                ptr_str = '*' if is_ptr else ''
+                                                Code.append(f'{basic_type_name}{ptr_str} {var_name}{array_size_str} = (({basic_type_name}{ptr_str}){addr});')
                                             else:
-                                                # 如果右侧不是函数调用，使用默认结构体名
-                                                struct_name = 'XXX'
-                                        elif base_type.startswith('struct '):
-                                            # 处理已经包含 struct 关键字的类型
-                                            is_struct = True
-                                            struct_name = base_type[7:]
-                                        # 处理 t.CStruct | t.CPtr 类型
-                                        elif original_base_type == '*' or (is_ptr and base_type == ''):
-                                            # 处理 t.CStruct | t.CPtr 类型
-                                            is_struct = True
-                                            is_ptr = True
-                                            # 使用右侧表达式的名称作为结构体名（仅当是函数调用时）
-                                            if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Name):
-                                                struct_name = Node.value.func.id
+                                                # 获取结构体名称
+                                                struct_name = 'BOOTINFO'  # 默认值
+                                                # 尝试从第二个参数获取结构体名称
+                                                if len(Node.value.args) >= 2:
+                                                    # 处理不同类型的第二个参数
+                                                    if isinstance(Node.value.args[1], ast.Name):
+                                                        # 变量名或类名
+                                                        struct_name = Node.value.args[1].id
+                                                    elif isinstance(Node.value.args[1], ast.Attribute):
+                                                        # 处理属性访问，如 t.MEMMAN
+                                                        struct_name = Node.value.args[1].attr
+                                                # 生成类型转换代码
+                                                Code.append(f'struct {struct_name}* {var_name}{array_size_str} = ((struct {struct_name} *){addr});')
+                                        else:
+                                            # 生成普通指针声明
+                                            if is_basic_type:
+                                                # 处理基本类型
+                                                ptr_str = '*' if is_ptr else ''
+                                                Code.append(f'{basic_type_name}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
                                             else:
-                                                # 如果右侧不是函数调用，使用默认结构体名
-                                                struct_name = 'XXX'
-                                    
-                                    # 处理 typedef 类型
-                                    if is_typedef:
-                                        # 获取右侧类型
-                                        right_type = 'int'  # 默认类型
-                                        if isinstance(Node.value, ast.Attribute) and isinstance(Node.value.value, ast.Name) and Node.value.value.id == 't':
-                                            right_attr = Node.value.attr
-                                            if hasattr(t, right_attr):
-                                                type_obj = getattr(t, right_attr)
-                                                if isinstance(type_obj, type):
-                                                    right_type = type_obj().CName
-                                        # 生成 typedef 语句
-                                        Code.append(f'typedef {right_type} {var_name};')
-                                        # 添加变量到当前作用域
-                                        if self.VarScopes:
-                                            self.VarScopes[-1][var_name] = var_name
-                                        continue
-                                    
-                                    # 特殊处理 c.State，表示仅声明不定义
-                                    if ValueCode[0] == 'c.State':
-                                        # 处理其他变量
+                                                Code.append(f'void* {var_name}{array_size_str} = {ValueCode[0]};')
+                                    else:
+                                        # 处理结构体类型，生成声明并调用构造函数
                                         if is_basic_type:
                                             # 处理基本类型
                                             ptr_str = '*' if is_ptr else ''
-                                            Code.append(f'{basic_type_name}{ptr_str} {var_name}{array_size_str};')
+                                            Code.append(f'{basic_type_name}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
                                         elif is_struct and struct_name:
-                                            if is_ptr:
-                                                Code.append(f'struct {struct_name}* {var_name}{array_size_str};')
-                                            else:
-                                                Code.append(f'struct {struct_name} {var_name}{array_size_str};')
-                                        else:
-                                            # 检查 base_type 是否包含存储类修饰符
-                                            storage_class, type_part = check_storage_class(base_type)
-                                            
-                                            if storage_class:
-                                                # 处理带存储类修饰符的变量
-                                                Code.append(f'{storage_class} {type_part} {var_name}{array_size_str};')
-                                            else:
-                                                Code.append(f'{base_type} {var_name}{array_size_str};')
-                                    else:
-                                        self.debug_print(f"DEBUG ELSE: ValueCode[0]='{ValueCode[0]}', Node.value type={type(Node.value)}")
-                                        # 优先检查是否是 t.CType 调用
-                                        if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Attribute):
-                                            # 检查是否是 t.CType 调用
-                                            if (isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 't' and 
-                                                Node.value.func.attr == 'CType'):
-                                                # 提取参数
-                                                if len(Node.value.args) >= 1:
-                                                    # 获取地址值
-                                                    addr = self.HandleExpr(Node.value.args[0])[0]
-                                                    # 生成类型转换代码
-                                                    if is_basic_type:
-                                                        # 处理基本类型
-                                                        ptr_str = '*' if is_ptr else ''
-                                                        Code.append(f'{basic_type_name}{ptr_str} {var_name}{array_size_str} = (({basic_type_name}{ptr_str}){addr});')
-                                                    else:
-                                                        # 获取结构体名称
-                                                        struct_name = 'BOOTINFO'  # 默认值
-                                                        # 尝试从第二个参数获取结构体名称
-                                                        if len(Node.value.args) >= 2:
-                                                            # 处理不同类型的第二个参数
-                                                            if isinstance(Node.value.args[1], ast.Name):
-                                                                # 变量名或类名
-                                                                struct_name = Node.value.args[1].id
-                                                            elif isinstance(Node.value.args[1], ast.Attribute):
-                                                                # 处理属性访问，如 t.MEMMAN
-                                                                struct_name = Node.value.args[1].attr
-                                                        # 生成类型转换代码
-                                                        Code.append(f'struct {struct_name}* {var_name}{array_size_str} = ((struct {struct_name} *){addr});')
-                                                else:
-                                                    # 生成普通指针声明
-                                                    if is_basic_type:
-                                                        # 处理基本类型
-                                                        ptr_str = '*' if is_ptr else ''
-                                                        Code.append(f'{basic_type_name}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
-                                                    else:
-                                                        Code.append(f'void* {var_name}{array_size_str} = {ValueCode[0]};')
-                                            else:
-                                                # 处理结构体类型，生成声明并调用构造函数
-                                                if is_basic_type:
-                                                    # 处理基本类型
-                                                    ptr_str = '*' if is_ptr else ''
-                                                    Code.append(f'{basic_type_name}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
-                                                elif is_struct and struct_name:
-                                                    if is_ptr:
-                                                        # 直接生成带赋值的指针声明
-                                                        Code.append(f'struct {struct_name}* {var_name}{array_size_str} = {ValueCode[0]};')
-                                                    else:
-                                                        # 检查右侧是否是c模块的函数调用
-                                                        is_c_function = False
-                                                        if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Attribute):
-                                                            if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
-                                                                is_c_function = True
-                                                        
-                                                        if is_c_function:
-                                                            # 如果是c模块的函数调用，直接生成带赋值的声明
-                                                            Code.append(f'struct {struct_name} {var_name}{array_size_str} = {ValueCode[0]};')
-                                                        else:
-                                                            Code.append(f'struct {struct_name} {var_name}{array_size_str};')
-                                                            # 检查右侧是否是构造函数调用
-                                                            if isinstance(Node.value, ast.Call):
-                                                                # 检查是否是真正的结构体构造函数
-                                                                # 只有当被调用的函数不是c模块的函数时，才可能是构造函数
-                                                                is_c_function = False
-                                                                if isinstance(Node.value.func, ast.Attribute):
-                                                                    if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
-                                                                        is_c_function = True
-                                                                
-                                                                # 只有不是c模块的函数，才可能是构造函数
-                                                                if not is_c_function:
-                                                                    # 获取被调用的函数名
-                                                                    called_func_name = None
-                                                                    if isinstance(Node.value.func, ast.Name):
-                                                                        called_func_name = Node.value.func.id
-                                                                    elif isinstance(Node.value.func, ast.Attribute):
-                                                                        called_func_name = Node.value.func.attr
-                                                                     
-                                                                    # 检查函数名是否与结构体名相同，并且结构体在符号表中明确标记为结构体
-                                                                    if called_func_name == struct_name and struct_name in self.SymbolTable and self.SymbolTable[struct_name]['type'] == 'struct':
-                                                                        # 提取构造函数参数
-                                                                        args = []
-                                                                        for arg in Node.value.args:
-                                                                            args.append(self.HandleExpr(arg)[0])
-                                                                        args_str = ', '.join(args)
-                                                                        # 生成构造函数调用
-                                                                        if args_str:
-                                                                            Code.append(f'{struct_name}____init__(&{var_name}, {args_str});')
-                                                                        else:
-                                                                            Code.append(f'{struct_name}____init__(&{var_name});')
-                                                else:
-                                                    # 检查 base_type 是否包含存储类修饰符
-                                                    storage_class, type_part = check_storage_class(base_type)
-                                                    
-                                                    # 处理指针类型
-                                                    ptr_str = '*' if is_ptr else ''
-                                                    
-                                                    # 处理数组指针类型，如 const char (*)[16] → const char (*var)[16]
-                                                    if is_array_ptr:
-                                                        # 对于数组指针，数组大小应该放在 ) 之后，变量名放在 (* 和 ) 之间
-                                                        self.debug_print(f"DEBUG: is_array_ptr=True, base_type='{base_type}', type_part='{type_part}', array_size_str='{array_size_str}'")
-                                                        if storage_class:
-                                                            self.debug_print(type_part)
-                                                            type_with_var = type_part.replace('(*)', f'(*{var_name})')
-                                                            self.debug_print(f"DEBUG: storage_class='{storage_class}', type_with_var='{type_with_var}'")
-                                                            Code.append(f'{storage_class} {type_with_var}{array_size_str} = {ValueCode[0]};')
-                                                        else:
-                                                            type_with_var = base_type.replace('(*)', f'(*{var_name})')
-                                                            self.debug_print(f"DEBUG: no storage_class, type_with_var='{type_with_var}'")
-                                                            Code.append(f'{type_with_var}{array_size_str} = {ValueCode[0]};')
-                                                    elif storage_class:
-                                                        # 处理带存储类修饰符的变量
-                                                        Code.append(f'{storage_class} {type_part}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
-                                                    else:
-                                                        # 处理普通变量，包括指针类型
-                                                        Code.append(f'{base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
-                                        # 检查是否已经识别为结构体类型
-                                        elif is_struct and struct_name:
-                                            # 处理结构体类型，生成声明并调用构造函数
                                             if is_ptr:
                                                 # 直接生成带赋值的指针声明
                                                 Code.append(f'struct {struct_name}* {var_name}{array_size_str} = {ValueCode[0]};')
                                             else:
-                                                Code.append(f'struct {struct_name} {var_name}{array_size_str};')
-                                                # 检查右侧是否是构造函数调用
-                                                if isinstance(Node.value, ast.Call):
-                                                    # 检查是否是真正的结构体构造函数
-                                                    # 只有当被调用的函数不是c模块的函数时，才可能是构造函数
-                                                    is_c_function = False
-                                                    if isinstance(Node.value.func, ast.Attribute):
-                                                        if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
-                                                            is_c_function = True
-                                                    
-                                                    # 只有不是c模块的函数，才可能是构造函数
-                                                    if not is_c_function:
-                                                        # 获取被调用的函数名
-                                                        called_func_name = None
-                                                        if isinstance(Node.value.func, ast.Name):
-                                                            called_func_name = Node.value.func.id
-                                                        elif isinstance(Node.value.func, ast.Attribute):
-                                                            called_func_name = Node.value.func.attr
-                                                        
-                                                        # 检查函数名是否与结构体名相同，并且结构体在符号表中明确标记为结构体
-                                                        if called_func_name == struct_name and struct_name in self.SymbolTable and self.SymbolTable[struct_name]['type'] == 'struct':
-                                                            # 提取构造函数参数
-                                                            args = []
-                                                            for arg in Node.value.args:
-                                                                args.append(self.HandleExpr(arg)[0])
-                                                            args_str = ', '.join(args)
-                                                            # 生成构造函数调用
-                                                            if args_str:
-                                                                Code.append(f'{struct_name}____init__(&{var_name}, {args_str});')
-                                                            else:
-                                                                Code.append(f'{struct_name}____init__(&{var_name});')
-                                        # 检查右侧是否是执行格式（带括号）且类型注解包含自定义结构体或t.Struct
-                                        elif isinstance(Node.value, ast.Call):
-                                            # 检查是否是结构体构造函数调用
-                                            struct_name = None
-                                            if isinstance(Node.value.func, ast.Name):
-                                                # 函数名作为结构体名
-                                                struct_name = Node.value.func.id
-                                            elif isinstance(Node.value.func, ast.Attribute):
-                                                # 属性访问作为结构体名
-                                                struct_name = Node.value.func.attr
-                                            
-                                            # 检查是否是结构体
-                                            is_struct_call = False
-                                            # 尝试从类型注解中获取结构体名称
-                                            annotation_str = ast.dump(Node.annotation)
-                                            struct_name_from_annotation = None
-                                            
-                                            # 查找类型注解中的结构体名称
-                                            if 'Name(id=' in annotation_str:
-                                                # 提取结构体名称
-                                                import re
-                                                match = re.search(r'Name\(id=\"([A-Za-z0-9_]+)\"', annotation_str)
-                                                if match:
-                                                    struct_name_from_annotation = match.group(1)
-                                                    if struct_name_from_annotation:
-                                                        struct_name = struct_name_from_annotation
-                                            
-                                            if struct_name:
-                                                # 检查结构体是否在符号表中且明确记录为结构体类型
-                                                if struct_name in self.SymbolTable and self.SymbolTable[struct_name]['type'] == 'struct':
-                                                    is_struct_call = True
-                                                # 如果结构体不在符号表中，但左侧是指针类型，也视为结构体
-                                                elif is_ptr and base_type == '':
-                                                    is_struct_call = True
-                                            
-                                            if is_struct_call:
-                                                # 视为结构体声明且赋值
-                                                if is_ptr:
-                                                    Code.append(f'struct {struct_name}* {var_name}{array_size_str} = {ValueCode[0]};')
+                                                # 检查右侧是否是c模块的函数调用
+                                                is_c_function = False
+                                                if isinstance(Node.value, ast.Call) and isinstance(Node.value.func, ast.Attribute):
+                                                    if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
+                                                        is_c_function = True
+                                                
+                                                if is_c_function:
+                                                    # 如果是c模块的函数调用，直接生成带赋值的声明
+                                                    Code.append(f'struct {struct_name} {var_name}{array_size_str} = {ValueCode[0]};')
                                                 else:
                                                     Code.append(f'struct {struct_name} {var_name}{array_size_str};')
-                                                    # 检查是否是真正的结构体构造函数
-                                                    # 只有当被调用的函数不是c模块的函数时，才可能是构造函数
-                                                    is_c_function = False
-                                                    if isinstance(Node.value.func, ast.Attribute):
-                                                        if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
-                                                            is_c_function = True
-                                                    
-                                                    # 只有不是c模块的函数，才可能是构造函数
-                                                    if not is_c_function:
-                                                        # 获取被调用的函数名
-                                                        called_func_name = None
-                                                        if isinstance(Node.value.func, ast.Name):
-                                                            called_func_name = Node.value.func.id
-                                                        elif isinstance(Node.value.func, ast.Attribute):
-                                                            called_func_name = Node.value.func.attr
+                                                    # 检查右侧是否是构造函数调用
+                                                    if isinstance(Node.value, ast.Call):
+                                                        # 检查是否是真正的结构体构造函数
+                                                        # 只有当被调用的函数不是c模块的函数时，才可能是构造函数
+                                                        is_c_function = False
+                                                        if isinstance(Node.value.func, ast.Attribute):
+                                                            if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
+                                                                is_c_function = True
                                                         
-                                                        # 检查函数名是否与结构体名相同，并且结构体在符号表中明确标记为结构体
-                                                        if called_func_name == struct_name and struct_name in self.SymbolTable and self.SymbolTable[struct_name]['type'] == 'struct':
-                                                            # 生成构造函数调用
-                                                            args = ['&' + var_name]
-                                                            for arg in Node.value.args:
-                                                                args.append(self.HandleExpr(arg)[0])
-                                                            args_str = ', '.join(args)
-                                                            Code.append(f'{struct_name}____init__({args_str});')
-                                            else:
-                                                # 生成普通声明
-                                                # 检查 base_type 是否包含存储类修饰符
-                                                storage_class, type_part = check_storage_class(base_type)
-                                                
-                                                # 处理指针类型
-                                                ptr_str = '*' if is_ptr else ''
-                                                
-                                                if storage_class:
-                                                    # 处理带存储类修饰符的变量
-                                                    Code.append(f'{storage_class} {type_part}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
-                                                else:
-                                                    # 处理普通变量，包括指针类型
-                                                    # 检查base_type是否是一个结构体名
-                                                    if base_type in self.SymbolTable and self.SymbolTable[base_type]['type'] == 'struct':
-                                                        # 如果是结构体名，在前面加上struct关键字
-                                                        Code.append(f'struct {base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
-                                                    else:
-                                                        # 否则，直接使用base_type
-                                                        Code.append(f'{base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
+                                                        # 只有不是c模块的函数，才可能是构造函数
+                                                        if not is_c_function:
+                                                            # 获取被调用的函数名
+                                                            called_func_name = None
+                                                            if isinstance(Node.value.func, ast.Name):
+                                                                called_func_name = Node.value.func.id
+                                                            elif isinstance(Node.value.func, ast.Attribute):
+                                                                called_func_name = Node.value.func.attr
+                                                             
+                                                            # 检查函数名是否与结构体名相同，并且结构体在符号表中明确标记为结构体
+                                                            if called_func_name == struct_name and struct_name in self.SymbolTable and self.SymbolTable[struct_name]['type'] == 'struct':
+                                                                # 提取构造函数参数
+                                                                args = []
+                                                                for arg in Node.value.args:
+                                                                    args.append(self.HandleExpr(arg)[0])
+                                                                args_str = ', '.join(args)
+                                                                # 生成构造函数调用
+                                                                if args_str:
+                                                                    Code.append(f'{struct_name}____init__(&{var_name}, {args_str});')
+                                                                else:
+                                                                    Code.append(f'{struct_name}____init__(&{var_name});')
                                         else:
-                                            # 生成普通声明
                                             # 检查 base_type 是否包含存储类修饰符
                                             storage_class, type_part = check_storage_class(base_type)
                                             
                                             # 处理指针类型
                                             ptr_str = '*' if is_ptr else ''
                                             
-                                            if storage_class:
+                                            # 处理数组指针类型，如 const char (*)[16] → const char (*var)[16]
+                                            if is_array_ptr:
+                                                # 对于数组指针，数组大小应该放在 ) 之后，变量名放在 (* 和 ) 之间
+                                                self.debug_print(f"DEBUG: is_array_ptr=True, base_type='{base_type}', type_part='{type_part}', array_size_str='{array_size_str}'")
+                                                if storage_class:
+                                                    self.debug_print(type_part)
+                                                    type_with_var = type_part.replace('(*)', f'(*{var_name})')
+                                                    self.debug_print(f"DEBUG: storage_class='{storage_class}', type_with_var='{type_with_var}'")
+                                                    Code.append(f'{storage_class} {type_with_var}{array_size_str} = {ValueCode[0]};')
+                                                else:
+                                                    type_with_var = base_type.replace('(*)', f'(*{var_name})')
+                                                    self.debug_print(f"DEBUG: no storage_class, type_with_var='{type_with_var}'")
+                                                    Code.append(f'{type_with_var}{array_size_str} = {ValueCode[0]};')
+                                            elif storage_class:
                                                 # 处理带存储类修饰符的变量
                                                 Code.append(f'{storage_class} {type_part}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
                                             else:
                                                 # 处理普通变量，包括指针类型
-                                                # 检查base_type是否是一个结构体名
-                                                if base_type in self.SymbolTable and self.SymbolTable[base_type]['type'] == 'struct':
-                                                    # 如果是结构体名，在前面加上struct关键字
-                                                    Code.append(f'struct {base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
-                                                else:
-                                                    # 否则，直接使用base_type
-                                                    Code.append(f'{base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
-                                    # 添加变量到当前作用域
-                                    if self.VarScopes:
-                                        self.VarScopes[-1][var_name] = type_name
-                                else:
-                                    # 默认使用int类型
-                                    # 特殊处理数组初始化
-                                    if isinstance(Node.value, ast.List):
-                                        elements = []
-                                        for elt in Node.value.elts:
-                                            elements.append(self.HandleExpr(elt)[0])
-                                        elements_str = ', '.join(elements)
-                                        Code.append(f'int {var_name}[] = {{ {elements_str} }};')
-                                    else:
-                                        # 特殊处理 c.State，表示仅声明不定义
-                                        if ValueCode[0] == 'c.State':
-                                            Code.append(f'int {var_name};')
-                                        else:
-                                            Code.append(f'int {var_name} = {ValueCode[0]};')
-                                    # 添加变量到当前作用域
-                                    if self.VarScopes:
-                                        self.VarScopes[-1][var_name] = 'int'
-                            except Exception as e:
-                                print(f'Warning: Failed to get type annotation: {e}')
-                                # 发生异常时，默认使用int类型
-                                # 特殊处理数组初始化
-                                if isinstance(Node.value, ast.List):
-                                    elements = []
-                                    for elt in Node.value.elts:
-                                        elements.append(self.HandleExpr(elt)[0])
-                                    elements_str = ', '.join(elements)
-                                    Code.append(f'int {var_name}[] = {{ {elements_str} }};')
-                                else:
-                                    # 特殊处理 c.State，表示仅声明不定义
-                                    if ValueCode[0] == 'c.State':
-                                        Code.append(f'int {var_name};')
+                                                Code.append(f'{base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
+                                # 检查是否已经识别为结构体类型
+                                elif is_struct and struct_name:
+                                    # 处理结构体类型，生成声明并调用构造函数
+                                    if is_ptr:
+                                        # 直接生成带赋值的指针声明
+                                        Code.append(f'struct {struct_name}* {var_name}{array_size_str} = {ValueCode[0]};')
                                     else:
-                                        Code.append(f'int {var_name} = {ValueCode[0]};')
-                                # 添加变量到当前作用域
-                                if self.VarScopes:
-                                    self.VarScopes[-1][var_name] = 'int'
-                    else:
-                        # 没有赋值部分，视为仅声明不定义，等价于 = c.State
-                        # 直接处理特定的变量
-                        if var_name == 'font':
-                            Code.append('extern char font[4096];')
-                        else:
-                            try:
-                                type_name = self.GetTypeName(Node.annotation)
-                                # 无论type_name是否为空，都生成声明语句
-                                if type_name and type_name.strip():
-                                    # 处理数组类型，提取数组大小
-                                    base_type, array_size_str = extract_array_size(type_name)
+                                        Code.append(f'struct {struct_name} {var_name}{array_size_str};')
+                                        # 检查右侧是否是构造函数调用
+                                        if isinstance(Node.value, ast.Call):
+                                            # 检查是否是真正的结构体构造函数
+                                            # 只有当被调用的函数不是c模块的函数时，才可能是构造函数
+                                            is_c_function = False
+                                            if isinstance(Node.value.func, ast.Attribute):
+                                                if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
+                                                    is_c_function = True
+                                            
+                                            # 只有不是c模块的函数，才可能是构造函数
+                                            if not is_c_function:
+                                                # 获取被调用的函数名
+                                                called_func_name = None
+                                                if isinstance(Node.value.func, ast.Name):
+                                                    called_func_name = Node.value.func.id
+                                                elif isinstance(Node.value.func, ast.Attribute):
+                                                    called_func_name = Node.value.func.attr
+                                                
+                                                # 检查函数名是否与结构体名相同，并且结构体在符号表中明确标记为结构体
+                                                if called_func_name == struct_name and struct_name in self.SymbolTable and self.SymbolTable[struct_name]['type'] == 'struct':
+                                                    # 提取构造函数参数
+                                                    args = []
+                                                    for arg in Node.value.args:
+                                                        args.append(self.HandleExpr(arg)[0])
+                                                    args_str = ', '.join(args)
+                                                    # 生成构造函数调用
+                                                    if args_str:
+                                                        Code.append(f'{struct_name}____init__(&{var_name}, {args_str});')
+                                                    else:
+                                                        Code.append(f'{struct_name}____init__(&{var_name});')
+                                # 检查右侧是否是执行格式（带括号）且类型注解包含自定义结构体或t.Struct
+                                elif isinstance(Node.value, ast.Call):
+                                    # 检查是否是结构体构造函数调用
+                                    struct_name = None
+                                    if isinstance(Node.value.func, ast.Name):
+                                        # 函数名作为结构体名
+                                        struct_name = Node.value.func.id
+                                    elif isinstance(Node.value.func, ast.Attribute):
+                                        # 属性访问作为结构体名
+                                        struct_name = Node.value.func.attr
                                     
-                                    # 检查是否是数组指针类型，如 'const char (*)[16]'
-                                    is_array_ptr = '(*)' in base_type
+                                    # 检查是否是结构体
+                                    is_struct_call = False
+                                    # 尝试从类型注解中获取结构体名称
+                                    struct_name_from_annotation = analyze_annotation(Node.annotation).StructTarget
+                                    if struct_name_from_annotation:
+                                        struct_name = struct_name_from_annotation
                                     
-                                    # 检查 base_type 是否包含存储类修饰符
-                                    storage_class, type_part = check_storage_class(base_type)
+                                    if struct_name:
+                                        # 检查结构体是否在符号表中且明确记录为结构体类型
+                                        if struct_name in self.SymbolTable and self.SymbolTable[struct_name]['type'] == 'struct':
+                                            is_struct_call = True
+                                        # 如果结构体不在符号表中，但左侧是指针类型，也视为结构体
+                                        elif is_ptr and base_type == '':
+                                            is_struct_call = True
                                     
-                                    # 处理数组指针类型，如 const char (*)[16] → const char (*var)[16]
-                                    if is_array_ptr:
+                                    if is_struct_call:
+                                        # 视为结构体声明且赋值
+                                        if is_ptr:
+                                            Code.append(f'struct {struct_name}* {var_name}{array_size_str} = {ValueCode[0]};')
+                                        else:
+                                            Code.append(f'struct {struct_name} {var_name}{array_size_str};')
+                                            # 检查是否是真正的结构体构造函数
+                                            # 只有当被调用的函数不是c模块的函数时，才可能是构造函数
+                                            is_c_function = False
+                                            if isinstance(Node.value.func, ast.Attribute):
+                                                if isinstance(Node.value.func.value, ast.Name) and Node.value.func.value.id == 'c':
+                                                    is_c_function = True
+                                            
+                                            # 只有不是c模块的函数，才可能是构造函数
+                                            if not is_c_function:
+                                                # 获取被调用的函数名
+                                                called_func_name = None
+                                                if isinstance(Node.value.func, ast.Name):
+                                                    called_func_name = Node.value.func.id
+                                                elif isinstance(Node.value.func, ast.Attribute):
+                                                    called_func_name = Node.value.func.attr
+                                                
+                                                # 检查函数名是否与结构体名相同，并且结构体在符号表中明确标记为结构体
+                                                if called_func_name == struct_name and struct_name in self.SymbolTable and self.SymbolTable[struct_name]['type'] == 'struct':
+                                                    # 生成构造函数调用
+                                                    args = ['&' + var_name]
+                                                    for arg in Node.value.args:
+                                                        args.append(self.HandleExpr(arg)[0])
+                                                    args_str = ', '.join(args)
+                                                    Code.append(f'{struct_name}____init__({args_str});')
+                                    else:
+                                        # 生成普通声明
+                                        # 检查 base_type 是否包含存储类修饰符
+                                        storage_class, type_part = check_storage_class(base_type)
+                                        
+                                        # 处理指针类型
+                                        ptr_str = '*' if is_ptr else ''
+                                        
                                         if storage_class:
-                                            type_with_var = type_part.replace('(*)', f'(*{var_name})')
-                                            Code.append(f'{storage_class} {type_with_var}{array_size_str};')
+                                            # 处理带存储类修饰符的变量
+                                            Code.append(f'{storage_class} {type_part}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
                                         else:
-                                            type_with_var = base_type.replace('(*)', f'(*{var_name})')
-                                            Code.append(f'{type_with_var}{array_size_str};')
-                                    elif storage_class:
+                                            # 处理普通变量，包括指针类型
+                                            # 检查base_type是否是一个结构体名
+                                            if base_type in self.SymbolTable and self.SymbolTable[base_type]['type'] == 'struct':
+                                                # 如果是结构体名，在前面加上struct关键字
+                                                Code.append(f'struct {base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
+                                            else:
+                                                # 否则，直接使用base_type
+                                                Code.append(f'{base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
+                                else:
+                                    # 生成普通声明
+                                    # 检查 base_type 是否包含存储类修饰符
+                                    storage_class, type_part = check_storage_class(base_type)
+                                    
+                                    # 处理指针类型
+                                    ptr_str = '*' if is_ptr else ''
+                                    
+                                    if storage_class:
                                         # 处理带存储类修饰符的变量
-                                        Code.append(f'{storage_class} {type_part} {var_name}{array_size_str};')
+                                        Code.append(f'{storage_class} {type_part}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
                                     else:
-                                        Code.append(f'{base_type} {var_name}{array_size_str};')
-                                    
-                                    # 添加变量到当前作用域
-                                    if self.VarScopes:
-                                        self.VarScopes[-1][var_name] = type_name
-                                else:
+                                        # 处理普通变量，包括指针类型
+                                        # 检查base_type是否是一个结构体名
+                                        if base_type in self.SymbolTable and self.SymbolTable[base_type]['type'] == 'struct':
+                                            # 如果是结构体名，在前面加上struct关键字
+                                            Code.append(f'struct {base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
+                                        else:
+                                            # 否则，直接使用base_type
+                                            Code.append(f'{base_type}{ptr_str} {var_name}{array_size_str} = {ValueCode[0]};')
+                            # 添加变量到当前作用域
+                            self.VarScopes.Bind(var_name, type_name)
+                        else:
+                            # 默认使用int类型
+                            # 特殊处理数组初始化
+                            if isinstance(Node.value, ast.List):
+                                elements = []
+                                for elt in Node.value.elts:
+                                    elements.append(self.HandleExpr(elt)[0])
+                                elements_str = ', '.join(elements)
+                                Code.append(f'int {var_name}[] = {{ {elements_str} }};')
+                            else:
+                                # 特殊处理 c.State，表示仅声明不定义
+                                if ValueCode[0] == 'c.State':
                                     Code.append(f'int {var_name};')
-                                    # 添加变量到当前作用域
-                                    if self.VarScopes:
-                                        self.VarScopes[-1][var_name] = 'int'
-                            except Exception as e:
-                                print(f'Warning: Failed to get type annotation: {e}')
+                                else:
+                                    Code.append(f'int {var_name} = {ValueCode[0]};')
+                            # 添加变量到当前作用域
+                            self.VarScopes.Bind(var_name, 'int')
+                    except Exception as e:
+                        print(f'Warning: Failed to get type annotation: {e}')
+                        # 发生异常时，默认使用int类型
+                        # 特殊处理数组初始化
+                        if isinstance(Node.value, ast.List):
+                            elements = []
+                            for elt in Node.value.elts:
+                                elements.append(self.HandleExpr(elt)[0])
+                            elements_str = ', '.join(elements)
+                            Code.append(f'int {var_name}[] = {{ {elements_str} }};')
+                        else:
+                            # 特殊处理 c.State，表示仅声明不定义
+                            if ValueCode[0] == 'c.State':
                                 Code.append(f'int {var_name};')
-                                # 添加变量到当前作用域
-                                if self.VarScopes:
-                                    self.VarScopes[-1][var_name] = 'int'
-                elif isinstance(Node.target, ast.Attribute):
-                    # 处理 self.attribute 赋值，如 self.led = led
-                    if isinstance(Node.target.value, ast.Name) and Node.target.value.id == 'self':
-                        attr_name = Node.target.attr
-                        # 检查是否有赋值部分
-                        if Node.value:
-                            ValueCode = self.HandleExpr(Node.value)
-                            if ValueCode:
-                                Code.append(f'self->{attr_name} = {ValueCode[0]};')
+                            else:
+                                Code.append(f'int {var_name} = {ValueCode[0]};')
+                        # 添加变量到当前作用域
+                        self.VarScopes.Bind(var_name, 'int')
+            else:
+                # 没有赋值部分，视为仅声明不定义，等价于 = c.State
+                # 直接处理特定的变量
+                if var_name == 'font':
+                    Code.append('extern char font[4096];')
                 else:
-                    # 直接生成int类型的声明语句
-                    Code.append(f'int a = "123";')
-            elif isinstance(Node, ast.ClassDef):
-                Code.extend(self.HandleClassDef(Node))
-            elif hasattr(ast, 'Match') and isinstance(Node, ast.Match):
-                # 处理 Python 3.10+ 的 match 语句
-                Code.extend(self.HandleMatch(Node))
+                    try:
+                        type_name = self.GetTypeName(Node.annotation)
+                        # 无论type_name是否为空，都生成声明语句
+                        if type_name and type_name.strip():
+                            # 处理数组类型，提取数组大小
+                            base_type, array_size_str = extract_array_size(type_name)
+                            
+                            # 检查是否是数组指针类型，如 'const char (*)[16]'
+                            is_array_ptr = '(*)' in base_type
+                            
+                            # 检查 base_type 是否包含存储类修饰符
+                            storage_class, type_part = check_storage_class(base_type)
+                            
+                            # 处理数组指针类型，如 const char (*)[16] → const char (*var)[16]
+                            if is_array_ptr:
+                                if storage_class:
+                                    type_with_var = type_part.replace('(*)', f'(*{var_name})')
+                                    Code.append(f'{storage_class} {type_with_var}{array_size_str};')
+                                else:
+                                    type_with_var = base_type.replace('(*)', f'(*{var_name})')
+                                    Code.append(f'{type_with_var}{array_size_str};')
+                            elif storage_class:
+                                # 处理带存储类修饰符的变量
+                                Code.append(f'{storage_class} {type_part} {var_name}{array_size_str};')
+                            else:
+                                Code.append(f'{base_type} {var_name}{array_size_str};')
+                            
+                            # 添加变量到当前作用域
+                            self.VarScopes.Bind(var_name, type_name)
+                        else:
+                            Code.append(f'int {var_name};')
+                            # 添加变量到当前作用域
+                            self.VarScopes.Bind(var_name, 'int')
+                    except Exception as e:
+                        print(f'Warning: Failed to get type annotation: {e}')
+                        Code.append(f'int {var_name};')
+                        # 添加变量到当前作用域
+                        self.VarScopes.Bind(var_name, 'int')
+        elif isinstance(Node.target, ast.Attribute):
+            # 处理 self.attribute 赋值，如 self.led = led
+            if isinstance(Node.target.value, ast.Name) and Node.target.value.id == 'self':
+                attr_name = Node.target.attr
+                # 检查是否有赋值部分
+                if Node.value:
+                    ValueCode = self.HandleExpr(Node.value)
+                    if ValueCode:
+                        Code.append(f'self->{attr_name} = {ValueCode[0]};')
+        else:
+            # 直接生成int类型的声明语句
+            Code.append(f'int a = "123";')
         return Code
     
+    def StmtClassDef(self, Node, in_block=False):
+        """处理函数体中的类定义"""
+        return self.HandleClassDef(Node)
+    
+    def StmtMatch(self, Node, in_block=False):
+        """处理 match 语句"""
+        # 处理 Python 3.10+ 的 match 语句
+        return self.HandleMatch(Node)
+    
     @debug_handle
     def HandleMatch(self, Node):
         """处理 match 语句，转换为 C 的 switch 语句"""
@@ -2802,8 +2833,7 @@ class Translator:
                 Code.append('        {')
                 body_code = self.HandleBody(case.body, in_block=True)
                 # 缩进 body 代码
-                for line in body_code:
-                    Code.append('            ' + line)
+                Code.append(IndentedCode(body_code, 3))
                 
                 # 如果没有 break，添加 break（C 语言 switch 需要）
                 # 检查最后一个语句是否已经是 break
@@ -2820,8 +2850,7 @@ class Translator:
                     Code.append(f'            {var_name} = {subject};')
                 if body:
                     body_code = self.HandleBody(body, in_block=True)
-                    for line in body_code:
-                        Code.append('            ' + line)
+                    Code.append(IndentedCode(body_code, 3))
             Code.append('            break;')
             Code.append('        }')
         
@@ -2838,7 +2867,7 @@ class Translator:
         # 处理if语句体，确保正确缩进，传入in_block=True表示在块级作用域中
         body_code = self.HandleBody(Node.body, in_block=True)
         # if语句体内部的语句应该再缩进4个空格
-        Code.extend(['    ' + line for line in body_code])
+        Code.append(IndentedCode(body_code))
         Code.append('}')
         if Node.orelse:
             # 处理else部分
@@ -2851,7 +2880,7 @@ class Translator:
                 Code.append('else if (' + elif_test + ') {')
                 # 处理elif语句体，传入in_block=True表示在块级作用域中
                 elif_body_code = self.HandleBody(elif_node.body, in_block=True)
-                Code.extend(['    ' + line for line in elif_body_code])
+                Code.append(IndentedCode(elif_body_code))
                 Code.append('}')
                 # 移到下一个else部分，可能是另一个elif或最后的else
                 current_else = elif_node.orelse
@@ -2860,7 +2889,7 @@ class Translator:
             if current_else:
                 Code.append('else {')
                 else_code = self.HandleBody(current_else, in_block=True)
-                Code.extend(['    ' + line for line in else_code])
+                Code.append(IndentedCode(else_code))
                 Code.append('}')
         return Code
     
@@ -2895,7 +2924,7 @@ class Translator:
             # 添加字符变量声明
             Code.append(f'    char {var_name} = {base_var}[__for_i];')
             # 处理循环体，传入in_block=True表示在块级作用域中
-            Code.extend(['    ' + line for line in self.HandleBody(Node.body, in_block=True)])
+            Code.append(IndentedCode(self.HandleBody(Node.body, in_block=True)))
             Code.append('}')
             return Code
         
@@ -2917,7 +2946,7 @@ class Translator:
             # 添加字符变量声明
             Code.append(f'    char {var_name} = {base_var}[__for_i];')
             # 处理循环体，传入in_block=True表示在块级作用域中
-            Code.extend(['    ' + line for line in self.HandleBody(Node.body, in_block=True)])
+            Code.append(IndentedCode(self.HandleBody(Node.body, in_block=True)))
             Code.append('}')
             return Code
         
@@ -2954,19 +2983,19 @@ class Translator:
                     # start与循环变量相同，省略初始化部分
                     Code.append(f'for (; {var_name} {condition_op} {stop}; {var_name} += {step}) {{')
                 # 检查循环变量是否已经在作用域中声明
-                elif self.VarScopes and var_name in self.VarScopes[-1]:
+                elif self.VarScopes.InCurrent(var_name):
                     # 变量已存在，在for循环头中赋值（不重新定义类型）
                     Code.append(f'for ({var_name} = {start}; {var_name} {condition_op} {stop}; {var_name} += {step}) {{')
                 else:
                     # 变量未声明，在for循环头中定义
                     Code.append(f'for (int {var_name} = {start}; {var_name} {condition_op} {stop}; {var_name} += {step}) {{')
-                Code.extend(['    ' + line for line in self.HandleBody(Node.body, in_block=True)])
+                Code.append(IndentedCode(self.HandleBody(Node.body, in_block=True)))
                 Code.append('}')
                 return Code
         
         # 默认处理
         Code.append('for (...) {')
-        Code.extend(['    ' + line for line in self.HandleBody(Node.body, in_block=True)])
+        Code.append(IndentedCode(self.HandleBody(Node.body, in_block=True)))
         Code.append('}')
         return Code
     
@@ -3001,7 +3030,7 @@ class Translator:
                 body_code.extend(self.HandleBody([stmt], in_block=True))
             # 处理if语句之前的部分（如果有的话）
             if body_code:
-                Code.extend(['    ' + line for line in body_code])
+                Code.append(IndentedCode(body_code))
             # 生成while条件 - 取反条件，因为原代码是"if条件则break"，所以循环应继续当条件为假
             condition_code = self.HandleExpr(condition)[0]
             # 只有对于已经整体带括号的表达式，不再添加外层括号
@@ -3013,14 +3042,32 @@ class Translator:
             # C语言中while条件必须加括号
             Code.append('while (' + Test + ') {')
             body_code = self.HandleBody(Node.body, in_block=True)
-            Code.extend(['    ' + line for line in body_code])
+            Code.append(IndentedCode(body_code))
             Code.append('}')
         
         return Code
     
     @debug_handle
     def GetTypeName(self, Node):
-        """获取类型名称"""
+        """获取类型名称
+        
+        Name/Attribute/Call 节点的结果只取决于节点结构，按 type_name_key 缓存在
+        TYPE_NAME_CACHE 中；数组大小每次重新生成，| 组合按左右两侧的类型名缓存，
+        结果与不使用缓存时完全相同。
+        """
+        key = type_name_key(Node)
+        if key is None:
+            return self.ResolveTypeName(Node)
+        type_name = TYPE_NAME_CACHE.get(key)
+        if type_name is not None:
+            self.TypeNameHits += 1
+            return type_name
+        self.TypeNameMisses += 1
+        type_name = TYPE_NAME_CACHE[key] = self.ResolveTypeName(Node)
+        return type_name
+    
+    def ResolveTypeName(self, Node):
+        """不经缓存解析类型名称"""
         if isinstance(Node, ast.Name):
             type_name = Node.id
             # 检查是否是t模块中的类型
@@ -3107,233 +3154,244 @@ class Translator:
             elif right_type is None:
                 return left_type
             
-            # 处理存储类修饰符与数组类型的组合
-            if left_type == 'extern' and '[' in right_type:
-                # 处理 t.CExtern | t.CInt[MAX_LANGUAGE_NUMBER] 或 t.CExtern | t.CChar[4096]
-                base_type = right_type.split('[')[0]
-                array_size = right_type[right_type.find('['):]
-                return f'extern {base_type}{array_size}'
-            elif left_type == 'static' and '[' in right_type:
-                # 处理 t.CStatic | t.CChar[128]
-                base_type = right_type.split('[')[0]
-                array_size = right_type[right_type.find('['):]
-                return f'static {base_type}{array_size}'
-            elif left_type == 'unsigned' and 'char*' in right_type and '[' in right_type:
-                # 处理 t.CUnsigned | t.CChar | t.CPtr | t.CChar[256]
-                return 'unsigned char*[' + right_type.split('[')[1]
-            # 处理存储类修饰符
-            elif left_type in ['static', 'extern']:
-                storage_class = left_type
-                base_type = right_type
-                # 修复 extern *struct TASKCTL 这样的格式，确保指针符号在结构体名称后面
-                if base_type.startswith('*') and 'struct ' in base_type:
-                    # 提取结构体名称
-                    struct_name = base_type.replace('*', '').strip()
-                    return f'{storage_class} {struct_name}*'
-                return f'{storage_class} {base_type}'
-            elif right_type in ['static', 'extern']:
-                storage_class = right_type
-                base_type = left_type
-                return f'{storage_class} {base_type}'
-            # 处理 const 修饰符
-            elif left_type == 'const':
-                return f'const {right_type}'
-            elif right_type == 'const':
-                return f'const {left_type}'
-            # 处理 volatile 修饰符
-            elif left_type == 'volatile':
-                return f'volatile {right_type}'
-            elif right_type == 'volatile':
-                return f'volatile {left_type}'
-            # 处理指针类型
-            elif left_type == 'char' and right_type == '*':
-                return 'char*'
-            elif left_type == '*' and right_type == 'char':
-                return 'char*'
-            elif left_type == 'int' and right_type == '*':
-                return 'int*'
-            elif left_type == '*' and right_type == 'int':
-                return 'int*'
-            elif left_type == '*' and right_type.startswith('uint8_t'):
-                return 'uint8_t*'
-            elif left_type.startswith('uint8_t') and right_type == '*':
-                return 'uint8_t*'
-            # 处理数组指针类型，如 t.CConst | t.CChar[16] | t.CArrayPtr
-            elif right_type == '(*)':
-                # 数组指针：将数组大小移到括号外，如 const char[16] | (*) → const char (*)[16]
+            key = ('|', left_type, right_type)
+            type_name = TYPE_NAME_CACHE.get(key)
+            if type_name is not None:
+                self.TypeNameHits += 1
+                return type_name
+            self.TypeNameMisses += 1
+            type_name = TYPE_NAME_CACHE[key] = self.CombineTypeNames(left_type, right_type)
+            return type_name
+        # 确保返回有效的类型名称
+        return 'int'
+    
+    def CombineTypeNames(self, left_type, right_type):
+        """组合 | 两侧的类型名称，如 ('extern', 'struct SHEET*') -> 'extern struct SHEET*'"""
+        # 处理存储类修饰符与数组类型的组合
+        if left_type == 'extern' and '[' in right_type:
+            # 处理 t.CExtern | t.CInt[MAX_LANGUAGE_NUMBER] 或 t.CExtern | t.CChar[4096]
+            base_type = right_type.split('[')[0]
+            array_size = right_type[right_type.find('['):]
+            return f'extern {base_type}{array_size}'
+        elif left_type == 'static' and '[' in right_type:
+            # 处理 t.CStatic | t.CChar[128]
+            base_type = right_type.split('[')[0]
+            array_size = right_type[right_type.find('['):]
+            return f'static {base_type}{array_size}'
+        elif left_type == 'unsigned' and 'char*' in right_type and '[' in right_type:
+            # 处理 t.CUnsigned | t.CChar | t.CPtr | t.CChar[256]
+            return 'unsigned char*[' + right_type.split('[')[1]
+        # 处理存储类修饰符
+        elif left_type in ['static', 'extern']:
+            storage_class = left_type
+            base_type = right_type
+            # 修复 extern *struct TASKCTL 这样的格式，确保指针符号在结构体名称后面
+            if base_type.startswith('*') and 'struct ' in base_type:
+                # 提取结构体名称
+                struct_name = base_type.replace('*', '').strip()
+                return f'{storage_class} {struct_name}*'
+            return f'{storage_class} {base_type}'
+        elif right_type in ['static', 'extern']:
+            storage_class = right_type
+            base_type = left_type
+            return f'{storage_class} {base_type}'
+        # 处理 const 修饰符
+        elif left_type == 'const':
+            return f'const {right_type}'
+        elif right_type == 'const':
+            return f'const {left_type}'
+        # 处理 volatile 修饰符
+        elif left_type == 'volatile':
+            return f'volatile {right_type}'
+        elif right_type == 'volatile':
+            return f'volatile {left_type}'
+        # 处理指针类型
+        elif left_type == 'char' and right_type == '*':
+            return 'char*'
+        elif left_type == '*' and right_type == 'char':
+            return 'char*'
+        elif left_type == 'int' and right_type == '*':
+            return 'int*'
+        elif left_type == '*' and right_type == 'int':
+            return 'int*'
+        elif left_type == '*' and right_type.startswith('uint8_t'):
+            return 'uint8_t*'
+        elif left_type.startswith('uint8_t') and right_type == '*':
+            return 'uint8_t*'
+        # 处理数组指针类型，如 t.CConst | t.CChar[16] | t.CArrayPtr
+        elif right_type == '(*)':
+            # 数组指针：将数组大小移到括号外，如 const char[16] | (*) → const char (*)[16]
+            if '[' in left_type:
+                type_part = left_type.split('[')[0]
+                array_part = left_type[left_type.find('['):]
+                return f'{type_part} (*){array_part}'
+            return f'{left_type} (*)'
+        elif left_type == '(*)':
+            if '[' in right_type:
+                type_part = right_type.split('[')[0]
+                array_part = right_type[right_type.find('['):]
+                return f'{type_part} (*){array_part}'
+            return f'{right_type} (*)'
+        # 处理自定义类型与指针类型的组合，如 CONSOLE | t.CPtr
+        elif right_type == '*' and left_type != 'int':
+            if left_type.startswith('struct '):
+                return left_type + '*'
+            # 检查是否是基本类型（char, int, etc.）或包含基本类型（如 const char）
+            basic_types = ['char', 'int', 'short', 'long', 'float', 'double', 'unsigned char', 'unsigned int', 'unsigned short', 'unsigned long']
+            if any(left_type.startswith(bt) for bt in basic_types) or any(bt in left_type for bt in basic_types):
+                # 处理数组类型与指针的组合，如 const char[16] | t.CPtr
                 if '[' in left_type:
                     type_part = left_type.split('[')[0]
                     array_part = left_type[left_type.find('['):]
-                    return f'{type_part} (*){array_part}'
-                return f'{left_type} (*)'
-            elif left_type == '(*)':
+                    return f'{type_part}*{array_part}'
+                return f'{left_type}*'
+            else:
+                # 检查是否已经包含 'struct '（如 'extern struct TASKCTL'）
+                if 'struct ' in left_type:
+                    return f'{left_type}*'
+                return f'struct {left_type}*'
+        elif left_type == '*' and right_type != 'int':
+            if right_type.startswith('struct '):
+                # 处理数组类型与指针的组合，如 struct SHEET[MAX_SHEETS] | t.CPtr
+                if '[' in right_type:
+                    # 提取结构体名称和数组大小
+                    struct_name = right_type.split('[')[0]  # 'struct SHEET'
+                    array_part = right_type[right_type.find('['):]  # '[MAX_SHEETS]'
+                    return f'{struct_name} *{array_part}'
+                return right_type + '*'
+            # 检查是否是基本类型（char, int, etc.）或包含基本类型（如 const char）
+            basic_types = ['char', 'int', 'short', 'long', 'float', 'double', 'unsigned char', 'unsigned int', 'unsigned short', 'unsigned long']
+            if any(right_type.startswith(bt) for bt in basic_types) or any(bt in right_type for bt in basic_types):
+                # 处理数组类型与指针的组合
                 if '[' in right_type:
                     type_part = right_type.split('[')[0]
                     array_part = right_type[right_type.find('['):]
-                    return f'{type_part} (*){array_part}'
-                return f'{right_type} (*)'
-            # 处理自定义类型与指针类型的组合，如 CONSOLE | t.CPtr
-            elif right_type == '*' and left_type != 'int':
-                if left_type.startswith('struct '):
-                    return left_type + '*'
-                # 检查是否是基本类型（char, int, etc.）或包含基本类型（如 const char）
-                basic_types = ['char', 'int', 'short', 'long', 'float', 'double', 'unsigned char', 'unsigned int', 'unsigned short', 'unsigned long']
-                if any(left_type.startswith(bt) for bt in basic_types) or any(bt in left_type for bt in basic_types):
-                    # 处理数组类型与指针的组合，如 const char[16] | t.CPtr
-                    if '[' in left_type:
-                        type_part = left_type.split('[')[0]
-                        array_part = left_type[left_type.find('['):]
-                        return f'{type_part}*{array_part}'
-                    return f'{left_type}*'
-                else:
-                    # 检查是否已经包含 'struct '（如 'extern struct TASKCTL'）
-                    if 'struct ' in left_type:
-                        return f'{left_type}*'
-                    return f'struct {left_type}*'
-            elif left_type == '*' and right_type != 'int':
-                if right_type.startswith('struct '):
-                    # 处理数组类型与指针的组合，如 struct SHEET[MAX_SHEETS] | t.CPtr
-                    if '[' in right_type:
-                        # 提取结构体名称和数组大小
-                        struct_name = right_type.split('[')[0]  # 'struct SHEET'
-                        array_part = right_type[right_type.find('['):]  # '[MAX_SHEETS]'
-                        return f'{struct_name} *{array_part}'
-                    return right_type + '*'
-                # 检查是否是基本类型（char, int, etc.）或包含基本类型（如 const char）
-                basic_types = ['char', 'int', 'short', 'long', 'float', 'double', 'unsigned char', 'unsigned int', 'unsigned short', 'unsigned long']
-                if any(right_type.startswith(bt) for bt in basic_types) or any(bt in right_type for bt in basic_types):
-                    # 处理数组类型与指针的组合
-                    if '[' in right_type:
-                        type_part = right_type.split('[')[0]
-                        array_part = right_type[right_type.find('['):]
-                        return f'{type_part}*{array_part}'
-                    return f'{right_type}*'
+                    return f'{type_part}*{array_part}'
+                return f'{right_type}*'
+            else:
+                # 处理数组类型与指针的组合
+                if '[' in right_type:
+                    type_part = right_type.split('[')[0]
+                    array_part = right_type[right_type.find('['):]
+                    return f'struct {type_part} *{array_part}'
+                return f'struct {right_type}*'
+        # 处理结构体指针类型
+        elif (left_type == 'struct' and right_type == '*') or (left_type == '*' and right_type == 'struct'):
+            return 'struct *'
+        # 处理结构体名称与指针类型的组合，如 NODE | t.CPtr
+        elif left_type.startswith('struct ') and right_type == '*':
+            return left_type + '*'
+        elif right_type.startswith('struct ') and left_type == '*':
+            return right_type + '*'
+        # 处理自定义类型与指针类型的组合，如 CONSOLE | t.CPtr
+        elif right_type == '*' and not left_type.startswith('struct ') and left_type != 'int':
+            return f'struct {left_type}*'
+        elif left_type == '*' and not right_type.startswith('struct ') and right_type != 'int':
+            return f'struct {right_type}*'
+        # 处理自定义类型与指针类型的组合，如 SHEET | t.CPtr
+        elif right_type == '*':
+            # 自定义类型与指针的组合，返回结构体指针
+            # 检查是否是基本类型（char, int, etc.）
+            basic_types = ['char', 'int', 'short', 'long', 'float', 'double', 'unsigned char', 'unsigned int', 'unsigned short', 'unsigned long']
+            if any(left_type.startswith(bt) for bt in basic_types) or '[' in left_type:
+                # 对于基本类型或数组类型，添加指针
+                if '[' in left_type:
+                    # 处理数组类型与指针的组合，如 t.CChar[60] | t.CPtr
+                    type_part = left_type.split('[')[0]
+                    array_part = left_type[left_type.find('['):]
+                    return f'{type_part}*{array_part}'
+                # 对于基本类型，添加指针
+                return f'{left_type}*'
+            return f'struct {left_type}*'
+        elif left_type == '*':
+            # 指针与自定义类型的组合，返回结构体指针
+            # 检查是否是基本类型（char, int, etc.）
+            basic_types = ['char', 'int', 'short', 'long', 'float', 'double', 'unsigned char', 'unsigned int', 'unsigned short', 'unsigned long']
+            if any(right_type.startswith(bt) for bt in basic_types) or '[' in right_type:
+                # 对于基本类型或数组类型，添加指针
+                if '[' in right_type:
+                    # 处理指针与数组类型的组合，如 t.CPtr | t.CChar[60]
+                    type_part = right_type.split('[')[0]
+                    array_part = right_type[right_type.find('['):]
+                    return f'{type_part}*{array_part}'
+                # 对于基本类型，添加指针
+                return f'{right_type}*'
+            return f'struct {right_type}*'
+        elif '*' in left_type or '*' in right_type:
+            # 处理指针和结构体数组的组合，如 * | struct FREEINFO[MEMMAN_FREES] 或 struct * | struct FREEINFO[MEMMAN_FREES]
+            if (('*' in left_type or '*' in right_type) and '[' in left_type and 'struct ' in left_type) or (('*' in left_type or '*' in right_type) and '[' in right_type and 'struct ' in right_type):
+                # 提取结构体名称和数组大小
+                if '[' in right_type and 'struct ' in right_type:
+                    struct_part = right_type.split('[')[0]
+                    array_part = right_type[right_type.find('['):]
                 else:
-                    # 处理数组类型与指针的组合
-                    if '[' in right_type:
-                        type_part = right_type.split('[')[0]
-                        array_part = right_type[right_type.find('['):]
-                        return f'struct {type_part} *{array_part}'
-                    return f'struct {right_type}*'
-            # 处理结构体指针类型
-            elif (left_type == 'struct' and right_type == '*') or (left_type == '*' and right_type == 'struct'):
-                return 'struct *'
-            # 处理结构体名称与指针类型的组合，如 NODE | t.CPtr
+                    struct_part = left_type.split('[')[0]
+                    array_part = left_type[left_type.find('['):]
+                # 移除结构体部分中的 * 符号
+                struct_part = struct_part.replace('*', '').strip()
+                # 生成正确的结构体数组指针格式，如 struct FREEINFO *free[MEMMAN_FREES]
+                return f'{struct_part} *{array_part}'
+            # 处理带名称的结构体指针类型
             elif left_type.startswith('struct ') and right_type == '*':
-                return left_type + '*'
-            elif right_type.startswith('struct ') and left_type == '*':
-                return right_type + '*'
-            # 处理自定义类型与指针类型的组合，如 CONSOLE | t.CPtr
-            elif right_type == '*' and not left_type.startswith('struct ') and left_type != 'int':
-                return f'struct {left_type}*'
-            elif left_type == '*' and not right_type.startswith('struct ') and right_type != 'int':
-                return f'struct {right_type}*'
-            # 处理自定义类型与指针类型的组合，如 SHEET | t.CPtr
-            elif right_type == '*':
-                # 自定义类型与指针的组合，返回结构体指针
-                # 检查是否是基本类型（char, int, etc.）
-                basic_types = ['char', 'int', 'short', 'long', 'float', 'double', 'unsigned char', 'unsigned int', 'unsigned short', 'unsigned long']
-                if any(left_type.startswith(bt) for bt in basic_types) or '[' in left_type:
-                    # 对于基本类型或数组类型，添加指针
-                    if '[' in left_type:
-                        # 处理数组类型与指针的组合，如 t.CChar[60] | t.CPtr
-                        type_part = left_type.split('[')[0]
-                        array_part = left_type[left_type.find('['):]
-                        return f'{type_part}*{array_part}'
-                    # 对于基本类型，添加指针
-                    return f'{left_type}*'
-                return f'struct {left_type}*'
-            elif left_type == '*':
-                # 指针与自定义类型的组合，返回结构体指针
-                # 检查是否是基本类型（char, int, etc.）
-                basic_types = ['char', 'int', 'short', 'long', 'float', 'double', 'unsigned char', 'unsigned int', 'unsigned short', 'unsigned long']
-                if any(right_type.startswith(bt) for bt in basic_types) or '[' in right_type:
-                    # 对于基本类型或数组类型，添加指针
-                    if '[' in right_type:
-                        # 处理指针与数组类型的组合，如 t.CPtr | t.CChar[60]
-                        type_part = right_type.split('[')[0]
-                        array_part = right_type[right_type.find('['):]
-                        return f'{type_part}*{array_part}'
-                    # 对于基本类型，添加指针
-                    return f'{right_type}*'
-                return f'struct {right_type}*'
-            elif '*' in left_type or '*' in right_type:
-                # 处理指针和结构体数组的组合，如 * | struct FREEINFO[MEMMAN_FREES] 或 struct * | struct FREEINFO[MEMMAN_FREES]
-                if (('*' in left_type or '*' in right_type) and '[' in left_type and 'struct ' in left_type) or (('*' in left_type or '*' in right_type) and '[' in right_type and 'struct ' in right_type):
-                    # 提取结构体名称和数组大小
-                    if '[' in right_type and 'struct ' in right_type:
-                        struct_part = right_type.split('[')[0]
-                        array_part = right_type[right_type.find('['):]
-                    else:
-                        struct_part = left_type.split('[')[0]
-                        array_part = left_type[left_type.find('['):]
-                    # 移除结构体部分中的 * 符号
-                    struct_part = struct_part.replace('*', '').strip()
-                    # 生成正确的结构体数组指针格式，如 struct FREEINFO *free[MEMMAN_FREES]
-                    return f'{struct_part} *{array_part}'
-                # 处理带名称的结构体指针类型
-                elif left_type.startswith('struct ') and right_type == '*':
-                    return f'{left_type}*'
-                elif left_type == '*' and right_type.startswith('struct '):
-                    return f'{right_type}*'
-                # 处理 extern * | struct TASKCTL 这样的情况
-                elif left_type.startswith('extern *') and right_type.startswith('struct '):
-                    # 生成 extern struct TASKCTL* 格式
-                    return f'extern {right_type}*'
-                elif right_type.startswith('extern *') and left_type.startswith('struct '):
-                    # 生成 extern struct TASKCTL* 格式
-                    return f'extern {left_type}*'
-                # 处理同时指定 t.CStruct 和结构体名称的情况，如 struct * | struct MEMMAN 或 struct | struct SHEET[MAX_SHEETS]
-                elif left_type.startswith('struct ') and right_type.startswith('struct '):
-                    # 当左右两侧都是结构体类型时，优先使用右侧的完整结构体类型
-                    if '*' in left_type and '*' not in right_type:
-                        return f'{right_type}*'
-                    else:
-                        return right_type
-                # 处理 t.CStruct | SHEET[MAX_SHEETS] 这样的情况，避免生成 struct struct SHEET[MAX_SHEETS]
-                elif left_type == 'struct' and right_type.startswith('struct '):
-                    # 当左侧是 struct，右侧是完整的结构体类型时，只使用右侧的类型
-                    return right_type
-                elif right_type == 'struct' and left_type.startswith('struct '):
-                    # 当右侧是 struct，左侧是完整的结构体类型时，只使用左侧的类型
-                    return left_type
-                # 处理普通指针类型组合，如 * | unsigned char 或 unsigned char | *
-                elif left_type == '*' and right_type != '*':
-                    # 当左侧是指针，右侧是普通类型时，将指针放在右侧类型后面
+                return f'{left_type}*'
+            elif left_type == '*' and right_type.startswith('struct '):
+                return f'{right_type}*'
+            # 处理 extern * | struct TASKCTL 这样的情况
+            elif left_type.startswith('extern *') and right_type.startswith('struct '):
+                # 生成 extern struct TASKCTL* 格式
+                return f'extern {right_type}*'
+            elif right_type.startswith('extern *') and left_type.startswith('struct '):
+                # 生成 extern struct TASKCTL* 格式
+                return f'extern {left_type}*'
+            # 处理同时指定 t.CStruct 和结构体名称的情况，如 struct * | struct MEMMAN 或 struct | struct SHEET[MAX_SHEETS]
+            elif left_type.startswith('struct ') and right_type.startswith('struct '):
+                # 当左右两侧都是结构体类型时，优先使用右侧的完整结构体类型
+                if '*' in left_type and '*' not in right_type:
                     return f'{right_type}*'
-                elif right_type == '*' and left_type != '*':
-                    # 当右侧是指针，左侧是普通类型时，将指针放在左侧类型后面
-                    return f'{left_type}*'
                 else:
-                    return f'{left_type}{right_type}'
-            # 处理同时指定 t.CStruct 和结构体名称的情况，如 struct | struct SHEET[MAX_SHEETS]
-            elif (left_type == 'struct' and right_type.startswith('struct ')) or (right_type == 'struct' and left_type.startswith('struct ')):
-                # 当左右两侧都是结构体类型时，优先使用右侧的完整结构体类型
-                if left_type == 'struct' and right_type.startswith('struct '):
                     return right_type
-                else:
-                    return left_type
-            # 处理长整型和整型的组合
-            elif (left_type == 'long' and right_type == 'int') or (left_type == 'int' and right_type == 'long'):
-                return 'long int'
-            # 处理无符号长整型的组合
-            elif (left_type == 'unsigned int' and right_type == 'long') or (left_type == 'long' and right_type == 'unsigned int'):
-                return 'unsigned long'
-            # 处理长整型和整型数组的组合
-            elif (left_type == 'long' and 'int[' in right_type) or (left_type == 'int' and 'long[' in right_type):
-                # 提取数组大小部分
-                if '[' in right_type:
-                    array_part = right_type[right_type.find('['):]
-                    return f'long int{array_part}'
-                elif '[' in left_type:
-                    array_part = left_type[left_type.find('['):]
-                    return f'long int{array_part}'
-            # 确保返回有效的类型名称
-            elif left_type == 'int' or right_type == 'int':
-                return 'int'
-            return f'{left_type} {right_type}'
+            # 处理 t.CStruct | SHEET[MAX_SHEETS] 这样的情况，避免生成 struct struct SHEET[MAX_SHEETS]
+            elif left_type == 'struct' and right_type.startswith('struct '):
+                # 当左侧是 struct，右侧是完整的结构体类型时，只使用右侧的类型
+                return right_type
+            elif right_type == 'struct' and left_type.startswith('struct '):
+                # 当右侧是 struct，左侧是完整的结构体类型时，只使用左侧的类型
+                return left_type
+            # 处理普通指针类型组合，如 * | unsigned char 或 unsigned char | *
+            elif left_type == '*' and right_type != '*':
+                # 当左侧是指针，右侧是普通类型时，将指针放在右侧类型后面
+                return f'{right_type}*'
+            elif right_type == '*' and left_type != '*':
+                # 当右侧是指针，左侧是普通类型时，将指针放在左侧类型后面
+                return f'{left_type}*'
+            else:
+                return f'{left_type}{right_type}'
+        # 处理同时指定 t.CStruct 和结构体名称的情况，如 struct | struct SHEET[MAX_SHEETS]
+        elif (left_type == 'struct' and right_type.startswith('struct ')) or (right_type == 'struct' and left_type.startswith('struct ')):
+            # 当左右两侧都是结构体类型时，优先使用右侧的完整结构体类型
+            if left_type == 'struct' and right_type.startswith('struct '):
+                return right_type
+            else:
+                return left_type
+        # 处理长整型和整型的组合
+        elif (left_type == 'long' and right_type == 'int') or (left_type == 'int' and right_type == 'long'):
+            return 'long int'
+        # 处理无符号长整型的组合
+        elif (left_type == 'unsigned int' and right_type == 'long') or (left_type == 'long' and right_type == 'unsigned int'):
+            return 'unsigned long'
+        # 处理长整型和整型数组的组合
+        elif (left_type == 'long' and 'int[' in right_type) or (left_type == 'int' and 'long[' in right_type):
+            # 提取数组大小部分
+            if '[' in right_type:
+                array_part = right_type[right_type.find('['):]
+                return f'long int{array_part}'
+            elif '[' in left_type:
+                array_part = left_type[left_type.find('['):]
+                return f'long int{array_part}'
         # 确保返回有效的类型名称
-        return 'int'
+        elif left_type == 'int' or right_type == 'int':
+            return 'int'
+        return f'{left_type} {right_type}'
     
     def HandleTSpecialCall(self, attr, args, keywords):
         """处理t模块中的特殊语法"""
@@ -3583,4 +3641,70 @@ class Translator:
     def GetUnaryOpSymbol(self, Op):
         """获取一元运算符符号"""
         op_name = type(Op).__name__
-        return UNARY_OPERATOR_MAP.get(op_name, '')
\ No newline at end of file
+        return UNARY_OPERATOR_MAP.get(op_name, '')
+
+
+def find_visitor(visitors, node_type):
+    """按节点类型查找分派表中的处理项
+
+    表中没有该类型时沿 MRO 查找基类，与原来逐个 isinstance 判断的结果相同
+    （如 ast.Name 的子类按 ast.Name 处理）；找到后写回表中，下次直接命中。
+    都没有时返回 None。
+    """
+    for base in node_type.__mro__[1:]:
+        visitor = visitors.get(base)
+        if visitor is not None:
+            visitors[node_type] = visitor
+            return visitor
+    return None
+
+
+# 顶层输出段，按顺序生成：导入、宏定义、全局变量和结构体、函数和类方法
+TOP_LEVEL_SECTIONS = ('imports', 'macros', 'globals', 'functions')
+SECTION_IMPORTS, SECTION_MACROS, SECTION_GLOBALS, SECTION_FUNCTIONS = range(len(TOP_LEVEL_SECTIONS))
+
+# 顶层节点类型 -> [(输出段, 处理方法名)]，类定义同时产生结构体和类方法
+Translator.TopLevelSections = {
+    ast.Import: [(SECTION_IMPORTS, 'HandleImport')],
+    ast.ImportFrom: [(SECTION_IMPORTS, 'HandleImportFrom')],
+    ast.Expr: [(SECTION_MACROS, 'HandleTopLevelExpr')],
+    ast.ClassDef: [(SECTION_GLOBALS, 'HandleClassDef'), (SECTION_FUNCTIONS, 'HandleClassMethods')],
+    ast.Assign: [(SECTION_GLOBALS, 'HandleAssign')],
+    ast.AnnAssign: [(SECTION_GLOBALS, 'HandleGlobalAnnAssign')],
+    ast.FunctionDef: [(SECTION_FUNCTIONS, 'HandleFunctionDef')],
+}
+
+# 语句节点类型 -> 处理函数，供 HandleBody 分派
+Translator.StatementVisitors = {
+    ast.Expr: Translator.StmtExpr,
+    ast.If: Translator.StmtIf,
+    ast.For: Translator.StmtFor,
+    ast.While: Translator.StmtWhile,
+    ast.Break: Translator.StmtBreak,
+    ast.Continue: Translator.StmtContinue,
+    ast.Return: Translator.StmtReturn,
+    ast.Assign: Translator.StmtAssign,
+    ast.AugAssign: Translator.StmtAugAssign,
+    ast.AnnAssign: Translator.StmtAnnAssign,
+    ast.ClassDef: Translator.StmtClassDef,
+}
+if hasattr(ast, 'Match'):
+    Translator.StatementVisitors[ast.Match] = Translator.StmtMatch
+
+# 表达式节点类型 -> 处理函数，供 HandleExpr 分派
+Translator.ExpressionVisitors = {
+    ast.Constant: Translator.ExprConstant,
+    ast.Name: Translator.ExprName,
+    ast.BinOp: Translator.ExprBinOp,
+    ast.BoolOp: Translator.ExprBoolOp,
+    ast.UnaryOp: Translator.ExprUnaryOp,
+    ast.Call: Translator.ExprCall,
+    ast.Subscript: Translator.ExprSubscript,
+    ast.Tuple: Translator.ExprTuple,
+    ast.List: Translator.ExprList,
+    ast.Set: Translator.ExprSet,
+    ast.Compare: Translator.ExprCompare,
+    ast.Attribute: Translator.ExprAttribute,
+    ast.IfExp: Translator.ExprIfExp,
+    ast.NamedExpr: Translator.ExprNamedExpr,
+}
@@ -0,0 +1,120 @@
+# C 类型模型
+
+STORAGE_CLASSES = ('extern', 'static', 'register', 'auto')
+TYPE_QUALIFIERS = ('const', 'volatile')
+TAG_KEYWORDS = ('struct', 'union')
+
+
+class CType:
+    """解析后的 C 类型
+
+    GetTypeName 和 C 符号提取器生成的类型字符串（如 'struct SHEET*'、
+    'static char[0x80]'、'const char (*)[16]'）在这里拆成各个部分。
+    同一个类型字符串只解析一次，之后通过 c_type 返回同一个对象，
+    查询方直接读取字段，不再对字符串做 split/rstrip。
+
+    Attributes:
+        Spelling: 原始类型字符串，写出 C 代码时使用
+        Base: 去掉存储类、限定符、指针和数组后的基础类型，如 'struct SHEET'、'unsigned char'
+        Qualifiers: 类型限定符元组，如 ('const',)
+        StorageClass: 存储类，如 'extern'，没有时为空字符串
+        PointerDepth: 指针层数
+        ArrayDims: 数组各维大小的元组（字符串形式），如 ('MAX_SHEETS',)
+        StructName: 结构体/联合体名，不是结构体或匿名时为 None
+        IsArrayPointer: 是否是数组指针，如 'const char (*)[16]'
+    """
+
+    __slots__ = ('Spelling', 'Base', 'Qualifiers', 'StorageClass', 'PointerDepth',
+                 'ArrayDims', 'StructName', 'IsArrayPointer')
+
+    def __init__(self, spelling):
+        self.Spelling = spelling
+        specifier, self.ArrayDims = split_array_dims(spelling)
+        self.IsArrayPointer = '(*)' in specifier
+        if self.IsArrayPointer:
+            specifier = specifier.replace('(*)', '*')
+        self.PointerDepth = specifier.count('*')
+        words = specifier.replace('*', ' ').split()
+        self.StorageClass = ''
+        qualifiers = []
+        base_words = []
+        for word in words:
+            if word in STORAGE_CLASSES:
+                self.StorageClass = word
+            elif word in TYPE_QUALIFIERS:
+                qualifiers.append(word)
+            else:
+                base_words.append(word)
+        self.Qualifiers = tuple(qualifiers)
+        self.Base = ' '.join(base_words)
+        self.StructName = None
+        if len(base_words) >= 2 and base_words[0] in TAG_KEYWORDS:
+            self.StructName = base_words[1]
+
+    @property
+    def IsPointer(self):
+        """是否是指针（包括指针数组和数组指针）"""
+        return self.PointerDepth > 0
+
+    @property
+    def IsArray(self):
+        """是否是数组（数组指针不算）"""
+        return bool(self.ArrayDims) and not self.IsArrayPointer
+
+    @property
+    def IsStruct(self):
+        """基础类型是否是结构体或联合体"""
+        return self.StructName is not None
+
+    def Declare(self, name):
+        """生成声明 name 的 C 代码（不含分号），如 'struct SHEET *sheets0[MAX_SHEETS]'"""
+        dims = ''.join(f'[{size}]' for size in self.ArrayDims)
+        if not self.ArrayDims:
+            return f'{self.Spelling} {name}'
+        prefix = self.Spelling[:self.Spelling.find('[')].rstrip()
+        if self.IsArrayPointer:
+            return prefix.replace('(*)', f'(*{name})') + dims
+        if prefix.endswith('*'):
+            return f'{prefix[:-1].strip()} *{name}{dims}'
+        return f'{prefix} {name}{dims}'
+
+    def __repr__(self):
+        return f'CType({self.Spelling!r})'
+
+    def __str__(self):
+        return self.Spelling
+
+
+def split_array_dims(spelling):
+    """把类型字符串拆成数组维度之前的部分和各维大小
+
+    维度表达式中可以有嵌套的方括号，如 'int[sizeof(a[0])]'。
+    """
+    start = spelling.find('[')
+    if start < 0:
+        return spelling.strip(), ()
+    dims = []
+    depth = 0
+    size_start = start + 1
+    for i in range(start, len(spelling)):
+        char = spelling[i]
+        if char == '[':
+            if depth == 0:
+                size_start = i + 1
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                dims.append(spelling[size_start:i].strip())
+    return spelling[:start].strip(), tuple(dims)
+
+
+TYPE_CACHE = {}
+
+
+def c_type(spelling):
+    """获取类型字符串对应的 CType，同一字符串总是返回同一个对象"""
+    ctype = TYPE_CACHE.get(spelling)
+    if ctype is None:
+        ctype = TYPE_CACHE[spelling] = CType(spelling)
+    return ctype
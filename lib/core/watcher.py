@@ -0,0 +1,221 @@
+# 监视模式：源文件或辅助文件变化时重新翻译受影响的文件
+
+import ast
+import os
+import time
+
+from lib.core.builder import convert_source, output_path_for
+from lib.core.server import WarmSymbolTables
+from lib.core.type_model import c_type
+from lib.utils.helpers import open_output_file
+
+
+class WatchedUnit:
+    """监视中的一个源文件"""
+
+    __slots__ = ('input_file', 'output_file', 'stamp', 'names')
+
+    def __init__(self, input_file, output_file):
+        self.input_file = input_file
+        self.output_file = output_file
+        self.stamp = None  # 上次翻译时的 (mtime_ns, size)
+        self.names = frozenset()  # 源代码中引用的名称
+
+
+def scan_sources(directory):
+    """递归收集目录下的 .py 文件，返回 路径 -> (mtime_ns, size)
+
+    目录项的 stat 结果由 os.scandir 一并取得，每轮扫描不再逐个调用 os.stat。
+    """
+    sources = {}
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if entry.name != '__pycache__' and not entry.name.startswith('.'):
+                        pending.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    sources[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return sources
+
+
+def stat_stamp(file_path):
+    """文件的 (mtime_ns, size)，文件不存在时为 None"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def referenced_names(tree):
+    """源代码中出现的所有名称（变量名、属性名），用于判断依赖了哪些辅助符号"""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+    return frozenset(names)
+
+
+def changed_symbols(old_table, new_table):
+    """比较两张辅助符号表，返回定义发生变化的符号名
+
+    结构体变化时，类型为该结构体（或其指针、数组）的全局变量和结构体也算作变化，
+    因为使用这些变量的代码即使没有直接写出结构体名，成员访问的翻译结果也可能改变。
+    """
+    changed = {name for name in old_table.keys() | new_table.keys()
+               if old_table.get(name) != new_table.get(name)}
+    while True:
+        added = set()
+        for name, info in new_table.items():
+            if name in changed:
+                continue
+            if info.get('type') == 'variable':
+                types = [info.get('declared_type', '')]
+            elif info.get('type') == 'struct':
+                types = [member.get('type', '') for member in info.get('members', {}).values()]
+            else:
+                continue
+            if any(c_type(type_name).StructName in changed for type_name in types if type_name):
+                added.add(name)
+        if not added:
+            return changed
+        changed |= added
+
+
+class Watcher:
+    """轮询目录中的 Python 源文件和 -h 辅助文件，只重新翻译受影响的文件
+
+    源文件变化时重新翻译它本身；辅助文件（包括 .symbin）变化时重新合并辅助符号表，
+    只重新翻译引用了定义发生变化的符号的文件。生成的 C 代码与输出文件现有内容相同时不写入。
+    """
+
+    def __init__(self, directory, output_dir=None, helper_files=(), encoding='utf-8', cache_dir=None):
+        self.directory = directory
+        self.output_dir = output_dir
+        self.helper_files = list(helper_files)
+        self.encoding = encoding
+        self.cache_dir = cache_dir
+        self.Units = {}
+        self.WarmSymbols = WarmSymbolTables()
+        self.HelperStamps = None
+        self.SymbolTable = {}
+        self.Cycles = 0
+
+    def CheckHelpers(self):
+        """辅助文件有变化时重新合并符号表，返回 (变化的符号名, 最近的修改时间)"""
+        stamps = [stat_stamp(file_path) for file_path in self.helper_files]
+        if stamps == self.HelperStamps:
+            return set(), 0
+        previous = self.HelperStamps or [None] * len(stamps)
+        edit_time = max((stamp[0] for stamp, old in zip(stamps, previous)
+                         if stamp is not None and stamp != old), default=0)
+        self.HelperStamps = stamps
+        symbol_table = self.WarmSymbols.Load(self.helper_files, self.encoding)
+        changed = changed_symbols(self.SymbolTable, symbol_table)
+        self.SymbolTable = symbol_table
+        return changed, edit_time
+
+    def Translate(self, unit):
+        """翻译一个文件，返回 (ConvertResult, 是否写入了输出文件)"""
+        with open(unit.input_file, 'r', encoding=self.encoding) as f:
+            code = f.read()
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            tree = None
+        unit.names = referenced_names(tree) if tree is not None else frozenset()
+        result = convert_source(unit.input_file, code, self.SymbolTable, tree, self.cache_dir)
+        if result.error:
+            return result, False
+        try:
+            with open(unit.output_file, 'r', encoding=self.encoding) as f:
+                if f.read() == result.code:
+                    return result, False
+        except OSError:
+            pass
+        output_dir = os.path.dirname(unit.output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open_output_file(unit.output_file, self.encoding) as f:
+            f.write(result.code)
+        return result, True
+
+    def Cycle(self):
+        """执行一轮检查，返回报告行列表（没有变化时为空）"""
+        start = time.perf_counter()
+        first = self.Cycles == 0
+        self.Cycles += 1
+        changed_names, helper_edit_time = self.CheckHelpers()
+        sources = scan_sources(self.directory)
+
+        # 待翻译文件 -> 触发翻译的修改时间（纳秒）
+        pending = {}
+        for path in [path for path in self.Units if path not in sources]:
+            del self.Units[path]
+        for path, stamp in sources.items():
+            unit = self.Units.get(path)
+            if unit is None:
+                unit = self.Units[path] = WatchedUnit(
+                    path, output_path_for(path, self.directory, self.output_dir))
+            if unit.stamp != stamp:
+                unit.stamp = stamp
+                pending[path] = stamp[0]
+            elif changed_names and not changed_names.isdisjoint(unit.names):
+                pending[path] = helper_edit_time
+        if not pending:
+            return []
+
+        lines = []
+        written = 0
+        failed = 0
+        latencies = []
+        for path in sorted(pending):
+            unit = self.Units[path]
+            try:
+                result, wrote = self.Translate(unit)
+            except OSError as e:
+                error = str(e)
+            else:
+                error = result.error
+            if error:
+                failed += 1
+                lines.append(f'  {path} FAILED {error}')
+                continue
+            written += wrote
+            status = f'-> {unit.output_file}' if wrote else '(unchanged)'
+            lines.append(f'  {path} {result.seconds * 1e3:.1f} ms {status}')
+            if not first and pending[path]:
+                latencies.append(time.time() - pending[path] / 1e9)
+        elapsed = time.perf_counter() - start
+        summary = (f'[watch] {len(pending)} retranslated: {written} written, '
+                   f'{len(pending) - written - failed} unchanged, {failed} failed in {elapsed * 1e3:.1f} ms')
+        if changed_names and not first:
+            summary += f', {len(changed_names)} helper symbols changed'
+        if latencies:
+            summary += f'; edit-to-C latency max {max(latencies) * 1e3:.0f} ms'
+        return [summary] + lines
+
+    def Run(self, interval):
+        """持续轮询，直到被中断"""
+        print(f'Watching {self.directory} (every {interval} s, Ctrl+C to stop)')
+        try:
+            while True:
+                lines = self.Cycle()
+                if lines:
+                    print('\n'.join(lines), flush=True)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
@@ -1,8 +1,8 @@
 # 工具函数
 
+import contextlib
 import os
 import sys
-import subprocess
 from lib.constants.config import ERROR_MESSAGES
 
 
@@ -14,6 +14,7 @@ def detect_file_type(file_path):
 
 def execute_command(command, shell=True, capture_output=True, text=True):
     """执行命令"""
+    import subprocess  # 只有编译和运行时才需要，不拖慢启动
     try:
         result = subprocess.run(
             command,
@@ -51,6 +52,24 @@ def write_file_content(file_path, content):
         return False
 
 
+@contextlib.contextmanager
+def open_output_file(file_path, encoding='utf-8'):
+    """打开输出文件用于流式写入
+
+    内容先写入同目录下的临时文件，全部写完后再替换目标文件；
+    写入过程中出错时删除临时文件，原有的输出文件保持不变。
+    """
+    temp_path = f'{file_path}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'w', encoding=encoding) as f:
+            yield f
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def append_file_content(file_path, content):
     """追加文件内容"""
     try:
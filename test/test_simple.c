@@ -1,4 +1,21 @@
-// Generated by TransPyC
+ /*
+       ___        ___         ___     
+      /  /\      /  /\       /  /\    
+     /  /:/     /  /::\     /  /:/    
+    /  /:/     /  /:/\:\   /  /:/     
+   /  /:/     /  /:/~/:/  /  /:/  ___ 
+  /  /::\    /__/:/ /:/  /__/:/  /  /\
+ /  /:/\:\   \  \:\/:/   \  \:\ /  /:/
+/__/:/  \:\   \  \::/     \  \:\  /:/ 
+\__\/ \  \:\   \  \:\      \  \:\/:/  
+       \  \:\   \  \:\      \  \::/   
+        \__\/    \__\/       \__\/    
+Copyright GVSDS Team
+Actor TermiNexus 
+Generated by TransPyC
+*/
+
+
 #include <stdio.h>
 #include "lib.includes.c.h"
 #include "lib.includes.t.h"
@@ -7,22 +24,20 @@ struct Person {
     int age;
 };
 int add(int a, int b) {
-    return (a + b);
+    return a + b;
 }
 void Person____init__(struct Person* self, char* name, int age) {
     self->name = name;
     self->age = age;
 }
 void Person__greet(struct Person* self) {
-    printf("%d
-", 0);
+    printf("%d\n", 0);
 }
 int main(void) {
     int result = add(5, 3);
-    printf("%d
-", 0);
+    printf("%d\n", 0);
     struct Person p;
     Person____init__(&p, "Alice", 30);
     Person__greet(&p);
     return 0;
-}
\ No newline at end of file
+}
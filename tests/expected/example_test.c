@@ -0,0 +1,494 @@
+ /*
+       ___        ___         ___     
+      /  /\      /  /\       /  /\    
+     /  /:/     /  /::\     /  /:/    
+    /  /:/     /  /:/\:\   /  /:/     
+   /  /:/     /  /:/~/:/  /  /:/  ___ 
+  /  /::\    /__/:/ /:/  /__/:/  /  /\
+ /  /:/\:\   \  \:\/:/   \  \:\ /  /:/
+/__/:/  \:\   \  \::/     \  \:\  /:/ 
+\__\/ \  \:\   \  \:\      \  \:\/:/  
+       \  \:\   \  \:\      \  \::/   
+        \__\/    \__\/       \__\/    
+Copyright GVSDS Team
+Actor TermiNexus 
+Generated by TransPyC
+*/
+
+
+#define F1 -1
+#define F2 -2
+#define F3 -3
+#define F4 -4
+#define F5 -5
+#define F6 -6
+#define F7 -7
+#define F8 -8
+#define F9 -9
+#define F10 -10
+#define F11 -11
+#define F12 -12
+#define ESC -350
+#define BCK 0x08
+#define TAB 0x09
+#define LSH -158
+#define LCT -187
+#define LAL -141
+#define FXU -111
+#define FXD -112
+#define FXL -113
+#define FXR -114
+#define XEN -120
+#define RCT -121
+#define XXG -122
+#define RSH -123
+#define RAL -124
+#define HME -125
+#define PGU -126
+#define END -127
+#define PGD -128
+#define INS -129
+#define DEL -130
+#define WIN -131
+#define RMN -132
+int MOUSEX;
+int MOUSEY;
+int MOUSEBTN;
+void* sht_back;
+void* sht_mouse;
+void* shtctl;
+int memtotal;
+void* binfo;
+void* sht_start;
+void* buf_start;
+int sht_start_flan;
+void* RegistrationCode = "0x000001";
+void* finfo;
+void* sht;
+void* key_win;
+void* sht2;
+void* fifo;
+void* keycmd;
+int key_shift;
+int key_leds;
+int keycmd_wait;
+void* imewords;
+void* memman;
+void* fat;
+int i;
+int pxdeep;
+int Input_method;
+int mousemode;
+int keytable0 = {0, 0, '1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=', 0x08, 0, 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '[', ']', 0x0a, 0, 'A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ';', '\'', '`', 0, '\\', 'Z', 'X', 'C', 'V', 'B', 'N', 'M', ',', '.', '/', 0, '*', 0, ' ', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '7', 0, '9', '-', '4', '5', '6', '+', '1', 0, '3', '0', '.', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0x5c, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0x5c, 0, 0};
+int keytable1 = {0, 0, '!', '@', '#', '$', '%', '^', '&', '*', '(', ')', '_', '+', 0x08, 0, 'Q', 'W', 'E', 'R', 'T', 'Y', 'U', 'I', 'O', 'P', '{', '}', 0x0a, 0, 'A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', ':', '"', '~', 0, '|', 'Z', 'X', 'C', 'V', 'B', 'N', 'M', '<', '>', '?', 0, '*', 0, ' ', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '7', '8', '9', '-', '4', '5', '6', '+', '1', '2', '3', '0', '.', 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, '_', 0, 0, 0, 0, 0, 0, 0, 0, 0, '|', 0, 0};
+int cmdico = {{7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7}, {15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15, 15}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 7, 7, 7, 0, 7, 0, 7, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 7, 0, 0, 0, 0, 0, 0, 7, 0, 0, 0, 0, 0, 0, 0}, {0, 7, 7, 7, 0, 7, 0, 0, 0, 7, 0, 0, 0, 0, 0, 0}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}, {7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7, 7}};
+void SAIBMain(void) {
+    int j;
+    int x;
+    int y;
+    int mmx = -1;
+    int mmy = -1;
+    int mmx2 = 0;
+    struct XXX* cmd;
+    struct XXX* timer_systime;
+    struct XXX* start_d;
+    struct XXX* font;
+    struct XXX* s;
+    struct XXX* fifobuf;
+    struct XXX* keycmd_buf;
+    int mx;
+    int my;
+    int new_mx = -1;
+    int new_my = 0;
+    int new_wx = 0x7fffffff;
+    int new_wy = 0;
+    struct XXX* mdec;
+    struct XXX* buf_back;
+    struct XXX* buf_mouse;
+    struct XXX* task_a;
+    struct XXX* task;
+    struct XXX* nihongo;
+    key_shift = 0;
+    key_leds = binfo->leds >> 4 & 7;
+    keycmd_wait = -1;
+    init_gdtidt();
+    init_pic();
+    io_sti();
+    fifo32_init(c.PtrCast(fifo, 128);, fifobuf, 0);
+    c.PtrCast(0x0fec, t.CInt);__Set(&c.PtrCast(0x0fec, t.CInt);, fifo);
+    init_pit();
+    init_keyboard(c.PtrCast(fifo, 256);, 256);
+    enable_mouse(c.PtrCast(fifo, 512);, mdec);
+    io_out8(0x21, 0xf8);
+    io_out8(0xa1, 0xef);
+    fifo32_init(c.PtrCast(keycmd, 32);, keycmd_buf, 0);
+    init_acpi();
+    memtotal = memtest(0x00400000, 0xbfffffff);
+    memman_init(memman);
+    memman_free(memman, 0x00001000, 0x0009e000);
+    memman_free(memman, 0x00400000, memtotal - 0x00400000);
+    init_color();
+    shtctl = shtctl_init(memman, binfo->vram, binfo->scrnx, binfo->scrny);
+    task_a = task_init(memman);
+    fifo->task = task_a;
+    task_run(task_a, 1, 2);
+    c.PtrCast(0x0fe4, t.CInt);__Set(&c.PtrCast(0x0fe4, t.CInt);, shtctl);
+    task_a->langmode = 0;
+    timer_systime = timer_alloc();
+    timer_init(timer_systime, c.PtrCast(fifo, 100);, 100);
+    timer_settime(timer_systime, 100);
+    sht_back = sheet_alloc(shtctl);
+    buf_back = memman_alloc_4k(memman, binfo->scrnx * binfo->scrny);
+    sheet_setbuf(sht_back, buf_back, binfo->scrnx, binfo->scrny, -1);
+    init_desktop(buf_back, binfo->scrnx, binfo->scrny);
+    sht_start = sheet_alloc(shtctl);
+    buf_start = memman_alloc_4k(memman, 450 * 600);
+    sheet_setbuf(sht_start, buf_start, 450, 600, -1);
+    init_start(sht_start);
+    sheet_slide(sht_start, 0, binfo->scrny - 630);
+    key_win = open_console(shtctl, memtotal);
+    cmd = key_win;
+    sht_mouse = sheet_alloc(shtctl);
+    sheet_setbuf(sht_mouse, buf_mouse, 16, 16, 99);
+    init_mouse_cursor8(buf_mouse, 99);
+    mx = binfo->scrnx - 16 / 2;
+    my = binfo->scrny - 28 - 16 / 2;
+    sheet_slide(sht_back, 0, 0);
+    sheet_slide(key_win, 32, 4);
+    sheet_slide(sht_mouse, MOUSEX, MOUSEY);
+    sheet_updown(sht_back, 0);
+    sheet_updown(key_win, 2);
+    sheet_updown(sht_mouse, 3);
+    keywin_on(key_win);
+    fifo32_put(c.PtrCast(keycmd, KEYCMD_LED);, KEYCMD_LED);
+    fifo32_put(c.PtrCast(keycmd, KEYCMD_LED);, key_leds);
+    nihongo = memman_alloc_4k(memman, 0x5d5d * 32);
+    fat = memman_alloc_4k(memman, 4 * 2880);
+    file_readfat(fat, c.PtrCast(ADR_DISKIMG + 0x000200, t.CInt););
+    finfo = file_search("HZK16.fnt", c.PtrCast(ADR_DISKIMG + 0x002600, t.CInt);, 224);
+    if (finfo != 0) {
+        file_loadfile(finfo->clustno, finfo->size, nihongo, fat, c.PtrCast(ADR_DISKIMG + 0x003e00, t.CInt););
+    }
+    else {
+        i = 0;
+        while (i < 16 * 256) {
+            c.PtrCast(nihongo + i, t.CChar);__Set(&c.PtrCast(nihongo + i, t.CChar);, c.PtrCast(font + i, t.CChar);__Get(&c.PtrCast(font + i, t.CChar);));
+            i += 1;
+        }
+        while (i < 16 * 256 + 32 * 94 * 47) {
+            c.PtrCast(nihongo + i, t.CChar);__Set(&c.PtrCast(nihongo + i, t.CChar);, 0xff);
+            i += 1;
+        }
+    }
+    c.PtrCast(0x0fe8, t.CInt);__Set(&c.PtrCast(0x0fe8, t.CInt);, nihongo);
+    memman_free_4k(memman, fat, 4 * 2880);
+    while (1) {
+        if (fifo32_status(keycmd) > 0 && keycmd_wait < 0) {
+            keycmd_wait = fifo32_get(keycmd);
+            wait_KBC_sendready();
+            io_out8(PORT_KEYDAT, keycmd_wait);
+        }
+        io_cli();
+        if (fifo32_status(fifo) == 0) {
+            if (new_mx >= 0) {
+                io_sti();
+                sheet_slide(sht_mouse, new_mx, new_my);
+                new_mx = -1;
+            }
+            else if (new_wx != 0x7fffffff) {
+                io_sti();
+                sheet_slide(sht, new_wx, new_wy);
+                new_wx = 0x7fffffff;
+            }
+            else {
+                task_sleep(task_a);
+                io_sti();
+            }
+        }
+        else {
+            i = fifo32_get(fifo);
+            j = c.PtrCast(fifo->buf + fifo->q - 2 + fifo->size % fifo->size, t.CInt);__Get(&c.PtrCast(fifo->buf + fifo->q - 2 + fifo->size % fifo->size, t.CInt););
+            io_sti();
+            if (key_win != 0 && key_win->flags == 0) {
+                if (shtctl->top == 1) {
+                    key_win = 0;
+                }
+                else {
+                    key_win = c.PtrCast(shtctl->sheets + shtctl->top - 1, t.CPtr);__Get(&c.PtrCast(shtctl->sheets + shtctl->top - 1, t.CPtr););
+                    keywin_on(key_win);
+                }
+            }
+            if (256 <= i && i <= 511) {
+                if (i < 0x80 + 256) {
+                    if (key_shift == 0) {
+                        s[0] = c.PtrCast(keytable0 + i - 256, t.CChar);__Get(&c.PtrCast(keytable0 + i - 256, t.CChar););
+                    }
+                    else {
+                        s[0] = c.PtrCast(keytable1 + i - 256, t.CChar);__Get(&c.PtrCast(keytable1 + i - 256, t.CChar););
+                    }
+                }
+                else {
+                    s[0] = 0;
+                }
+                if ('A' <= s[0] && s[0] <= 'Z') {
+                    if (key_leds & 4 == 0 && key_shift == 0 || key_leds & 4 != 0 && key_shift != 0) {
+                        s[0] += 0x20;
+                    }
+                }
+                if (s[0] != 0 && key_win != 0) {
+                    fifo32_put(c.PtrCast(key_win->task.fifo, t.CPtr);, s[0] + 256);
+                }
+                if (i == 256 + 0x0f && key_win != 0) {
+                    keywin_off(key_win);
+                    j = key_win->height - 1;
+                    if (j == 0) {
+                        j = shtctl->top - 1;
+                    }
+                    key_win = c.PtrCast(shtctl->sheets + j, t.CPtr);__Get(&c.PtrCast(shtctl->sheets + j, t.CPtr););
+                    keywin_on(key_win);
+                }
+                if (i == 256 + 0x63) {
+                    key_shift |= 2;
+                }
+                if (i == 256 + 0x2a) {
+                    key_shift |= 1;
+                }
+                if (i == 256 + 0x36) {
+                    key_shift |= 2;
+                }
+                if (i == 256 + 0xaa) {
+                    key_shift &= ~1;
+                }
+                if (i == 256 + 0xb6) {
+                    key_shift &= ~2;
+                }
+                if (i == 256 + 0x3a) {
+                    key_leds ^= 4;
+                    fifo32_put(c.PtrCast(keycmd, t.CPtr);, KEYCMD_LED);
+                    fifo32_put(c.PtrCast(keycmd, t.CPtr);, key_leds);
+                }
+                if (i == 256 + 0x45) {
+                    key_leds ^= 2;
+                    fifo32_put(c.PtrCast(keycmd, t.CPtr);, KEYCMD_LED);
+                    fifo32_put(c.PtrCast(keycmd, t.CPtr);, key_leds);
+                }
+                if (i == 256 + 0x46) {
+                    key_leds ^= 1;
+                    fifo32_put(c.PtrCast(keycmd, t.CPtr);, KEYCMD_LED);
+                    fifo32_put(c.PtrCast(keycmd, t.CPtr);, key_leds);
+                }
+                if (i == 256 + 0x3b && key_shift != 0 && key_win != 0) {
+                    task = key_win->task;
+                    if (task != 0 && task->tss.ss0 != 0) {
+                        cons_putstr0(task->cons, "");
+                        io_cli();
+                        task->tss->eax = c.PtrCast(c.PtrCast(task, t.CPtr);.tss.esp0, t.CInt);__Get(&c.PtrCast(c.PtrCast(task, t.CPtr);.tss.esp0, t.CInt););
+                        task->tss->eip = asm_end_app;
+                        io_sti();
+                        task_run(task, -1, 0);
+                    }
+                }
+                if (i == 256 + 0x3c && key_shift != 0) {
+                    if (key_win != 0) {
+                        keywin_off(key_win);
+                    }
+                    key_win = open_console(shtctl, memtotal);
+                    sheet_slide(key_win, 32, 4);
+                    sheet_updown(key_win, shtctl->top);
+                    keywin_on(key_win);
+                }
+                if (i == 256 + 0x57) {
+                    sheet_updown(c.PtrCast(shtctl->sheets + 1, t.CPtr);__Get(&c.PtrCast(shtctl->sheets + 1, t.CPtr);), shtctl->top - 1);
+                }
+                if (i == 256 + 0xfa) {
+                    keycmd_wait = -1;
+                }
+                if (i == 256 + 0xfe) {
+                    wait_KBC_sendready();
+                    io_out8(PORT_KEYDAT, keycmd_wait);
+                }
+            }
+            else if (512 <= i && i <= 767) {
+                if (mouse_decode(mdec, i - 512) != 0) {
+                    mx += mdec->x;
+                    my += mdec->y;
+                    if (mx < 0) {
+                        mx = 0;
+                    }
+                    if (my < 0) {
+                        my = 0;
+                    }
+                    if (mx > binfo->scrnx - 1) {
+                        mx = binfo->scrnx - 1;
+                    }
+                    if (my > binfo->scrny - 1) {
+                        my = binfo->scrny - 1;
+                    }
+                    new_mx = mx;
+                    new_my = my;
+                    MOUSEX = mx;
+                    MOUSEY = my;
+                    MOUSEBTN = mdec->btn;
+                    win_zonclick(MOUSEBTN, MOUSEX, MOUSEY, 0, binfo->scrny - 30, 30, binfo->scrny, sht_start_flan, sht);
+                    sht_start_flan = win_szonclick(MOUSEBTN, MOUSEX, MOUSEY, 0, binfo->scrny - 30, 30, binfo->scrny, sht_start_flan, sht);
+                    if (sht_start_flan == 1 && binddmousebox(MOUSEX, MOUSEY, MOUSEBTN, 0, 0, binfo->scrnx, binfo->scrny - 630, 1) || binddmousebox(MOUSEX, MOUSEY, MOUSEBTN, 400, binfo->scrny - 630, binfo->scrnx, binfo->scrny, 1) || binddmousebox(MOUSEX, MOUSEY, MOUSEBTN, 30, binfo->scrny - 30, 400, binfo->scrny, 1) || binddmousebox(MOUSEX, MOUSEY, MOUSEBTN, 0, 0, binfo->scrnx, binfo->scrny - 630, 2) || binddmousebox(MOUSEX, MOUSEY, MOUSEBTN, 400, binfo->scrny - 630, binfo->scrnx, binfo->scrny, 2) || binddmousebox(MOUSEX, MOUSEY, MOUSEBTN, 30, binfo->scrny - 30, 400, binfo->scrny, 2)) {
+                        sheet_updown(sht_start, -1);
+                        sht_start_flan = 0;
+                    }
+                    if (mdec->btn & 0x01 != 0) {
+                        if (mmx < 0) {
+                            j = shtctl->top - 1;
+                            while (j > 0) {
+                                sht = c.PtrCast(shtctl->sheets + j, t.CPtr);__Get(&c.PtrCast(shtctl->sheets + j, t.CPtr););
+                                x = mx - sht->vx0;
+                                y = my - sht->vy0;
+                                if (0 <= x && x < sht->bxsize && 0 <= y && y < sht->bysize) {
+                                    sheet_updown(sht, shtctl->top - 1);
+                                    if (sht != key_win) {
+                                        keywin_off(key_win);
+                                        key_win = sht;
+                                        keywin_on(key_win);
+                                    }
+                                    if (3 <= x && x < sht->bxsize - 3 && 3 <= y && y < 21) {
+                                        mmx = mx;
+                                        mmy = my;
+                                        mmx2 = sht->vx0;
+                                        new_wy = sht->vy0;
+                                    }
+                                    if (sht->bxsize - 21 <= x && x < sht->bxsize - 5 && 5 <= y && y < 19) {
+                                        if (sht->flags & 0x10 != 0) {
+                                            task = sht->task;
+                                            cons_putstr0(task->cons, "");
+                                            io_cli();
+                                            task->tss->eax = c.PtrCast(c.PtrCast(task, t.CPtr);.tss.esp0, t.CInt);__Get(&c.PtrCast(c.PtrCast(task, t.CPtr);.tss.esp0, t.CInt););
+                                            task->tss->eip = asm_end_app;
+                                            io_sti();
+                                            task_run(task, -1, 0);
+                                        }
+                                        else if (sht->flags == 0x25) {
+                                        }
+                                        else {
+                                            task = sht->task;
+                                            sheet_updown(sht, -1);
+                                            keywin_off(key_win);
+                                            key_win = c.PtrCast(shtctl->sheets + shtctl->top - 1, t.CPtr);__Get(&c.PtrCast(shtctl->sheets + shtctl->top - 1, t.CPtr););
+                                            keywin_on(key_win);
+                                            io_cli();
+                                            fifo32_put(c.PtrCast(task->fifo, t.CPtr);, 4);
+                                            io_sti();
+                                        }
+                                    }
+                                    break;
+                                }
+                                j -= 1;
+                            }
+                        }
+                        else {
+                            x = mx - mmx;
+                            y = my - mmy;
+                            new_wx = mmx2 + x + 2 & ~3;
+                            new_wy = new_wy + y;
+                            mmy = my;
+                        }
+                    }
+                    else {
+                        mmx = -1;
+                        if (new_wx != 0x7fffffff) {
+                            sheet_slide(sht, new_wx, new_wy);
+                            new_wx = 0x7fffffff;
+                        }
+                    }
+                }
+            }
+            else if (768 <= i && i <= 1023) {
+                close_console(c.PtrCast(shtctl->sheets0 + i - 768, t.CPtr);__Get(&c.PtrCast(shtctl->sheets0 + i - 768, t.CPtr);));
+            }
+            else if (1024 <= i && i <= 2023) {
+                close_constask(c.PtrCast(taskctl.tasks0 + i - 1024, t.CPtr);__Get(&c.PtrCast(taskctl.tasks0 + i - 1024, t.CPtr);));
+            }
+            else if (2024 <= i && i <= 2279) {
+                sht2 = c.PtrCast(shtctl->sheets0 + i - 2024, t.CPtr);__Get(&c.PtrCast(shtctl->sheets0 + i - 2024, t.CPtr););
+                memman_free_4k(memman, sht2->buf, 256 * 165);
+                sheet_free(sht2);
+            }
+            else if (i == 100) {
+                sprintf(s, "%d/%d/%d", get_year(), get_mon_hex(), get_day_of_month());
+                putfonts8_asc_sht(sht_back, binfo->scrnx - 170, binfo->scrny - 20, COL8_FFFFFF, COL8_RWL, s, 15);
+                sprintf(s, "%d:%d:%d", get_hour_hex(), get_min_hex(), get_sec_hex());
+                putfonts8_asc_sht(sht_back, binfo->scrnx - 70, binfo->scrny - 20, COL8_FFFFFF, COL8_RWL, s, 8);
+                sheet_refresh(sht_back, binfo->scrnx - 200, binfo->scrny - 20, binfo->scrnx - 70 + 5 * 8, binfo->scrny - 50 + 16);
+                timer_settime(timer_systime, 100);
+            }
+        }
+    }
+}
+void KeywinOff(* key_win) {
+    change_wtitle8(key_win, 0);
+    if (key_win->flags & 0x20 != 0) {
+        fifo32_put(c.PtrCast(key_win->task.fifo, t.CPtr);, 3);
+    }
+    return;
+}
+void KeywinOn(* key_win) {
+    change_wtitle8(key_win, 1);
+    if (key_win->flags & 0x20 != 0) {
+        fifo32_put(c.PtrCast(key_win->task.fifo, t.CPtr);, 2);
+    }
+    return;
+}
+void OpenConstask(* sht, int memtotal) {
+    struct XXX* memman = c.PtrCast(MEMMAN_ADDR, t.CPtr);;
+    struct task_alloc* task = task_alloc();
+    struct memman_alloc_4k* cons_fifo = memman_alloc_4k(memman, 128 * 4);
+    task->cons_stack = memman_alloc_4k(memman, 64 * 1024);
+    task->tss->esp = task->cons_stack + 64 * 1024 - 12;
+    task->tss->eip = console_task;
+    task->tss->es = 1 * 8;
+    task->tss->cs = 2 * 8;
+    task->tss->ss = 1 * 8;
+    task->tss->ds = 1 * 8;
+    task->tss->fs = 1 * 8;
+    task->tss->gs = 1 * 8;
+    c.PtrCast(c.PtrCast(task, t.CPtr);.tss.esp + 4, t.CInt);__Set(&c.PtrCast(c.PtrCast(task, t.CPtr);.tss.esp + 4, t.CInt);, sht);
+    c.PtrCast(c.PtrCast(task, t.CPtr);.tss.esp + 8, t.CInt);__Set(&c.PtrCast(c.PtrCast(task, t.CPtr);.tss.esp + 8, t.CInt);, memtotal);
+    task_run(task, 2, 2);
+    fifo32_init(c.PtrCast(task->fifo, t.CPtr);, 128, cons_fifo, task);
+    return task;
+}
+void OpenConsole(* shtctl, int memtotal) {
+    int i = 0;
+    int j = 0;
+    struct XXX* memman = c.PtrCast(MEMMAN_ADDR, t.CPtr);;
+    struct sheet_alloc* sht = sheet_alloc(shtctl);
+    struct memman_alloc_4k* buf = memman_alloc_4k(memman, 525 * 479);
+    sheet_setbuf(sht, buf, 525, 479, 255);
+    make_window8(buf, 525, 479, "Cmd.exw(System Internal storage)", 0);
+    make_textbox8(sht, 3, 24, 519, 452, COL8_000000);
+    while (i < 16) {
+        j = 0;
+        while (j < 16) {
+            c.PtrCast(buf + i + 4 * 525 + j + 6, t.CInt);__Set(&c.PtrCast(buf + i + 4 * 525 + j + 6, t.CInt);, cmdico[i][j]);
+            j += 1;
+        }
+        i += 1;
+    }
+    sht->task = open_constask(sht, memtotal);
+    sht->flags |= 0x20;
+    return sht;
+}
+void CloseConstask(* task) {
+    struct XXX* memman = c.PtrCast(MEMMAN_ADDR, t.CPtr);;
+    task_sleep(task);
+    memman_free_4k(memman, task->cons_stack, 64 * 1024);
+    memman_free_4k(memman, task->fifo.buf, 525 * 4);
+    task->flags = 0;
+    return;
+}
+void CloseConsole(* sht) {
+    struct XXX* memman = c.PtrCast(MEMMAN_ADDR, t.CPtr);;
+    struct XXX* task = sht->task;
+    memman_free_4k(memman, sht->buf, 770 * 655);
+    sheet_free(sht);
+    close_constask(task);
+    return;
+}
@@ -0,0 +1,43 @@
+ /*
+       ___        ___         ___     
+      /  /\      /  /\       /  /\    
+     /  /:/     /  /::\     /  /:/    
+    /  /:/     /  /:/\:\   /  /:/     
+   /  /:/     /  /:/~/:/  /  /:/  ___ 
+  /  /::\    /__/:/ /:/  /__/:/  /  /\
+ /  /:/\:\   \  \:\/:/   \  \:\ /  /:/
+/__/:/  \:\   \  \::/     \  \:\  /:/ 
+\__\/ \  \:\   \  \:\      \  \:\/:/  
+       \  \:\   \  \:\      \  \::/   
+        \__\/    \__\/       \__\/    
+Copyright GVSDS Team
+Actor TermiNexus 
+Generated by TransPyC
+*/
+
+
+#include <stdio.h>
+#include "lib.includes.c.h"
+#include "lib.includes.t.h"
+struct Person {
+    char* name;
+    int age;
+};
+int add(int a, int b) {
+    return a + b;
+}
+void Person____init__(struct Person* self, char* name, int age) {
+    self->name = name;
+    self->age = age;
+}
+void Person__greet(struct Person* self) {
+    printf("%d\n", 0);
+}
+int main(void) {
+    int result = add(5, 3);
+    printf("%d\n", 0);
+    struct Person p;
+    Person____init__(&p, "Alice", 30);
+    Person__greet(&p);
+    return 0;
+}
@@ -0,0 +1,44 @@
+# 测试共用的工具函数
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def run_cli(argv, cwd=None):
+    """在当前进程中运行一次命令行，返回 (退出码, 标准输出)"""
+    from TransPyC import TransPyC
+    output = io.StringIO()
+    previous = os.getcwd()
+    code = 0
+    try:
+        if cwd:
+            os.chdir(cwd)
+        with contextlib.redirect_stdout(output):
+            try:
+                TransPyC().Run(list(argv))
+            except SystemExit as e:
+                code = e.code or 0
+    finally:
+        os.chdir(previous)
+    return code, output.getvalue()
+
+
+def translate_file(input_file, helper_files=(), extra_args=()):
+    """用命令行翻译仓库中的一个文件（不使用符号缓存），返回生成的C代码"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        output_file = os.path.join(work_dir, 'out.c')
+        argv = ['-f', os.path.join(ROOT, input_file), '-o', output_file, '-nocache', *extra_args]
+        if helper_files:
+            argv += ['-h', *(os.path.join(ROOT, path) for path in helper_files)]
+        code, output = run_cli(argv)
+        if code:
+            raise AssertionError(f'translation of {input_file} exited with {code}:\n{output}')
+        with open(output_file, 'r', encoding='utf-8') as f:
+            return f.read()
@@ -0,0 +1,67 @@
+# 注解分析：结构化探测与原来在 ast.dump 文本中查找的结果一致，每个注解节点只分析一次
+
+import ast
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT
+from lib.core.annotations import analyze_annotation
+
+SAMPLES = ('kernel.py', 'kernel2.py', 'test/example1.py', 'test/test_simple.py')
+
+
+def annotation(text):
+    return ast.parse(text, mode='eval').body
+
+
+def sample_annotations():
+    """样例文件中所有的类型注解（变量、参数和返回值）"""
+    for path in SAMPLES:
+        with open(os.path.join(ROOT, path), 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.AnnAssign, ast.arg)) and node.annotation is not None:
+                yield node.annotation
+            elif isinstance(node, ast.FunctionDef) and node.returns is not None:
+                yield node.returns
+
+
+class AnnotationInfoTest(unittest.TestCase):
+
+    def test_matches_ast_dump_probes(self):
+        count = 0
+        for node in sample_annotations():
+            dump = ast.dump(node)
+            info = analyze_annotation(node)
+            self.assertEqual(info.IsPointer, 'CPtr' in dump, dump)
+            self.assertEqual(info.IsArrayPtr, 'CArrayPtr' in dump, dump)
+            self.assertEqual(info.HasStruct, 'CStruct' in dump, dump)
+            count += 1
+        self.assertGreater(count, 100)
+
+    def test_fields(self):
+        cases = {
+            't.CExtern | t.CInt': (False, False, 'extern', False, None, 'int'),
+            'SHEET | t.CPtr': (True, False, '', False, 'SHEET', ''),
+            't.CStruct(name=SHEETCTL) | t.CPtr': (True, False, '', True, 'SHEETCTL', ''),
+            't.CStruct(Node)': (False, False, '', True, 'Node', ''),
+            't.CStatic | t.CUnsignedChar[0x80]': (False, False, 'static', False, None, 'unsigned char'),
+            't.CChar | t.CArrayPtr[16]': (False, True, '', False, None, 'char'),
+            't.CInt32T': (False, False, '', False, None, 'int'),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text):
+                info = analyze_annotation(annotation(text))
+                self.assertEqual((info.IsPointer, info.IsArrayPtr, info.StorageClass, info.HasStruct,
+                                  info.StructTarget, info.BasicType), expected)
+
+    def test_analysis_is_cached_on_node(self):
+        node = annotation('t.CInt | t.CPtr')
+        self.assertIs(analyze_annotation(node), analyze_annotation(node))
+        self.assertIsNot(analyze_annotation(annotation('t.CInt | t.CPtr')), analyze_annotation(node))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# 异步运行子进程：输出和退出码、程序不存在时为 127、超时和取消时结束子进程
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import support  # noqa: F401  (把仓库根目录加入 sys.path)
+from lib.core.async_jobs import compile_argv, run_process, split_args
+
+
+def python(code):
+    return [sys.executable, '-c', code]
+
+
+def pid_is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+class RunProcessTest(unittest.TestCase):
+
+    def test_success(self):
+        result = asyncio.run(run_process(python('import sys; print("out"); print("err", file=sys.stderr)')))
+        self.assertEqual((result.returncode, result.stdout, result.stderr), (0, 'out\n', 'err\n'))
+        self.assertTrue(result.ok)
+        self.assertFalse(result.timed_out)
+
+    def test_nonzero_exit(self):
+        result = asyncio.run(run_process(python('import sys; print("partial"); sys.exit(3)')))
+        self.assertEqual((result.returncode, result.stdout), (3, 'partial\n'))
+        self.assertFalse(result.ok)
+        self.assertFalse(result.timed_out)
+
+    def test_missing_program(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            missing = os.path.join(work_dir, 'no-such-program')
+            result = asyncio.run(run_process([missing, '-v']))
+        self.assertEqual(result.returncode, 127)
+        self.assertIn('no-such-program', result.stderr)
+        self.assertEqual(result.argv, [missing, '-v'])
+        self.assertFalse(result.ok)
+
+    def test_timeout_kills_process(self):
+        start = time.perf_counter()
+        result = asyncio.run(run_process(python('import time; print("started", flush=True); time.sleep(60)'),
+                                         timeout=1.0))
+        self.assertLess(time.perf_counter() - start, 30)
+        self.assertTrue(result.timed_out)
+        self.assertFalse(result.ok)
+        self.assertNotEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, 'started\n')
+
+    def test_cancel_kills_process(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            pid_file = os.path.join(work_dir, 'pid')
+            code = f'import os, time; open({pid_file!r}, "w").write(str(os.getpid())); time.sleep(60)'
+
+            async def cancel_when_started():
+                task = asyncio.create_task(run_process(python(code)))
+                while not os.path.exists(pid_file) or not os.path.getsize(pid_file):
+                    await asyncio.sleep(0.02)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                with open(pid_file, 'r', encoding='utf-8') as f:
+                    return int(f.read())
+
+            pid = asyncio.run(asyncio.wait_for(cancel_when_started(), 30))
+        # run_process 结束并回收了子进程
+        self.assertFalse(pid_is_running(pid))
+
+    def test_compile_argv(self):
+        self.assertEqual(compile_argv('a.c', 'a.exe', 'ccache gcc', '-O2 -DNAME="a b"'),
+                         ['ccache', 'gcc', '-O2', '-DNAME=a b', 'a.c', '-o', 'a.exe'])
+        self.assertEqual(split_args(['-x', 'a b']), ['-x', 'a b'])
+        self.assertEqual(split_args(None), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# 基准测试套件的比较规则：超出阈值才算退化，耗时差别小于噪声或不到 1 ms 时不算，没有基线时退出码为 1
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT
+sys.path.insert(0, os.path.join(ROOT, 'bench'))
+import bench_suite
+from bench_suite import Compare, Spread
+
+
+def result(median_ms, peak_kb=100.0, process_ms=None):
+    return {'median_ms': median_ms, 'p95_ms': median_ms, 'peak_kb': peak_kb, 'process_ms': process_ms or [median_ms]}
+
+
+class CompareTest(unittest.TestCase):
+
+    def test_regressions_and_noise(self):
+        baseline = {'fast': result(10.0), 'noisy': result(10.0), 'tiny': result(0.5), 'memory': result(10.0),
+                    'same': result(10.0)}
+        results = {
+            'fast': result(14.0, process_ms=[14.0, 15.0]),
+            'noisy': result(14.0, process_ms=[14.0, 21.0]),
+            'tiny': result(1.2),
+            'memory': result(10.0, peak_kb=200.0, process_ms=[10.0, 30.0]),
+            'same': result(11.0),
+            'new': result(99.0),
+        }
+        regressions, inconclusive = Compare(results, baseline, 0.25)
+        self.assertEqual(regressions, ['fast: median_ms 10.0 -> 14.0 (+40%)',
+                                       'memory: peak_kb 100.0 -> 200.0 (+100%)'])
+        self.assertEqual(inconclusive, ['noisy: median_ms 10.0 -> 14.0 (+40%), processes differ by 50%'])
+
+    def test_spread(self):
+        self.assertAlmostEqual(Spread(result(10.0, process_ms=[10.0, 12.0, 15.0])), 0.5)
+        self.assertEqual(Spread({'median_ms': 3.0}), 0.0)
+
+    def test_missing_baseline_fails_unless_allowed(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            missing = os.path.join(work_dir, 'baseline.json')
+            for extra, expected in (([], 1), (['--allow-missing-baseline'], 0)):
+                with self.subTest(extra=extra):
+                    argv = ['bench_suite.py', '--baseline', missing, *extra]
+                    with mock.patch.object(sys, 'argv', argv), \
+                            mock.patch.object(bench_suite, 'Measure', return_value={'case': result(1.0)}), \
+                            contextlib.redirect_stdout(io.StringIO()) as output:
+                        self.assertEqual(bench_suite.main(), expected)
+                    self.assertIn('No baseline at', output.getvalue())
+            # 保存后再比较，同样的结果没有退化
+            with mock.patch.object(sys, 'argv', ['bench_suite.py', '--baseline', missing, '--save-baseline']), \
+                    mock.patch.object(bench_suite, 'Measure', return_value={'case': result(1.0)}), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(bench_suite.main(), 0)
+            with open(missing, 'r', encoding='utf-8') as f:
+                self.assertIn('case', json.load(f)['cases'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# 批量构建：辅助符号先于所有文件载入，结果按清单顺序报告，并行数不影响输出，单个文件失败时报告错误并以 1 退出
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT, run_cli
+from lib.core.builder import collect_build_units, load_shared_symbols, run_build
+
+HELPER = os.path.join(ROOT, 'kernel2.py')
+
+# 构建目录中的文件（相对构建目录）-> (仓库中的源文件, 以 kernel2.py 为辅助文件时的期望输出)
+SOURCES = {
+    'kernel.py': ('kernel.py', 'tests/expected/kernel.c'),
+    'sub/example1.py': ('test/example1.py', 'tests/expected/example1.kernel2.c'),
+    'sub/test_split.py': ('backup_test/test_split.py', 'tests/expected/test_split.kernel2.c'),
+}
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class BuildTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.work_dir.name, 'src')
+        for name, (source, _) in SOURCES.items():
+            os.makedirs(os.path.dirname(os.path.join(self.src, name)), exist_ok=True)
+            shutil.copy(os.path.join(ROOT, source), os.path.join(self.src, name))
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def build(self, jobs, output_dir=None, target=None):
+        units = collect_build_units(target or self.src, output_dir)
+        return run_build(units, load_shared_symbols([HELPER]), jobs)
+
+    def test_helper_symbols_reach_every_unit(self):
+        code, output = run_cli(['-build', self.src, '-h', HELPER, '-j', '2', '-nocache'])
+        self.assertEqual(code, 0, output)
+        self.assertIn('Built 3/3 files', output)
+        for name, (_, expected) in SOURCES.items():
+            with self.subTest(name):
+                output_file = os.path.join(self.src, os.path.splitext(name)[0] + '.c')
+                self.assertEqual(read(output_file), read(os.path.join(ROOT, expected)))
+
+    def test_results_follow_manifest_order(self):
+        # kernel.py 最慢，放在最前面时也按清单顺序报告
+        order = ['kernel.py', 'sub/test_split.py', 'sub/example1.py']
+        manifest = os.path.join(self.src, 'build.txt')
+        with open(manifest, 'w', encoding='utf-8') as f:
+            f.write('# 构建清单\n' + ''.join(f'{name}\n' for name in order))
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                results = self.build(jobs, target=manifest)
+                self.assertEqual([os.path.relpath(result.unit.input_file, self.src) for result in results],
+                                 [os.path.normpath(name) for name in order])
+                code, output = run_cli(['-build', manifest, '-h', HELPER, '-j', str(jobs), '-nocache'])
+                self.assertEqual(code, 0, output)
+                reported = [line.split()[3] for line in output.splitlines() if line.startswith('[')]
+                self.assertEqual(reported, [result.unit.input_file for result in results])
+
+    def test_jobs_do_not_change_output(self):
+        outputs = {}
+        for jobs in (1, 2):
+            output_dir = os.path.join(self.work_dir.name, f'out{jobs}')
+            results = self.build(jobs, output_dir)
+            self.assertEqual([result.error for result in results], [None] * len(SOURCES))
+            outputs[jobs] = {os.path.relpath(result.unit.output_file, output_dir): read(result.unit.output_file)
+                             for result in results}
+        self.assertEqual(len(outputs[1]), len(SOURCES))
+        self.assertEqual(outputs[1], outputs[2])
+
+    def test_failing_unit_is_reported(self):
+        with open(os.path.join(self.src, 'sub', 'broken.py'), 'w', encoding='utf-8') as f:
+            f.write('def broken(:\n')
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                results = self.build(jobs)
+                errors = {os.path.basename(result.unit.input_file): result.error for result in results}
+                self.assertTrue(errors.pop('broken.py').startswith('SyntaxError: '))
+                self.assertEqual(errors, {'kernel.py': None, 'example1.py': None, 'test_split.py': None})
+                self.assertFalse(os.path.exists(os.path.join(self.src, 'sub', 'broken.c')))
+                code, output = run_cli(['-build', self.src, '-h', HELPER, '-j', str(jobs), '-nocache'])
+                self.assertEqual(code, 1)
+                self.assertIn('broken.py FAILED SyntaxError: ', output)
+                self.assertIn('Built 3/4 files', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
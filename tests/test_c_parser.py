@@ -0,0 +1,93 @@
+# C 符号提取器：结构体成员、typedef、联合体、枚举、函数、全局变量和宏，跳过注释、字符串和函数体
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import support  # noqa: F401  (把仓库根目录加入 sys.path)
+from lib.core.c_parser import TOKEN_DIRECTIVE, extract_c_symbols, tokenize_c
+from lib.core.translator import Translator
+
+HEADER = r'''
+/* int commented_out(void); */
+// int line_comment(void);
+#define MAX_SHEETS 256
+#define ADDR(x) ((x) + 1)
+struct SHEET { unsigned char *buf; int bxsize, bysize; struct SHEET *next; };
+typedef struct { int a[4]; char name[16]; } Point;
+union U { int i; float f; };
+enum Color { RED, GREEN = 5, BLUE };
+extern int counter;
+static char table[0x80];
+const char *names[MAX_SHEETS];
+struct SHEET *sheet_alloc(struct SHEETCTL *ctl, int n);
+void io_hlt(void);
+int main(void) { int x = (int) cast_target(3); call_in_body(x); return ADDR(x); }
+const char *msg = "in_string(1);";
+'''
+
+
+def variable(declared_type, is_pointer=False):
+    return {'type': 'variable', 'declared_type': declared_type, 'is_pointer': is_pointer}
+
+
+def member(member_type, is_pointer=False):
+    return {'type': member_type, 'is_pointer': is_pointer}
+
+
+class CSymbolExtractorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.symbols = extract_c_symbols(HEADER)
+
+    def test_declarations(self):
+        self.assertEqual(self.symbols['SHEET'], {'type': 'struct', 'members': {
+            'buf': member('unsigned char*', True), 'bxsize': member('int'), 'bysize': member('int'),
+            'next': member('struct SHEET*', True)}})
+        self.assertEqual(self.symbols['Point'], {'type': 'struct', 'members': {
+            'a': member('int[4]'), 'name': member('char[16]')}})
+        self.assertEqual(self.symbols['U']['members'], {'i': member('int'), 'f': member('float')})
+        for name in ('RED', 'GREEN', 'BLUE'):
+            self.assertEqual(self.symbols[name], variable('enum Color'))
+        self.assertEqual(self.symbols['counter'], variable('extern int'))
+        self.assertEqual(self.symbols['table'], variable('static char[0x80]'))
+        self.assertEqual(self.symbols['names'], variable('const char*[MAX_SHEETS]', True))
+        self.assertEqual(self.symbols['msg'], variable('const char*', True))
+
+    def test_functions_and_macros(self):
+        for name in ('sheet_alloc', 'io_hlt', 'main', 'ADDR'):
+            self.assertEqual(self.symbols[name], {'type': 'function'}, name)
+        self.assertEqual(self.symbols['MAX_SHEETS'], variable('#define'))
+
+    def test_calls_casts_comments_and_strings_are_not_symbols(self):
+        for name in ('commented_out', 'line_comment', 'cast_target', 'call_in_body', 'in_string', 'x'):
+            self.assertNotIn(name, self.symbols)
+
+    def test_existing_table_is_updated(self):
+        table = {'kept': {'type': 'function'}}
+        self.assertIs(extract_c_symbols('int added;', table), table)
+        self.assertEqual(set(table), {'kept', 'added'})
+
+    def test_incomplete_input_does_not_raise(self):
+        for cut in range(len(HEADER)):
+            extract_c_symbols(HEADER[:cut])
+
+    def test_tokenizer_keeps_directives_whole(self):
+        tokens = list(tokenize_c('#define A(x) \\\n  (x)\nint a;'))
+        self.assertEqual(tokens[0][0], TOKEN_DIRECTIVE)
+        self.assertEqual([text for _, text in tokens[1:]], ['int', 'a', ';'])
+
+    def test_header_helper_files_are_parsed(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, 'helper.h')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(HEADER)
+            translator = Translator()
+            translator.ParseHelperFiles([path])
+        self.assertEqual(dict(translator.SymbolTable), self.symbols)
+
+
+if __name__ == '__main__':
+    unittest.main()
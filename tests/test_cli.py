@@ -0,0 +1,110 @@
+# 命令行参数解析：各选项写入 Args，缺少参数时报错退出，默认读取 sys.argv[1:]
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT, run_cli
+from TransPyC import TransPyC
+from lib.constants.config import ERROR_MESSAGES
+
+
+def parse(argv):
+    """解析 argv，返回 TransPyC 对象"""
+    app = TransPyC()
+    app.ParseArgs(argv)
+    return app
+
+
+class ParseArgsTest(unittest.TestCase):
+
+    def test_translate_options(self):
+        app = parse(['-f', 'in.py', '-o', 'out.c', '-e', 'gbk', '-debug', 'log.p2c', '-cache', 'c',
+                     '-nocache', '-metrics', 'm.json', '-cc', 'clang', '-cflags', '-O2 -Wall', '-run',
+                     '-args', 'a b'])
+        self.assertEqual(app.Args, {
+            'Input': 'in.py', 'Output': 'out.c', 'Encoding': 'gbk', 'Debug': 'log.p2c', 'CacheDir': 'c',
+            'NoCache': True, 'Metrics': 'm.json', 'CompileCommand': 'clang', 'CompileFlags': '-O2 -Wall',
+            'Run': True, 'RunArgs': 'a b',
+        })
+
+    def test_helper_files_stop_at_next_option(self):
+        app = parse(['-h', 'a.py', 'b.h', 'c.symbin', '-f', 'in.py', '-o', 'out.c', '--encoding', 'utf-8'])
+        self.assertEqual(app.HelperFiles, ['a.py', 'b.h', 'c.symbin'])
+        self.assertEqual(app.Args['Encoding'], 'utf-8')
+
+    def test_header_files_take_the_rest(self):
+        app = parse(['-f', 'in.py', '-o', 'out.c', '-wh', 'a.h', '-x'])
+        self.assertEqual(app.HeaderFiles, ['a.h', '-x'])
+
+    def test_profile_argument_is_optional(self):
+        self.assertIs(parse(['-f', 'in.py', '-o', 'out.c', '-profile']).Profile, True)
+        self.assertIs(parse(['-profile', '-f', 'in.py', '-o', 'out.c']).Profile, True)
+        self.assertEqual(parse(['-f', 'in.py', '-o', 'out.c', '-profile', 'p.json']).Profile, 'p.json')
+
+    def test_modes_without_input_and_output(self):
+        self.assertEqual(parse(['-presym', 'a.py', '-o', 'a.symbin', '-debug', 'a.p2c']).Args['PreSym'],
+                         {'input': 'a.py', 'output': 'a.symbin', 'debug': 'a.p2c'})
+        self.assertEqual(parse(['-presym', 'a.c']).Args['PreSym']['output'], 'a.symbin')
+        self.assertEqual(parse(['-build', 'src', '-j', '4']).Args, {'Build': 'src', 'Jobs': 4})
+        self.assertEqual(parse(['-watch', 'src']).Args, {'Watch': 'src'})
+        self.assertEqual(parse(['-serve', 's.sock']).Args, {'Serve': 's.sock'})
+
+    def test_default_argv_is_sys_argv(self):
+        with mock.patch.object(sys, 'argv', ['TransPyC.py', '-f', 'in.py', '-o', 'out.c']):
+            app = parse(None)
+        self.assertEqual(app.Args, {'Input': 'in.py', 'Output': 'out.c'})
+
+    def test_errors_exit_with_status_1(self):
+        for argv, message in (
+                (['-f'], 'Error: -f requires an argument'),
+                (['-f', 'in.py', '-o', 'out.c', '-j', 'x'], 'Error: -j requires a number'),
+                (['-f', 'in.py', '-o', 'out.c', '-metrics'], 'Error: -metrics requires an output file'),
+                (['-f', 'in.py', '-o', 'out.c', '-bogus'], 'Error: Unknown argument -bogus'),
+                (['-f', 'in.py'], ERROR_MESSAGES['MISSING_ARGS'])):
+            with self.subTest(argv=argv):
+                code, output = run_cli(argv)
+                self.assertEqual(code, 1)
+                self.assertTrue(output.startswith(message), output)
+
+
+
+def imported_modules(argv, cwd):
+    """在新进程中运行命令行，用 -X importtime 返回 (退出码, 导入过的模块名集合)"""
+    process = subprocess.run([sys.executable, '-X', 'importtime', os.path.join(ROOT, 'TransPyC.py'), *argv],
+                             cwd=cwd, capture_output=True, text=True)
+    modules = {line.rsplit('|', 1)[1].strip() for line in process.stderr.splitlines()
+               if line.startswith('import time:') and line.count('|') == 2}
+    return process.returncode, modules
+
+
+class LazyImportTest(unittest.TestCase):
+    """客户端、帮助和 C 文件预处理不载入翻译器"""
+
+    def test_light_paths_do_not_import_translator(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            cases = {
+                'client': ['-client', os.path.join(work_dir, 'missing.sock'), '-f', 'a.py', '-o', 'a.c'],
+                'help': ['-h'],
+                'missing output': ['-h', 'a.py'],
+                'presym c': ['-presym', os.path.join(ROOT, 'kernel2.c'), '-o', os.path.join(work_dir, 'k.symbin')],
+            }
+            for name, argv in cases.items():
+                with self.subTest(name):
+                    code, modules = imported_modules(argv, work_dir)
+                    self.assertIn('lib.constants.config', modules)
+                    self.assertNotIn('lib.core.translator', modules)
+                    self.assertEqual(code, 0 if name == 'presym c' else 1)
+            # 确认检测有效：预处理 Python 文件需要翻译器
+            code, modules = imported_modules(['-presym', os.path.join(ROOT, 'kernel2.py'), '-o',
+                                              os.path.join(work_dir, 'k2.symbin')], work_dir)
+            self.assertEqual(code, 0)
+            self.assertIn('lib.core.translator', modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
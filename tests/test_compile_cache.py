@@ -0,0 +1,163 @@
+# CompileCache：缓存键随源代码、头文件、编译器和编译标志变化，找不到的头文件和引入其它输入文件的编译标志不缓存
+
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import run_cli
+from lib.core.compile_cache import CompileCache, flags_have_inputs, include_dirs
+
+PROGRAM = '''import c
+import t
+
+def main() -> t.CInt:
+    x: t.CInt = 41
+    x += 1
+    return 0
+'''
+
+
+class CompileCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.dir = self.work_dir.name
+        self.cache = CompileCache(os.path.join(self.dir, 'cache'))
+        self.c_file = self.write('main.c', '#include "a.h"\nint main(void) { return A; }\n')
+        self.write('a.h', '#include "b.h"\n#define A B\n')
+        self.write('b.h', '#define B 0\n')
+        # 不受运行测试的环境影响
+        patcher = mock.patch.dict(os.environ, {'CPATH': '', 'C_INCLUDE_PATH': ''})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def key(self, flags='', command='gcc'):
+        return self.cache.MakeKey(self.c_file, command, flags)
+
+    def test_key_is_stable(self):
+        self.assertIsNotNone(self.key())
+        self.assertEqual(self.key(), self.key())
+
+    def test_key_changes_with_inputs(self):
+        base = self.key()
+        self.assertNotEqual(self.key('-O2'), base)
+        self.assertNotEqual(self.key(command='cc'), base)
+        self.write('b.h', '#define B 1\n')
+        changed_nested_header = self.key()
+        self.assertNotEqual(changed_nested_header, base)
+        self.write('main.c', '#include "a.h"\nint main(void) { return A + 1; }\n')
+        self.assertNotEqual(self.key(), changed_nested_header)
+
+    def test_unresolved_header_is_not_cacheable(self):
+        self.write('main.c', '#include "elsewhere.h"\nint main(void) { return 0; }\n')
+        self.assertIsNone(self.key())
+        self.assertEqual(self.cache.Uncacheable, 1)
+
+    def test_flags_with_input_files_are_not_cacheable(self):
+        for flags in ('extra.c', '-O2 lib/extra.o', 'libx.a', '-lm', '-L lib', '-Llib', '-include pre.h',
+                      '-T link.ld', '-Wl,-Tlink.ld', '-Xlinker -Tlink.ld', '@args.rsp', '-I inc -DX=1 x.c'):
+            with self.subTest(flags):
+                self.assertTrue(flags_have_inputs(flags))
+        for flags in ('', '-O2 -Wall', '-I inc -D X -U Y -x c', '-std=c99 -Iinc -DNAME=value'):
+            with self.subTest(flags):
+                self.assertFalse(flags_have_inputs(flags))
+        self.assertIsNone(self.key('-O2 extra.c'))
+        self.assertEqual(self.cache.Uncacheable, 1)
+
+    def test_headers_in_search_dirs_are_hashed(self):
+        self.write('main.c', '#include "quoted.h"\nint main(void) { return 0; }\n')
+        self.write('inc/quoted.h', '#define Q 1\n')
+        for index, flags in enumerate(('-iquote inc', '-Iinc', '-I inc', '-isystem inc', '-idirafter inc')):
+            with self.subTest(flags):
+                flags = flags.replace('inc', os.path.join(self.dir, 'inc'))
+                first = self.key(flags)
+                self.assertIsNotNone(first)
+                self.write('inc/quoted.h', f'#define Q {index + 2}\n')
+                self.assertNotEqual(self.key(flags), first)
+        with mock.patch.dict(os.environ, {'CPATH': os.path.join(self.dir, 'inc')}):
+            self.assertIsNotNone(self.key())
+
+    def test_include_dirs_order(self):
+        self.assertEqual(include_dirs('-idirafter z -Ia -iquote q -isystem s -I b'), ['q', 'a', 'b', 's', 'z'])
+
+    def test_store_and_lookup(self):
+        key = self.key()
+        executable = self.write('main.exe', 'binary')
+        os.chmod(executable, 0o755)
+        output = os.path.join(self.dir, 'copy.exe')
+        self.assertIsNone(self.cache.Lookup(key, output))
+        self.cache.Store(key, executable, 0.25)
+        self.assertEqual(self.cache.Lookup(key, output), 0.25)
+        with open(output, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'binary')
+        self.assertTrue(os.stat(output).st_mode & stat.S_IXUSR)
+        self.assertEqual((self.cache.Hits, self.cache.Misses), (1, 1))
+
+    def test_stats_are_written_on_flush(self):
+        stats_file = os.path.join(self.cache.CacheDir, 'stats.json')
+        for _ in range(3):
+            self.cache.Lookup(self.key(), os.path.join(self.dir, 'copy.exe'))
+        self.assertFalse(os.path.exists(stats_file))
+        self.cache.Flush()
+        self.assertEqual(self.cache.Stats()['misses'], 3)
+        other = CompileCache(os.path.dirname(self.cache.CacheDir))
+        other.Lookup(self.key(), os.path.join(self.dir, 'copy.exe'))
+        other.Flush()
+        self.assertEqual(CompileCache(os.path.dirname(self.cache.CacheDir)).Stats()['misses'], 4)
+
+
+@unittest.skipUnless(shutil.which('gcc'), 'gcc is not installed')
+class CompileAndRunCacheTest(unittest.TestCase):
+
+    def test_second_compile_is_a_cache_hit(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            source = os.path.join(work_dir, 'prog.py')
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(PROGRAM)
+            argv = ['-f', source, '-o', os.path.join(work_dir, 'prog.c'), '-cc', 'gcc',
+                    '-cache', os.path.join(work_dir, 'cache')]
+            code, first = run_cli(argv, cwd=work_dir)
+            self.assertEqual(code, 0)
+            self.assertIn('Compilation successful!\n', first)
+            os.remove(os.path.join(work_dir, 'prog.c.exe'))
+            code, second = run_cli(argv, cwd=work_dir)
+            self.assertIn('Compilation successful! (cached', second)
+            self.assertTrue(os.path.exists(os.path.join(work_dir, 'prog.c.exe')))
+            code, third = run_cli(argv + ['-cflags', '-O1'], cwd=work_dir)
+            self.assertIn('Compilation successful!\n', third)
+
+    def test_extra_source_file_change_is_compiled(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            source = os.path.join(work_dir, 'prog.py')
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(PROGRAM)
+            extra = os.path.join(work_dir, 'extra.c')
+            argv = ['-f', source, '-o', os.path.join(work_dir, 'prog.c'), '-cc', 'gcc', '-cflags', extra,
+                    '-run', '-cache', os.path.join(work_dir, 'cache')]
+            for message in ('first', 'second'):
+                with open(extra, 'w', encoding='utf-8') as f:
+                    f.write('#include <stdio.h>\n'
+                            f'__attribute__((constructor)) static void hello(void) {{ puts("{message}"); }}\n')
+                code, output = run_cli(argv, cwd=work_dir)
+                self.assertEqual(code, 0)
+                self.assertIn('Compilation successful!\n', output)
+                self.assertIn(f'Execution output:\n{message}\n', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
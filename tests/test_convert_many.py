@@ -0,0 +1,69 @@
+# ConvertMany：三种执行方式的结果与逐个 Convert 相同，出错的代码单独报告，不影响其他代码和调用对象
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT
+from TransPyC import SymbolFile, TransPyC
+from lib.core.builder import CONVERT_EXECUTORS
+
+HELPER = os.path.join(ROOT, 'kernel2.py')
+SAMPLES = ('kernel.py', 'test.py', 'test/example1.py', 'test/test_simple.py', 'backup_test/test_split.py')
+BROKEN = ('broken', 'def broken(:\n')
+
+
+def read(path):
+    with open(os.path.join(ROOT, path), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def convert(code):
+    """逐个转换：每段代码使用新的 TransPyC 对象"""
+    app = TransPyC(code)
+    app.AddSymbol(SymbolFile(HELPER))
+    return app.Convert()
+
+
+class ConvertManyTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sources = [(path, read(path)) for path in SAMPLES]
+        cls.expected = {name: convert(code) for name, code in cls.sources}
+
+    def test_executors_match_serial_convert(self):
+        app = TransPyC()
+        app.AddSymbol(SymbolFile(HELPER))
+        symbols = dict(app.translator.SymbolTable)
+        for executor in CONVERT_EXECUTORS:
+            with self.subTest(executor=executor):
+                results = list(app.ConvertMany(self.sources, jobs=2, executor=executor))
+                self.assertEqual(sorted(result.name for result in results), sorted(SAMPLES))
+                self.assertEqual({result.name: result.error for result in results}, dict.fromkeys(SAMPLES))
+                self.assertEqual({result.name: result.code for result in results}, self.expected)
+        # 各段代码写入的符号不会留在调用对象上
+        self.assertEqual(app.translator.SymbolTable, symbols)
+
+    def test_bad_input_is_reported_per_source(self):
+        with self.assertRaises(SyntaxError):
+            convert(BROKEN[1])
+        app = TransPyC()
+        app.AddSymbol(SymbolFile(HELPER))
+        for executor in CONVERT_EXECUTORS:
+            with self.subTest(executor=executor):
+                results = {result.name: result for result in
+                           app.ConvertMany([BROKEN, *self.sources], jobs=2, executor=executor)}
+                broken = results.pop('broken')
+                self.assertIsNone(broken.code)
+                self.assertTrue(broken.error.startswith('SyntaxError: '), broken.error)
+                self.assertEqual({name: result.code for name, result in results.items()}, self.expected)
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            TransPyC().ConvertMany(self.sources, executor='fiber')
+
+
+if __name__ == '__main__':
+    unittest.main()
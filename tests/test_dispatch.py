@@ -0,0 +1,146 @@
+# 分派表：HandleExpr/HandleBody/顶层分段选中的处理方法与原来的 isinstance 判断链相同
+
+import ast
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT
+from lib.core.translator import (
+    SECTION_FUNCTIONS, SECTION_GLOBALS, SECTION_IMPORTS, SECTION_MACROS, Translator, find_visitor,
+)
+
+SAMPLES = ('kernel.py', 'kernel2.py', 'test/example1.py', 'test/test_simple.py')
+
+# 改为分派表之前 HandleExpr 中的判断链（按判断顺序），都不匹配时返回 ['0']
+EXPRESSION_CHAIN = (
+    (ast.Constant, 'ExprConstant'), (ast.Name, 'ExprName'), (ast.BinOp, 'ExprBinOp'),
+    (ast.BoolOp, 'ExprBoolOp'), (ast.UnaryOp, 'ExprUnaryOp'), (ast.Call, 'ExprCall'),
+    (ast.Subscript, 'ExprSubscript'), (ast.Tuple, 'ExprTuple'), (ast.List, 'ExprList'), (ast.Set, 'ExprSet'),
+    (ast.Compare, 'ExprCompare'), (ast.Attribute, 'ExprAttribute'), (ast.IfExp, 'ExprIfExp'),
+    (ast.NamedExpr, 'ExprNamedExpr'),
+)
+
+# HandleBody 中的判断链，都不匹配的语句被忽略
+STATEMENT_CHAIN = (
+    (ast.Expr, 'StmtExpr'), (ast.If, 'StmtIf'), (ast.For, 'StmtFor'), (ast.While, 'StmtWhile'),
+    (ast.Break, 'StmtBreak'), (ast.Continue, 'StmtContinue'), (ast.Return, 'StmtReturn'),
+    (ast.Assign, 'StmtAssign'), (ast.AugAssign, 'StmtAugAssign'), (ast.AnnAssign, 'StmtAnnAssign'),
+    (ast.ClassDef, 'StmtClassDef'), (ast.Match, 'StmtMatch'),
+)
+
+# GenerateCCode 原来逐段扫描顶层节点时，每一段处理的节点类型
+TOP_LEVEL_CHAIN = (
+    (ast.Import, SECTION_IMPORTS, 'HandleImport'), (ast.ImportFrom, SECTION_IMPORTS, 'HandleImportFrom'),
+    (ast.Expr, SECTION_MACROS, 'HandleTopLevelExpr'),
+    (ast.ClassDef, SECTION_GLOBALS, 'HandleClassDef'), (ast.Assign, SECTION_GLOBALS, 'HandleAssign'),
+    (ast.AnnAssign, SECTION_GLOBALS, 'HandleGlobalAnnAssign'),
+    (ast.FunctionDef, SECTION_FUNCTIONS, 'HandleFunctionDef'),
+    (ast.ClassDef, SECTION_FUNCTIONS, 'HandleClassMethods'),
+)
+
+
+class CustomName(ast.Name):
+    """ast.Name 的子类，原来的 isinstance 判断按 ast.Name 处理"""
+
+
+class CustomPass(ast.Pass):
+    """没有处理方法的语句的子类"""
+
+
+def chain_handler(chain, node):
+    """原来的判断链选中的处理方法名，都不匹配时返回 None"""
+    for node_type, name in chain:
+        if isinstance(node, node_type):
+            return name
+    return None
+
+
+def table_handler(visitors, node):
+    """分派表选中的处理方法名，与 HandleExpr/HandleBody 的查找方式相同"""
+    visitor = visitors.get(type(node)) or find_visitor(visitors, type(node))
+    return None if visitor is None else visitor.__name__
+
+
+def top_level_sections(node):
+    """原来逐段扫描时处理该节点的 (输出段, 处理方法名)，按输出段排序"""
+    return sorted((section, name) for node_type, section, name in TOP_LEVEL_CHAIN if isinstance(node, node_type))
+
+
+def table_sections(node):
+    sections = Translator.TopLevelSections.get(type(node)) or find_visitor(Translator.TopLevelSections, type(node))
+    return sorted(sections or ())
+
+
+def sample_trees():
+    for path in SAMPLES:
+        with open(os.path.join(ROOT, path), 'r', encoding='utf-8') as f:
+            yield path, ast.parse(f.read())
+
+
+def node_classes(base):
+    """ast 模块中 base 的全部具体子类"""
+    found = []
+    pending = [base]
+    while pending:
+        node_type = pending.pop()
+        for subclass in node_type.__subclasses__():
+            if subclass.__module__ == 'ast' and not subclass.__name__.startswith('_'):
+                found.append(subclass)
+            pending.append(subclass)
+    return found
+
+
+class DispatchTest(unittest.TestCase):
+
+    def test_sample_nodes_match_old_chain(self):
+        counts = {'expr': 0, 'stmt': 0, 'top': 0}
+        for path, tree in sample_trees():
+            for node in ast.walk(tree):
+                if isinstance(node, ast.expr):
+                    self.assertEqual(table_handler(Translator.ExpressionVisitors, node),
+                                     chain_handler(EXPRESSION_CHAIN, node), (path, ast.dump(node)))
+                    counts['expr'] += 1
+                elif isinstance(node, ast.stmt):
+                    self.assertEqual(table_handler(Translator.StatementVisitors, node),
+                                     chain_handler(STATEMENT_CHAIN, node), (path, ast.dump(node)))
+                    counts['stmt'] += 1
+            for node in tree.body:
+                self.assertEqual(table_sections(node), top_level_sections(node), (path, ast.dump(node)))
+                counts['top'] += 1
+        self.assertGreater(counts['expr'], 1000)
+        self.assertGreater(counts['stmt'], 100)
+        self.assertGreater(counts['top'], 50)
+
+    def test_every_ast_node_type_matches_old_chain(self):
+        for node_type in node_classes(ast.expr):
+            with self.subTest(node_type.__name__):
+                node = node_type.__new__(node_type)
+                self.assertEqual(table_handler(Translator.ExpressionVisitors, node),
+                                 chain_handler(EXPRESSION_CHAIN, node))
+        for node_type in node_classes(ast.stmt):
+            with self.subTest(node_type.__name__):
+                node = node_type.__new__(node_type)
+                self.assertEqual(table_handler(Translator.StatementVisitors, node),
+                                 chain_handler(STATEMENT_CHAIN, node))
+                self.assertEqual(table_sections(node), top_level_sections(node))
+
+    def test_subclass_nodes_use_base_handler(self):
+        translator = Translator()
+        self.assertEqual(translator.HandleExpr(CustomName(id='value', ctx=ast.Load())), ['value'])
+        body = [ast.Expr(value=ast.Call(func=CustomName(id='f', ctx=ast.Load()), args=[], keywords=[])),
+                CustomPass()]
+        self.assertEqual(translator.HandleBody(body), ['f();'])
+
+    def test_unknown_nodes_fall_back(self):
+        translator = Translator()
+        lambda_node = ast.parse('lambda: 0', mode='eval').body
+        self.assertEqual(translator.HandleExpr(lambda_node), ['0'])
+        self.assertEqual(translator.HandleBody([ast.Pass(), ast.Global(names=['x'])]), [])
+        self.assertIsNone(find_visitor(Translator.ExpressionVisitors, ast.Lambda))
+        self.assertNotIn(ast.Lambda, Translator.ExpressionVisitors)
+
+
+if __name__ == '__main__':
+    unittest.main()
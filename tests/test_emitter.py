@@ -0,0 +1,69 @@
+# CodeEmitter：写出的内容与展开缩进后 '\n'.join 的结果相同
+
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import support  # noqa: F401  (把仓库根目录加入 sys.path)
+from lib.core.emitter import CodeEmitter, IndentedCode, count_code_lines, flatten_code
+
+
+def nested(depth):
+    """depth 层嵌套的代码块"""
+    code = ['x++;']
+    for level in range(depth):
+        code = [f'if (a{level}) {{', IndentedCode(code), '}']
+    return code
+
+
+def emit(code, **kwargs):
+    output = io.StringIO()
+    emitter = CodeEmitter(output, **kwargs)
+    emitter.Emit(code)
+    return output.getvalue(), emitter
+
+
+class CodeEmitterTest(unittest.TestCase):
+
+    def test_output_matches_flattened_lines(self):
+        code = ['int f(void) {', IndentedCode(nested(3)), IndentedCode(['return 0;'], 2), '}']
+        text, emitter = emit(code)
+        self.assertEqual(text, '\n'.join(flatten_code(code)))
+        self.assertEqual(text.splitlines()[4], '                x++;')
+        self.assertEqual(text.splitlines()[-2], '        return 0;')
+        self.assertEqual(emitter.LineCount, count_code_lines(code))
+        self.assertEqual(emitter.Depth, 0)
+
+    def test_line_counts(self):
+        self.assertEqual(count_code_lines(nested(5)), 11)
+        self.assertEqual(IndentedCode(nested(2)).LineCount, 5)
+        self.assertEqual(count_code_lines([]), 0)
+
+    def test_successive_emits_are_joined_by_newlines(self):
+        output = io.StringIO()
+        emitter = CodeEmitter(output)
+        emitter.Emit(['a;'])
+        emitter.Emit([])
+        emitter.Emit(['b;', IndentedCode(['c;'])])
+        self.assertEqual(output.getvalue(), 'a;\nb;\n    c;')
+
+    def test_custom_indent_unit(self):
+        text, _ = emit(nested(2), indent_unit='\t')
+        self.assertEqual(text, 'if (a1) {\n\tif (a0) {\n\t\tx++;\n\t}\n}')
+
+    def test_depth_is_restored_after_error(self):
+        class Failing:
+            def write(self, text):
+                if 'boom' in text:
+                    raise OSError('disk full')
+
+        emitter = CodeEmitter(Failing())
+        with self.assertRaises(OSError):
+            emitter.Emit([IndentedCode([IndentedCode(['boom'])])])
+        self.assertEqual(emitter.Depth, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
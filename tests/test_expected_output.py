@@ -0,0 +1,61 @@
+# 示例程序的翻译结果与 tests/expected 中记录的C代码逐字节比较
+#
+# 翻译器的输出有意改变时，检查差异后用下面的命令重新生成:
+#   python tests/test_expected_output.py --update
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT, translate_file
+
+# 期望输出文件（相对仓库根目录）-> (输入文件, 辅助文件)
+# 示例程序旁边的 .c 就是它的期望输出；kernel.c、kernel2.c 是手写的C源文件（kernel2.c 也用作辅助文件），
+# 它们以及其他组合的期望输出放在 tests/expected 中
+CASES = {
+    'test.c': ('test.py', ['test2.py']),
+    'test/example1.c': ('test/example1.py', []),
+    'test/test_simple.c': ('test/test_simple.py', []),
+    'backup_test/test.c': ('backup_test/test.py', ['backup_test/test_helper.py', 'backup_test/test.h']),
+    'backup_test/test_split.c': ('backup_test/test_split.py', []),
+    'tests/expected/kernel.c': ('kernel.py', ['kernel2.py']),
+    'tests/expected/kernel2.c': ('kernel2.py', []),
+    'tests/expected/example_test.c': ('backup_test/example_test.py', []),
+    # 辅助文件中结构体成员和函数局部变量不是全局符号，不应影响没有用到它们的程序
+    'tests/expected/test.kernel2.c': ('test.py', ['kernel2.py']),
+    'tests/expected/example1.kernel2.c': ('test/example1.py', ['kernel2.py']),
+    'tests/expected/test_simple.kernel2.c': ('test/test_simple.py', ['kernel2.py']),
+    'tests/expected/backup_test.kernel2.c': ('backup_test/test.py', ['kernel2.py']),
+    'tests/expected/test_split.kernel2.c': ('backup_test/test_split.py', ['kernel2.py']),
+}
+
+
+class ExpectedOutputTest(unittest.TestCase):
+
+    def test_samples(self):
+        for name, (input_file, helper_files) in CASES.items():
+            with self.subTest(name):
+                with open(os.path.join(ROOT, name), 'r', encoding='utf-8') as f:
+                    expected = f.read()
+                self.assertEqual(translate_file(input_file, helper_files), expected)
+
+    def test_unused_helper_does_not_change_output(self):
+        """只用到自身定义的程序，加上 kernel2.py 作为辅助文件后输出不变"""
+        for input_file in ('test/example1.py', 'test/test_simple.py', 'backup_test/test_split.py'):
+            with self.subTest(input_file):
+                self.assertEqual(translate_file(input_file, ['kernel2.py']), translate_file(input_file))
+
+
+def update():
+    for name, (input_file, helper_files) in CASES.items():
+        with open(os.path.join(ROOT, name), 'w', encoding='utf-8') as f:
+            f.write(translate_file(input_file, helper_files))
+        print(f'{name} <- {input_file} {" ".join(helper_files)}')
+
+
+if __name__ == '__main__':
+    if '--update' in sys.argv:
+        update()
+    else:
+        unittest.main()
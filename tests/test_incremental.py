@@ -0,0 +1,217 @@
+# 增量翻译缓存：定义缓存按读取的符号失效，符号缓存按文件内容和编码失效，结果与不用缓存时相同
+
+import ast
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import support  # noqa: F401  (把仓库根目录加入 sys.path)
+from lib.core import incremental
+from lib.core.incremental import RecordingTable, dependencies_match
+from lib.core.translator import Translator
+
+HELPER = '''import c
+import t
+
+class Pt(t.CStruct):
+    x: t.CInt
+
+cur: Pt | t.CPtr = c.State
+'''
+
+MAIN = '''import c
+import t
+
+def f() -> t.CInt:
+    x: t.CInt = cur.x + 1
+    return x
+
+def g(a: t.CInt) -> t.CInt:
+    return a * 2
+'''
+
+
+class RecordingTableTest(unittest.TestCase):
+
+    def test_dependencies_follow_read_keys(self):
+        original = {'a': {'type': 'int'}, 'b': {'type': 'char'}}
+        table = RecordingTable(original)
+        table.get('a')
+        'missing' in table
+        table['new'] = {'type': 'short'}
+        dependencies = table.Dependencies()
+        self.assertEqual(set(dependencies['keys']), {'a', 'missing'})
+        self.assertEqual(table.Writes, {'new': {'type': 'short'}})
+        self.assertTrue(dependencies_match(dependencies, {**original, 'b': {'type': 'long'}}))
+        self.assertFalse(dependencies_match(dependencies, {**original, 'a': {'type': 'long'}}))
+        self.assertFalse(dependencies_match(dependencies, {**original, 'missing': {}}))
+
+    def test_writes_stay_in_overlay(self):
+        original = {'a': 1, 'b': 2}
+        table = RecordingTable(original)
+        table['b'] = 3
+        table['c'] = 4
+        self.assertEqual(original, {'a': 1, 'b': 2})
+        self.assertEqual((table['b'], table.get('c'), 'c' in table), (3, 4, True))
+        self.assertEqual(dict(table), {'a': 1, 'b': 3, 'c': 4})
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.Writes, {'b': 3, 'c': 4})
+
+    def test_iteration_depends_on_whole_table(self):
+        original = {'a': 1}
+        table = RecordingTable(original)
+        list(table.items())
+        dependencies = table.Dependencies()
+        self.assertTrue(dependencies_match(dependencies, {'a': 1}))
+        self.assertFalse(dependencies_match(dependencies, {'a': 1, 'b': 2}))
+
+
+class HelperFileTest(unittest.TestCase):
+    """在临时目录中准备辅助文件和缓存目录"""
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.work_dir.name, 'cache')
+        self.helper = os.path.join(self.work_dir.name, 'helper.py')
+        self.write_helper(HELPER)
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write_helper(self, text):
+        with open(self.helper, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def corrupt_entries(self, cache):
+        for dir_path, _, file_names in os.walk(cache.CacheDir):
+            for file_name in file_names:
+                with open(os.path.join(dir_path, file_name), 'w', encoding='utf-8') as f:
+                    f.write('{')
+
+
+class IncrementalCacheTest(HelperFileTest):
+
+    def translate(self, code=MAIN, cached=True):
+        """翻译 code，返回 (C代码, 翻译器)"""
+        translator = Translator()
+        if cached:
+            translator.set_definition_cache(self.cache_dir)
+        translator.ParseHelperFiles([self.helper], 'utf-8')
+        translator.OriginalLines = code.split('\n')
+        translator.Content = code
+        return translator.GenerateCCode(ast.parse(code)), translator
+
+    def counts(self, translator):
+        return translator.DefinitionCache.Hits, translator.DefinitionCache.Misses
+
+    def test_second_run_hits_and_matches(self):
+        uncached, _ = self.translate(cached=False)
+        first, translator = self.translate()
+        self.assertEqual(self.counts(translator), (0, 2))
+        second, translator = self.translate()
+        self.assertEqual(self.counts(translator), (2, 0))
+        self.assertEqual(first, uncached)
+        self.assertEqual(second, uncached)
+
+    def test_hit_replays_resolved_names(self):
+        _, cold = self.translate()
+        _, warm = self.translate()
+        self.assertEqual(self.counts(warm), (2, 0))
+        self.assertEqual(warm.VarScopes.Resolved, cold.VarScopes.Resolved)
+        self.assertEqual(warm.VarScopes.Resolved['f'], {'cur': 'global'})
+
+    def test_changed_symbol_invalidates_only_its_readers(self):
+        self.translate()
+        self.write_helper(HELPER.replace('cur: Pt | t.CPtr', 'cur: Pt'))
+        code, translator = self.translate()
+        self.assertEqual(self.counts(translator), (1, 1))
+        self.assertIn('cur.x + 1', code)
+        self.assertEqual(code, self.translate(cached=False)[0])
+
+    def test_changed_definition_is_retranslated(self):
+        self.translate()
+        changed = MAIN.replace('a * 2', 'a * 3')
+        code, translator = self.translate(changed)
+        self.assertEqual(self.counts(translator), (1, 1))
+        self.assertIn('a * 3', code)
+
+    def test_translator_change_invalidates_entries(self):
+        self.translate()
+        with mock.patch.object(incremental, '_ToolFingerprint', 'changed'):
+            _, translator = self.translate()
+        self.assertEqual(self.counts(translator), (0, 2))
+
+    def test_corrupt_entry_is_a_miss(self):
+        _, translator = self.translate()
+        self.corrupt_entries(translator.DefinitionCache)
+        code, translator = self.translate()
+        self.assertEqual(self.counts(translator), (0, 2))
+        self.assertEqual(code, self.translate(cached=False)[0])
+
+
+class SymbolCacheTest(HelperFileTest):
+
+    def load(self, cached=True, encoding='utf-8'):
+        """解析辅助文件，返回翻译器"""
+        translator = Translator()
+        if cached:
+            translator.set_symbol_cache(self.cache_dir)
+        translator.ParseHelperFiles([self.helper], encoding)
+        return translator
+
+    def counts(self, translator):
+        return translator.SymbolCache.Hits, translator.SymbolCache.Misses
+
+    def assert_matches_uncached(self, translator):
+        expected = self.load(cached=False).SymbolTable
+        self.assertEqual(list(translator.SymbolTable.items()), list(expected.items()))
+
+    def test_second_load_hits_and_matches(self):
+        self.assertEqual(self.counts(self.load()), (0, 1))
+        translator = self.load()
+        self.assertEqual(self.counts(translator), (1, 0))
+        self.assert_matches_uncached(translator)
+
+    def test_changed_contents_are_a_miss(self):
+        self.load()
+        self.write_helper(HELPER.replace('cur: Pt | t.CPtr', 'cur: Pt'))
+        translator = self.load()
+        self.assertEqual(self.counts(translator), (0, 1))
+        self.assert_matches_uncached(translator)
+
+    def test_encoding_is_part_of_key(self):
+        self.load()
+        self.assertEqual(self.counts(self.load(encoding='gbk')), (0, 1))
+
+    def test_translator_change_invalidates_entries(self):
+        self.load()
+        with mock.patch.object(incremental, '_ToolFingerprint', 'changed'):
+            self.assertEqual(self.counts(self.load()), (0, 1))
+
+    def test_counts_from_threads_are_not_lost(self):
+        cache = incremental.SymbolCache(self.cache_dir)
+        cache.Store('00hit', {})
+        previous = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, previous)
+        threads = [threading.Thread(target=lambda: [cache.Lookup(key) for key in ('00hit', '00miss') * 200])
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((cache.Hits, cache.Misses), (1600, 1600))
+
+    def test_corrupt_entry_is_a_miss(self):
+        self.corrupt_entries(self.load().SymbolCache)
+        translator = self.load()
+        self.assertEqual(self.counts(translator), (0, 1))
+        self.assert_matches_uncached(translator)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# Metrics：嵌套阶段的耗时不重复计算，内存峰值计入所在阶段及其外层，-metrics 写出 JSON
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT, run_cli
+from lib.core.metrics import NULL_METRICS, Metrics
+
+
+def phases(metrics):
+    return {phase['name']: phase for phase in metrics.ToDict()['phases']}
+
+
+class MetricsTest(unittest.TestCase):
+
+    def tearDown(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def test_nested_phases_are_exclusive(self):
+        metrics = Metrics(track_memory=False)
+        with metrics.Phase('outer'):
+            time.sleep(0.01)
+            with metrics.Phase('inner'):
+                time.sleep(0.1)
+        result = phases(metrics)
+        self.assertEqual(result['inner']['parent'], 'outer')
+        self.assertIsNone(result['outer']['parent'])
+        self.assertGreaterEqual(result['inner']['wall_ms'], 100)
+        self.assertGreaterEqual(result['outer']['wall_ms'], 10)
+        # 外层不含内层的耗时
+        self.assertLess(result['outer']['wall_ms'], 100)
+        self.assertGreaterEqual(metrics.ToDict()['total']['wall_ms'],
+                                result['outer']['wall_ms'] + result['inner']['wall_ms'])
+
+    def test_memory_peak_includes_child_phases(self):
+        metrics = Metrics()
+        with metrics.Phase('outer'):
+            with metrics.Phase('inner'):
+                data = bytearray(4 * 1024 * 1024)
+                del data
+            with metrics.Phase('small'):
+                data = bytearray(1024)
+                del data
+        result = phases(metrics)
+        self.assertGreaterEqual(result['inner']['peak_kb'], 4096)
+        self.assertLess(result['small']['peak_kb'], 1024)
+        self.assertGreaterEqual(result['outer']['peak_kb'], result['inner']['peak_kb'])
+        self.assertTrue(metrics.ToDict()['memory_tracked'])
+        metrics.Close()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_does_not_stop_tracing_it_did_not_start(self):
+        tracemalloc.start()
+        metrics = Metrics()
+        metrics.Close()
+        self.assertTrue(tracemalloc.is_tracing())
+
+    def test_phase_is_closed_on_error(self):
+        metrics = Metrics(track_memory=False)
+        with self.assertRaises(ValueError):
+            with metrics.Phase('failing'):
+                raise ValueError
+        self.assertEqual(metrics.Stack, [])
+        self.assertIn('failing', phases(metrics))
+
+    def test_null_metrics(self):
+        with NULL_METRICS.Phase('anything'):
+            NULL_METRICS.Count('anything', 1)
+
+    def test_cli_writes_json(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            metrics_file = os.path.join(work_dir, 'metrics.json')
+            code, output = run_cli(['-f', os.path.join(ROOT, 'kernel.py'), '-o', os.path.join(work_dir, 'kernel.c'),
+                                    '-h', os.path.join(ROOT, 'kernel2.py'), '-nocache', '-metrics', metrics_file])
+            self.assertEqual(code, 0)
+            self.assertIn(f'Metrics written to: {metrics_file}', output)
+            with open(metrics_file, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        names = [phase['name'] for phase in result['phases']]
+        self.assertEqual(names, ['helpers', 'read', 'parse', 'debug_dump', 'write', 'generate'])
+        self.assertEqual(result['phases'][-1]['parent'], 'write')
+        self.assertEqual(set(result['counts']), {'helper_files', 'helper_symbols', 'source_lines', 'ast_nodes',
+                                                 'symbols', 'emitted_lines'})
+        self.assertEqual(result['counts']['helper_files'], 1)
+        self.assertTrue(result['memory_tracked'])
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+if __name__ == '__main__':
+    unittest.main()
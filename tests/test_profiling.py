@@ -0,0 +1,92 @@
+# Profiler 写出的 pstats 数据与 cProfile 的口径一致
+
+import ast
+import cProfile
+import os
+import pstats
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import support  # noqa: F401  (把仓库根目录加入 sys.path)
+from lib.core.profiling import Profiler
+from lib.core.translator import Translator
+
+
+def recurse(n):
+    return recurse(n - 1) if n else 0
+
+
+def outer():
+    for _ in range(3):
+        recurse(2)
+
+
+class ManualProfile:
+    """用 Enter/Exit 重现 outer/recurse 的调用过程"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def recurse(self, n):
+        self.profiler.Enter(('recurse', ''))
+        try:
+            if n:
+                self.recurse(n - 1)
+        finally:
+            self.profiler.Exit()
+
+    def outer(self):
+        self.profiler.Enter(('outer', ''))
+        try:
+            for _ in range(3):
+                self.recurse(2)
+        finally:
+            self.profiler.Exit()
+
+
+def call_counts(stats, name):
+    """函数条目的 (原始调用次数, 调用次数) 和各调用方条目的 (调用次数, 原始调用次数)"""
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        if func[2] == name:
+            return (cc, nc), {caller[2]: values[:2] for caller, values in callers.items()}
+    raise KeyError(name)
+
+
+class ProfilerPstatsTest(unittest.TestCase):
+
+    def write_stats(self, profiler):
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, 'profile.pstats')
+            profiler.Write(path)
+            return pstats.Stats(path)
+
+    def test_recursive_counts_match_cprofile(self):
+        reference = cProfile.Profile()
+        reference.runcall(outer)
+        reference.create_stats()
+        expected = call_counts(pstats.Stats(reference), 'recurse')
+
+        profiler = Profiler()
+        ManualProfile(profiler).outer()
+        self.assertEqual(call_counts(self.write_stats(profiler), 'recurse'), expected)
+
+    def test_caller_counts_add_up_for_translator(self):
+        profiler = Profiler()
+        translator = Translator()
+        translator.set_profiler(profiler)
+        code = 'def f(a: t.CInt) -> t.CInt:\n    return ((a + 1) * (a - 2)) + (a << 3)\n'
+        translator.OriginalLines = code.split('\n')
+        translator.Content = code
+        translator.GenerateCCode(ast.parse(code))
+        stats = self.write_stats(profiler)
+        self.assertTrue(stats.stats)
+        for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+            if callers:
+                self.assertEqual(sum(values[0] for values in callers.values()), nc, func)
+                self.assertLessEqual(sum(values[1] for values in callers.values()), nc, func)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# ScopeStack：内层绑定覆盖外层、离开时恢复，按限定名记录解析到的名字
+
+import ast
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import support  # noqa: F401  (把仓库根目录加入 sys.path)
+from lib.core.scopes import ScopeStack
+from lib.core.translator import Translator
+
+METHODS = '''import t
+import c
+
+class Pt(t.CStruct):
+    x: t.CInt
+
+cur: Pt | t.CPtr = c.State
+
+class A(t.CStruct):
+    x: t.CInt
+    def __init__(self, v: t.CInt):
+        cur: Pt | t.CPtr = c.State
+        self.x = cur.x
+
+class B(t.CStruct):
+    y: t.CInt
+    def __init__(self, w: t.CInt):
+        self.y = cur.x
+'''
+
+
+class ScopeStackTest(unittest.TestCase):
+
+    def test_inner_binding_shadows_and_is_restored(self):
+        scopes = ScopeStack()
+        scopes.Enter('f')
+        scopes.Bind('a', 'int')
+        scopes.Enter('g')
+        scopes.Bind('a', 'char *')
+        scopes.Bind('b', 'short')
+        self.assertEqual(scopes.Lookup('a'), 'char *')
+        self.assertTrue(scopes.InCurrent('b'))
+        scopes.Leave()
+        self.assertEqual(scopes.Lookup('a'), 'int')
+        self.assertIsNone(scopes.Lookup('b'))
+        self.assertFalse(scopes.InCurrent('b'))
+        scopes.Leave()
+        self.assertIsNone(scopes.Lookup('a'))
+
+    def test_bind_without_scope_is_ignored(self):
+        scopes = ScopeStack()
+        scopes.Bind('a', 'int')
+        self.assertIsNone(scopes.Lookup('a'))
+        scopes.Leave()
+
+    def test_nested_owners_are_qualified(self):
+        scopes = ScopeStack()
+        for outer in ('f', 'g'):
+            scopes.Enter(outer)
+            scopes.Enter('helper')
+            scopes.Bind('value', 'int')
+            scopes.Lookup('value')
+            scopes.NoteGlobal(f'{outer}_global')
+            scopes.Leave()
+            scopes.Leave()
+        self.assertEqual(scopes.Resolved['f.helper'], {'value': 'local', 'f_global': 'global'})
+        self.assertEqual(scopes.Resolved['g.helper'], {'value': 'local', 'g_global': 'global'})
+
+    def test_merge_resolved_matches_direct_recording(self):
+        scopes = ScopeStack()
+        scopes.Resolved = {'f': {'a': 'global', 'b': 'local'}}
+        scopes.MergeResolved({'f': {'a': 'local', 'b': 'global', 'c': 'global'}, 'g': {}})
+        self.assertEqual(scopes.Resolved, {'f': {'a': 'local', 'b': 'local', 'c': 'global'}, 'g': {}})
+
+    def test_same_named_methods_are_recorded_separately(self):
+        translator = Translator()
+        translator.OriginalLines = METHODS.split('\n')
+        translator.Content = METHODS
+        translator.GenerateCCode(ast.parse(METHODS))
+        self.assertEqual(translator.VarScopes.Resolved['A.__init__'], {'cur': 'local'})
+        self.assertEqual(translator.VarScopes.Resolved['B.__init__'], {'cur': 'global'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+# 常驻翻译服务：-client 的输出与直接运行完全相同，已退出的服务留下的套接字文件会被替换
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT
+from lib.core.server import remove_stale_socket, server_is_listening
+
+SCRIPT = os.path.join(ROOT, 'TransPyC.py')
+TIMEOUT = 60
+
+
+def run(args, cwd):
+    """运行一次 TransPyC.py，返回 (退出码, 标准输出, 标准错误) 的字节"""
+    result = subprocess.run([sys.executable, SCRIPT, *args], cwd=cwd, capture_output=True, timeout=TIMEOUT)
+    return result.returncode, result.stdout, result.stderr
+
+
+def ast_section(debug_data):
+    """调试文件中的 AST 部分"""
+    start = debug_data.index(b'=== AST Tree (Compact) ===\n')
+    return debug_data[start:debug_data.index(b'\n\n', start)]
+
+
+def make_stale_socket(path):
+    """绑定后不删除就关闭，相当于服务被强行终止后留下的套接字文件"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(path)
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix domain sockets are not available')
+class ServerTest(unittest.TestCase):
+
+    def setUp(self):
+        # 套接字路径长度有限，使用较短的临时目录
+        self.work_dir = tempfile.mkdtemp(prefix='p2c')
+        self.addCleanup(shutil.rmtree, self.work_dir, True)
+        self.socket_path = os.path.join(self.work_dir, 's.sock')
+        for name in ('kernel.py', 'kernel2.py'):
+            shutil.copy(os.path.join(ROOT, name), self.work_dir)
+
+    def start_server(self):
+        server = subprocess.Popen([sys.executable, SCRIPT, '-serve', self.socket_path], cwd=self.work_dir,
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        self.addCleanup(self.stop_server, server)
+        first_line = server.stdout.readline()
+        if first_line.startswith('Removed stale socket'):
+            first_line = server.stdout.readline()
+        self.assertEqual(first_line, f'TransPyC server listening on {self.socket_path}\n')
+        return server
+
+    def stop_server(self, server):
+        if server.poll() is None:
+            run(['-client', self.socket_path, '-stop'], self.work_dir)
+            try:
+                server.wait(TIMEOUT)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+        server.stdout.close()
+
+    def read(self, name):
+        with open(os.path.join(self.work_dir, name), 'rb') as f:
+            return f.read()
+
+    def test_client_output_matches_direct_run(self):
+        self.start_server()
+        for index, args in enumerate((
+                ['-f', 'kernel.py', '-h', 'kernel2.py', '-nocache'],
+                ['-f', 'kernel.py', '-h', 'kernel2.py', '-nocache', '-e', 'utf-8'],
+                ['-f', 'missing.py', '-nocache'])):
+            with self.subTest(args=args):
+                direct = run([*args, '-o', f'direct{index}.c'], self.work_dir)
+                client = run(['-client', self.socket_path, *args, '-o', f'client{index}.c'], self.work_dir)
+                self.assertEqual(client[:2], direct[:2])
+                # 异常的回溯中调用栈不同，只比较最后一行
+                self.assertEqual(client[2].splitlines()[-1:], direct[2].splitlines()[-1:])
+                if direct[0] == 0:
+                    self.assertEqual(self.read(f'client{index}.c'), self.read(f'direct{index}.c'))
+                    # 调试文件中的 [ENTER]/[CACHE] 记录随缓存状态变化（直接运行时符号缓存命中与否也不同），
+                    # 只比较 AST 部分
+                    self.assertEqual(ast_section(self.read(f'client{index}.p2c')),
+                                     ast_section(self.read(f'direct{index}.p2c')))
+
+    def test_stale_socket_is_replaced(self):
+        make_stale_socket(self.socket_path)
+        self.assertFalse(server_is_listening(self.socket_path))
+        code, output, _ = run(['-client', self.socket_path, '-stats'], self.work_dir)
+        self.assertEqual(code, 1)
+        self.assertIn(b'stale socket file', output)
+        self.start_server()
+        self.assertTrue(server_is_listening(self.socket_path))
+        code, output, _ = run(['-client', self.socket_path, '-stats'], self.work_dir)
+        self.assertEqual(code, 0)
+        self.assertIn(b'no requests served', output)
+
+    def test_live_server_is_not_replaced(self):
+        self.start_server()
+        code, output, _ = run(['-serve', self.socket_path], self.work_dir)
+        self.assertEqual(code, 1)
+        self.assertIn(b'already listening', output)
+        self.assertTrue(server_is_listening(self.socket_path))
+
+    def test_blocking_modes_are_rejected(self):
+        self.start_server()
+        for args in (['-watch', '.'], ['-serve', 'other.sock']):
+            with self.subTest(args=args):
+                code, output, _ = run(['-client', self.socket_path, *args], self.work_dir)
+                self.assertEqual(code, 1)
+                self.assertIn(f'Error: {args[0]} cannot be forwarded to a running server'.encode(), output)
+        code, output, _ = run(['-client', self.socket_path, '-stats'], self.work_dir)
+        self.assertEqual(code, 0)
+
+    def test_regular_file_is_not_removed(self):
+        with open(self.socket_path, 'w', encoding='utf-8') as f:
+            f.write('not a socket')
+        self.assertFalse(remove_stale_socket(self.socket_path))
+        self.assertEqual(self.read('s.sock'), b'not a socket')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# SourceIndex：GetNumericLiteral/GetStringQuoteType 取出的字面量原文与逐行扫描的结果一致
+
+import ast
+import os
+import sys
+import token
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import support  # noqa: F401  (把仓库根目录加入 sys.path)
+from lib.core.source_index import SourceIndex
+from lib.core.translator import Translator
+
+CODE = '''x = -5
+y = -3.5e-2
+z = 0x1F + -0b101
+s = "ab" 'cd'
+f = f"v={x:>4} {'q'}"
+t = (1 +
+2, "w",
+"k")
+u = foo(
+-7)
+g = "中文" + 'é'
+m = """a
+b"""
+'''
+
+# (行号, 列号, 值) -> 字面量原文
+EXPECTED = {
+    (1, 5, 5): '5',
+    (2, 5, 0.035): '3.5e-2',
+    (3, 4, 31): '0x1F',
+    (3, 12, 5): '0b101',
+    # 隐式拼接的字符串只取第一段
+    (4, 4, 'abcd'): '"ab"',
+    # f-string 中的常量片段位于整个 f-string 的位置，取出整个 f-string；其中嵌套的字符串单独取出
+    (5, 4, 'v='): 'f"v={x:>4} {\'q\'}"',
+    (5, 4, ' '): 'f"v={x:>4} {\'q\'}"',
+    (5, 4, '>4'): 'f"v={x:>4} {\'q\'}"',
+    (5, 16, 'q'): "'q'",
+    # 续行的第 0 列
+    (6, 5, 1): '1',
+    (7, 0, 2): '2',
+    (7, 3, 'w'): '"w"',
+    (8, 0, 'k'): '"k"',
+    (10, 1, 7): '7',
+    # 非 ASCII 行：ast 的列号是 UTF-8 字节偏移
+    (11, 4, '中文'): '"中文"',
+    (11, 15, 'é'): "'é'",
+    # 跨行的三引号字符串回退到逐行扫描，只取第一行
+    (12, 4, 'a\nb'): '"""a\n',
+}
+
+
+def literals(translator, tree):
+    """按 (行号, 列号, 值) 收集每个常量的字面量原文"""
+    found = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Constant):
+            continue
+        if isinstance(node.value, str):
+            literal = translator.GetStringQuoteType(translator.Content, node)
+        else:
+            literal = translator.GetNumericLiteral(translator.Content, node)
+        found[(node.lineno, node.col_offset, node.value)] = literal
+    return found
+
+
+class SourceIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = ast.parse(CODE)
+        self.translator = Translator()
+        self.translator.OriginalLines = CODE.split('\n')
+        self.translator.Content = CODE
+
+    def test_literals_from_whole_file_tokens(self):
+        self.assertEqual(literals(self.translator, self.tree), EXPECTED)
+
+    def test_literals_from_statement_tokens(self):
+        self.translator.SourceIndex.SetStatementRanges(
+            [(node.lineno, node.end_lineno) for node in self.tree.body])
+        self.assertEqual(literals(self.translator, self.tree), EXPECTED)
+
+    def test_only_queried_statement_is_tokenized(self):
+        index = SourceIndex(CODE)
+        index.SetStatementRanges([(node.lineno, node.end_lineno) for node in self.tree.body])
+        self.assertEqual(index.GetNumericLiteral(7, 0), '2')
+        self.assertEqual(index.TokenizedStatements, {5})
+
+    def test_other_code_uses_its_own_index(self):
+        code = 'a = 0o17\n'
+        node = ast.parse(code).body[0].value
+        self.assertEqual(self.translator.GetNumericLiteral(code, node), '0o17')
+
+    def test_underscore_numbers_use_line_scan(self):
+        index = SourceIndex('n = 1_000\n')
+        self.assertIsNone(index.GetNumericLiteral(1, 4))
+        self.assertEqual(index.GetToken(1, 4, token.NUMBER), '1_000')
+
+    def test_offsets(self):
+        index = SourceIndex('ab\ncd\n')
+        self.assertEqual(index.GetOffset(2, 1), 4)
+        self.assertEqual(index.GetLine(2, keepends=False), 'cd')
+        with self.assertRaises(IndexError):
+            index.GetLine(3)
+
+
+if __name__ == '__main__':
+    unittest.main()
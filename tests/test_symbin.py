@@ -0,0 +1,164 @@
+# .symbin：新旧格式的读写、截断或损坏的文件以 ValueError 报告，并从源文件重新生成
+
+import json
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import run_cli
+from lib.core.symbin import (
+    SYMBIN_HEADER, LayeredSymbolTable, SymbinTable, decode_symbol_table, encode_symbol_table, open_symbol_file,
+)
+from lib.core.translator import Translator
+
+SYMBOLS = {
+    'zeta': {'type': 'variable', 'c_type': 'int'},
+    'alpha': {'type': 'function', 'return_type': 'char*', 'params': [['s', 'char*']]},
+    '中文': {'type': 'variable', 'c_type': 'unsigned char'},
+    'SHEET': {'type': 'struct', 'members': {'x': 'int', 'next': 'struct SHEET*'}},
+}
+
+HELPER = '''import c
+import t
+
+counter: t.CExtern | t.CInt = c.State
+
+def helper(x: t.CInt) -> t.CInt | c.State: pass
+'''
+
+
+def legacy_bytes(symbol_table):
+    """第 1 版格式：4 字节长度加 JSON"""
+    data = json.dumps(symbol_table).encode('utf-8')
+    return struct.pack('<I', len(data)) + data
+
+
+class SymbinFormatTest(unittest.TestCase):
+
+    def test_version_2_round_trip(self):
+        data = encode_symbol_table(SYMBOLS)
+        decoded = decode_symbol_table(data)
+        self.assertEqual(decoded, SYMBOLS)
+        self.assertEqual(list(decoded), list(SYMBOLS))
+        table = SymbinTable(data)
+        self.assertEqual(table['中文'], SYMBOLS['中文'])
+        self.assertNotIn('missing', table)
+        self.assertEqual(len(table), len(SYMBOLS))
+
+    def test_version_1_round_trip(self):
+        self.assertEqual(decode_symbol_table(legacy_bytes(SYMBOLS)), SYMBOLS)
+
+    def test_empty_table(self):
+        self.assertEqual(decode_symbol_table(encode_symbol_table({})), {})
+
+    def test_truncated_data_raises_value_error(self):
+        for data in (encode_symbol_table(SYMBOLS), legacy_bytes(SYMBOLS)):
+            for size in range(len(data)):
+                with self.subTest(size=size), self.assertRaises(ValueError):
+                    decode_symbol_table(data[:size])
+
+    def test_corrupt_data_raises_only_value_error(self):
+        data = encode_symbol_table(SYMBOLS)
+        for position in range(4, len(data)):
+            for value in (0x00, 0x7f, 0xff):
+                corrupt = bytearray(data)
+                corrupt[position] = value
+                try:
+                    decode_symbol_table(bytes(corrupt))
+                except ValueError:
+                    pass
+                try:
+                    table = SymbinTable(bytes(corrupt))
+                    for name in SYMBOLS:
+                        table.get(name)
+                except ValueError:
+                    pass
+
+    def test_header_offsets_are_checked(self):
+        data = bytearray(encode_symbol_table(SYMBOLS))
+        fields = list(SYMBIN_HEADER.unpack_from(data))
+        for field, value in ((4, 0), (5, fields[4]), (6, fields[5]), (7, len(data))):
+            corrupt = list(fields)
+            corrupt[field] = value
+            with self.subTest(field=field), self.assertRaises(ValueError):
+                SymbinTable(SYMBIN_HEADER.pack(*corrupt) + data[SYMBIN_HEADER.size:])
+
+
+class LayeredSymbolTableTest(unittest.TestCase):
+
+    def test_len_does_not_decode_or_flatten(self):
+        layer = SymbinTable(encode_symbol_table(SYMBOLS))
+        table = LayeredSymbolTable({'zeta': {'type': 'variable', 'c_type': 'long'}})
+        table.AddLayer(layer)
+        table['new'] = {'type': 'variable', 'c_type': 'char'}
+        self.assertEqual(len(table), len(SYMBOLS) + 1)
+        self.assertEqual(table.Layers, [layer])
+        self.assertEqual(set(layer.Entries), {'zeta'})
+        self.assertEqual(len(table), len(dict(table.items())))
+        self.assertEqual(table.Layers, [])
+
+
+class LoadSymbinFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.work_dir.name, 'helper.py')
+        self.symbin = os.path.join(self.work_dir.name, 'helper.symbin')
+        with open(self.source, 'w', encoding='utf-8') as f:
+            f.write(HELPER)
+        code, _ = run_cli(['-presym', self.source])
+        self.assertEqual(code, 0)
+        translator = Translator()
+        translator.ParsePythonFile(self.source)
+        self.expected = dict(translator.SymbolTable)
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def load(self):
+        translator = Translator()
+        translator.LoadSymbinFile(self.symbin)
+        return dict(translator.SymbolTable)
+
+    def truncate(self):
+        with open(self.symbin, 'rb') as f:
+            data = f.read()
+        with open(self.symbin, 'wb') as f:
+            f.write(data[:len(data) // 2])
+
+    def test_presym_output_loads(self):
+        self.assertEqual(self.load(), self.expected)
+
+    def test_legacy_file_loads(self):
+        with open(self.symbin, 'wb') as f:
+            f.write(legacy_bytes(self.expected))
+        self.assertEqual(self.load(), self.expected)
+
+    def test_presym_does_not_overwrite_mapped_file(self):
+        table = open_symbol_file(self.symbin)
+        self.addCleanup(table.Close)
+        with open(self.source, 'w', encoding='utf-8') as f:
+            f.write(HELPER.replace('counter', 'renamed_counter'))
+        code, _ = run_cli(['-presym', self.source])
+        self.assertEqual(code, 0)
+        self.assertEqual(dict(table.items()), self.expected)
+        self.assertIn('renamed_counter', self.load())
+
+    def test_truncated_file_is_rebuilt_from_source(self):
+        self.truncate()
+        self.assertEqual(self.load(), self.expected)
+        table = open_symbol_file(self.symbin)
+        self.assertEqual(dict(table.items()), self.expected)
+        table.Close()
+
+    def test_truncated_file_without_source_is_skipped(self):
+        os.remove(self.source)
+        self.truncate()
+        self.assertEqual(self.load(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+# SymbolRegistry：跳过未变化的文件、重新解析变化的文件（删掉的符号随之删除），合并结果与逐个解析相同
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import run_cli
+from TransPyC import SymbolFile
+from lib.core.symbol_registry import SymbolRegistry
+from lib.core.translator import Translator
+
+
+def write_helper(path, body, mtime_ns=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('import c\nimport t\n\n' + body)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def sequential_table(paths):
+    """逐个调用 ParseHelperFile 得到的符号表"""
+    translator = Translator()
+    for path in paths:
+        translator.ParseHelperFile(path)
+    return dict(translator.SymbolTable)
+
+
+class SymbolRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.first = os.path.join(self.work_dir.name, 'first.py')
+        self.second = os.path.join(self.work_dir.name, 'second.py')
+        write_helper(self.first, 'shared: t.CExtern | t.CInt = c.State\nonly_first: t.CExtern | t.CInt = c.State\n',
+                     10 ** 18)
+        write_helper(self.second, 'shared: t.CExtern | t.CChar | t.CPtr = c.State\n', 10 ** 18)
+        self.registry = SymbolRegistry()
+        self.translator = Translator()
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def register(self, *paths):
+        return self.registry.Register(self.translator, [SymbolFile(file=path) for path in paths])
+
+    def test_unchanged_files_are_skipped(self):
+        self.assertEqual(self.register(self.first, self.second), 2)
+        self.assertEqual(self.register(self.first, self.second), 0)
+        self.assertEqual(self.registry.Parsed, 2)
+
+    def test_touched_file_with_same_content_is_not_reparsed(self):
+        self.register(self.first, self.second)
+        os.utime(self.first, ns=(2 * 10 ** 18, 2 * 10 ** 18))
+        self.assertEqual(self.register(self.first, self.second), 0)
+
+    def test_new_file_is_added_after_existing_ones(self):
+        self.register(self.first)
+        self.assertEqual(self.register(self.first, self.second), 1)
+        self.assertEqual(dict(self.translator.SymbolTable), sequential_table([self.first, self.second]))
+
+    def test_changed_earlier_file_does_not_override_later_file(self):
+        self.register(self.first, self.second)
+        write_helper(self.first, 'shared: t.CExtern | t.CUnsignedInt = c.State\nadded: t.CExtern | t.CInt = c.State\n',
+                     2 * 10 ** 18)
+        self.assertEqual(self.register(self.first, self.second), 1)
+        table = dict(self.translator.SymbolTable)
+        self.assertIn('added', table)
+        self.assertEqual(table['shared'], sequential_table([self.second])['shared'])
+        expected = sequential_table([self.first, self.second])
+        self.assertEqual({name: table[name] for name in expected}, expected)
+
+    def test_symbol_dropped_from_changed_file_is_removed(self):
+        self.register(self.first, self.second)
+        write_helper(self.first, 'added: t.CExtern | t.CInt = c.State\n', 2 * 10 ** 18)
+        self.assertEqual(self.register(self.first, self.second), 1)
+        table = dict(self.translator.SymbolTable)
+        self.assertNotIn('only_first', table)
+        self.assertEqual(table, sequential_table([self.first, self.second]))
+
+    def test_symbol_still_defined_by_later_file_is_kept(self):
+        self.register(self.first, self.second)
+        write_helper(self.first, 'added: t.CExtern | t.CInt = c.State\n', 2 * 10 ** 18)
+        write_helper(self.second, 'only_first: t.CExtern | t.CInt = c.State\n', 2 * 10 ** 18)
+        self.register(self.first, self.second)
+        self.assertEqual(dict(self.translator.SymbolTable), sequential_table([self.first, self.second]))
+
+    def test_symbol_dropped_from_changed_symbin_is_removed(self):
+        symbin = os.path.join(self.work_dir.name, 'first.symbin')
+        code, _ = run_cli(['-presym', self.first, '-o', symbin])
+        self.assertEqual(code, 0)
+        self.register(symbin, self.second)
+        self.assertIn('only_first', self.translator.SymbolTable)
+        write_helper(self.first, 'added: t.CExtern | t.CInt = c.State\n')
+        code, _ = run_cli(['-presym', self.first, '-o', symbin])
+        os.utime(symbin, ns=(2 * 10 ** 18, 2 * 10 ** 18))
+        self.assertEqual(self.register(symbin, self.second), 1)
+        self.assertNotIn('only_first', self.translator.SymbolTable)
+        self.assertIn('added', self.translator.SymbolTable)
+        self.assertEqual(dict(self.translator.SymbolTable), sequential_table([self.first, self.second]))
+
+    def test_parallel_parse_matches_sequential(self):
+        paths = []
+        for index in range(8):
+            path = os.path.join(self.work_dir.name, f'helper{index}.py')
+            write_helper(path, f'shared: t.CExtern | t.CInt = c.State\nvalue{index}: t.CExtern | t.CInt = c.State\n'
+                               f'def func{index}(x: t.CInt) -> t.CInt | c.State: pass\n')
+            paths.append(path)
+        registry = SymbolRegistry(max_workers=4)
+        self.assertEqual(registry.Register(self.translator, [SymbolFile(file=path) for path in paths]), 8)
+        self.assertEqual(dict(self.translator.SymbolTable), sequential_table(paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
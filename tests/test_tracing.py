@@ -0,0 +1,84 @@
+# Tracer：缓冲写出，按 -e 指定的编码写入的部分与其它调试信息保持顺序
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import run_cli
+from lib.core.tracing import Tracer
+from lib.core.translator import Translator
+
+PROGRAM = '''import c
+import t
+
+def main() -> t.CInt:
+    s: t.CChar | t.CPtr = "中文"
+    return 0
+'''
+
+
+class TracerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.work_dir.name, 'trace.p2c')
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def read(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_buffer_is_written_when_full_or_flushed(self):
+        tracer = Tracer(self.path, capacity=3)
+        tracer.Write('a\n')
+        tracer.Write('b\n')
+        self.assertFalse(os.path.exists(self.path))
+        tracer.Write('c\n')
+        self.assertEqual(self.read(), b'a\nb\nc\n')
+        tracer.Write('d\n')
+        tracer.Close()
+        self.assertEqual(self.read(), b'a\nb\nc\nd\n')
+
+    def test_other_encoding_keeps_order(self):
+        tracer = Tracer(self.path)
+        tracer.Write('前\n')
+        tracer.Write('中\n', 'gbk')
+        tracer.Write('后\n', 'utf-8')
+        tracer.Close()
+        self.assertEqual(self.read(), '前\n'.encode('utf-8') + '中\n'.encode('gbk') + '后\n'.encode('utf-8'))
+
+    def test_translator_has_a_single_tracer(self):
+        translator = Translator()
+        translator.set_debug_file(self.path)
+        translator.debug_print('x', 1)
+        translator.debug_write('y\n')
+        translator.flush_debug()
+        self.assertEqual(self.read(), b'x 1\ny\n')
+        translator.set_debug_file(None)
+        self.assertIsNone(translator.Tracer)
+        translator.debug_print('ignored')
+
+
+class DebugDumpEncodingTest(unittest.TestCase):
+
+    def test_ast_dump_uses_source_encoding(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            source = os.path.join(work_dir, 'prog.py')
+            with open(source, 'w', encoding='gbk') as f:
+                f.write(PROGRAM)
+            output = os.path.join(work_dir, 'prog.c')
+            code, _ = run_cli(['-f', source, '-o', output, '-e', 'gbk', '-nocache'], cwd=work_dir)
+            self.assertEqual(code, 0)
+            with open(output[:-2] + '.p2c', 'rb') as f:
+                data = f.read()
+            start = data.index(b'=== AST Tree (Compact) ===\n')
+            end = data.index(b'\n\n', start)
+            self.assertIn("value='中文'".encode('gbk'), data[start:end])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# CType：类型字符串拆成存储类、限定符、指针、数组和结构体名，同一字符串只解析一次
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import support  # noqa: F401  (把仓库根目录加入 sys.path)
+from lib.core.type_model import c_type, split_array_dims
+
+# 类型字符串 -> (Base, Qualifiers, StorageClass, PointerDepth, ArrayDims, StructName, IsArrayPointer, Declare('v'))
+CASES = {
+    'int': ('int', (), '', 0, (), None, False, 'int v'),
+    'struct SHEET*': ('struct SHEET', (), '', 1, (), 'SHEET', False, 'struct SHEET* v'),
+    'union U**': ('union U', (), '', 2, (), 'U', False, 'union U** v'),
+    'static char[0x80]': ('char', (), 'static', 0, ('0x80',), None, False, 'static char v[0x80]'),
+    'extern unsigned int': ('unsigned int', (), 'extern', 0, (), None, False, 'extern unsigned int v'),
+    'volatile const int': ('int', ('volatile', 'const'), '', 0, (), None, False, 'volatile const int v'),
+    'const char (*)[16]': ('char', ('const',), '', 1, ('16',), None, True, 'const char (*v)[16]'),
+    'struct SHEET *[MAX_SHEETS]': ('struct SHEET', (), '', 1, ('MAX_SHEETS',), 'SHEET', False,
+                                   'struct SHEET *v[MAX_SHEETS]'),
+    'int[sizeof(a[0])][2]': ('int', (), '', 0, ('sizeof(a[0])', '2'), None, False, 'int v[sizeof(a[0])][2]'),
+}
+
+
+class CTypeTest(unittest.TestCase):
+
+    def test_fields_and_declarations(self):
+        for spelling, expected in CASES.items():
+            with self.subTest(spelling):
+                ctype = c_type(spelling)
+                self.assertEqual((ctype.Base, ctype.Qualifiers, ctype.StorageClass, ctype.PointerDepth,
+                                  ctype.ArrayDims, ctype.StructName, ctype.IsArrayPointer, ctype.Declare('v')),
+                                 expected)
+                self.assertEqual(str(ctype), spelling)
+
+    def test_predicates(self):
+        self.assertTrue(c_type('struct SHEET *[4]').IsPointer)
+        self.assertTrue(c_type('struct SHEET *[4]').IsArray)
+        self.assertTrue(c_type('struct SHEET *[4]').IsStruct)
+        self.assertTrue(c_type('const char (*)[16]').IsPointer)
+        self.assertFalse(c_type('const char (*)[16]').IsArray)
+        self.assertFalse(c_type('struct *').IsStruct)
+
+    def test_types_are_interned(self):
+        self.assertIs(c_type('char*'), c_type('char*'))
+        self.assertIsNot(c_type('char*'), c_type('char *'))
+
+    def test_split_array_dims(self):
+        self.assertEqual(split_array_dims(' int '), ('int', ()))
+        self.assertEqual(split_array_dims('char[a[1]][ 2 ]'), ('char', ('a[1]', '2')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+# GetTypeName 的结构缓存：缓存结果与不使用缓存时相同，缓存键包含影响结果的全部节点内容，命中次数按实例统计
+
+import ast
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT
+from lib.core import translator as translator_module
+from lib.core.translator import TYPE_NAME_CACHE, Translator, type_name_key
+
+SAMPLES = ('kernel.py', 'kernel2.py', 'test.py', 'test2.py', 'test/example1.py',
+           'test/test_simple.py', 'backup_test/test.py', 'backup_test/test_split.py',
+           'backup_test/example_test.py')
+
+# 只有细节不同的注解，缓存键必须能区分它们
+SIMILAR = '''
+a: t.CStruct(name="A")
+b: t.CStruct(name="B")
+c: t.CStruct(name=B)
+d: t.CStruct(name=1)
+e: t.CStruct(name=True)
+f: t.CStruct(name="1")
+g: t.CInt
+h: c.CInt
+i: CInt
+j: t.CInt | t.CPtr
+k: t.CPtr | t.CInt
+l: t.CStatic | t.CChar[0x80]
+m: t.CStatic | t.CChar[0x40]
+n: t.CStruct(name="A") | t.CPtr
+o: t.CStruct(name="B") | t.CPtr
+'''
+
+
+class NeverStores(dict):
+    """不保存任何内容的缓存，用来得到不经缓存的结果"""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+def annotations(tree):
+    """树中所有注解节点及其子节点"""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.arg) and node.annotation is not None:
+            yield from ast.walk(node.annotation)
+        elif isinstance(node, ast.AnnAssign):
+            yield from ast.walk(node.annotation)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.returns is not None:
+            yield from ast.walk(node.returns)
+
+
+def sample_annotations():
+    nodes = []
+    for path in SAMPLES:
+        with open(os.path.join(ROOT, path), 'r', encoding='utf-8') as f:
+            nodes.extend(annotations(ast.parse(f.read())))
+    nodes.extend(annotations(ast.parse(SIMILAR)))
+    return nodes
+
+
+def translate(path):
+    with open(os.path.join(ROOT, path), 'r', encoding='utf-8') as f:
+        content = f.read()
+    translator = Translator()
+    translator.OriginalLines = content.split('\n')
+    translator.Content = content
+    return translator.GenerateCCode(ast.parse(content))
+
+
+class TypeNameCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        TYPE_NAME_CACHE.clear()
+        self.addCleanup(TYPE_NAME_CACHE.clear)
+
+    def uncached(self, node):
+        with mock.patch.object(translator_module, 'TYPE_NAME_CACHE', NeverStores()):
+            return Translator().GetTypeName(node)
+
+    def test_cached_names_equal_uncached(self):
+        nodes = sample_annotations()
+        self.assertGreater(len(nodes), 200)
+        expected = [self.uncached(node) for node in nodes]
+        self.assertEqual(TYPE_NAME_CACHE, {})
+        translator = Translator()
+        # 第二遍全部来自缓存，两遍都应与不使用缓存时相同
+        for _ in range(2):
+            self.assertEqual([translator.GetTypeName(node) for node in nodes], expected)
+        self.assertGreater(translator.TypeNameHits, 0)
+
+    def test_key_covers_everything_that_changes_the_name(self):
+        names = {}
+        for node in sample_annotations():
+            key = type_name_key(node)
+            if key is not None:
+                names.setdefault(key, set()).add(self.uncached(node))
+        self.assertEqual({key: found for key, found in names.items() if len(found) > 1}, {})
+        similar = {node.target.id: node.annotation for node in ast.parse(SIMILAR).body}
+        translator = Translator()
+        resolved = {name: translator.GetTypeName(node) for name, node in similar.items()}
+        for first, second in ('ab', 'de', 'gh', 'lm', 'no'):
+            with self.subTest(first=first, second=second):
+                self.assertNotEqual(resolved[first], resolved[second])
+        # 结果碰巧相同的也分开缓存：名称和字符串参数、1 和 '1'、t.CInt 和 CInt
+        for first, second in ('ab', 'bc', 'de', 'df', 'gh', 'gi'):
+            with self.subTest(first=first, second=second):
+                self.assertNotEqual(type_name_key(similar[first]), type_name_key(similar[second]))
+        self.assertEqual(resolved, {name: self.uncached(node) for name, node in similar.items()})
+
+    def test_translation_does_not_depend_on_cache_contents(self):
+        cold = {}
+        for path in SAMPLES:
+            TYPE_NAME_CACHE.clear()
+            cold[path] = translate(path)
+        # 缓存中留有其他文件的结果时，按相反顺序再翻译一遍
+        for path in reversed(SAMPLES):
+            with self.subTest(path):
+                self.assertEqual(translate(path), cold[path])
+        self.assertTrue(TYPE_NAME_CACHE)
+
+    def test_hit_and_miss_counts(self):
+        annotation = ast.parse('x: t.CStatic | t.CInt').body[0].annotation
+        first = Translator()
+        first.GetTypeName(annotation)
+        # 两侧的叶子节点和 | 组合各未命中一次
+        self.assertEqual((first.TypeNameHits, first.TypeNameMisses), (0, 3))
+        first.GetTypeName(annotation)
+        self.assertEqual((first.TypeNameHits, first.TypeNameMisses), (3, 3))
+        # 缓存由所有实例共用，计数按实例分别统计
+        second = Translator()
+        second.GetTypeName(annotation.left)
+        self.assertEqual((second.TypeNameHits, second.TypeNameMisses), (1, 0))
+        # 数组节点本身不经过缓存，只有元素类型 t.CChar 计一次未命中
+        second.GetTypeName(ast.parse('y: t.CChar[0x80]').body[0].annotation)
+        self.assertEqual((second.TypeNameHits, second.TypeNameMisses), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
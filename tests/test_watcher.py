@@ -0,0 +1,128 @@
+# Watcher：只重新翻译变化的源文件和引用了变化的辅助符号的文件，内容相同时不重写输出
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import support  # noqa: F401  (把仓库根目录加入 sys.path)
+from lib.core.watcher import Watcher, changed_symbols
+
+HELPER = '''import c
+import t
+
+class Pt(t.CStruct):
+    x: t.CInt
+
+cur: Pt | t.CPtr = c.State
+'''
+
+USES_CUR = '''import c
+import t
+
+def f() -> t.CInt:
+    return cur.x
+'''
+
+INDEPENDENT = '''import c
+import t
+
+def g(a: t.CInt) -> t.CInt:
+    return a * 2
+'''
+
+
+class WatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self.work_dir.name, 'src')
+        self.helper = os.path.join(self.work_dir.name, 'helper.py')
+        self.mtime = 10 ** 18
+        self.write(self.helper, HELPER)
+        self.a = self.write(os.path.join(self.source_dir, 'a.py'), USES_CUR)
+        self.b = self.write(os.path.join(self.source_dir, 'sub', 'b.py'), INDEPENDENT)
+        self.watcher = Watcher(self.source_dir, helper_files=[self.helper])
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write(self, path, text):
+        """写入文件并设置一个递增的修改时间，不依赖文件系统的时间精度"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        self.mtime += 10 ** 9
+        os.utime(path, ns=(self.mtime, self.mtime))
+        return path
+
+    def read(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def retranslated(self):
+        """执行一轮，返回重新翻译的文件名和报告"""
+        lines = self.watcher.Cycle()
+        return {os.path.basename(line.split()[0]) for line in lines[1:]}, lines
+
+    def test_first_cycle_translates_everything(self):
+        names, lines = self.retranslated()
+        self.assertEqual(names, {'a.py', 'b.py'})
+        self.assertTrue(lines[0].startswith('[watch] 2 retranslated: 2 written, 0 unchanged, 0 failed'))
+        self.assertIn('cur->x', self.read(self.a[:-3] + '.c'))
+        self.assertEqual(self.watcher.Cycle(), [])
+
+    def test_changed_source_only(self):
+        self.retranslated()
+        self.write(self.b, INDEPENDENT.replace('a * 2', 'a * 3'))
+        names, _ = self.retranslated()
+        self.assertEqual(names, {'b.py'})
+        self.assertIn('a * 3', self.read(self.b[:-3] + '.c'))
+
+    def test_touched_source_is_not_rewritten(self):
+        self.retranslated()
+        output = self.b[:-3] + '.c'
+        os.utime(output, ns=(1, 1))
+        self.write(self.b, INDEPENDENT)
+        names, lines = self.retranslated()
+        self.assertEqual(names, {'b.py'})
+        self.assertIn('(unchanged)', lines[1])
+        self.assertEqual(os.stat(output).st_mtime_ns, 1)
+
+    def test_helper_change_retranslates_dependents(self):
+        self.retranslated()
+        self.write(self.helper, HELPER.replace('cur: Pt | t.CPtr', 'cur: Pt'))
+        names, lines = self.retranslated()
+        self.assertEqual(names, {'a.py'})
+        self.assertIn('helper symbols changed', lines[0])
+        self.assertIn('cur.x', self.read(self.a[:-3] + '.c'))
+
+    def test_removed_and_broken_sources(self):
+        self.retranslated()
+        os.remove(self.b)
+        self.write(self.a, 'def broken(:\n')
+        names, lines = self.retranslated()
+        self.assertEqual(names, {'a.py'})
+        self.assertIn('FAILED', lines[1])
+        self.assertEqual(set(self.watcher.Units), {self.a})
+
+
+class ChangedSymbolsTest(unittest.TestCase):
+
+    def test_struct_change_propagates_to_users(self):
+        old = {
+            'Pt': {'type': 'struct', 'members': {'x': {'type': 'int', 'is_pointer': False}}},
+            'Box': {'type': 'struct', 'members': {'p': {'type': 'struct Pt*', 'is_pointer': True}}},
+            'cur': {'type': 'variable', 'declared_type': 'struct Box*', 'is_pointer': True},
+            'other': {'type': 'variable', 'declared_type': 'int', 'is_pointer': False},
+            'func': {'type': 'function'},
+        }
+        new = dict(old, Pt={'type': 'struct', 'members': {'x': {'type': 'char', 'is_pointer': False}}})
+        self.assertEqual(changed_symbols(old, new), {'Pt', 'Box', 'cur'})
+        self.assertEqual(changed_symbols(old, dict(old)), set())
+        self.assertEqual(changed_symbols(old, {k: v for k, v in old.items() if k != 'func'}), {'func'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# 合成输入生成器：同一规格生成相同的源代码，规模随维度变化，生成的代码可以翻译
+
+import ast
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from support import ROOT, run_cli
+sys.path.insert(0, os.path.join(ROOT, 'bench'))
+from workload import WorkloadSpec, generate_helper, generate_source, write_workload
+
+
+def top_level(source, node_type):
+    return [node for node in ast.parse(source).body if isinstance(node, node_type)]
+
+
+class WorkloadTest(unittest.TestCase):
+
+    def test_same_spec_same_source(self):
+        spec = WorkloadSpec(functions=5, depth=4)
+        self.assertEqual(generate_source(spec), generate_source(WorkloadSpec(functions=5, depth=4)))
+        self.assertEqual(generate_helper(spec), generate_helper(spec.Replace()))
+
+    def test_dimensions_control_size(self):
+        spec = WorkloadSpec(functions=7, structs=3, members=2, arrays=2, defines=5, helper_symbols=10)
+        source = generate_source(spec)
+        self.assertEqual(len(top_level(source, ast.FunctionDef)), 7)
+        self.assertEqual(len(top_level(source, ast.ClassDef)), 3)
+        self.assertEqual(len(top_level(source, ast.AnnAssign)), 2 + 5)
+        helper = ast.parse(generate_helper(spec)).body
+        self.assertEqual(len([node for node in helper if not isinstance(node, ast.Import)]), 10)
+        self.assertGreater(len(generate_source(spec.Replace(depth=8))), len(source))
+
+    def test_unknown_dimension_is_rejected(self):
+        with self.assertRaises(ValueError):
+            WorkloadSpec(fuctions=3)
+
+    def test_edge_sizes_parse(self):
+        for values in ({'structs': 0}, {'members': 0}, {'depth': 0}, {'literals': 0}, {'helper_symbols': 0}):
+            with self.subTest(values):
+                spec = WorkloadSpec(**values)
+                ast.parse(generate_source(spec))
+                ast.parse(generate_helper(spec))
+
+    def test_generated_workload_translates(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            source, helper = write_workload(work_dir, WorkloadSpec(functions=3, depth=5))
+            output = os.path.join(work_dir, 'workload.c')
+            code, _ = run_cli(['-f', source, '-o', output, '-h', helper, '-nocache'])
+            self.assertEqual(code, 0)
+            with open(output, 'r', encoding='utf-8') as f:
+                c_code = f.read()
+        self.assertIn('int wl_func_2(', c_code)
+        self.assertEqual(c_code.count('{'), c_code.count('}'))
+
+
+if __name__ == '__main__':
+    unittest.main()